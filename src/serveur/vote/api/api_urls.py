@@ -1,22 +1,49 @@
 # api_urls.py
 from django.urls import path
+from app.async_api_view import VOTE_ASYNC_READS
 from api.vote_controller import (
+    VoteBulkView,
     VoteDeleteView,
+    VoteValidationJobView,
     VoteValidationView,
     VoteView,
     VotesByVoterView,
     VotesByVoterMeView,
     VotesForUserView,
     VotesForUserMeView,
+    VotesByVoterAsyncView,
+    VotesByVoterMeAsyncView,
+    VotesForUserAsyncView,
+    VotesForUserMeAsyncView,
 )
 from api.publication_controller import PublicationSettingView
-from api.result_controller import ResultView
+from api.result_controller import ResultChangesAsyncView, ResultChangesView, ResultAsyncView, ResultView
 from api.publication_controller import PublicationSettingView
-from api.stats_controller import StatsDailyView, StatsMonthlyView, StatsChartView
+from api.stats_controller import (
+    StatsDailyView,
+    StatsMonthlyView,
+    StatsChartView,
+    StatsDailyAsyncView,
+    StatsMonthlyAsyncView,
+    StatsChartAsyncView,
+)
+
+if VOTE_ASYNC_READS:
+    # Lectures servies par les vues async (serveur ASGI)
+    VotesByVoterView = VotesByVoterAsyncView
+    VotesByVoterMeView = VotesByVoterMeAsyncView
+    VotesForUserView = VotesForUserAsyncView
+    VotesForUserMeView = VotesForUserMeAsyncView
+    ResultView = ResultAsyncView
+    ResultChangesView = ResultChangesAsyncView
+    StatsDailyView = StatsDailyAsyncView
+    StatsMonthlyView = StatsMonthlyAsyncView
+    StatsChartView = StatsChartAsyncView
 
 
 urlpatterns = [
     path("votes", VoteView.as_view(), name="create_vote"),
+    path("votes/bulk", VoteBulkView.as_view(), name="create_votes_bulk"),
     path("votes/<str:domain>", VoteDeleteView.as_view(), name="delete_vote"),
 
     path("votes/by-voter/me", VotesByVoterMeView.as_view(), name="votes_by_voter_me"),
@@ -25,8 +52,10 @@ urlpatterns = [
     path("votes/for-user/<str:userId>", VotesForUserView.as_view(), name="votes_for_user"),
 
     path("votes/validate/force", VoteValidationView.as_view(), name="vote_validation"),
+    path("votes/validate/jobs/<str:jobId>", VoteValidationJobView.as_view(), name="vote_validation_job"),
     
     path("results", ResultView.as_view(), name="get_results"),
+    path("results/changes", ResultChangesView.as_view(), name="get_result_changes"),
 
     path("publication", PublicationSettingView.as_view(), name="publication_setting"),
 
@@ -1,7 +1,52 @@
+import logging
+import os
+import threading
+
 from django.apps import AppConfig
 
+logger = logging.getLogger(__name__)
+
+
 class ApiConfig(AppConfig):
     name = "api"
 
     def ready(self):
         import app.schema_extensions
+
+
+_schema_check_started = False
+
+
+def start_schema_check():
+    """
+    Lance la vérification du schéma Neo4j en tâche de fond (ne bloque pas le
+    démarrage), si VOTE_SCHEMA_CHECK est actif. Appelée par app.wsgi et
+    app.asgi : seuls les processus qui servent des requêtes la font
+    (runserver charge app.wsgi), pas les commandes de gestion, le cron ni
+    les tests.
+    """
+    global _schema_check_started
+    if _schema_check_started or os.getenv("VOTE_SCHEMA_CHECK", "true").lower() not in ("1", "true", "yes"):
+        return
+    _schema_check_started = True
+    threading.Thread(target=check_vote_schema, daemon=True).start()
+
+
+def check_vote_schema():
+    """
+    Avertit si des contraintes ou index du modèle de vote manquent
+    (cf. manage.py ensure_vote_schema). Neo4j indisponible n'est pas bloquant.
+    """
+    from db.repository.schema_repository import SchemaRepository
+
+    try:
+        missing = SchemaRepository.missing_schema()
+    except Exception as exc:
+        logger.warning("Vérification du schéma Neo4j impossible : %s", exc)
+        return
+
+    if missing:
+        logger.warning(
+            "Schéma Neo4j incomplet (%s) : lancer `python manage.py ensure_vote_schema`",
+            ", ".join(missing),
+        )
@@ -0,0 +1,38 @@
+import hmac
+import logging
+import os
+
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+
+from app.instrumentation import METRICS, render_phases
+from db.repository.run_repository import RunRepository
+
+# Jeton exigé (Authorization: Bearer <jeton>) pour lire /metrics ; vide = endpoint désactivé
+VOTE_METRICS_TOKEN = os.getenv("VOTE_METRICS_TOKEN", "")
+
+logger = logging.getLogger(__name__)
+
+
+@require_GET
+def metrics_view(request):
+    """
+    GET /metrics
+    Métriques du processus (requêtes Cypher, requêtes HTTP, phases du
+    traitement quotidien) au format texte Prometheus. Désactivé (404) tant
+    que VOTE_METRICS_TOKEN n'est pas défini.
+    """
+    if not VOTE_METRICS_TOKEN:
+        return HttpResponse("Not Found\n", status=404, content_type="text/plain")
+    header = request.META.get("HTTP_AUTHORIZATION", "")
+    if not hmac.compare_digest(header, f"Bearer {VOTE_METRICS_TOKEN}"):
+        return HttpResponse("Unauthorized\n", status=401, content_type="text/plain")
+
+    text = METRICS.render()
+    try:
+        # Journal VoteRun : le traitement quotidien tourne dans le processus du cron
+        text += render_phases(RunRepository.get_last_phases())
+    except Exception as exc:
+        logger.warning("Métriques des phases indisponibles : %r", exc)
+
+    return HttpResponse(text, content_type="text/plain; version=0.0.4; charset=utf-8")
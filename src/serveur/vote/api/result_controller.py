@@ -11,7 +11,8 @@ from rest_framework.response import Response
 from rest_framework import status
 from datetime import datetime
 
-from core.dto.result_response_dto import VoteResultSerializer
+from app.async_api_view import AsyncAPIView
+from core.dto.result_response_dto import ResultChangesSerializer, VoteResultSerializer
 from core.services.result_service import ResultService
 
 
@@ -44,6 +45,14 @@ class ResultView(APIView):
                 type=OpenApiTypes.DATE,
                 location=OpenApiParameter.QUERY,
             ),
+            OpenApiParameter(
+                name="asOf",
+                description="Résultats tels qu'au dernier instantané à cette date (YYYY-MM-DD), "
+                            "incompatible avec since",
+                required=False,
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+            ),
         ],
         responses={
             200: VoteResultSerializer(many=True),
@@ -51,12 +60,29 @@ class ResultView(APIView):
             401: OpenApiResponse(description="Unauthorized"),
         },
         description="Récupère les résultats agrégés des votes avec classement. "
-                    "Paramètres: domain, top, since (YYYY-MM-DD).",
+                    "Paramètres: domain, top, since (YYYY-MM-DD), asOf (YYYY-MM-DD).",
     )
     def get(self, request):
         """
         Récupère les résultats agrégés des votes.
         """
+        query = self._query(request)
+        if isinstance(query, Response):
+            return query
+
+        # Récupération des résultats
+        results = ResultService.get_vote_results(**query)
+
+        # Sérialisation
+        serializer = VoteResultSerializer(results, many=True)
+        
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def _query(request) -> dict | Response:
+        """
+        Paramètres de ResultService.get_vote_results, ou la réponse d'erreur.
+        """
         current_user_id = request.user.id
 
         if current_user_id is None:
@@ -69,6 +95,7 @@ class ResultView(APIView):
         domain = request.query_params.get("domain", None)
         top = request.query_params.get("top", 100)
         since_str = request.query_params.get("since", None)
+        as_of_str = request.query_params.get("asOf", None)
 
         # Validation de 'top'
         try:
@@ -95,14 +122,151 @@ class ResultView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-        # Récupération des résultats
-        results = ResultService.get_vote_results(
-            domain=domain,
-            top=top,
-            since=since
-        )
+        # Validation de 'asOf'
+        as_of = None
+        if as_of_str:
+            if since is not None:
+                return Response(
+                    {"error": "Parameters 'since' and 'asOf' cannot be combined"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            try:
+                as_of = datetime.strptime(as_of_str, "%Y-%m-%d").date()
+            except ValueError:
+                return Response(
+                    {"error": "Parameter 'asOf' must be in YYYY-MM-DD format"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
-        # Sérialisation
-        serializer = VoteResultSerializer(results, many=True)
-        
+        return {"domain": domain, "top": top, "since": since, "as_of": as_of}
+
+
+class ResultChangesView(APIView):
+    """
+    GET /api/results/changes
+    """
+
+    @extend_schema(
+        tags=["Results"],
+        parameters=[
+            OpenApiParameter(
+                name="from",
+                description="Date de l'instantané de départ (YYYY-MM-DD)",
+                required=True,
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="to",
+                description="Date de l'instantané d'arrivée (YYYY-MM-DD)",
+                required=True,
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="domain",
+                description="Filtrer par domaine (optionnel)",
+                required=False,
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+            ),
+            OpenApiParameter(
+                name="top",
+                description="Taille des classements comparés (défaut 100)",
+                required=False,
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+            ),
+        ],
+        responses={
+            200: ResultChangesSerializer,
+            400: OpenApiResponse(description="Paramètres invalides"),
+            401: OpenApiResponse(description="Unauthorized"),
+            404: OpenApiResponse(description="Aucun instantané à l'une des dates"),
+        },
+        description="Compare les classements de deux instantanés de résultats : "
+                    "candidats dont le nombre de voix, le rang ou l'élection a changé.",
+    )
+    def get(self, request):
+        """
+        Évolution des résultats entre deux dates.
+        """
+        query = self._query(request)
+        if isinstance(query, Response):
+            return query
+        return self._response(ResultService.get_result_changes(**query))
+
+    @staticmethod
+    def _query(request) -> dict | Response:
+        """
+        Paramètres de ResultService.get_result_changes, ou la réponse d'erreur.
+        """
+        if request.user.id is None:
+            return Response(
+                {"error": "Unauthorized"},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        domain = request.query_params.get("domain", None)
+
+        try:
+            top = int(request.query_params.get("top", 100))
+        except ValueError:
+            return Response(
+                {"error": "Parameter 'top' must be an integer"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if top <= 0:
+            return Response(
+                {"error": "Parameter 'top' must be a positive integer"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        dates = {}
+        for name in ("from", "to"):
+            try:
+                dates[name] = datetime.strptime(request.query_params.get(name, ""), "%Y-%m-%d").date()
+            except ValueError:
+                return Response(
+                    {"error": f"Parameter '{name}' is required in YYYY-MM-DD format"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        return {"from_date": dates["from"], "to_date": dates["to"], "domain": domain, "top": top}
+
+    @staticmethod
+    def _response(changes: dict | None) -> Response:
+        if changes is None:
+            return Response(
+                {"error": "No result snapshot on or before the requested dates"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        serializer = ResultChangesSerializer(changes)
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class ResultAsyncView(AsyncAPIView, ResultView):
+    """
+    GET /api/results, servi par le driver Neo4j async (VOTE_ASYNC_READS)
+    """
+
+    async def get(self, request):
+        query = self._query(request)
+        if isinstance(query, Response):
+            return query
+
+        results = await ResultService.aget_vote_results(**query)
+        return Response(VoteResultSerializer(results, many=True).data, status=status.HTTP_200_OK)
+
+
+class ResultChangesAsyncView(AsyncAPIView, ResultChangesView):
+    """
+    GET /api/results/changes, servi par le driver Neo4j async (VOTE_ASYNC_READS)
+    """
+
+    async def get(self, request):
+        query = self._query(request)
+        if isinstance(query, Response):
+            return query
+        return self._response(await ResultService.aget_result_changes(**query))
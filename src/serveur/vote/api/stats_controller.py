@@ -1,4 +1,8 @@
+import calendar
+import datetime
 from typing import Dict
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from drf_spectacular.utils import (
     extend_schema,
     OpenApiResponse,
@@ -9,9 +13,57 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
+from app.async_api_view import AsyncAPIView
 from core.dto.stats_response_dto import StatsDailySerializer, StatsMonthlySerializer, StatsChartSerializer
+from core.services.stats_cache import StatsCache
 from core.services.stats_service import StatsService
 
+
+def _cached_response(request, endpoint: str, params: dict, last_date: str, version: tuple, compute,
+                     with_last_modified: bool = True):
+    """
+    Réponse de statistiques mise en cache, avec ETag / Last-Modified dérivés
+    de la date de l'instantané : un GET conditionnel à jour reçoit un 304.
+
+    Sans `with_last_modified`, seul l'ETag est envoyé : à utiliser quand
+    `version` peut changer dans la journée (Last-Modified n'en dépend pas).
+    """
+    key, etag, last_modified = _cache_validators(endpoint, params, last_date, version, with_last_modified)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = Response(StatsCache.get_or_set(key, compute), status=status.HTTP_200_OK)
+    return _with_validators(response, etag, last_modified)
+
+
+async def _acached_response(request, endpoint: str, params: dict, last_date: str, version: tuple, acompute,
+                            with_last_modified: bool = True):
+    """
+    Variante async de _cached_response (`acompute` est une coroutine).
+    """
+    key, etag, last_modified = _cache_validators(endpoint, params, last_date, version, with_last_modified)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = Response(await StatsCache.aget_or_set(key, acompute), status=status.HTTP_200_OK)
+    return _with_validators(response, etag, last_modified)
+
+
+def _cache_validators(
+    endpoint: str, params: dict, last_date: str, version: tuple, with_last_modified: bool = True
+) -> tuple[str, str, int | None]:
+    key = StatsCache.key(endpoint, params, last_date, *version)
+    last_modified = None
+    if with_last_modified:
+        last_modified = calendar.timegm(datetime.date.fromisoformat(last_date).timetuple())
+    return key, StatsCache.etag(key), last_modified
+
+
+def _with_validators(response, etag: str, last_modified: int | None):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
 class StatsDailyView(APIView):
     """
     GET /stats/votes/daily/{userId}
@@ -35,16 +87,23 @@ class StatsDailyView(APIView):
         days = int(request.query_params.get("days", 30))
         include_monthly = request.query_params.get("includeMonthly", "false").lower() in ("1", "true", "yes")
 
-        res = StatsService.get_daily_stats(userId, days=days, include_monthly=include_monthly)
-        by_domain = res.get("byDomain", [])  # list of {domain, series:[{date,count},...]}
-        print(by_domain)
-        payload = {
-            "userId": res.get("userId", userId),
-            "byDomain": by_domain,
-            "monthlyByDomain": res.get("monthlyByDomain")
-        }
-        serializer = StatsDailySerializer(payload)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        def compute():
+            res = StatsService.get_daily_stats(userId, days=days, include_monthly=include_monthly)
+            by_domain = res.get("byDomain", [])  # list of {domain, series:[{date,count},...]}
+            payload = {
+                "userId": res.get("userId", userId),
+                "byDomain": by_domain,
+                "monthlyByDomain": res.get("monthlyByDomain")
+            }
+            return StatsDailySerializer(payload).data
+
+        # Le filtrage des domaines dépend de publishVotes, qui peut changer dans la
+        # journée : ETag seulement, un If-Modified-Since ne doit pas donner de 304
+        last_date, publish_votes, _ = StatsService.get_stats_version(userId)
+        return _cached_response(
+            request, "daily", {"userId": userId, "days": days, "includeMonthly": include_monthly},
+            last_date, (publish_votes,), compute, with_last_modified=False,
+        )
 
 
 class StatsMonthlyView(APIView):
@@ -68,11 +127,16 @@ class StatsMonthlyView(APIView):
             return Response({"detail": "Unauthorized"}, status=status.HTTP_401_UNAUTHORIZED)
 
         months = int(request.query_params.get("months", 12))
-        monthly_by_domain = StatsService.get_monthly_stats(userId, months=months)
 
-        payload = {"userId": userId, "monthlyByDomain": monthly_by_domain}
-        serializer = StatsMonthlySerializer(payload)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        def compute():
+            monthly_by_domain = StatsService.get_monthly_stats(userId, months=months)
+            payload = {"userId": userId, "monthlyByDomain": monthly_by_domain}
+            return StatsMonthlySerializer(payload).data
+
+        last_date, _, _ = StatsService.get_stats_version()
+        return _cached_response(
+            request, "monthly", {"userId": userId, "months": months}, last_date, (), compute,
+        )
 
 class StatsChartView(APIView):
     """
@@ -97,7 +161,81 @@ class StatsChartView(APIView):
         domain = request.query_params.get("domain")
         days = int(request.query_params.get("days", 30))
 
-        chart = StatsService.get_chart(domain=domain, days=days)
-        serializer = StatsChartSerializer(data=chart, many=True)
-        serializer.is_valid(raise_exception=False)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # Clé et calcul reposent sur le même catalogue, lu dans Neo4j avec lastDate
+        last_date, _, domains = StatsService.get_stats_version()
+
+        def compute():
+            chart = StatsService.get_chart(domain=domain, days=days, domains=domains)
+            serializer = StatsChartSerializer(data=chart, many=True)
+            serializer.is_valid(raise_exception=False)
+            return serializer.data
+
+        return _cached_response(
+            request, "chart", {"domain": domain, "days": days}, last_date, (domains,), compute,
+        )
+
+
+# -------------------- VARIANTES ASYNC (VOTE_ASYNC_READS) --------------------
+# Mêmes réponses (et même cache) que les vues sync, lues avec le driver Neo4j async
+
+
+class StatsDailyAsyncView(AsyncAPIView, StatsDailyView):
+    async def get(self, request, userId: str):
+        if getattr(request.user, "id", None) is None:
+            return Response({"detail": "Unauthorized"}, status=status.HTTP_401_UNAUTHORIZED)
+
+        days = int(request.query_params.get("days", 30))
+        include_monthly = request.query_params.get("includeMonthly", "false").lower() in ("1", "true", "yes")
+
+        async def acompute():
+            res = await StatsService.aget_daily_stats(userId, days=days, include_monthly=include_monthly)
+            payload = {
+                "userId": res.get("userId", userId),
+                "byDomain": res.get("byDomain", []),
+                "monthlyByDomain": res.get("monthlyByDomain")
+            }
+            return StatsDailySerializer(payload).data
+
+        last_date, publish_votes, _ = await StatsService.aget_stats_version(userId)
+        return await _acached_response(
+            request, "daily", {"userId": userId, "days": days, "includeMonthly": include_monthly},
+            last_date, (publish_votes,), acompute, with_last_modified=False,
+        )
+
+
+class StatsMonthlyAsyncView(AsyncAPIView, StatsMonthlyView):
+    async def get(self, request, userId: str):
+        if getattr(request.user, "id", None) is None:
+            return Response({"detail": "Unauthorized"}, status=status.HTTP_401_UNAUTHORIZED)
+
+        months = int(request.query_params.get("months", 12))
+
+        async def acompute():
+            monthly_by_domain = await StatsService.aget_monthly_stats(userId, months=months)
+            return StatsMonthlySerializer({"userId": userId, "monthlyByDomain": monthly_by_domain}).data
+
+        last_date, _, _ = await StatsService.aget_stats_version()
+        return await _acached_response(
+            request, "monthly", {"userId": userId, "months": months}, last_date, (), acompute,
+        )
+
+
+class StatsChartAsyncView(AsyncAPIView, StatsChartView):
+    async def get(self, request):
+        if getattr(request.user, "id", None) is None:
+            return Response({"detail": "Unauthorized"}, status=status.HTTP_401_UNAUTHORIZED)
+
+        domain = request.query_params.get("domain")
+        days = int(request.query_params.get("days", 30))
+
+        last_date, _, domains = await StatsService.aget_stats_version()
+
+        async def acompute():
+            chart = await StatsService.aget_chart(domain=domain, days=days, domains=domains)
+            serializer = StatsChartSerializer(data=chart, many=True)
+            serializer.is_valid(raise_exception=False)
+            return serializer.data
+
+        return await _acached_response(
+            request, "chart", {"domain": domain, "days": days}, last_date, (domains,), acompute,
+        )
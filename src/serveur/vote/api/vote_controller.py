@@ -4,14 +4,24 @@ from drf_spectacular.utils import (
     OpenApiParameter,
 )
 
+from django.urls import reverse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-
-from core.dto.vote_request_dto import VoteRequestSerializer
-from core.dto.vote_response_dto import VoteSerializer, ReceivedVotesSerializer
-from core.services.vote_service import VoteService
-from core.services.vote_validation_service import VoteValidationService
+from rest_framework.permissions import IsAuthenticated
+
+from app.async_api_view import AsyncAPIView
+from app.security_config import IsVoteOperator
+from core.dto.vote_request_dto import VoteRequestSerializer, VoteBulkRequestSerializer
+from core.dto.vote_response_dto import (
+    VoteSerializer,
+    ReceivedVotesSerializer,
+    VoteBulkResponseSerializer,
+    VoteRunQueuedSerializer,
+    VoteRunSerializer,
+)
+from core.services.vote_service import VoteService, BULK_MAX_VOTES
+from core.services.vote_job_service import VoteJobService
 
 
 class VoteView(APIView):
@@ -54,6 +64,71 @@ class VoteView(APIView):
 
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
+class VoteBulkView(APIView):
+    """
+    POST /api/votes/bulk
+    """
+
+    @extend_schema(
+        tags=["Votes"],
+        request=VoteBulkRequestSerializer,
+        responses={
+            201: VoteBulkResponseSerializer,
+            207: VoteBulkResponseSerializer,
+            400: OpenApiResponse(description="Invalid payload"),
+            401: OpenApiResponse(description="Unauthorized"),
+        },
+        description="Crée plusieurs votes de l'utilisateur authentifié en une requête. "
+                    "Pour un même domaine, seul le dernier vote est conservé. "
+                    "Retourne 207 si certains items sont invalides. "
+                    "Les imports de votes de plusieurs votants passent par "
+                    "`manage.py import_votes`, pas par l'API."
+    )
+    def post(self, request):
+        serializer = VoteBulkRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        voter_id = request.user.id
+
+        if voter_id is None:
+            return Response(
+                {"error": "Unauthorized"},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        items = serializer.validated_data["votes"]
+        if len(items) > BULK_MAX_VOTES:
+            return Response(
+                {"error": f"At most {BULK_MAX_VOTES} votes per request"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Validation item par item : les items invalides n'empêchent pas les autres
+        results: list[dict] = [None] * len(items)
+        valid_items: list[dict] = []
+        valid_indexes: list[int] = []
+        for index, item in enumerate(items):
+            item_serializer = VoteRequestSerializer(data=item)
+            if item_serializer.is_valid():
+                valid_items.append(item_serializer.validated_data)
+                valid_indexes.append(index)
+            else:
+                results[index] = {"index": index, "status": "invalid", "errors": item_serializer.errors}
+
+        created = VoteService.create_votes(voter_id=str(voter_id), items=valid_items)
+        for index, result in zip(valid_indexes, created):
+            results[index] = {"index": index, **result}
+
+        created_count = sum(1 for result in results if result["status"] == "created")
+        response_serializer = VoteBulkResponseSerializer({"created": created_count, "results": results})
+        all_valid = len(valid_items) == len(items)
+
+        return Response(
+            response_serializer.data,
+            status=status.HTTP_201_CREATED if all_valid else status.HTTP_207_MULTI_STATUS,
+        )
+
 class VoteDeleteView(APIView):
     """
     DELETE /api/votes/{domain}
@@ -258,9 +333,135 @@ class VoteValidationView(APIView):
     
     @extend_schema(
         tags=["Votes"],
-        responses={200: OpenApiResponse(description="Validation exécutée")},
-        description="Force l'exécution de la tâche quotidienne de validation des votes."
+        parameters=[
+            OpenApiParameter(
+                name="resume",
+                type=bool,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Reprend l'exécution du jour interrompue au lieu d'en démarrer une nouvelle",
+            )
+        ],
+        responses={
+            202: VoteRunQueuedSerializer,
+            403: OpenApiResponse(description="Reprise réservée aux opérateurs"),
+        },
+        description="Met en file la tâche quotidienne de validation des votes. "
+                    "Son avancement se suit via /api/votes/validate/jobs/{jobId} (opérateurs). "
+                    "La reprise (resume) est réservée aux opérateurs."
+    )
+    def get(self, request):
+        resume = request.query_params.get("resume", "false").lower() in ("1", "true", "yes")
+        if resume and not IsVoteOperator().has_permission(request, self):
+            # La reprise renvoie l'id de l'exécution du jour
+            self.permission_denied(request, message=IsVoteOperator.message)
+        job = VoteJobService.enqueue(resume=resume)
+
+        serializer = VoteRunQueuedSerializer(
+            {"jobId": job["id"], "status": job["status"], "resumed": job["resumed"]}
+        )
+        return Response(
+            serializer.data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": reverse("vote_validation_job", kwargs={"jobId": job["id"]})},
+        )
+
+
+class VoteValidationJobView(APIView):
+    """
+    GET /api/votes/validate/jobs/{jobId}
+    DELETE /api/votes/validate/jobs/{jobId}
+    Réservé aux opérateurs (VOTE_OPERATOR_UIDS).
+    """
+
+    permission_classes = [IsAuthenticated, IsVoteOperator]
+
+    @extend_schema(
+        tags=["Votes"],
+        parameters=[
+            OpenApiParameter(name="jobId", type=str, location=OpenApiParameter.PATH, description="Id de l'exécution")
+        ],
+        responses={
+            200: VoteRunSerializer,
+            403: OpenApiResponse(description="Réservé aux opérateurs"),
+            404: OpenApiResponse(description="Exécution introuvable"),
+        },
+        description="Statut et avancement (par phase et par domaine) d'une exécution de la tâche quotidienne."
+    )
+    def get(self, _, jobId: str):
+        job = VoteJobService.get_job(jobId)
+        if job is None:
+            return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response(VoteRunSerializer(job).data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        tags=["Votes"],
+        parameters=[
+            OpenApiParameter(name="jobId", type=str, location=OpenApiParameter.PATH, description="Id de l'exécution")
+        ],
+        responses={
+            202: OpenApiResponse(description="Annulation demandée (effective à la fin de la phase ou du domaine en cours)"),
+            403: OpenApiResponse(description="Réservé aux opérateurs"),
+            404: OpenApiResponse(description="Exécution introuvable"),
+            409: OpenApiResponse(description="Exécution déjà terminée"),
+        },
+        description="Annule une exécution en file ou en cours de la tâche quotidienne."
     )
-    def get(self, _):
-        VoteValidationService.process_daily_votes()
-        return Response(status=status.HTTP_200_OK)
+    def delete(self, _, jobId: str):
+        job_status = VoteJobService.cancel(jobId)
+        if job_status is None:
+            return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+        if job_status in ("completed", "failed"):
+            return Response({"error": f"Job already {job_status}"}, status=status.HTTP_409_CONFLICT)
+
+        return Response({"jobId": jobId, "status": job_status}, status=status.HTTP_202_ACCEPTED)
+
+
+# -------------------- VARIANTES ASYNC (VOTE_ASYNC_READS) --------------------
+# Mêmes réponses que les vues sync, lues avec le driver Neo4j async
+
+
+class VotesByVoterAsyncView(AsyncAPIView, VotesByVoterView):
+    async def get(self, request, voterId: str):
+        votes = await VoteService.aget_votes_by_voter(
+            voter_id=str(voterId),
+            domain=request.query_params.get("domain"),
+        )
+        return Response(VoteSerializer(votes, many=True).data, status=status.HTTP_200_OK)
+
+
+class VotesByVoterMeAsyncView(AsyncAPIView, VotesByVoterMeView):
+    async def get(self, request):
+        voter_id = request.user.id
+        if voter_id is None:
+            return Response({"error": "Unauthorized"}, status=status.HTTP_401_UNAUTHORIZED)
+
+        votes = await VoteService.aget_votes_by_voter(
+            voter_id=str(voter_id),
+            domain=request.query_params.get("domain"),
+            is_me=True,
+        )
+        return Response(VoteSerializer(votes, many=True).data, status=status.HTTP_200_OK)
+
+
+class VotesForUserAsyncView(AsyncAPIView, VotesForUserView):
+    async def get(self, request, userId: str):
+        received_votes = await VoteService.aget_received_votes(
+            user_id=str(userId),
+            domain=request.query_params.get("domain"),
+        )
+        return Response(ReceivedVotesSerializer(received_votes).data, status=status.HTTP_200_OK)
+
+
+class VotesForUserMeAsyncView(AsyncAPIView, VotesForUserMeView):
+    async def get(self, request):
+        user_id = request.user.id
+        if user_id is None:
+            return Response({"error": "Unauthorized"}, status=status.HTTP_401_UNAUTHORIZED)
+
+        received_votes = await VoteService.aget_received_votes(
+            user_id=str(user_id),
+            domain=request.query_params.get("domain"),
+        )
+        return Response(ReceivedVotesSerializer(received_votes).data, status=status.HTTP_200_OK)
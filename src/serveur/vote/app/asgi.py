@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
 
 application = get_asgi_application()
+
+# Avertit au démarrage du serveur si le schéma Neo4j est incomplet
+from api.apps import start_schema_check  # noqa: E402
+
+start_schema_check()
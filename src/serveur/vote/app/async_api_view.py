@@ -0,0 +1,74 @@
+import os
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from rest_framework.views import APIView
+
+from app.neo4j_config import close_async_driver
+
+# Lectures servies par les vues async (driver Neo4j async) : à activer sous ASGI
+# (uvicorn app.asgi:application) ; en WSGI chaque requête crée sa boucle et son driver
+VOTE_ASYNC_READS = os.getenv("VOTE_ASYNC_READS", "false").lower() in ("1", "true", "yes")
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView dont les handlers sont des coroutines (DRF ne sait appeler que
+    des handlers sync).
+
+    Le traitement DRF est conservé : authentification, permissions et
+    négociation (APIView.initial) s'exécutent dans un thread, l'appel à
+    Firebase pouvant passer par le réseau ; les erreurs passent par
+    handle_exception. Hors ASGI, la boucle d'événements ne vit que le temps
+    de la requête : son driver Neo4j est fermé avant de répondre. Sous-classer
+    la vue sync pour reprendre ses paramètres OpenAPI :
+
+        class VotesByVoterAsyncView(AsyncAPIView, VotesByVoterView):
+            async def get(self, request, voterId: str): ...
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Schéma OpenAPI du handler sync remplacé (extend_schema le range dans
+        # handler.kwargs["schema"])
+        for method in cls.http_method_names:
+            handler = cls.__dict__.get(method)
+            if handler is None or "schema" in getattr(handler, "kwargs", {}):
+                continue
+            for base in cls.__mro__[1:]:
+                overridden = base.__dict__.get(method)
+                if overridden is not None and "schema" in getattr(overridden, "kwargs", {}):
+                    handler.kwargs = {**getattr(handler, "kwargs", {}), "schema": overridden.kwargs["schema"]}
+                    break
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            return await self._adispatch(request, *args, **kwargs)
+        finally:
+            if not isinstance(request, ASGIRequest):
+                await close_async_driver()
+
+    async def _adispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial, thread_sensitive=False)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
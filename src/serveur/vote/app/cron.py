@@ -1,4 +1,6 @@
-from core.services.vote_validation_service import VoteValidationService
+from core.services.vote_job_service import VoteJobService
 
 def process_daily_votes():
-    VoteValidationService.process_daily_votes()
\ No newline at end of file
+    # Reprend l'exécution du jour si une précédente a été interrompue ;
+    # attend la fin d'une exécution lancée depuis l'API (verrou partagé)
+    VoteJobService.run(resume=True)
@@ -0,0 +1,540 @@
+"""
+Instrumentation légère du service de vote.
+
+- Le driver Neo4j (cf. app.neo4j_config) est enveloppé : chaque requête
+  Cypher est chronométrée et rattachée à la méthode de repository qui l'a
+  lancée (fonction `work` passée à execute_read / execute_write). Le
+  résumé de `result.consume()` fournit les mises à jour effectuées et le
+  temps serveur ; les db hits ne sont connus qu'avec PROFILE
+  (NEO4J_PROFILE_QUERIES).
+- Les compteurs sont agrégés dans un registre du processus, exposé au
+  format texte Prometheus par GET /metrics. Les phases du traitement
+  quotidien, qui tourne le plus souvent dans le processus du cron, sont
+  lues dans le journal VoteRun (cf. render_phases).
+- `collect()` cumule les requêtes d'un bloc (requête HTTP, phase du
+  traitement quotidien) pour en donner les totaux.
+"""
+import bisect
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+# Préfixe les requêtes par PROFILE pour relever les db hits (coûteux, à réserver au diagnostic)
+NEO4J_PROFILE_QUERIES = os.getenv("NEO4J_PROFILE_QUERIES", "false").lower() in ("1", "true", "yes")
+
+# Bornes des histogrammes de durée (secondes)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+# Requêtes qui ne peuvent pas être profilées (schéma, transactions implicites)
+_NOT_PROFILABLE = re.compile(r"^\s*(SHOW|CREATE\s+(CONSTRAINT|INDEX)|DROP|PROFILE|EXPLAIN)\b|IN\s+TRANSACTIONS", re.I)
+
+
+class _Registry:
+    """
+    Compteurs, jauges et histogrammes du processus, indexés par nom et
+    étiquettes. Suffisant pour l'exposition Prometheus sans dépendance.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.help: dict[str, tuple[str, str]] = {}
+        self.values: dict[str, dict[tuple, float]] = {}
+        self.histograms: dict[str, dict[tuple, list]] = {}
+
+    def describe(self, name: str, kind: str, text: str) -> None:
+        self.help[name] = (kind, text)
+
+    def inc(self, name: str, labels: dict, value: float = 1) -> None:
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            series = self.values.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, labels: dict, value: float) -> None:
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            self.values.setdefault(name, {})[key] = value
+
+    def observe(self, name: str, labels: dict, value: float) -> None:
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            series = self.histograms.setdefault(name, {})
+            # [compteurs par borne..., +Inf, somme]
+            state = series.setdefault(key, [0] * (len(DURATION_BUCKETS) + 1) + [0.0])
+            state[bisect.bisect_left(DURATION_BUCKETS, value)] += 1
+            state[-1] += value
+
+    def reset(self) -> None:
+        with self.lock:
+            self.values.clear()
+            self.histograms.clear()
+
+    def render(self) -> str:
+        """
+        Registre au format d'exposition texte Prometheus (version 0.0.4).
+        """
+        lines = []
+        with self.lock:
+            for name in sorted(set(self.values) | set(self.histograms)):
+                kind, text = self.help.get(name, ("untyped", ""))
+                lines.append(f"# HELP {name} {text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for key, value in sorted(self.values.get(name, {}).items()):
+                    lines.append(f"{name}{_labels(key)} {_number(value)}")
+                for key, state in sorted(self.histograms.get(name, {}).items()):
+                    cumulated = 0
+                    for bound, count in zip((*DURATION_BUCKETS, "+Inf"), state):
+                        cumulated += count
+                        lines.append(f"{name}_bucket{_labels(key + (('le', str(bound)),))} {cumulated}")
+                    lines.append(f"{name}_sum{_labels(key)} {_number(state[-1])}")
+                    lines.append(f"{name}_count{_labels(key)} {cumulated}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(key: tuple) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in key) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+METRICS = _Registry()
+METRICS.describe("vote_neo4j_queries_total", "counter", "Requêtes Cypher exécutées, par méthode de repository")
+METRICS.describe("vote_neo4j_query_errors_total", "counter", "Requêtes Cypher en erreur, par méthode de repository")
+METRICS.describe("vote_neo4j_query_seconds", "histogram", "Durée des requêtes Cypher (envoi à consommation du résultat)")
+METRICS.describe("vote_neo4j_query_rows_total", "counter", "Lignes lues dans les résultats Cypher")
+METRICS.describe("vote_neo4j_query_updates_total", "counter", "Nœuds, relations, propriétés et labels modifiés")
+METRICS.describe("vote_neo4j_query_db_hits_total", "counter", "db hits des requêtes profilées (NEO4J_PROFILE_QUERIES)")
+METRICS.describe("vote_http_requests_total", "counter", "Requêtes HTTP, par route, méthode et statut")
+METRICS.describe("vote_http_request_seconds", "histogram", "Durée des requêtes HTTP, par route")
+METRICS.describe("vote_http_request_neo4j_queries_total", "counter", "Requêtes Cypher lancées par les requêtes HTTP, par route")
+METRICS.describe("vote_http_request_neo4j_seconds_total", "counter", "Temps passé dans Neo4j par les requêtes HTTP, par route")
+
+
+@dataclass
+class QueryTotals:
+    """
+    Totaux des requêtes Cypher d'un bloc `collect()`.
+    """
+    queries: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    rows: int = 0
+    updates: int = 0
+    db_hits: int = 0
+
+    def as_dict(self) -> dict:
+        return dict(self.__dict__)
+
+
+_collectors: ContextVar[tuple[QueryTotals, ...]] = ContextVar("neo4j_query_collectors", default=())
+
+
+@contextmanager
+def collect():
+    """
+    Cumule dans un QueryTotals les requêtes Cypher exécutées dans le bloc
+    (blocs imbriqués : chaque niveau reçoit les requêtes de ses sous-blocs).
+    Les requêtes des processus workers ne sont pas comptées.
+    """
+    totals = QueryTotals()
+    token = _collectors.set(_collectors.get() + (totals,))
+    try:
+        yield totals
+    finally:
+        _collectors.reset(token)
+
+
+def record_query(method: str, seconds: float, rows: int, updates: int, db_hits: int, error: bool) -> None:
+    labels = {"method": method}
+    METRICS.inc("vote_neo4j_queries_total", labels)
+    METRICS.observe("vote_neo4j_query_seconds", labels, seconds)
+    METRICS.inc("vote_neo4j_query_rows_total", labels, rows)
+    if updates:
+        METRICS.inc("vote_neo4j_query_updates_total", labels, updates)
+    if db_hits:
+        METRICS.inc("vote_neo4j_query_db_hits_total", labels, db_hits)
+    if error:
+        METRICS.inc("vote_neo4j_query_errors_total", labels)
+    for totals in _collectors.get():
+        totals.queries += 1
+        totals.errors += error
+        totals.seconds += seconds
+        totals.rows += rows
+        totals.updates += updates
+        totals.db_hits += db_hits
+
+
+def record_request(route: str, method: str, status: int, seconds: float, totals: QueryTotals) -> None:
+    METRICS.inc("vote_http_requests_total", {"route": route, "method": method, "status": str(status)})
+    METRICS.observe("vote_http_request_seconds", {"route": route}, seconds)
+    if totals.queries:
+        METRICS.inc("vote_http_request_neo4j_queries_total", {"route": route}, totals.queries)
+        METRICS.inc("vote_http_request_neo4j_seconds_total", {"route": route}, totals.seconds)
+
+
+def render_phases(phases: list[dict]) -> str:
+    """
+    Métriques des phases du traitement quotidien au format texte Prometheus,
+    à partir des étapes du journal VoteRun (cf. RunRepository.get_last_phases).
+    """
+    registry = _Registry()
+    registry.describe("vote_daily_phase_seconds", "gauge", "Durée de la dernière exécution de chaque phase du traitement quotidien")
+    registry.describe("vote_daily_phase_neo4j_queries", "gauge", "Requêtes Cypher de la dernière exécution de chaque phase du traitement quotidien")
+    registry.describe("vote_daily_phase_errors_total", "counter", "Phases du traitement quotidien en erreur")
+    for phase in phases:
+        labels = {"phase": phase["phase"]}
+        if phase["seconds"] is not None:
+            registry.set("vote_daily_phase_seconds", labels, phase["seconds"])
+        if phase["queries"] is not None:
+            registry.set("vote_daily_phase_neo4j_queries", labels, phase["queries"])
+        registry.set("vote_daily_phase_errors_total", labels, phase["failures"])
+    return registry.render() if phases else ""
+
+
+def _profile_db_hits(profile: dict | None) -> int:
+    if not profile:
+        return 0
+    return profile.get("dbHits", 0) + sum(_profile_db_hits(child) for child in profile.get("children", ()))
+
+
+def _updates(summary) -> int:
+    counters = summary.counters
+    return (
+        counters.nodes_created + counters.nodes_deleted
+        + counters.relationships_created + counters.relationships_deleted
+        + counters.properties_set + counters.labels_added + counters.labels_removed
+    )
+
+
+def _caller(depth: int = 2) -> str:
+    code = sys._getframe(depth).f_code
+    return getattr(code, "co_qualname", code.co_name)
+
+
+class _InstrumentedResult:
+    """
+    Résultat Cypher qui compte les lignes lues. La requête est enregistrée
+    dès que le résultat est entièrement lu (ou consommé) ; sinon en fin de
+    transaction, cf. _InstrumentedTransaction.finish.
+    """
+
+    def __init__(self, result, method: str, started: float, profiled: bool):
+        self._result = result
+        self._method = method
+        self._started = started
+        self._profiled = profiled
+        self._rows = 0
+        self._summary = None
+        self._recorded = False
+
+    def __getattr__(self, name):
+        return getattr(self._result, name)
+
+    def __iter__(self):
+        for record in self._result:
+            self._rows += 1
+            yield record
+        self.consume()
+
+    def single(self, *args, **kwargs):
+        record = self._result.single(*args, **kwargs)
+        self._rows += record is not None
+        self.consume()
+        return record
+
+    def data(self, *keys):
+        return self._read_all(self._result.data(*keys))
+
+    def values(self, *keys):
+        return self._read_all(self._result.values(*keys))
+
+    def value(self, *args, **kwargs):
+        return self._read_all(self._result.value(*args, **kwargs))
+
+    def fetch(self, n):
+        rows = self._result.fetch(n)
+        self._rows += len(rows)
+        return rows
+
+    def _read_all(self, rows: list) -> list:
+        self._rows += len(rows)
+        self.consume()
+        return rows
+
+    def consume(self):
+        if self._summary is not None:
+            return self._summary
+        try:
+            self._summary = self._result.consume()
+        except Exception:
+            self._record(0, 0, True)
+            raise
+        db_hits = _profile_db_hits(self._summary.profile) if self._profiled else 0
+        self._record(_updates(self._summary), db_hits, False)
+        return self._summary
+
+    def _record(self, updates: int, db_hits: int, error: bool) -> None:
+        if not self._recorded:
+            self._recorded = True
+            record_query(self._method, time.perf_counter() - self._started, self._rows, updates, db_hits, error)
+
+
+def _profiled(query) -> tuple[object, bool]:
+    profiled = NEO4J_PROFILE_QUERIES and isinstance(query, str) and not _NOT_PROFILABLE.search(query)
+    return ("PROFILE " + query if profiled else query), profiled
+
+
+def _run(target, method: str, query, parameters, kwargs, results: list | None):
+    query, profiled = _profiled(query)
+    started = time.perf_counter()
+    try:
+        result = target.run(query, parameters, **kwargs)
+    except Exception:
+        record_query(method, time.perf_counter() - started, 0, 0, 0, True)
+        raise
+    instrumented = _InstrumentedResult(result, method, started, profiled)
+    if results is not None:
+        results.append(instrumented)
+    return instrumented
+
+
+class _InstrumentedTransaction:
+    """
+    Transaction dont les requêtes sont attribuées à `method` ; `finish()`
+    consomme les résultats restants pour en relever le résumé.
+    """
+
+    def __init__(self, tx, method: str):
+        self._tx = tx
+        self.method = method
+        self._results: list[_InstrumentedResult] = []
+
+    def __getattr__(self, name):
+        return getattr(self._tx, name)
+
+    def run(self, query, parameters=None, **kwargs):
+        return _run(self._tx, self.method, query, parameters, kwargs, self._results)
+
+    def finish(self) -> None:
+        # Résultats non lus en entier par le code appelant
+        results, self._results = self._results, []
+        for result in results:
+            try:
+                result.consume()
+            except Exception:
+                # Déjà enregistrée en erreur ; la transaction remontera l'erreur
+                pass
+
+    def commit(self):
+        self.finish()
+        return self._tx.commit()
+
+    def close(self):
+        self.finish()
+        return self._tx.close()
+
+
+def _instrumented_work(work):
+    method = getattr(work, "__qualname__", repr(work))
+
+    def run_work(tx, *args, **kwargs):
+        instrumented = _InstrumentedTransaction(tx, method)
+        try:
+            return work(instrumented, *args, **kwargs)
+        finally:
+            instrumented.finish()
+
+    return run_work
+
+
+class InstrumentedSession:
+    def __init__(self, session):
+        self._session = session
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+    def __enter__(self):
+        self._session.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._session.__exit__(*exc)
+
+    def execute_read(self, work, *args, **kwargs):
+        return self._session.execute_read(_instrumented_work(work), *args, **kwargs)
+
+    def execute_write(self, work, *args, **kwargs):
+        return self._session.execute_write(_instrumented_work(work), *args, **kwargs)
+
+    def begin_transaction(self, *args, **kwargs):
+        return _ExplicitTransaction(self._session.begin_transaction(*args, **kwargs))
+
+    def run(self, query, parameters=None, **kwargs):
+        # Transaction implicite : pas de fin de transaction pour consommer le résultat,
+        # la requête est enregistrée quand l'appelant le consomme
+        return _run(self._session, _caller(), query, parameters, kwargs, None)
+
+
+class _ExplicitTransaction(_InstrumentedTransaction):
+    """
+    Transaction explicite (partagée par les lectures d'une requête HTTP,
+    cf. app.neo4j_config._RequestScope) : chaque requête est attribuée à
+    la fonction qui l'exécute.
+    """
+
+    def __init__(self, tx):
+        super().__init__(tx, "")
+
+    def run(self, query, parameters=None, **kwargs):
+        return _run(self._tx, _caller(), query, parameters, kwargs, self._results)
+
+
+class InstrumentedDriver:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+    def __enter__(self):
+        self._driver.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._driver.__exit__(*exc)
+
+    def session(self, *args, **kwargs):
+        return InstrumentedSession(self._driver.session(*args, **kwargs))
+
+
+# -------------------- DRIVER ASYNC (vues ASGI) --------------------
+
+
+class _AsyncInstrumentedResult(_InstrumentedResult):
+    """
+    Variante async de _InstrumentedResult (neo4j.AsyncResult).
+    """
+
+    async def __aiter__(self):
+        async for record in self._result:
+            self._rows += 1
+            yield record
+        await self.consume()
+
+    async def single(self, *args, **kwargs):
+        record = await self._result.single(*args, **kwargs)
+        self._rows += record is not None
+        await self.consume()
+        return record
+
+    async def data(self, *keys):
+        return await self._aread_all(await self._result.data(*keys))
+
+    async def values(self, *keys):
+        return await self._aread_all(await self._result.values(*keys))
+
+    async def value(self, *args, **kwargs):
+        return await self._aread_all(await self._result.value(*args, **kwargs))
+
+    async def fetch(self, n):
+        rows = await self._result.fetch(n)
+        self._rows += len(rows)
+        return rows
+
+    async def _aread_all(self, rows: list) -> list:
+        self._rows += len(rows)
+        await self.consume()
+        return rows
+
+    async def consume(self):
+        if self._summary is not None:
+            return self._summary
+        try:
+            self._summary = await self._result.consume()
+        except Exception:
+            self._record(0, 0, True)
+            raise
+        db_hits = _profile_db_hits(self._summary.profile) if self._profiled else 0
+        self._record(_updates(self._summary), db_hits, False)
+        return self._summary
+
+
+class _AsyncInstrumentedTransaction(_InstrumentedTransaction):
+    async def run(self, query, parameters=None, **kwargs):
+        query, profiled = _profiled(query)
+        started = time.perf_counter()
+        try:
+            result = await self._tx.run(query, parameters, **kwargs)
+        except Exception:
+            record_query(self.method, time.perf_counter() - started, 0, 0, 0, True)
+            raise
+        instrumented = _AsyncInstrumentedResult(result, self.method, started, profiled)
+        self._results.append(instrumented)
+        return instrumented
+
+    async def afinish(self) -> None:
+        results, self._results = self._results, []
+        for result in results:
+            try:
+                await result.consume()
+            except Exception:
+                pass
+
+
+def _async_instrumented_work(work):
+    method = getattr(work, "__qualname__", repr(work))
+
+    async def run_work(tx, *args, **kwargs):
+        instrumented = _AsyncInstrumentedTransaction(tx, method)
+        try:
+            return await work(instrumented, *args, **kwargs)
+        finally:
+            await instrumented.afinish()
+
+    return run_work
+
+
+class AsyncInstrumentedSession:
+    def __init__(self, session):
+        self._session = session
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+    async def __aenter__(self):
+        await self._session.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc):
+        return await self._session.__aexit__(*exc)
+
+    async def execute_read(self, work, *args, **kwargs):
+        return await self._session.execute_read(_async_instrumented_work(work), *args, **kwargs)
+
+    async def execute_write(self, work, *args, **kwargs):
+        return await self._session.execute_write(_async_instrumented_work(work), *args, **kwargs)
+
+
+class AsyncInstrumentedDriver:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+    def session(self, *args, **kwargs):
+        return AsyncInstrumentedSession(self._driver.session(*args, **kwargs))
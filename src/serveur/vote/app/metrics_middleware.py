@@ -0,0 +1,55 @@
+import os
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from app.instrumentation import collect, record_request
+
+# Renvoie la durée et le temps Neo4j de chaque requête dans l'en-tête
+# Server-Timing (diagnostic : à ne pas activer en production)
+VOTE_SERVER_TIMING = os.getenv("VOTE_SERVER_TIMING", "false").lower() in ("1", "true", "yes")
+
+
+class MetricsMiddleware:
+    """
+    Durée et requêtes Cypher de chaque requête HTTP, par route (cf.
+    app.instrumentation). Avec VOTE_SERVER_TIMING, les totaux de la requête
+    sont aussi renvoyés dans l'en-tête Server-Timing. Utilisable en WSGI
+    comme en ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with collect() as totals:
+            response = self.get_response(request)
+        return self._record(request, response, time.perf_counter() - started, totals)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with collect() as totals:
+            response = await self.get_response(request)
+        return self._record(request, response, time.perf_counter() - started, totals)
+
+    @staticmethod
+    def _record(request, response, seconds, totals):
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match is not None else "unmatched"
+        record_request(route, request.method, response.status_code, seconds, totals)
+
+        if not VOTE_SERVER_TIMING:
+            return response
+        response["Server-Timing"] = (
+            f'app;dur={seconds * 1000:.1f}, '
+            f'neo4j;dur={totals.seconds * 1000:.1f};desc="{totals.queries} queries"'
+        )
+        return response
@@ -1,11 +1,235 @@
+import asyncio
+import logging
 import os
-from neo4j import GraphDatabase
+import random
+import time
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import sync_to_async
+from neo4j import READ_ACCESS, AsyncGraphDatabase, GraphDatabase
+from neo4j.exceptions import DriverError, Neo4jError
+
+from app.instrumentation import AsyncInstrumentedDriver, InstrumentedDriver
 
 NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
 NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "password")
 
-_driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+# Pool de connexions du driver (durées en secondes)
+NEO4J_MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "100"))
+NEO4J_CONNECTION_ACQUISITION_TIMEOUT = float(os.getenv("NEO4J_CONNECTION_ACQUISITION_TIMEOUT", "60"))
+NEO4J_MAX_CONNECTION_LIFETIME = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))
+# Connexions inactives depuis plus longtemps vérifiées avant réutilisation (vide = jamais)
+NEO4J_LIVENESS_CHECK_TIMEOUT = os.getenv("NEO4J_LIVENESS_CHECK_TIMEOUT", "")
+
+# Nouvelles tentatives des lectures d'une requête HTTP sur erreur transitoire
+# (mêmes valeurs par défaut que les transactions gérées du driver)
+READ_RETRY_TIME = 30.0
+READ_RETRY_INITIAL_DELAY = 1.0
+READ_RETRY_DELAY_MULTIPLIER = 2.0
+READ_RETRY_DELAY_JITTER = 0.2
+
+logger = logging.getLogger(__name__)
+
+
+def _driver_options() -> dict:
+    return {
+        "auth": (NEO4J_USER, NEO4J_PASSWORD),
+        "max_connection_pool_size": NEO4J_MAX_POOL_SIZE,
+        "connection_acquisition_timeout": NEO4J_CONNECTION_ACQUISITION_TIMEOUT,
+        "max_connection_lifetime": NEO4J_MAX_CONNECTION_LIFETIME,
+        "liveness_check_timeout": float(NEO4J_LIVENESS_CHECK_TIMEOUT) if NEO4J_LIVENESS_CHECK_TIMEOUT else None,
+    }
+
+
+def _create_driver():
+    # Requêtes chronométrées et comptées (cf. app.instrumentation, GET /metrics)
+    return InstrumentedDriver(GraphDatabase.driver(NEO4J_URI, **_driver_options()))
+
+
+_driver = _create_driver()
+# Drivers async (vues ASGI), un par boucle d'événements : les connexions
+# d'un driver sont liées à la boucle qui l'a créé
+_async_drivers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncInstrumentedDriver]" = (
+    weakref.WeakKeyDictionary()
+)
 
 def get_driver():
-    return _driver
\ No newline at end of file
+    return _driver
+
+def reset_driver():
+    """
+    Recrée le driver du processus courant.
+    À appeler dans un processus fils (pool de workers) : les connexions
+    ouvertes par le parent ne doivent pas être partagées.
+    """
+    global _driver
+    _driver = _create_driver()
+    return _driver
+
+
+def get_async_driver():
+    """
+    Driver neo4j.AsyncGraphDatabase de la boucle d'événements courante,
+    créé au premier appel. Un serveur ASGI n'a qu'une boucle par worker ;
+    hors ASGI (async_to_sync), une boucle par requête : le driver est
+    fermé en fin de requête par close_async_driver.
+    """
+    loop = asyncio.get_running_loop()
+    driver = _async_drivers.get(loop)
+    if driver is None:
+        driver = AsyncInstrumentedDriver(AsyncGraphDatabase.driver(NEO4J_URI, **_driver_options()))
+        _async_drivers[loop] = driver
+    return driver
+
+
+async def close_async_driver():
+    """
+    Ferme le driver async de la boucle courante, s'il y en a un. À appeler
+    avant la fin d'une boucle éphémère (vue async servie en WSGI) : ses
+    connexions ne peuvent plus être fermées une fois la boucle arrêtée.
+    """
+    driver = _async_drivers.pop(asyncio.get_running_loop(), None)
+    if driver is not None:
+        await driver.close()
+
+
+class _RequestScope:
+    """
+    Session partagée par les appels de repository d'une même requête HTTP.
+
+    La session (donc la connexion du pool) n'est ouverte qu'au premier
+    appel, en mode lecture : en cluster, les lectures vont aux followers,
+    les écritures (execute_write) au leader. Les lectures successives
+    réutilisent une seule transaction, fermée avant toute écriture pour
+    que les lectures suivantes voient les données écrites. Comme avec
+    session.execute_read, une lecture en erreur transitoire est rejouée
+    dans une nouvelle transaction.
+    """
+
+    def __init__(self):
+        self.session = None
+        self.read_tx = None
+
+    def get_session(self):
+        if self.session is None:
+            self.session = get_driver().session(default_access_mode=READ_ACCESS)
+        return self.session
+
+    def read(self, work, *args):
+        started = time.monotonic()
+        delay = READ_RETRY_INITIAL_DELAY
+        while True:
+            try:
+                if self.read_tx is None:
+                    self.read_tx = self.get_session().begin_transaction()
+                return work(self.read_tx, *args)
+            except (DriverError, Neo4jError) as exc:
+                # La connexion a pu être perdue : transaction et session abandonnées
+                self._discard()
+                if not exc.is_retryable() or time.monotonic() - started > READ_RETRY_TIME:
+                    raise
+                jittered = delay * random.uniform(1 - READ_RETRY_DELAY_JITTER, 1 + READ_RETRY_DELAY_JITTER)
+                logger.warning("Lecture Neo4j rejouée dans %.1f s : %r", jittered, exc)
+                time.sleep(jittered)
+                delay *= READ_RETRY_DELAY_MULTIPLIER
+            except Exception:
+                # Une transaction en erreur n'est plus utilisable
+                self.end_read()
+                raise
+
+    def write(self, work, *args):
+        self.end_read()
+        return self.get_session().execute_write(work, *args)
+
+    def end_read(self):
+        if self.read_tx is not None:
+            tx, self.read_tx = self.read_tx, None
+            tx.close()
+
+    def close(self):
+        try:
+            self.end_read()
+        finally:
+            if self.session is not None:
+                session, self.session = self.session, None
+                session.close()
+
+    def _discard(self):
+        try:
+            self.close()
+        except Exception:
+            # Connexion déjà perdue
+            self.read_tx = None
+            self.session = None
+
+
+_request_scope: ContextVar[_RequestScope | None] = ContextVar("neo4j_request_scope", default=None)
+
+
+@asynccontextmanager
+async def arequest_scope():
+    """
+    request_scope pour une requête servie en ASGI : les vues sync,
+    exécutées dans un thread, héritent du contexte. La session éventuellement
+    ouverte est fermée hors de la boucle d'événements.
+    """
+    scope = _RequestScope()
+    token = _request_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _request_scope.reset(token)
+        if scope.session is not None:
+            await sync_to_async(scope.close, thread_sensitive=False)()
+
+
+@contextmanager
+def request_scope():
+    """
+    Partage une session Neo4j entre les appels execute_read / execute_write
+    exécutés dans le bloc (cf. app.neo4j_middleware).
+    """
+    scope = _RequestScope()
+    token = _request_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _request_scope.reset(token)
+        scope.close()
+
+
+def execute_read(work, *args):
+    """
+    Exécute `work(tx, *args)` en lecture : dans la transaction de la requête
+    courante si un request_scope est actif, sinon dans une session dédiée.
+    """
+    scope = _request_scope.get()
+    if scope is not None:
+        return scope.read(work, *args)
+    with get_driver().session() as session:
+        return session.execute_read(work, *args)
+
+
+def execute_write(work, *args):
+    """
+    Exécute `work(tx, *args)` dans une transaction d'écriture gérée
+    (nouvelles tentatives en cas d'erreur transitoire), sur la session de
+    la requête courante si un request_scope est actif.
+    """
+    scope = _request_scope.get()
+    if scope is not None:
+        return scope.write(work, *args)
+    with get_driver().session() as session:
+        return session.execute_write(work, *args)
+
+
+async def aexecute_read(work, *args):
+    """
+    Exécute `await work(tx, *args)` dans une transaction de lecture gérée
+    du driver async (une session par appel).
+    """
+    async with get_async_driver().session() as session:
+        return await session.execute_read(work, *args)
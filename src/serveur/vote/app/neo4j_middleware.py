@@ -0,0 +1,31 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from app.neo4j_config import arequest_scope, request_scope
+
+
+class Neo4jSessionMiddleware:
+    """
+    Une session Neo4j (une connexion du pool) par requête HTTP, partagée
+    par tous les appels de repository de la requête.
+
+    Utilisable en WSGI comme en ASGI : en ASGI, la chaîne reste async et
+    les vues async (driver async) ne passent pas par un thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with request_scope():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        async with arequest_scope():
+            return await self.get_response(request)
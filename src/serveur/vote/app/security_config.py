@@ -1,6 +1,8 @@
+import os
 from typing import Optional, Tuple
 from django.conf import settings
 from rest_framework.authentication import BaseAuthentication
+from rest_framework.permissions import BasePermission
 from rest_framework import exceptions
 
 import firebase_admin
@@ -9,6 +11,10 @@ from firebase_admin import credentials
 
 from drf_spectacular.extensions import OpenApiAuthenticationExtension
 
+# UID Firebase des opérateurs autorisés à piloter le traitement quotidien
+# (reprise, suivi et annulation des exécutions), séparés par des virgules
+VOTE_OPERATOR_UIDS = {uid.strip() for uid in os.getenv("VOTE_OPERATOR_UIDS", "").split(",") if uid.strip()}
+
 class FirebaseUser:
     """Minimal user object holding only the Firebase UID."""
     
@@ -54,3 +60,13 @@ class FirebaseAuthentication(BaseAuthentication):
 
         user = FirebaseUser(uid=uid)
         return (user, token)
+
+
+class IsVoteOperator(BasePermission):
+    """Utilisateur authentifié dont l'UID figure dans VOTE_OPERATOR_UIDS."""
+
+    message = "Operator permission required"
+
+    def has_permission(self, request, view) -> bool:
+        user = request.user
+        return bool(user and user.is_authenticated and str(user.id) in VOTE_OPERATOR_UIDS)
@@ -17,11 +17,15 @@ Including another URLconf
 from django.urls import include, path
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from api.metrics_controller import metrics_view
+
 urlpatterns = [
     path('api/', include('api.api_urls')),
 
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema')),
+
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vote.settings')
 
 application = get_wsgi_application()
+
+# Avertit au démarrage du serveur si le schéma Neo4j est incomplet
+from api.apps import start_schema_check  # noqa: E402
+
+start_schema_check()
@@ -0,0 +1,291 @@
+"""
+Benchmark du traitement quotidien des votes (VoteValidationService.process_daily_votes).
+
+Charge un graphe de délégation synthétique (cf. benchmarks.graph_generator)
+dans la base Neo4j configurée, exécute le traitement quotidien et relève la
+durée de chaque phase dans le journal VoteRun (nettoyage des doublons,
+recalcul des poids et détail par domaine, validation, stats du jour,
+résultats). Le rapport JSON permet de comparer deux exécutions.
+
+Usage (depuis src/serveur/vote, Neo4j configuré via NEO4J_URI / NEO4J_USER / NEO4J_PASSWORD) :
+    python -m benchmarks.bench_daily_pipeline --size 100k --output bench-100k.json
+    python -m benchmarks.bench_daily_pipeline --size 100k --compare bench-100k.json
+
+Les modes du traitement se règlent comme en production (VOTE_RECALCULATION_MODE,
+VOTE_RECALCULATION_WORKERS, VOTE_VALIDATION_MODE) et sont repris dans le rapport.
+
+Le traitement porte sur toute la base : à exécuter sur une base dédiée. Le
+benchmark refuse de démarrer si elle contient des utilisateurs hors benchmark,
+et la vide à la fin, sauf avec --keep.
+
+Avec --backend memory, le graphe est chargé dans InMemoryVoteRepository
+(sans Neo4j) et les phases sont chronométrées directement, hors résultats
+et journal VoteRun qui restent dans Neo4j :
+    python -m benchmarks.bench_daily_pipeline --size 1m --backend memory
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import time
+from collections import Counter
+from itertools import islice
+
+from app.neo4j_config import get_driver
+from benchmarks.graph_generator import PRESETS, GraphSpec, generate_users, generate_votes
+
+# Nœuds créés par le traitement quotidien, supprimés avec le graphe de test
+PIPELINE_LABELS = (
+    "DailyStat", "MonthlyStat", "StatsMeta", "Leaderboard", "ResultEntry", "ResultMeta",
+    "RecalculationMeta", "VoteRun", "VoteRunStep",
+)
+
+
+def batches(rows, batch_size: int):
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        yield batch
+
+
+def load_graph(session, spec: GraphSpec, batch_size: int = 10_000) -> dict:
+    for rows in batches(generate_users(spec), batch_size):
+        session.run(
+            """
+            UNWIND $rows AS row
+            CREATE (:User {id: row.id, threshold: row.threshold,
+                           publishVotes: row.publishVotes, bench: true})
+            """,
+            rows=rows,
+        ).consume()
+
+    votes = Counter()
+    unprocessed = 0
+    for rows in batches(generate_votes(spec), batch_size):
+        session.run(
+            """
+            UNWIND $rows AS row
+            MATCH (voter:User {id: row.voterId})
+            MATCH (target:User {id: row.targetUserId})
+            CREATE (voter)-[rel:VOTED {id: row.id, domain: row.domain,
+                                       createdAt: datetime(row.createdAt),
+                                       processed: row.processed}]->(target)
+            SET rel.valid = row.valid, rel.current = row.current
+            """,
+            rows=rows,
+        ).consume()
+        votes.update(row["domain"] for row in rows)
+        unprocessed += sum(not row["processed"] for row in rows)
+
+    return {
+        "users": spec.users,
+        "votes": sum(votes.values()),
+        "unprocessedVotes": unprocessed,
+        "votesByDomain": dict(votes.most_common()),
+    }
+
+
+def drop_graph(session, batch_size: int = 10_000) -> None:
+    for query in (
+        "MATCH (u:User {bench: true}) WITH u LIMIT $batchSize DETACH DELETE u RETURN count(*) AS deleted",
+        *(
+            f"MATCH (n:{label}) WITH n LIMIT $batchSize DETACH DELETE n RETURN count(*) AS deleted"
+            for label in PIPELINE_LABELS
+        ),
+    ):
+        while session.run(query, batchSize=batch_size).single()["deleted"]:
+            pass
+
+
+def load_memory_graph(spec: GraphSpec) -> dict:
+    from db.repository.memory_vote_repository import InMemoryVoteRepository
+
+    InMemoryVoteRepository.reset()
+    votes = list(generate_votes(spec))
+    InMemoryVoteRepository.load(generate_users(spec), votes)
+    by_domain = Counter(row["domain"] for row in votes)
+    return {
+        "users": spec.users,
+        "votes": len(votes),
+        "unprocessedVotes": sum(not row["processed"] for row in votes),
+        "votesByDomain": dict(by_domain.most_common()),
+    }
+
+
+def environment(session=None) -> dict:
+    from core.services import vote_validation_service
+    from db.repository import backend, vote_repository
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    neo4j = session and session.run(
+        "CALL dbms.components() YIELD name, versions, edition "
+        "RETURN versions[0] AS version, edition"
+    ).single()
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "backend": backend.VOTE_REPOSITORY_BACKEND,
+        "neo4j": f"{neo4j['version']} {neo4j['edition']}" if neo4j else None,
+        "recalculationMode": vote_repository.RECALCULATION_MODE,
+        "recalculationWorkers": vote_repository.RECALCULATION_WORKERS,
+        "validationMode": vote_validation_service.VALIDATION_MODE,
+    }
+
+
+def run_pipeline() -> dict:
+    from core.services.vote_validation_service import VoteValidationService
+    from db.repository.run_repository import RunRepository
+
+    started = time.perf_counter()
+    run_id = VoteValidationService.process_daily_votes()
+    seconds = time.perf_counter() - started
+
+    run = RunRepository.get_run(run_id)
+    phases = {step["phase"]: step["seconds"] for step in run["steps"] if not step["domain"]}
+    domains = {
+        step["domain"]: step["seconds"]
+        for step in run["steps"]
+        if step["domain"] and step["phase"] == "recalculate"
+    }
+    return {"seconds": seconds, "phases": phases, "recalculateByDomain": domains}
+
+
+def run_memory_pipeline() -> dict:
+    from core.services.vote_validation_service import VoteValidationService
+    from db.repository.backend import VoteRepository
+
+    # Mêmes phases que process_daily_votes, hors résultats (Neo4j)
+    phases = {}
+    domains = {}
+    started = time.perf_counter()
+    for phase, action in (
+        ("clean_duplicates", VoteRepository.clean_duplicate_domain_votes),
+        ("recalculate", VoteRepository.recalculate_counts_by_domain),
+        ("validate", VoteValidationService.validate_unprocessed_votes),
+        ("daily_stats", VoteValidationService.finalize_daily_stats),
+    ):
+        phase_started = time.perf_counter()
+        result = action()
+        phases[phase] = time.perf_counter() - phase_started
+        if phase == "recalculate":
+            domains = {report["domain"]: report["seconds"] for report in result}
+    seconds = time.perf_counter() - started
+    return {"seconds": seconds, "phases": phases, "recalculateByDomain": domains}
+
+
+def compare(previous: dict, current: dict) -> list[tuple[str, float | None, float | None]]:
+    """
+    Durées (précédente, courante) du total et de chaque phase.
+    """
+    names = list(current["pipeline"]["phases"])
+    names += [name for name in previous["pipeline"]["phases"] if name not in names]
+    rows = [("total", previous["pipeline"]["seconds"], current["pipeline"]["seconds"])]
+    rows += [
+        (name, previous["pipeline"]["phases"].get(name), current["pipeline"]["phases"].get(name))
+        for name in names
+    ]
+    return rows
+
+
+def print_comparison(rows) -> None:
+    print(f"{'phase':<20} {'avant':>10} {'après':>10} {'écart':>8}")
+    for name, before, after in rows:
+        delta = f"{(after - before) / before * 100:+.0f} %" if before and after is not None else "-"
+        before = f"{before:.2f} s" if before is not None else "-"
+        after = f"{after:.2f} s" if after is not None else "-"
+        print(f"{name:<20} {before:>10} {after:>10} {delta:>8}")
+
+
+def new_report(spec: GraphSpec, graph: dict, session=None) -> dict:
+    return {
+        "benchmark": "daily_pipeline",
+        "startedAt": datetime.datetime.now().isoformat(timespec="seconds"),
+        "spec": {**spec.__dict__, "chain_length": list(spec.chain_length),
+                 "cycle_size": list(spec.cycle_size)},
+        "environment": environment(session),
+        "graph": graph,
+    }
+
+
+def timed_load(spec: GraphSpec, load) -> dict:
+    print(f"Chargement du graphe de test ({spec.users} utilisateurs)...")
+    started = time.perf_counter()
+    graph = load()
+    graph["loadSeconds"] = time.perf_counter() - started
+    print(f"{graph['votes']} votes dont {graph['unprocessedVotes']} à traiter, "
+          f"chargés en {graph['loadSeconds']:.1f} s")
+    return graph
+
+
+def run(spec: GraphSpec, output: str | None, previous: str | None, keep: bool) -> dict:
+    from db.repository.backend import VOTE_REPOSITORY_BACKEND
+
+    if VOTE_REPOSITORY_BACKEND == "memory":
+        report = new_report(spec, timed_load(spec, lambda: load_memory_graph(spec)))
+        report["pipeline"] = run_memory_pipeline()
+    else:
+        from db.repository.schema_repository import SchemaRepository
+
+        driver = get_driver()
+        with driver.session() as session:
+            others = session.run(
+                "MATCH (u:User) WHERE u.bench IS NULL RETURN count(u) AS users"
+            ).single()["users"]
+            if others:
+                raise SystemExit(f"La base contient {others} utilisateurs hors benchmark : utiliser une base dédiée")
+
+            SchemaRepository.ensure_schema()
+            drop_graph(session)
+
+            report = new_report(spec, timed_load(spec, lambda: load_graph(session, spec)), session)
+            try:
+                report["pipeline"] = run_pipeline()
+            finally:
+                if not keep:
+                    drop_graph(session)
+
+    for name, seconds in report["pipeline"]["phases"].items():
+        print(f"{name:<20} {seconds:.2f} s")
+    print(f"{'total':<20} {report['pipeline']['seconds']:.2f} s")
+
+    if output:
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"Rapport écrit dans {output}")
+
+    if previous:
+        with open(previous, encoding="utf-8") as file:
+            print_comparison(compare(json.load(file), report))
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=PRESETS, default="10k", help="Taille prédéfinie du graphe")
+    parser.add_argument("--users", type=int, help="Nombre d'utilisateurs (remplace --size)")
+    parser.add_argument("--domains", type=int, default=GraphSpec.domains, help="Nombre de domaines")
+    parser.add_argument("--seed", type=int, default=GraphSpec.seed, help="Graine du générateur")
+    parser.add_argument("--output", help="Fichier JSON du rapport")
+    parser.add_argument("--compare", help="Rapport JSON précédent à comparer")
+    parser.add_argument("--keep", action="store_true", help="Conserve le graphe de test")
+    parser.add_argument("--backend", choices=("neo4j", "memory"),
+                        help="Backend de VoteRepository (remplace VOTE_REPOSITORY_BACKEND)")
+    args = parser.parse_args()
+
+    if args.backend:
+        # Lu à l'import de db.repository.backend, importé par les services
+        os.environ["VOTE_REPOSITORY_BACKEND"] = args.backend
+
+    spec = GraphSpec(users=args.users or PRESETS[args.size], domains=args.domains, seed=args.seed)
+    run(spec, args.output, args.compare, args.keep)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Micro-benchmark : recherche de relations VOTED par elementId.
+
+Compare l'ancienne forme des requêtes de marquage / mise à jour
+    MATCH (:User)-[v:VOTED]->(:User) WHERE elementId(v) IN $ids
+à la recherche directe utilisée par VoteRepository
+    UNWIND $ids AS relId MATCH ()-[v:VOTED]->() WHERE elementId(v) = relId
+
+Usage (depuis src/serveur/vote, Neo4j configuré via NEO4J_URI / NEO4J_USER / NEO4J_PASSWORD) :
+    python -m benchmarks.bench_relationship_lookup --edges 1000000 --ids 1000
+
+Le graphe de test (nœuds :User {bench: true}) est créé dans la base
+configurée puis supprimé, sauf avec --keep.
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.neo4j_config import get_driver
+
+QUERIES = {
+    "scan (IN $ids)": """
+        MATCH (:User)-[v:VOTED]->(:User)
+        WHERE elementId(v) IN $ids
+        RETURN count(v) AS found
+    """,
+    "seek (UNWIND $ids)": """
+        UNWIND $ids AS relId
+        MATCH ()-[v:VOTED]->()
+        WHERE elementId(v) = relId
+        RETURN count(v) AS found
+    """,
+}
+
+
+def create_graph(session, edges: int, batch_size: int = 50_000) -> None:
+    nodes = max(2, edges // 2)
+    for start in range(0, nodes, batch_size):
+        session.run(
+            """
+            UNWIND range($start, $end - 1) AS i
+            CREATE (:User {id: 'bench-' + toString(i), bench: true})
+            """,
+            start=start,
+            end=min(start + batch_size, nodes),
+        ).consume()
+
+    for start in range(0, edges, batch_size):
+        session.run(
+            """
+            UNWIND range($start, $end - 1) AS i
+            MATCH (a:User {id: 'bench-' + toString(i % $nodes)})
+            MATCH (b:User {id: 'bench-' + toString(toInteger(rand() * $nodes))})
+            CREATE (a)-[:VOTED {id: 'bench-vote-' + toString(i), domain: 'bench',
+                                processed: true, valid: true, current: true, count: 1}]->(b)
+            """,
+            start=start,
+            end=min(start + batch_size, edges),
+            nodes=nodes,
+        ).consume()
+
+
+def drop_graph(session, batch_size: int = 10_000) -> None:
+    while True:
+        deleted = session.run(
+            """
+            MATCH (u:User {bench: true})
+            WITH u LIMIT $batchSize
+            DETACH DELETE u
+            RETURN count(*) AS deleted
+            """,
+            batchSize=batch_size,
+        ).single()["deleted"]
+        if deleted == 0:
+            return
+
+
+def db_hits(plan: dict) -> int:
+    return plan.get("dbHits", 0) + sum(db_hits(child) for child in plan.get("children", []))
+
+
+def run(edges: int, ids: int, repeat: int, keep: bool) -> None:
+    driver = get_driver()
+    with driver.session() as session:
+        existing = session.run(
+            "MATCH (:User {bench: true})-[v:VOTED]->() RETURN count(v) AS edges"
+        ).single()["edges"]
+        if existing < edges:
+            print(f"Création du graphe de test ({edges} relations)...")
+            drop_graph(session)
+            create_graph(session, edges)
+
+        rel_ids = session.run(
+            """
+            MATCH (:User {bench: true})-[v:VOTED]->()
+            RETURN elementId(v) AS relId
+            LIMIT $limit
+            """,
+            limit=edges,
+        ).value()
+        sample = random.sample(rel_ids, min(ids, len(rel_ids)))
+
+        print(f"{len(rel_ids)} relations, {len(sample)} ids recherchés, {repeat} répétitions")
+        for name, query in QUERIES.items():
+            # Plan et accès base mesurés une fois, puis temps d'exécution répétés
+            summary = session.run("PROFILE " + query, ids=sample).consume()
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                found = session.run(query, ids=sample).single()["found"]
+                timings.append(time.perf_counter() - started)
+            print(
+                f"{name:<20} trouvées={found:<6} dbHits={db_hits(summary.profile):<10} "
+                f"médiane={statistics.median(timings) * 1000:.1f} ms"
+            )
+
+        if not keep:
+            drop_graph(session)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--edges", type=int, default=1_000_000, help="Nombre de relations VOTED du graphe de test")
+    parser.add_argument("--ids", type=int, default=1_000, help="Nombre de relations recherchées")
+    parser.add_argument("--repeat", type=int, default=5, help="Répétitions par requête")
+    parser.add_argument("--keep", action="store_true", help="Conserve le graphe de test")
+    args = parser.parse_args()
+    run(args.edges, args.ids, args.repeat, args.keep)
+
+
+if __name__ == "__main__":
+    main()
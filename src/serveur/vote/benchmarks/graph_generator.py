@@ -0,0 +1,162 @@
+"""
+Générateur de graphes de délégation synthétiques pour les benchmarks.
+
+Le graphe reproduit les formes rencontrées en production :
+- degré entrant en loi de puissance (popularité de Pareto, commune aux domaines) ;
+- longues chaînes de délégation ;
+- nombreux petits cycles ;
+- self-loops (vote pour soi-même) ;
+- domaines de tailles très inégales (loi de Zipf).
+
+Les votes « historiques » sont déjà validés (processed, valid, current) comme
+après un traitement quotidien ; les votes « du jour » sont non traités et
+comprennent des changements de vote et des doublons à nettoyer.
+
+Le générateur est déterministe pour une même `GraphSpec` (graine incluse).
+"""
+import datetime
+import random
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Iterator
+
+# Tailles prédéfinies (nombre d'utilisateurs)
+PRESETS = {
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+
+@dataclass(frozen=True)
+class GraphSpec:
+    users: int
+    domains: int = 8
+    # Exposant de Zipf de la participation par domaine (0 = domaines égaux)
+    domain_skew: float = 1.2
+    # Part des utilisateurs votant dans le plus gros domaine
+    max_participation: float = 0.6
+    # Exposant de la loi de puissance du degré entrant (> 1)
+    degree_exponent: float = 2.1
+    # Parts des votants d'un domaine placés dans des chaînes, des cycles, des self-loops
+    chain_ratio: float = 0.05
+    chain_length: tuple[int, int] = (20, 200)
+    cycle_ratio: float = 0.02
+    cycle_size: tuple[int, int] = (2, 5)
+    self_loop_ratio: float = 0.01
+    # Parts des votants d'un domaine votant aujourd'hui, et votant deux fois
+    new_vote_ratio: float = 0.05
+    duplicate_ratio: float = 0.01
+    seed: int = 42
+
+
+def user_id(index: int) -> str:
+    return f"bench-{index}"
+
+
+def domain_name(index: int) -> str:
+    return f"bench-domain-{index}"
+
+
+def participation(spec: GraphSpec) -> dict[str, int]:
+    """
+    Nombre de votants historiques par domaine, décroissant selon la loi de Zipf.
+    """
+    return {
+        domain_name(rank): max(2, int(spec.users * spec.max_participation / (rank + 1) ** spec.domain_skew))
+        for rank in range(spec.domains)
+    }
+
+
+def generate_users(spec: GraphSpec) -> Iterator[dict]:
+    rng = random.Random(spec.seed)
+    for index in range(spec.users):
+        yield {
+            "id": user_id(index),
+            "threshold": 100,
+            "publishVotes": rng.random() < 0.5,
+        }
+
+
+def generate_votes(spec: GraphSpec, today: datetime.date | None = None) -> Iterator[dict]:
+    """
+    Produit les votes domaine par domaine :
+    {id, voterId, targetUserId, domain, createdAt (ISO), processed, valid, current}
+
+    Chaque votant a au plus un vote historique courant par domaine.
+    """
+    today = today or datetime.date.today()
+    rng = random.Random(spec.seed)
+    history_at = datetime.datetime.combine(today - datetime.timedelta(days=1), datetime.time(12))
+    today_at = datetime.datetime.combine(today, datetime.time(8))
+
+    # Popularité globale : un utilisateur populaire l'est dans tous les domaines
+    popularity = [rng.paretovariate(spec.degree_exponent - 1) for _ in range(spec.users)]
+    cum_weights = list(accumulate(popularity))
+    population = range(spec.users)
+
+    def popular_target(voter: int) -> int:
+        while True:
+            target = rng.choices(population, cum_weights=cum_weights)[0]
+            if target != voter:
+                return target
+
+    sequence = 0
+
+    def vote(voter: int, target: int, domain: str, created_at: datetime.datetime, processed: bool) -> dict:
+        nonlocal sequence
+        sequence += 1
+        row = {
+            "id": f"bench-vote-{sequence}",
+            "voterId": user_id(voter),
+            "targetUserId": user_id(target),
+            "domain": domain,
+            "createdAt": created_at.isoformat(),
+            "processed": processed,
+        }
+        if processed:
+            row.update(valid=True, current=True)
+        return row
+
+    for domain, size in participation(spec).items():
+        voters = rng.sample(population, min(size, spec.users))
+        position = 0
+
+        # Longues chaînes : chaque membre vote pour le suivant
+        chained = int(len(voters) * spec.chain_ratio)
+        while chained > 1:
+            length = min(chained, rng.randint(*spec.chain_length))
+            chain = voters[position:position + length]
+            for source, target in zip(chain, chain[1:]):
+                yield vote(source, target, domain, history_at, True)
+            # Le dernier maillon délègue à un utilisateur populaire
+            yield vote(chain[-1], popular_target(chain[-1]), domain, history_at, True)
+            position += length
+            chained -= length
+
+        # Petits cycles : anneaux de 2 à 5 votants
+        cycled = int(len(voters) * spec.cycle_ratio)
+        while cycled > 1:
+            ring_size = min(cycled, rng.randint(*spec.cycle_size))
+            ring = voters[position:position + ring_size]
+            for index, source in enumerate(ring):
+                yield vote(source, ring[(index + 1) % len(ring)], domain, history_at, True)
+            position += ring_size
+            cycled -= ring_size
+
+        # Self-loops
+        for voter in voters[position:position + int(len(voters) * spec.self_loop_ratio)]:
+            yield vote(voter, voter, domain, history_at, True)
+            position += 1
+
+        # Les autres votants délèguent selon la popularité
+        for voter in voters[position:]:
+            yield vote(voter, popular_target(voter), domain, history_at, True)
+
+        # Votes du jour : changements de vote (ou premiers votes), dont certains en double
+        new_voters = rng.sample(population, min(spec.users, int(len(voters) * spec.new_vote_ratio)))
+        duplicates = int(len(voters) * spec.duplicate_ratio)
+        for index, voter in enumerate(new_voters):
+            if index < duplicates:
+                yield vote(voter, popular_target(voter), domain, today_at - datetime.timedelta(hours=1), False)
+            yield vote(voter, popular_target(voter), domain, today_at, False)
@@ -0,0 +1,222 @@
+"""
+Test de charge des endpoints de lecture : requêtes/seconde et latences,
+pour comparer le service WSGI (vues sync) au service ASGI (vues async,
+VOTE_ASYNC_READS=true).
+
+Le client n'utilise que la bibliothèque standard (asyncio, connexions
+HTTP/1.1 keep-alive) : `--concurrency` connexions enchaînent des GET sur
+les chemins donnés, en boucle, pendant `--duration` secondes.
+
+Usage (depuis src/serveur/vote, serveur démarré sur la même base Neo4j ;
+gunicorn et uvicorn ne sont pas dans requirements.txt) :
+    # WSGI
+    gunicorn app.wsgi:application -w 4 -b 127.0.0.1:8000
+    python -m benchmarks.load_read_api --url http://127.0.0.1:8000 --token $TOKEN \\
+        --label wsgi --output wsgi.json
+
+    # ASGI
+    VOTE_ASYNC_READS=true uvicorn app.asgi:application --workers 4 --port 8000
+    python -m benchmarks.load_read_api --url http://127.0.0.1:8000 --token $TOKEN \\
+        --label asgi --output asgi.json --compare wsgi.json
+
+Par défaut les chemins lus sont ceux d'un utilisateur (`--user-id`) :
+votes émis / reçus, statistiques, classement et résultats. `--path` (répétable)
+remplace cette liste.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+def default_paths(user_id: str, domain: str) -> list[str]:
+    return [
+        f"/api/votes/by-voter/{user_id}",
+        f"/api/votes/for-user/{user_id}",
+        f"/api/stats/votes/daily/{user_id}",
+        f"/api/stats/votes/monthly/{user_id}",
+        f"/api/stats/chart?domain={domain}",
+        f"/api/results?domain={domain}",
+    ]
+
+
+class Connection:
+    """
+    Connexion HTTP/1.1 keep-alive minimale (réponses Content-Length ou chunked).
+    """
+
+    def __init__(self, host: str, port: int, headers: dict):
+        self.host = host
+        self.port = port
+        self.headers = "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+        self.reader = None
+        self.writer = None
+
+    async def get(self, path: str) -> int:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        self.writer.write(f"GET {path} HTTP/1.1\r\nHost: {self.host}\r\n{self.headers}\r\n".encode())
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("connexion fermée par le serveur")
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        else:
+            await self.reader.readexactly(int(headers.get("content-length", 0)))
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+            self.reader = self.writer = None
+
+
+async def worker(index: int, conn: Connection, paths: list[str], deadline: float, samples: list, errors: dict):
+    i = index
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            status = await conn.get(path)
+        except (ConnectionError, OSError, asyncio.IncompleteReadError, ValueError, IndexError) as exc:
+            errors[type(exc).__name__] = errors.get(type(exc).__name__, 0) + 1
+            await conn.close()
+            continue
+        elapsed = time.perf_counter() - start
+        if status >= 400:
+            errors[str(status)] = errors.get(str(status), 0) + 1
+        samples.append((path, elapsed))
+    await conn.close()
+
+
+async def run_load(url: str, token: str | None, paths: list[str], concurrency: int, duration: float, warmup: float) -> dict:
+    parts = urlsplit(url)
+    host = parts.hostname or "127.0.0.1"
+    port = parts.port or 80
+    prefix = parts.path.rstrip("/")
+    paths = [prefix + p for p in paths]
+
+    headers = {"Accept": "application/json", "Connection": "keep-alive"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+
+    conns = [Connection(host, port, headers) for _ in range(concurrency)]
+
+    if warmup > 0:
+        deadline = time.perf_counter() + warmup
+        await asyncio.gather(*(worker(i, c, paths, deadline, [], {}) for i, c in enumerate(conns)))
+
+    samples, errors = [], {}
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(worker(i, c, paths, deadline, samples, errors) for i, c in enumerate(conns)))
+    wall = time.perf_counter() - start
+
+    return {
+        "requests": len(samples),
+        "wall_s": round(wall, 3),
+        "rps": round(len(samples) / wall, 1) if wall else 0.0,
+        "errors": errors,
+        "latency_ms": latency_summary([s for _, s in samples]),
+        "by_path": {
+            p: latency_summary([s for path, s in samples if path == p])
+            for p in paths
+        },
+    }
+
+
+def latency_summary(values: list[float]) -> dict:
+    if not values:
+        return {"count": 0}
+    values = sorted(values)
+
+    def pct(q: float) -> float:
+        return round(values[min(len(values) - 1, int(q * len(values)))] * 1000, 2)
+
+    return {
+        "count": len(values),
+        "mean": round(statistics.fmean(values) * 1000, 2),
+        "p50": pct(0.50),
+        "p95": pct(0.95),
+        "p99": pct(0.99),
+        "max": round(values[-1] * 1000, 2),
+    }
+
+
+def compare(report: dict, baseline: dict) -> None:
+    def ratio(new, old):
+        return f"x{new / old:.2f}" if old else "n/a"
+
+    print(f"\n{baseline.get('label', 'baseline')} -> {report.get('label', 'run')}")
+    print(f"  req/s : {baseline['rps']} -> {report['rps']} ({ratio(report['rps'], baseline['rps'])})")
+    for key in ("p50", "p95", "p99"):
+        old = baseline["latency_ms"].get(key)
+        new = report["latency_ms"].get(key)
+        if old is not None and new is not None:
+            print(f"  {key}   : {old} ms -> {new} ms ({ratio(new, old)})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge des endpoints de lecture (WSGI vs ASGI)")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--token", default=None, help="Jeton Firebase (Authorization: Bearer)")
+    parser.add_argument("--user-id", default="user-1")
+    parser.add_argument("--domain", default="general")
+    parser.add_argument("--path", action="append", dest="paths", help="Chemin à charger (répétable)")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--label", default=None, help="Nom du run (ex. wsgi, asgi)")
+    parser.add_argument("--output", default=None, help="Écrit le rapport JSON dans ce fichier")
+    parser.add_argument("--compare", default=None, help="Rapport JSON précédent à comparer")
+    args = parser.parse_args()
+
+    paths = args.paths or default_paths(args.user_id, args.domain)
+    report = {
+        "label": args.label,
+        "url": args.url,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "python": platform.python_version(),
+    }
+    report.update(asyncio.run(run_load(args.url, args.token, paths, args.concurrency, args.duration, args.warmup)))
+
+    print(json.dumps({k: report[k] for k in ("label", "requests", "rps", "errors", "latency_ms")}, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,3 +11,32 @@ class VoteResultSerializer(serializers.Serializer):
     count = serializers.IntegerField()
     elected = serializers.BooleanField()
     electedAt = serializers.DateTimeField(allow_null=True, required=False)
+
+
+class ResultChangeSerializer(serializers.Serializer):
+    """
+    Évolution d'un candidat entre deux instantanés (null : hors instantané).
+    """
+    userId = serializers.CharField()
+    domain = serializers.CharField()
+    fromCount = serializers.IntegerField(allow_null=True)
+    toCount = serializers.IntegerField(allow_null=True)
+    fromRank = serializers.IntegerField(allow_null=True)
+    toRank = serializers.IntegerField(allow_null=True)
+    fromElected = serializers.BooleanField(allow_null=True)
+    toElected = serializers.BooleanField(allow_null=True)
+
+
+class ResultChangesSerializer(serializers.Serializer):
+    """
+    DTO pour la réponse de l'endpoint /results/changes.
+    """
+    changes = ResultChangeSerializer(many=True)
+
+    def get_fields(self):
+        # "from" est un mot-clé Python : champ impossible à déclarer comme attribut
+        return {
+            "from": serializers.DateField(),
+            "to": serializers.DateField(),
+            **super().get_fields(),
+        }
@@ -3,3 +3,8 @@ from rest_framework import serializers
 class VoteRequestSerializer(serializers.Serializer):
     targetUserId = serializers.CharField()
     domain = serializers.CharField(max_length=100)
+
+
+class VoteBulkRequestSerializer(serializers.Serializer):
+    # Les items sont validés un par un (VoteRequestSerializer) pour un rapport par item
+    votes = serializers.ListField(child=serializers.DictField(), allow_empty=False)
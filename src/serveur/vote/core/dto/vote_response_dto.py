@@ -9,6 +9,18 @@ class VoteSerializer(serializers.Serializer):
     createdAt = serializers.DateTimeField()
 
 
+class VoteBulkItemSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=["created", "replaced", "invalid"])
+    vote = VoteSerializer(required=False)
+    errors = serializers.DictField(required=False)
+
+
+class VoteBulkResponseSerializer(serializers.Serializer):
+    created = serializers.IntegerField()
+    results = VoteBulkItemSerializer(many=True)
+
+
 class ReceivedVotesSerializer(serializers.Serializer):
     userId = serializers.CharField()
     total = serializers.IntegerField()
@@ -20,3 +32,41 @@ class ReceivedVotesSerializer(serializers.Serializer):
             child=serializers.CharField()
         )
     )
+
+
+class VoteRunQueuedSerializer(serializers.Serializer):
+    jobId = serializers.CharField()
+    status = serializers.CharField()
+    resumed = serializers.BooleanField()
+
+
+class VoteRunStepSerializer(serializers.Serializer):
+    phase = serializers.CharField()
+    domain = serializers.CharField(allow_blank=True)
+    status = serializers.CharField()
+    seconds = serializers.FloatField(allow_null=True, required=False)
+    error = serializers.CharField(allow_null=True, required=False)
+
+
+class VoteRunProgressSerializer(serializers.Serializer):
+    phasesDone = serializers.IntegerField()
+    phasesTotal = serializers.IntegerField()
+    currentPhase = serializers.CharField(allow_null=True)
+    domainsDone = serializers.IntegerField()
+    domainsTotal = serializers.IntegerField(allow_null=True)
+
+
+class VoteRunSerializer(serializers.Serializer):
+    """
+    Exécution du traitement quotidien (journal VoteRun) et son avancement.
+    """
+    jobId = serializers.CharField(source="id")
+    date = serializers.CharField()
+    status = serializers.ChoiceField(choices=["queued", "running", "completed", "failed", "cancelled"])
+    cancelRequested = serializers.BooleanField()
+    queuedAt = serializers.DateTimeField(allow_null=True, required=False)
+    startedAt = serializers.DateTimeField(allow_null=True, required=False)
+    finishedAt = serializers.DateTimeField(allow_null=True, required=False)
+    error = serializers.CharField(allow_null=True, required=False)
+    progress = VoteRunProgressSerializer()
+    steps = VoteRunStepSerializer(many=True)
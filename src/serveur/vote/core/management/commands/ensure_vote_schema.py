@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from db.repository.schema_repository import SchemaRepository
+
+
+class Command(BaseCommand):
+    help = "Crée (ou vérifie avec --check) les contraintes et index Neo4j du modèle de vote"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check", action="store_true",
+            help="Vérifie seulement ; échoue si des éléments sont absents",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            missing = SchemaRepository.missing_schema()
+            if missing:
+                raise CommandError(f"Schéma incomplet, absents : {', '.join(missing)}")
+            self.stdout.write(self.style.SUCCESS("Schéma complet"))
+            return
+
+        created = SchemaRepository.ensure_schema()
+        for name in created:
+            self.stdout.write(f"Créé : {name}")
+
+        missing = SchemaRepository.missing_schema()
+        if missing:
+            raise CommandError(f"Éléments toujours absents : {', '.join(missing)}")
+        self.stdout.write(self.style.SUCCESS("Schéma complet"))
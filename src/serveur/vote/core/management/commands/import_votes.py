@@ -0,0 +1,60 @@
+import csv
+import itertools
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.dto.vote_request_dto import VoteRequestSerializer
+from core.services.vote_service import VoteService
+
+
+class Command(BaseCommand):
+    help = (
+        "Importe des votes de plusieurs votants depuis un CSV (colonnes voterId, "
+        "targetUserId, domain), par lots d'écriture groupée (cf. VoteRepository.save_votes)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Fichier CSV à importer ('-' pour l'entrée standard)")
+        parser.add_argument(
+            "--chunk-size", type=int, default=10000,
+            help="Nombre de lignes lues et importées à la fois",
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] <= 0:
+            raise CommandError("--chunk-size doit être positif")
+
+        stream = sys.stdin if options["path"] == "-" else open(options["path"], newline="", encoding="utf-8")
+        created = replaced = invalid = 0
+        try:
+            reader = csv.DictReader(stream)
+            missing = {"voterId", "targetUserId", "domain"} - set(reader.fieldnames or ())
+            if missing:
+                raise CommandError(f"Colonnes absentes : {', '.join(sorted(missing))}")
+
+            # Ligne 1 : en-tête
+            rows = enumerate(reader, start=2)
+            while chunk := list(itertools.islice(rows, options["chunk_size"])):
+                items = []
+                for line, row in chunk:
+                    serializer = VoteRequestSerializer(data=row)
+                    errors = {} if serializer.is_valid() else dict(serializer.errors)
+                    if not row["voterId"]:
+                        errors["voterId"] = ["This field is required."]
+                    if errors:
+                        invalid += 1
+                        self.stderr.write(f"Ligne {line} ignorée : {errors}")
+                        continue
+                    items.append({**serializer.validated_data, "voterId": row["voterId"]})
+
+                results = VoteService.import_votes(items)
+                created += sum(1 for result in results if result["status"] == "created")
+                replaced += sum(1 for result in results if result["status"] == "replaced")
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{created} votes importés, {replaced} remplacés, {invalid} lignes invalides"
+        ))
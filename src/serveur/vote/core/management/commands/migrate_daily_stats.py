@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from db.repository.schema_repository import SchemaRepository
+from db.repository.backend import VoteRepository
+
+
+class Command(BaseCommand):
+    help = "Convertit les stats JSON des utilisateurs (u.stats) en nœuds DailyStat"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=500,
+            help="Nombre d'utilisateurs migrés par transaction",
+        )
+        parser.add_argument(
+            "--keep-json", action="store_true",
+            help="Conserve la propriété u.stats après migration",
+        )
+
+    def handle(self, *args, **options):
+        SchemaRepository.ensure_schema()
+        written = VoteRepository.migrate_json_stats(
+            batch_size=options["batch_size"],
+            keep_json=options["keep_json"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"{written} entrées DailyStat écrites"))
+
+        monthly = VoteRepository.rebuild_monthly_stats(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{monthly} entrées MonthlyStat écrites"))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core.services.vote_job_service import VoteJobService
+
+
+class Command(BaseCommand):
+    help = "Exécute le traitement quotidien des votes (validation, poids, stats, résultats)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--resume", action="store_true",
+            help="Reprend l'exécution du jour interrompue au lieu d'en démarrer une nouvelle",
+        )
+
+    def handle(self, *args, **options):
+        run_id = VoteJobService.run(resume=options["resume"])
+        job = VoteJobService.get_job(run_id)
+        self.stdout.write(self.style.SUCCESS(f"Exécution {run_id} : {job['status'] if job else 'inconnue'}"))
@@ -0,0 +1,70 @@
+from typing import Hashable, Iterable, Optional
+
+
+def chain_index(
+    edges: Iterable[tuple[Hashable, Hashable]],
+    exits: Optional[dict[Hashable, tuple[Optional[int], Optional[Hashable]]]] = None,
+) -> list[tuple[Optional[int], Optional[Hashable]]]:
+    """
+    Index de chaîne des relations VOTED courantes d'un domaine.
+
+    Pour chaque relation (source, cible), calcule (depth, root) :
+      - depth : longueur du plus long chemin sans relation répétée partant
+        de la source, c'est-à-dire du chemin que cherche
+        `VoteRepository._check_vote_validity` ;
+      - root : dernier nœud de ce chemin (fin de chaîne, ou nœud d'entrée
+        dans le cycle qui la termine).
+
+    Tant que chaque nœud n'a qu'une relation courante, ce chemin suit
+    simplement les successeurs. Dès qu'un nœud en a plusieurs, son chemin
+    n'est plus déterminé par un pointeur : ses relations et tout ce qui est
+    en amont reçoivent (None, None).
+
+    :param edges: relations dont la source est dans la zone indexée ; toutes
+        les relations courantes de ces sources doivent être fournies
+    :param exits: (depth, root) déjà connus pour les cibles hors zone qui ont
+        elles-mêmes une relation courante ; une cible absente de `edges`
+        comme source et de `exits` est une fin de chaîne
+    """
+    exits = exits or {}
+    edges = list(edges)
+
+    successors: dict[Hashable, list[Hashable]] = {}
+    for source, target in edges:
+        successors.setdefault(source, []).append(target)
+
+    resolved: dict[Hashable, tuple[Optional[int], Optional[Hashable]]] = {}
+
+    def settled(node: Hashable) -> Optional[tuple[Optional[int], Optional[Hashable]]]:
+        if node in resolved:
+            return resolved[node]
+        if node not in successors:
+            return exits.get(node, (0, node))
+        if len(successors[node]) > 1:
+            resolved[node] = (None, None)
+            return resolved[node]
+        return None
+
+    for start in successors:
+        # Remontée le long des successeurs jusqu'à un nœud connu ou un cycle
+        walk: list[Hashable] = []
+        position: dict[Hashable, int] = {}
+        node = start
+        while settled(node) is None and node not in position:
+            position[node] = len(walk)
+            walk.append(node)
+            node = successors[node][0]
+
+        if node in position:
+            # Cycle : chaque membre en fait le tour complet et revient sur lui-même
+            members = walk[position[node]:]
+            for member in members:
+                resolved[member] = (len(members), member)
+            del walk[position[node]:]
+
+        # Puis redescente : chaque nœud ajoute sa relation au chemin de son successeur
+        for member in reversed(walk):
+            depth, root = settled(successors[member][0])
+            resolved[member] = (None, None) if depth is None else (depth + 1, root)
+
+    return [resolved[source] for source, _ in edges]
@@ -0,0 +1,262 @@
+from array import array
+from typing import Hashable, Iterable, Optional
+
+
+class DelegationGraph:
+    """
+    Graphe de délégation d'un domaine, chargé en mémoire.
+
+    Les relations VOTED courantes d'un domaine sont stockées sous forme
+    d'arêtes numérotées (sources[e] -> targets[e]) avec deux index CSR :
+      - out_offsets / out_edges : arêtes sortantes de chaque nœud
+      - in_offsets  / in_edges  : arêtes entrantes de chaque nœud
+
+    `compute_weights` reproduit exactement le recalcul GDS effectué par
+    `VoteRepository._recalculate_counts_by_domain_tx` (SCC, tri topologique,
+    propagation des counts, valeur des cycles).
+    """
+
+    def __init__(self, node_count: int, sources: Iterable[int], targets: Iterable[int]):
+        self.node_count = node_count
+        self.sources = array("l", sources)
+        self.targets = array("l", targets)
+        self.edge_count = len(self.sources)
+        if len(self.targets) != self.edge_count:
+            raise ValueError("sources et targets doivent avoir la même longueur")
+
+        self.out_offsets, self.out_edges = self._build_csr(self.sources)
+        self.in_offsets, self.in_edges = self._build_csr(self.targets)
+        self.keys: list = list(range(node_count))
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[tuple[Hashable, Hashable]]) -> "DelegationGraph":
+        """
+        Construit le graphe à partir de couples (clé source, clé cible).
+        Les clés (elementId, id métier...) sont numérotées dans l'ordre
+        d'apparition et conservées dans `graph.keys`.
+        """
+        index: dict = {}
+        keys: list = []
+        sources: list[int] = []
+        targets: list[int] = []
+
+        for source_key, target_key in edges:
+            for key in (source_key, target_key):
+                if key not in index:
+                    index[key] = len(keys)
+                    keys.append(key)
+            sources.append(index[source_key])
+            targets.append(index[target_key])
+
+        graph = cls(len(keys), sources, targets)
+        graph.keys = keys
+        return graph
+
+    def _build_csr(self, endpoints: array) -> tuple[array, array]:
+        # Tri par dénombrement des arêtes selon l'extrémité donnée
+        offsets = array("l", [0]) * (self.node_count + 1)
+        for node in endpoints:
+            offsets[node + 1] += 1
+        for node in range(self.node_count):
+            offsets[node + 1] += offsets[node]
+
+        position = array("l", offsets[:-1])
+        edges = array("l", [0]) * self.edge_count
+        for edge, node in enumerate(endpoints):
+            edges[position[node]] = edge
+            position[node] += 1
+        return offsets, edges
+
+    # -------------------- COMPOSANTES FORTEMENT CONNEXES --------------------
+
+    def strongly_connected_components(self) -> tuple[list[int], int]:
+        """
+        Tarjan itératif (pas de récursion, donc pas de limite de profondeur).
+
+        Retourne (component, component_count). Les composantes sont numérotées
+        dans l'ordre topologique inverse : une composante ne reçoit que des
+        arêtes venant de composantes de numéro supérieur.
+        """
+        n = self.node_count
+        offsets = self.out_offsets
+        out_edges = self.out_edges
+        targets = self.targets
+
+        index = [-1] * n
+        low = [0] * n
+        on_stack = [False] * n
+        component = [-1] * n
+        stack: list[int] = []
+        counter = 0
+        component_count = 0
+
+        for root in range(n):
+            if index[root] != -1:
+                continue
+
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, offsets[root])]
+
+            while work:
+                node, position = work[-1]
+                end = offsets[node + 1]
+                descended = False
+
+                while position < end:
+                    successor = targets[out_edges[position]]
+                    position += 1
+                    if index[successor] == -1:
+                        work[-1] = (node, position)
+                        index[successor] = low[successor] = counter
+                        counter += 1
+                        stack.append(successor)
+                        on_stack[successor] = True
+                        work.append((successor, offsets[successor]))
+                        descended = True
+                        break
+                    if on_stack[successor] and index[successor] < low[node]:
+                        low[node] = index[successor]
+
+                if descended:
+                    continue
+
+                work.pop()
+                if low[node] == index[node]:
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component[member] = component_count
+                        if member == node:
+                            break
+                    component_count += 1
+
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+
+        return component, component_count
+
+    # -------------------- CALCUL DES POIDS --------------------
+
+    def compute_weights(
+        self, external: Optional[dict[int, tuple[int, bool]]] = None
+    ) -> tuple[list[Optional[int]], list[bool]]:
+        """
+        Calcule (counts, cycles) pour chaque arête, avec la même sémantique
+        que le recalcul GDS :
+          - une arête est cyclique si ses deux extrémités sont dans la même
+            composante (self-loops compris) ;
+          - un nœud hors cycle et non atteignable depuis un cycle (donc
+            présent dans le tri topologique GDS) donne à ses arêtes sortantes
+            1 + somme des counts entrants ;
+          - les arêtes d'une composante de taille > 1 reçoivent
+            taille + somme des counts entrant dans la composante ;
+          - toutes les autres arêtes (self-loop isolée, arêtes en aval d'un
+            cycle) gardent un count nul (None).
+
+        :param external: votes entrant depuis l'extérieur du graphe chargé
+            (recalcul incrémental), par nœud : (somme des counts, au moins une
+            arête entrante issue d'un nœud en aval d'un cycle)
+        """
+        external = external or {}
+        sources = self.sources
+        targets = self.targets
+        component, component_count = self.strongly_connected_components()
+
+        size = [0] * component_count
+        for node in range(self.node_count):
+            size[component[node]] += 1
+
+        # Représentant de chaque composante (utile pour les singletons)
+        representative = [0] * component_count
+        for node in range(self.node_count):
+            representative[component[node]] = node
+
+        cycles = [False] * self.edge_count
+        cyclic = [False] * component_count
+        for edge in range(self.edge_count):
+            source_component = component[sources[edge]]
+            if source_component == component[targets[edge]]:
+                cycles[edge] = True
+                cyclic[source_component] = True
+
+        counts: list[Optional[int]] = [None] * self.edge_count
+        tainted = [False] * component_count
+        in_offsets, in_edges = self.in_offsets, self.in_edges
+        out_offsets, out_edges = self.out_offsets, self.out_edges
+
+        # Propagation dans l'ordre topologique (composantes décroissantes)
+        for comp in range(component_count - 1, -1, -1):
+            if cyclic[comp]:
+                tainted[comp] = True
+                continue
+
+            node = representative[comp]
+            incoming, tainted[comp] = external.get(node, (0, False))
+            if tainted[comp]:
+                continue
+            for position in range(in_offsets[node], in_offsets[node + 1]):
+                edge = in_edges[position]
+                if tainted[component[sources[edge]]]:
+                    tainted[comp] = True
+                    break
+                incoming += counts[edge] or 0
+
+            if tainted[comp]:
+                continue
+
+            for position in range(out_offsets[node], out_offsets[node + 1]):
+                counts[out_edges[position]] = 1 + incoming
+
+        # Valeur des cycles : taille + somme des counts entrant depuis l'extérieur
+        entering = [0] * component_count
+        for edge in range(self.edge_count):
+            if not cycles[edge]:
+                target_component = component[targets[edge]]
+                if size[target_component] > 1:
+                    entering[target_component] += counts[edge] or 0
+        for node, (incoming, _) in external.items():
+            if size[component[node]] > 1:
+                entering[component[node]] += incoming
+
+        for edge in range(self.edge_count):
+            if cycles[edge]:
+                comp = component[sources[edge]]
+                if size[comp] > 1:
+                    counts[edge] = size[comp] + entering[comp]
+
+        return counts, cycles
+
+
+def incremental_weights(
+    internal_edges: list[tuple[Hashable, Hashable]],
+    boundary_edges: Iterable[tuple[Hashable, Optional[int], Optional[bool]]],
+) -> tuple[list[Optional[int]], list[bool]]:
+    """
+    Recalcule les poids d'une zone affectée par des changements.
+
+    :param internal_edges: relations (source, cible) dont la source est dans
+        la zone ; la zone doit être fermée vers l'aval (toute cible y est)
+    :param boundary_edges: relations entrant dans la zone depuis l'extérieur,
+        sous forme (cible, count stocké, cycle stocké) ; leurs valeurs sont
+        celles d'un recalcul complet puisque rien n'a changé en amont
+    :return: (counts, cycles) des relations internes, dans l'ordre donné,
+        identiques à ceux d'un recalcul complet du domaine
+    """
+    graph = DelegationGraph.from_edges(internal_edges)
+    index = {key: position for position, key in enumerate(graph.keys)}
+
+    external: dict[int, tuple[int, bool]] = {}
+    for target, count, cycle in boundary_edges:
+        node = index.get(target)
+        if node is None:
+            continue
+        incoming, tainted = external.get(node, (0, False))
+        # Un count nul hors cycle signifie que la source est en aval d'un cycle
+        external[node] = (incoming + (count or 0), tainted or (count is None and not cycle))
+
+    return graph.compute_weights(external)
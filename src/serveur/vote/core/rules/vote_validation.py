@@ -0,0 +1,192 @@
+from typing import Hashable, Iterable, Optional
+
+
+class DomainVoteValidator:
+    """
+    Validation en mémoire des votes d'un domaine.
+
+    Reproduit `VoteRepository._check_vote_validity` puis `_update_counts`
+    sur un graphe chargé une seule fois : chaque vote validé devient une
+    relation courante et modifie les counts du chemin, exactement comme
+    l'enchaînement check_vote_validity -> mark_vote_valid -> update_counts.
+
+    Les relations sont indexées par position ; `rel_ids[e]` garde l'elementId
+    d'origine. `cycles[e]` peut valoir None (propriété absente) : comme en
+    Cypher, seules les relations avec cycle = false comptent dans les sommes
+    entrantes.
+    """
+
+    def __init__(self, thresholds: dict[Hashable, Optional[int]]):
+        self.thresholds = thresholds
+        self.rel_ids: list[str] = []
+        self.sources: list[Hashable] = []
+        self.targets: list[Hashable] = []
+        self.counts: list[Optional[int]] = []
+        self.cycles: list[Optional[bool]] = []
+        self.out_edges: dict[Hashable, list[int]] = {}
+        self.in_edges: dict[Hashable, list[int]] = {}
+        self.touched: set[int] = set()
+        self.created: set[int] = set()
+
+    def add_edge(self, rel_id: str, source: Hashable, target: Hashable,
+                 count: Optional[int], cycle: Optional[bool]) -> int:
+        edge = len(self.rel_ids)
+        self.rel_ids.append(rel_id)
+        self.sources.append(source)
+        self.targets.append(target)
+        self.counts.append(count)
+        self.cycles.append(cycle)
+        self.out_edges.setdefault(source, []).append(edge)
+        self.in_edges.setdefault(target, []).append(edge)
+        return edge
+
+    def threshold(self, node: Hashable) -> int:
+        # Un seuil absent est traité comme "pas de limite" (-1)
+        value = self.thresholds.get(node)
+        return -1 if value is None else value
+
+    def incoming(self, node: Hashable) -> int:
+        return sum(
+            self.counts[edge] or 0
+            for edge in self.in_edges.get(node, ())
+            if self.cycles[edge] is False
+        )
+
+    # -------------------- PLUS LONG CHEMIN --------------------
+
+    def longest_trail(self, start: Hashable) -> list[int]:
+        """
+        Plus long chemin sans relation répétée depuis `start`, comme
+        `MATCH p = (start)-[:VOTED*]->(n) ORDER BY length(p) DESC LIMIT 1`.
+        """
+        # Cas courant : un seul vote courant par nœud, le chemin est unique
+        trail: list[int] = []
+        used: set[int] = set()
+        node = start
+        while True:
+            edges = self.out_edges.get(node, ())
+            if len(edges) > 1:
+                return self._longest_trail_search(start)
+            if not edges or edges[0] in used:
+                return trail
+            used.add(edges[0])
+            trail.append(edges[0])
+            node = self.targets[edges[0]]
+
+    def _longest_trail_search(self, start: Hashable) -> list[int]:
+        # Parcours exhaustif (itératif) des chemins, comme le fait Cypher
+        best: list[int] = []
+        trail: list[int] = []
+        used: set[int] = set()
+        stack = [iter(self.out_edges.get(start, ()))]
+
+        while stack:
+            for edge in stack[-1]:
+                if edge in used:
+                    continue
+                used.add(edge)
+                trail.append(edge)
+                stack.append(iter(self.out_edges.get(self.targets[edge], ())))
+                break
+            else:
+                stack.pop()
+                if len(trail) > len(best):
+                    best = list(trail)
+                if trail:
+                    used.discard(trail.pop())
+
+        return best
+
+    # -------------------- VERIFICATION / APPLICATION --------------------
+
+    def check_vote(self, voter: Hashable, target: Hashable) -> tuple[int, Optional[list[int]], bool]:
+        """
+        Même contrat que `VoteRepository.check_vote_validity`, mais les
+        relations du chemin sont rendues sous forme d'index locaux.
+        """
+        if voter == target:
+            return 0, [], True
+
+        rels = self.longest_trail(target)
+        nodes = [target] + [self.targets[edge] for edge in rels]
+
+        # Si le dernier rel est une self-loop, on l'enlève
+        if rels and self.sources[rels[-1]] == self.targets[rels[-1]]:
+            rels.pop()
+            nodes.pop()
+
+        incoming = self.incoming(voter)
+        violated = False
+        cycle = nodes[-1] == voter
+
+        if cycle:
+            for node in nodes:
+                threshold = self.threshold(node)
+                if threshold != -1 and incoming >= threshold:
+                    violated = True
+                    break
+
+        else:
+            for edge in rels:
+                threshold = self.threshold(self.sources[edge])
+                incoming_sum = (self.counts[edge] or 0) + incoming
+                if self.cycles[edge]:
+                    incoming_sum += 1
+                if threshold != -1 and incoming_sum > threshold:
+                    violated = True
+                    break
+
+            if not violated:
+                last_node_threshold = self.threshold(nodes[-1])
+                if not (last_node_threshold == -1 or (rels and self.cycles[rels[-1]])):
+                    if self.incoming(nodes[-1]) + incoming > last_node_threshold:
+                        violated = True
+
+        if violated:
+            return -1, None, cycle
+
+        return incoming + 1, rels, cycle
+
+    def apply_vote(self, rel_id: str, voter: Hashable, target: Hashable,
+                   count: int, rels: list[int], cycle: bool) -> None:
+        """
+        Équivalent de mark_vote_valid + update_counts : le vote devient
+        courant, puis les counts du chemin sont mis à jour.
+        """
+        edge = self.add_edge(rel_id, voter, target, count, cycle)
+        self.created.add(edge)
+
+        for path_edge in rels:
+            if cycle:
+                self.counts[path_edge] = count
+                self.cycles[path_edge] = True
+            elif self.counts[path_edge] is not None:
+                # En Cypher, null + count reste null
+                self.counts[path_edge] += count
+            self.touched.add(path_edge)
+
+    def validate(self, votes: Iterable[tuple[str, Hashable, Hashable]]) -> list[str]:
+        """
+        Valide les votes (rel_id, voter, target) dans l'ordre donné.
+        Retourne les rel_id invalidés.
+        """
+        rejected: list[str] = []
+        for rel_id, voter, target in votes:
+            count, rels, cycle = self.check_vote(voter, target)
+            if count == -1:
+                rejected.append(rel_id)
+                continue
+            self.apply_vote(rel_id, voter, target, count, rels, cycle)
+        return rejected
+
+    def created_rows(self) -> list[dict]:
+        return [
+            {"relId": self.rel_ids[edge], "count": self.counts[edge], "cycle": self.cycles[edge]}
+            for edge in sorted(self.created)
+        ]
+
+    def updated_rows(self) -> list[dict]:
+        return [
+            {"relId": self.rel_ids[edge], "count": self.counts[edge], "cycle": self.cycles[edge]}
+            for edge in sorted(self.touched - self.created)
+        ]
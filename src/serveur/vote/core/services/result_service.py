@@ -1,5 +1,5 @@
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
 
 from db.repository.result_repository import ResultRepository
 
@@ -17,7 +17,8 @@ class ResultService:
     def get_vote_results(
         domain: Optional[str] = None,
         top: int = 100,
-        since: Optional[datetime] = None
+        since: Optional[datetime] = None,
+        as_of: Optional[date] = None
     ) -> List[dict]:
         """
         Récupère les résultats agrégés des votes.
@@ -26,26 +27,85 @@ class ResultService:
             domain: Domaine optionnel pour filtrer les votes
             top: Nombre maximum de résultats (défaut: 100)
             since: Date optionnelle - votes depuis cette date
+            as_of: Date optionnelle - résultats tels qu'au dernier instantané à cette date
             
         Returns:
             Liste de résultats avec userId, domain, count, elected, electedAt
         """
         # Récupérer les résultats du repository (qui incluent domainTotal)
-        results = ResultRepository.get_vote_results(domain, top, since)
-        
+        if as_of is not None:
+            results = ResultRepository.get_vote_results_as_of(as_of, domain, top)
+        else:
+            results = ResultRepository.get_vote_results(domain, top, since)
+        return ResultService._with_election(results)
+
+    @staticmethod
+    async def aget_vote_results(
+        domain: Optional[str] = None,
+        top: int = 100,
+        since: Optional[datetime] = None,
+        as_of: Optional[date] = None
+    ) -> List[dict]:
+        """
+        Variante async de get_vote_results (vues ASGI).
+        """
+        if as_of is not None:
+            results = await ResultRepository.aget_vote_results_as_of(as_of, domain, top)
+        else:
+            results = await ResultRepository.aget_vote_results(domain, top, since)
+        return ResultService._with_election(results)
+
+    @staticmethod
+    def _with_election(results: List[dict]) -> List[dict]:
         # Calculer elected pour chaque résultat
         # elected = true si votes >= 20% des votes du domaine
         for result in results:
             domain_total = result.get('domainTotal', 0)
             
-            if domain_total > 0:
+            if result.get('elected') is not None:
+                # Déjà calculé dans l'instantané des résultats
+                pass
+            elif domain_total > 0:
                 # Élu si au moins 20% des voix du domaine
                 result['elected'] = (result['count'] >= domain_total * ResultService.ELECTION_THRESHOLD)
             else:
                 # Si pas de total (cas impossible), considérer comme non élu
                 result['elected'] = False
             
-            # Retirer domainTotal des résultats (usage interne uniquement)
+            # Retirer les champs internes des résultats
             result.pop('domainTotal', None)
+            result.pop('rank', None)
+            result.pop('globalRank', None)
         
-        return results
\ No newline at end of file
+        return results
+
+    @staticmethod
+    def get_result_changes(
+        from_date: date,
+        to_date: date,
+        domain: Optional[str] = None,
+        top: int = 100
+    ) -> Optional[dict]:
+        """
+        Évolution du classement entre deux instantanés de résultats
+        (cf. ResultRepository.get_result_changes). None si l'une des dates
+        précède tout instantané conservé.
+        """
+        return ResultRepository.get_result_changes(from_date, to_date, domain, top)
+
+    @staticmethod
+    async def aget_result_changes(
+        from_date: date,
+        to_date: date,
+        domain: Optional[str] = None,
+        top: int = 100
+    ) -> Optional[dict]:
+        return await ResultRepository.aget_result_changes(from_date, to_date, domain, top)
+
+    @staticmethod
+    def materialize_results() -> int:
+        """
+        Matérialise les résultats du jour (classement, totaux, élus au seuil
+        ELECTION_THRESHOLD) pour que /results les serve sans recalcul.
+        """
+        return ResultRepository.materialize_vote_results(ResultService.ELECTION_THRESHOLD)
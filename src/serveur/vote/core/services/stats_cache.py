@@ -0,0 +1,46 @@
+import hashlib
+import json
+import os
+
+from django.core.cache import cache
+
+# Durée de conservation (en secondes) d'une réponse de statistiques en cache
+STATS_CACHE_TIMEOUT = int(os.getenv("VOTE_STATS_CACHE_TIMEOUT", "172800"))
+
+
+class StatsCache:
+    """
+    Cache des réponses de statistiques (backend Django CACHES : mémoire
+    locale, ou Redis si REDIS_URL est défini).
+
+    La clé contient la date du dernier instantané (StatsMeta.lastDate) :
+    un nouvel instantané change toutes les clés, les anciennes entrées
+    expirent sans invalidation explicite.
+    """
+
+    @staticmethod
+    def key(endpoint: str, params: dict, last_date: str, *version) -> str:
+        raw = json.dumps([endpoint, params, last_date, *version], sort_keys=True, default=str)
+        return f"vote:stats:{last_date}:{hashlib.sha256(raw.encode()).hexdigest()[:32]}"
+
+    @staticmethod
+    def etag(key: str) -> str:
+        # "<date de l'instantané>-<empreinte>"
+        _, _, last_date, digest = key.split(":")
+        return f'"{last_date}-{digest[:16]}"'
+
+    @staticmethod
+    def get_or_set(key: str, compute):
+        value = cache.get(key)
+        if value is None:
+            value = compute()
+            cache.set(key, value, STATS_CACHE_TIMEOUT)
+        return value
+
+    @staticmethod
+    async def aget_or_set(key: str, acompute):
+        value = await cache.aget(key)
+        if value is None:
+            value = await acompute()
+            await cache.aset(key, value, STATS_CACHE_TIMEOUT)
+        return value
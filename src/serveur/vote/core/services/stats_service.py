@@ -1,10 +1,19 @@
 import os
 from typing import List
-from db.repository.vote_repository import VoteRepository
+from db.repository.backend import VoteRepository
 
 MIN_PUBLIC_VOTES = int(os.getenv("MIN_PUBLIC_VOTES", 5))
 
 class StatsService:
+    @staticmethod
+    def get_stats_version(user_id: str | None = None) -> tuple[str, bool, List | None]:
+        """
+        Retourne (date du dernier instantané, publishVotes de l'utilisateur,
+        catalogue des domaines de l'instantané), dont dépendent les réponses
+        de statistiques.
+        """
+        return VoteRepository.get_stats_version(user_id)
+
     @staticmethod
     def get_daily_stats(user_id: str, days: int = 30, include_monthly: bool = False) -> dict:
         """
@@ -17,6 +26,18 @@ class StatsService:
         """
         by_domain, publish_votes = VoteRepository.get_daily_votes_to_user(user_id, days)
         last_update = VoteRepository.get_last_update()
+        res = {
+            "userId": user_id,
+            "byDomain": StatsService._public_daily_domains(by_domain, publish_votes, last_update),
+        }
+
+        if include_monthly:
+            monthly_by_domain = VoteRepository.get_monthly_votes_to_user(user_id)
+            res["monthlyByDomain"] = monthly_by_domain
+        return res
+
+    @staticmethod
+    def _public_daily_domains(by_domain: list[dict], publish_votes: bool, last_update: str) -> list[dict]:
         if not publish_votes:
             filtered_domains = []
 
@@ -36,13 +57,7 @@ class StatsService:
                     filtered_domains.append(domain_entry)
 
             by_domain = filtered_domains
-
-        res = {"userId": user_id, "byDomain": by_domain}
-
-        if include_monthly:
-            monthly_by_domain = VoteRepository.get_monthly_votes_to_user(user_id)
-            res["monthlyByDomain"] = monthly_by_domain
-        return res
+        return by_domain
 
     @staticmethod
     def get_monthly_stats(user_id: str, months: int = 12) -> List:
@@ -52,17 +67,64 @@ class StatsService:
         return VoteRepository.get_monthly_votes_to_user(user_id, months)
         
     @staticmethod
-    def get_chart(domain: str | None = None, days: int = 30) -> List:
+    def get_chart(domain: str | None = None, days: int = 30, domains: List | None = None) -> List:
         """
         Retourne pour chaque domaine (ou pour un domaine donné) la liste des top users.
         Si domain est None, on génère pour tous les domaines trouvés.
+        `domains` : catalogue déjà lu (cf. get_stats_version), relu sinon.
         """
-        domains = VoteRepository.get_all_domains()
+        if domains is None:
+            domains = VoteRepository.get_all_domains()
         res = []
         if domain:
             domains = [domain] if domain in domains else []
 
+        # Classements pré-calculés chaque nuit ; calcul en direct sinon
+        leaderboards = VoteRepository.get_leaderboards(days)
+
+        for d in domains:
+            if leaderboards is not None:
+                users = leaderboards.get(d, [])
+            else:
+                users = VoteRepository.get_chart_for_domain(d, days)
+            res.append({"domain": d, "users": users})
+        return res
+
+    # Variantes async (vues ASGI)
+
+    @staticmethod
+    async def aget_stats_version(user_id: str | None = None) -> tuple[str, bool, List | None]:
+        return await VoteRepository.aget_stats_version(user_id)
+
+    @staticmethod
+    async def aget_daily_stats(user_id: str, days: int = 30, include_monthly: bool = False) -> dict:
+        by_domain, publish_votes = await VoteRepository.aget_daily_votes_to_user(user_id, days)
+        last_update = await VoteRepository.aget_last_update()
+        res = {
+            "userId": user_id,
+            "byDomain": StatsService._public_daily_domains(by_domain, publish_votes, last_update),
+        }
+        if include_monthly:
+            res["monthlyByDomain"] = await VoteRepository.aget_monthly_votes_to_user(user_id)
+        return res
+
+    @staticmethod
+    async def aget_monthly_stats(user_id: str, months: int = 12) -> List:
+        return await VoteRepository.aget_monthly_votes_to_user(user_id, months)
+
+    @staticmethod
+    async def aget_chart(domain: str | None = None, days: int = 30, domains: List | None = None) -> List:
+        if domains is None:
+            domains = await VoteRepository.aget_all_domains()
+        if domain:
+            domains = [domain] if domain in domains else []
+
+        leaderboards = await VoteRepository.aget_leaderboards(days)
+        res = []
         for d in domains:
-            users = VoteRepository.get_chart_for_domain(d, days)
+            if leaderboards is not None:
+                users = leaderboards.get(d, [])
+            else:
+                users = await VoteRepository.aget_chart_for_domain(d, days)
             res.append({"domain": d, "users": users})
         return res
@@ -0,0 +1,185 @@
+import datetime
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from core.services.vote_validation_service import VoteValidationService
+from db.repository.run_repository import RunCancelled, RunLockLost, RunRepository
+
+# Durée (en secondes) du bail du verrou, prolongé pendant l'exécution :
+# un processus arrêté brutalement le libère au plus tard après ce délai
+JOB_LOCK_TTL = int(os.getenv("VOTE_JOB_LOCK_TTL", "300"))
+# Intervalle (en secondes) entre deux tentatives de prise du verrou
+JOB_LOCK_POLL_INTERVAL = float(os.getenv("VOTE_JOB_LOCK_POLL_INTERVAL", "15"))
+
+logger = logging.getLogger(__name__)
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # Un seul worker par processus : les exécutions sont de toute façon
+    # sérialisées par le verrou Neo4j
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vote-job")
+        return _executor
+
+
+class VoteJobService:
+    """
+    Exécution du traitement quotidien des votes hors des requêtes HTTP.
+
+    La file et l'avancement sont ceux du journal VoteRun (cf. RunRepository) :
+    une exécution est mise en file ("queued"), puis exécutée par le worker
+    du processus une fois le verrou VoteRunLock obtenu. Le verrou est partagé
+    par tous les processus (serveur, cron) : deux exécutions ne se
+    chevauchent jamais, la seconde attend la fin de la première.
+    """
+
+    @staticmethod
+    def enqueue(resume: bool = False) -> dict:
+        """
+        Met en file une exécution et la confie au worker du processus.
+
+        :return: {"id", "resumed", "status"}
+        """
+        run = RunRepository.queue_run(datetime.date.today(), resume)
+        _get_executor().submit(VoteJobService._execute_in_background, run["id"])
+        return {**run, "status": "queued"}
+
+    @staticmethod
+    def run(resume: bool = False) -> str:
+        """
+        Met en file une exécution et l'exécute dans le thread courant (cron,
+        commande de gestion). Les erreurs du traitement sont propagées.
+
+        :return: l'identifiant de l'exécution
+        """
+        run = RunRepository.queue_run(datetime.date.today(), resume)
+        VoteJobService._execute(run["id"])
+        return run["id"]
+
+    @staticmethod
+    def get_job(run_id: str) -> Optional[dict]:
+        """
+        État d'une exécution : journal (cf. RunRepository.get_run) et avancement.
+        """
+        run = RunRepository.get_run(run_id)
+        if run is None:
+            return None
+        run["progress"] = VoteJobService._progress(run["steps"])
+        return run
+
+    @staticmethod
+    def cancel(run_id: str) -> Optional[str]:
+        """
+        Annule une exécution en file, ou demande l'arrêt d'une exécution en
+        cours (effectif à la fin de la phase ou du domaine en cours).
+
+        :return: le statut de l'exécution, None si elle n'existe pas
+        """
+        return RunRepository.request_cancel(run_id)
+
+    @staticmethod
+    def _progress(steps: list[dict]) -> dict:
+        by_key = {(step["phase"], step["domain"]): step for step in steps}
+        phases = VoteValidationService.PHASES
+        done = [phase for phase in phases if by_key.get((phase, ""), {}).get("status") == "completed"]
+        current = next(
+            (phase for phase in phases if by_key.get((phase, ""), {}).get("status") == "running"), None
+        )
+        setup = by_key.get(("recalculate_setup", ""))
+        return {
+            "phasesDone": len(done),
+            "phasesTotal": len(phases),
+            "currentPhase": current,
+            "domainsDone": sum(
+                1 for step in steps
+                if step["phase"] == "recalculate" and step["domain"] and step["status"] == "completed"
+            ),
+            "domainsTotal": setup.get("domainCount") if setup else None,
+        }
+
+    @staticmethod
+    def _execute_in_background(run_id: str) -> None:
+        # Exécuté par le worker : rien ne lit le résultat du Future
+        try:
+            VoteJobService._execute(run_id)
+        except Exception:
+            logger.exception("Échec de l'exécution %s", run_id)
+
+    @staticmethod
+    def _execute(run_id: str) -> None:
+        owner = str(uuid.uuid4())
+        while not RunRepository.acquire_lock(owner, run_id, JOB_LOCK_TTL):
+            if RunRepository.get_status(run_id) != "queued":
+                return
+            logger.info("Exécution %s en attente du verrou", run_id)
+            time.sleep(JOB_LOCK_POLL_INTERVAL)
+
+        heartbeat = _LockHeartbeat(owner, run_id)
+        try:
+            if not RunRepository.claim_run(run_id):
+                # Annulée pendant l'attente, ou déjà exécutée ailleurs
+                return
+            heartbeat.start()
+            VoteValidationService.process_daily_votes(run_id=run_id)
+        except RunCancelled:
+            logger.info("Exécution %s annulée", run_id)
+        except RunLockLost:
+            # Le journal est laissé en l'état : reprise par --resume ou par le cron
+            logger.error("Exécution %s arrêtée : verrou perdu", run_id)
+        finally:
+            heartbeat.stop()
+            RunRepository.forget_lock_lost(run_id)
+            RunRepository.release_lock(owner)
+
+
+class _LockHeartbeat(threading.Thread):
+    """
+    Prolonge le bail du verrou tant que l'exécution tourne.
+
+    Le verrou est perdu s'il a été repris, ou si aucune prolongation n'a
+    abouti pendant JOB_LOCK_TTL (un autre processus peut alors le prendre) :
+    l'exécution est arrêtée à la prochaine phase ou au prochain domaine
+    (cf. RunRepository.mark_lock_lost).
+    """
+
+    def __init__(self, owner: str, run_id: str):
+        super().__init__(name=f"vote-job-lock-{run_id}", daemon=True)
+        self.owner = owner
+        self.run_id = run_id
+        self._stopped = threading.Event()
+
+    def run(self):
+        renewed = time.monotonic()
+        while not self._stopped.wait(JOB_LOCK_TTL / 3):
+            try:
+                held = RunRepository.acquire_lock(self.owner, self.run_id, JOB_LOCK_TTL)
+            except Exception as exc:
+                logger.warning("Prolongation du verrou de l'exécution %s impossible : %r", self.run_id, exc)
+                held = time.monotonic() - renewed < JOB_LOCK_TTL
+            else:
+                renewed = time.monotonic() if held else renewed
+
+            if not held:
+                self._lose()
+                return
+
+    def _lose(self):
+        logger.error("Verrou de l'exécution %s perdu : arrêt de l'exécution", self.run_id)
+        try:
+            RunRepository.mark_lock_lost(self.run_id)
+        except Exception as exc:
+            # Le signal local suffit au processus courant
+            logger.warning("Perte du verrou de l'exécution %s non journalisée : %r", self.run_id, exc)
+
+    def stop(self):
+        self._stopped.set()
@@ -2,9 +2,10 @@ import os
 import uuid
 from django.utils import timezone
 
-from db.repository.vote_repository import VoteRepository
+from db.repository.backend import VoteRepository
 
 MIN_PUBLIC_VOTES = int(os.getenv("MIN_PUBLIC_VOTES", 5))
+BULK_MAX_VOTES = int(os.getenv("VOTE_BULK_MAX_ITEMS", 1000))
 
 class VoteService:
     @staticmethod
@@ -24,6 +25,54 @@ class VoteService:
 
         return vote
 
+    @staticmethod
+    def create_votes(voter_id: str, items: list[dict]) -> list[dict]:
+        """
+        Crée plusieurs votes du même votant (items : {targetUserId, domain} déjà validés).
+        Comme des appels successifs à create_vote, seul le dernier vote d'un domaine
+        est conservé : les précédents sont marqués "replaced".
+
+        Retourne, dans l'ordre des items, {"status": "created", "vote": dict}
+        ou {"status": "replaced"}.
+        """
+        return VoteService.import_votes([{**item, "voterId": voter_id} for item in items])
+
+    @staticmethod
+    def import_votes(items: list[dict]) -> list[dict]:
+        """
+        Crée des votes de plusieurs votants (items : {voterId, targetUserId, domain}
+        déjà validés). Réservé aux imports (cf. manage.py import_votes) : l'API
+        n'accepte que les votes de l'utilisateur authentifié (cf. create_votes).
+        Seul le dernier vote d'un même votant dans un domaine est conservé.
+
+        Retourne, dans l'ordre des items, {"status": "created", "vote": dict}
+        ou {"status": "replaced"}.
+        """
+        now = timezone.now()
+        last_by_key: dict[tuple[str, str], int] = {}
+        for index, item in enumerate(items):
+            last_by_key[(str(item["voterId"]), item["domain"])] = index
+
+        results: list[dict] = []
+        votes: list[dict] = []
+        for index, item in enumerate(items):
+            if last_by_key[(str(item["voterId"]), item["domain"])] != index:
+                results.append({"status": "replaced"})
+                continue
+            vote = {
+                "id": uuid.uuid4(),
+                "voterId": str(item["voterId"]),
+                "targetUserId": str(item["targetUserId"]),
+                "domain": item["domain"],
+                "createdAt": now,
+            }
+            votes.append(vote)
+            results.append({"status": "created", "vote": vote})
+
+        VoteRepository.save_votes(votes)
+
+        return results
+
     @staticmethod
     def delete_vote(voter_id: str, domain: str) -> bool:
         """
@@ -40,24 +89,32 @@ class VoteService:
         """
         Récupère la liste des votes émis par un user (option: filtrer par domaine).
         """
-        
-        publish_votes, stats = VoteRepository.get_publish_votes_setting(voter_id)
-        last_update = VoteRepository.get_last_update()
-        last_counts = stats[last_update] if last_update in stats else {}
-        public_domains = set()
-        if is_me or publish_votes:
-            public_domains = set(VoteRepository.get_all_domains())
-        else:
-            for domain_name, count in last_counts.items():
-                if count >= MIN_PUBLIC_VOTES:
-                    public_domains.add(domain_name)
-    
-
-        votes = VoteRepository.find_votes_by_voter(
+        profile = VoteRepository.find_votes_by_voter_with_stats(
             voter_id=voter_id,
             domain=domain,
         )
-        return [vote_entry for vote_entry in votes if vote_entry["domain"] in public_domains]
+        return VoteService._public_votes(profile, is_me)
+
+    @staticmethod
+    async def aget_votes_by_voter(voter_id: str, domain: str | None = None, is_me: bool = False) -> list[dict]:
+        """
+        Variante async de get_votes_by_voter (vues ASGI).
+        """
+        profile = await VoteRepository.afind_votes_by_voter_with_stats(voter_id=voter_id, domain=domain)
+        return VoteService._public_votes(profile, is_me)
+
+    @staticmethod
+    def _public_votes(profile: dict, is_me: bool) -> list[dict]:
+        # Les votes lus sont des relations courantes : tous leurs domaines sont publics
+        if is_me or profile["publishVotes"]:
+            return profile["votes"]
+
+        public_domains = {
+            domain_name
+            for domain_name, count in profile["lastCounts"].items()
+            if count >= MIN_PUBLIC_VOTES
+        }
+        return [vote_entry for vote_entry in profile["votes"] if vote_entry["domain"] in public_domains]
 
     @staticmethod
     def get_received_votes(user_id: str, domain: str | None = None, is_me: bool = False) -> dict:
@@ -70,21 +127,30 @@ class VoteService:
           "usersByDomain": { str: [str] }
         }
         """
+        res = VoteRepository.get_received_votes_with_stats(
+            user_id=user_id,
+            domain=domain,
+        )
+        return VoteService._public_received_votes(res, is_me)
 
-        publish_votes, stats = VoteRepository.get_publish_votes_setting(user_id)
-        last_update = VoteRepository.get_last_update()
-        last_counts = stats[last_update] if last_update in stats else {}
+    @staticmethod
+    async def aget_received_votes(user_id: str, domain: str | None = None, is_me: bool = False) -> dict:
+        """
+        Variante async de get_received_votes (vues ASGI).
+        """
+        res = await VoteRepository.aget_received_votes_with_stats(user_id=user_id, domain=domain)
+        return VoteService._public_received_votes(res, is_me)
+
+    @staticmethod
+    def _public_received_votes(res: dict, is_me: bool) -> dict:
+        publish_votes = res.pop("publishVotes")
+        last_counts = res.pop("lastCounts")
         public_domains = set()
 
         for domain_name, count in last_counts.items():
             if is_me or publish_votes or count >= MIN_PUBLIC_VOTES:
                 public_domains.add(domain_name)
 
-        res = VoteRepository.get_received_votes_summary(
-            user_id=user_id,
-            domain=domain,
-        )
-
         res["byDomain"] = {
             domain_key: count
             for domain_key, count in last_counts.items()
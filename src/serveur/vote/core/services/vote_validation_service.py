@@ -1,10 +1,25 @@
 import datetime
+import logging
+import os
 import random
-from db.repository.vote_repository import VoteRepository
+import time
+from app.instrumentation import collect
+from core.services.result_service import ResultService
+from db.repository.run_repository import RunCancelled, RunLockLost, RunRepository
+from db.repository.backend import VoteRepository
+
+# "sequential" : un vote après l'autre (3 transactions par vote)
+# "batch" : validation groupée en mémoire, par domaine
+VALIDATION_MODE = os.getenv("VOTE_VALIDATION_MODE", "sequential")
+
+logger = logging.getLogger(__name__)
 
 class VoteValidationService:
+    # Phases du traitement quotidien, dans l'ordre (étapes globales du journal VoteRun)
+    PHASES = ("clean_duplicates", "recalculate", "validate", "daily_stats", "results")
+
     @staticmethod
-    def process_daily_votes():
+    def process_daily_votes(resume: bool = False, run_id: str | None = None) -> str:
         """
         Traite les votes non encore validés chaque jour :
         - Supprime ou réinitialise les votes précédents via le service VoteService
@@ -12,51 +27,156 @@ class VoteValidationService:
         - Mélange aléatoirement ces votes
         - Valide environ 80 % des votes et rejette les 20 % restants
         - Marque les votes validés ou invalidés dans Neo4j via VoteRepository
+        - Calcule les stats du jour et matérialise les résultats
+
+        Chaque phase est journalisée dans un nœud VoteRun (cf. RunRepository).
+        Avec `resume`, une exécution du jour non terminée est reprise : ses
+        phases (et domaines recalculés) terminés ne sont pas refaits.
+
+        `run_id` désigne une exécution déjà démarrée par VoteJobService
+        (reprise de ses étapes terminées le cas échéant). Une annulation
+        demandée est constatée entre deux phases (et entre deux domaines
+        du recalcul) : RunCancelled est levée. La perte du verrou de
+        l'exécution (cf. VoteJobService) est constatée aux mêmes endroits :
+        RunLockLost est levée, sans rien écrire de plus dans le journal.
+
+        :return: l'identifiant de l'exécution
         """
+        if run_id is None:
+            run = RunRepository.start_run(datetime.date.today(), resume)
+            run_id = run["id"]
+            resumed = run["resumed"]
+        else:
+            resumed = True
+        completed = RunRepository.get_completed_steps(run_id) if resumed else {}
+
+        actions = {
+            "clean_duplicates": VoteRepository.clean_duplicate_domain_votes,
+            "recalculate": lambda: VoteRepository.recalculate_counts_by_domain(run_id=run_id),
+            "validate": lambda: VoteValidationService.validate_unprocessed_votes(run_id=run_id),
+            "daily_stats": VoteValidationService.finalize_daily_stats,
+            # Les counts ne changent plus avant le prochain cron : on fige les résultats
+            "results": ResultService.materialize_results,
+        }
+        for phase in VoteValidationService.PHASES:
+            action = actions[phase]
+            if (phase, "") in completed:
+                logger.info("Exécution %s : phase %s déjà terminée", run_id, phase)
+                continue
 
-        # Supprimer ou réinitialiser les votes précédents
-        VoteValidationService.remove_previous_votes()
+            stopped = RunRepository.stop_reason(run_id)
+            if stopped == "lock_lost":
+                raise RunLockLost(run_id)
+            if stopped == "cancelled":
+                RunRepository.finish_run(run_id, cancelled=True)
+                raise RunCancelled(run_id)
+
+            RunRepository.start_step(run_id, phase)
+            started = time.perf_counter()
+            try:
+                with collect() as totals:
+                    action()
+            except RunLockLost as exc:
+                VoteValidationService._log_phase(run_id, phase, time.perf_counter() - started, totals, exc)
+                raise
+            except RunCancelled as exc:
+                seconds = time.perf_counter() - started
+                VoteValidationService._log_phase(run_id, phase, seconds, totals, exc)
+                RunRepository.finish_step(
+                    run_id, phase, seconds=seconds, error="cancelled", queries=totals.queries
+                )
+                RunRepository.finish_run(run_id, cancelled=True)
+                raise
+            except Exception as exc:
+                seconds = time.perf_counter() - started
+                VoteValidationService._log_phase(run_id, phase, seconds, totals, exc)
+                RunRepository.finish_step(
+                    run_id, phase, seconds=seconds, error=repr(exc), queries=totals.queries
+                )
+                RunRepository.finish_run(run_id, error=f"{phase}: {exc!r}")
+                raise
+            seconds = time.perf_counter() - started
+            VoteValidationService._log_phase(run_id, phase, seconds, totals)
+            RunRepository.finish_step(run_id, phase, seconds=seconds, queries=totals.queries)
+
+        RunRepository.finish_run(run_id)
+        return run_id
+
+    @staticmethod
+    def _log_phase(run_id: str, phase: str, seconds: float, totals, error: Exception | None = None) -> None:
+        # Une ligne clé=valeur par phase ; les mêmes champs sont passés en `extra` pour un formateur JSON
+        fields = {
+            "run": run_id,
+            "phase": phase,
+            "status": "error" if error else "ok",
+            "seconds": round(seconds, 3),
+            "neo4j_seconds": round(totals.seconds, 3),
+            "queries": totals.queries,
+            "query_errors": totals.errors,
+            "rows": totals.rows,
+            "updates": totals.updates,
+            "db_hits": totals.db_hits,
+        }
+        logger.log(
+            logging.ERROR if error else logging.INFO,
+            "vote_run_phase %s",
+            " ".join(f"{key}={value}" for key, value in fields.items()),
+            extra={"vote_run_phase": fields},
+        )
+
+    @staticmethod
+    def validate_unprocessed_votes(run_id: str | None = None):
+        """
+        Valide environ 80 % des votes non traités (tirés au hasard) et marque
+        les autres comme invalides. Reprise naturelle : un vote validé ou
+        invalidé n'est plus « non traité ».
 
+        Les votes écartés par le tirage sont marqués avant la validation : un
+        arrêt pendant la validation ne laisse que des votes tirés pour être
+        validés. Avec `run_id`, le tirage (votes tirés pour être validés) est
+        journalisé dans la même transaction que ce marquage (étape
+        "validate_setup") ; une reprise valide, dans l'ordre du tirage, ceux
+        qui restent à traiter. Les votes enregistrés depuis le tirage sont
+        laissés à l'exécution suivante.
+        """
         # Récupérer la liste des relations VOTED non encore traitées
         vote_ids = VoteRepository.fetch_unprocessed_votes()
 
-        # Si aucun vote à traiter, on passe au calcule des stats
-        if vote_ids:
+        # Si aucun vote à traiter, rien à valider
+        if not vote_ids:
+            return
+
+        setup = RunRepository.get_completed_steps(run_id).get(("validate_setup", "")) if run_id else None
+        if setup is not None:
+            # Tirage déjà fait : seuls les votes tirés et pas encore traités
+            unprocessed = set(vote_ids)
+            validated = [vote_id for vote_id in setup["voteIds"] or [] if vote_id in unprocessed]
+        else:
             # Mélanger les IDs pour éviter un biais d'ordre
             random.shuffle(vote_ids)
             # Déterminer le nombre de votes à valider (80 %)
             cutoff = int(len(vote_ids) * 0.8) + 1
 
-            # Séparer les votes validés et rejetés
-            validated = vote_ids[:cutoff]
-            rejected = vote_ids[cutoff:]
+            # Séparer les votes validés et rejetés, marquer les rejetés dans la base
+            validated, drawn_out = vote_ids[:cutoff], vote_ids[cutoff:]
+            if run_id is not None:
+                VoteRepository.record_validation_draw(run_id, drawn_out, validated)
+            elif drawn_out:
+                VoteRepository.mark_votes_invalid(drawn_out)
 
-            # Logique de validation des votes de validated
-            for vote_id in validated:
-                if not VoteValidationService.validate_vote(vote_id):
-                    rejected.append(vote_id)
+        # Logique de validation des votes de validated
+        if VALIDATION_MODE == "batch":
+            rejected = VoteValidationService.validate_votes_batch(validated)
+        else:
+            rejected = [
+                vote_id for vote_id in validated
+                if not VoteValidationService.validate_vote(vote_id)
+            ]
 
-            # Marquer les votes rejetés dans la base
-            if rejected:
-                VoteRepository.mark_votes_invalid(rejected)
-        
-        VoteValidationService.finalize_daily_stats()
+        # Marquer les votes invalidés par la validation
+        if rejected:
+            VoteRepository.mark_votes_invalid(rejected)
 
-    @staticmethod
-    def remove_previous_votes():
-        """
-        Supprime les votes en double par domaine, puis recalcule les poids des votes.
-        
-        Étapes :
-        1. Supprime les relations VOTED en doublon et valide toutes les self-loop pour chaque
-           utilisateur et chaque domaine.
-        2. Recalcule les poids (`count`) et marque les cycles (`cycle`) pour tous les votes valides
-           via le recalcul par domaine dans GDS.
-        """
-        VoteRepository.clean_duplicate_domain_votes()
-
-        VoteRepository.recalculate_counts_by_domain()
-    
     @staticmethod
     def validate_vote(vote_id: str) -> bool:
         """
@@ -75,10 +195,23 @@ class VoteValidationService:
 
         return True
         
+    @staticmethod
+    def validate_votes_batch(vote_ids: list[str]) -> list[str]:
+        """
+        Valide une liste de votes en une passe par domaine, dans l'ordre donné.
+
+        :param vote_ids: les IDs (elementId) des relations VOTED à valider
+        :return: les IDs des votes invalidés (à marquer via mark_votes_invalid)
+        """
+        return VoteRepository.validate_votes_batch(vote_ids)
+
     @staticmethod
     def finalize_daily_stats():
         """
         Finalise les statistiques journalières en mettant à jour la date
-        du dernier calcul et en ajoutant les statistiques journalières
+        du dernier calcul et en ajoutant les statistiques journalières,
+        puis matérialise les classements par domaine
         """
-        VoteRepository.append_daily_stats(datetime.date.today())
\ No newline at end of file
+        today = datetime.date.today()
+        VoteRepository.append_daily_stats(today)
+        VoteRepository.build_leaderboards(today)
\ No newline at end of file
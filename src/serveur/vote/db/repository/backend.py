@@ -0,0 +1,13 @@
+import os
+
+# Implémentation de VoteRepository utilisée par les services :
+# "neo4j" (base configurée) ou "memory" (données du processus, non persistées,
+# pour les tests et les benchmarks)
+VOTE_REPOSITORY_BACKEND = os.getenv("VOTE_REPOSITORY_BACKEND", "neo4j")
+
+if VOTE_REPOSITORY_BACKEND == "memory":
+    from db.repository.memory_vote_repository import InMemoryVoteRepository as VoteRepository
+elif VOTE_REPOSITORY_BACKEND == "neo4j":
+    from db.repository.vote_repository import VoteRepository
+else:
+    raise ValueError(f"Backend de VoteRepository inconnu : {VOTE_REPOSITORY_BACKEND}")
@@ -0,0 +1,815 @@
+import datetime
+import json
+import threading
+import time
+from array import array
+from typing import Iterable, List
+
+from core.rules.delegation_graph import DelegationGraph
+from core.rules.vote_validation import DomainVoteValidator
+from db.repository.run_repository import RunRepository
+from db.repository.vote_repository import (
+    LEADERBOARD_SIZE,
+    LEADERBOARD_WINDOWS,
+    RECALCULATION_MODE,
+    RECALCULATION_MODES,
+    VoteRepository,
+)
+
+
+class _MemoryStore:
+    """
+    Graphe des votes et statistiques d'un processus.
+
+    Les relations VOTED sont numérotées (index = identifiant interne, rendu
+    en chaîne comme un elementId) et stockées en colonnes. Les relations
+    courantes sont indexées par domaine et par nœud (sortantes / entrantes),
+    toutes les relations et les relations non traitées par (votant, domaine).
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+
+        # Utilisateurs : id métier <-> index
+        self.user_index: dict[str, int] = {}
+        self.user_ids: list[str] = []
+        self.thresholds: dict[int, int | None] = {}
+        self.publish_votes: list[bool | None] = []
+        self.dirty: dict[int, set[str]] = {}
+
+        # Relations VOTED
+        self.sources = array("l")
+        self.targets = array("l")
+        self.domains: list[str] = []
+        self.vote_ids: list[str | None] = []
+        self.created_at: list[datetime.datetime | None] = []
+        self.processed = bytearray()
+        self.valid: list[bool | None] = []
+        self.current = bytearray()
+        self.counts: list[int | None] = []
+        self.cycles: list[bool | None] = []
+        self.deleted = bytearray()
+
+        # Entrantes en dict (ordonné) : retrait en O(1) pour les cibles populaires
+        self.out_edges: dict[str, dict[int, list[int]]] = {}
+        self.in_edges: dict[str, dict[int, dict[int, None]]] = {}
+        # Somme des counts entrants hors cycle des relations courantes, par domaine et par nœud
+        self.incoming: dict[str, dict[int, int]] = {}
+        self.by_voter: dict[tuple[int, str], list[int]] = {}
+        self.pending: dict[tuple[int, str], list[int]] = {}
+
+        # Statistiques : date -> userId -> domain -> count ; userId -> (month, domain) -> count
+        self.daily: dict[str, dict[str, dict[str, int | None]]] = {}
+        self.monthly: dict[str, dict[tuple[str, str], int]] = {}
+        self.stats_meta: dict = {}
+        self.leaderboards: dict[tuple[str, int], str] = {}
+        self.last_full_run: datetime.datetime | None = None
+
+    # -------------------- UTILISATEURS --------------------
+
+    def user(self, user_id: str, create: bool = False) -> int | None:
+        node = self.user_index.get(user_id)
+        if node is None and create:
+            # Valeurs posées par le MERGE ... ON CREATE de save_vote
+            node = self.add_user(user_id, 100, False)
+        return node
+
+    def add_user(self, user_id: str, threshold: int | None, publish_votes: bool | None) -> int:
+        node = len(self.user_ids)
+        self.user_index[user_id] = node
+        self.user_ids.append(user_id)
+        self.thresholds[node] = threshold
+        self.publish_votes.append(publish_votes)
+        return node
+
+    def mark_dirty(self, node: int, domain: str) -> None:
+        self.dirty.setdefault(node, set()).add(domain)
+
+    # -------------------- RELATIONS --------------------
+
+    def add_relation(self, voter: int, target: int, domain: str, vote_id: str | None,
+                     created_at: datetime.datetime | None, processed: bool = False,
+                     valid: bool | None = None, current: bool = False,
+                     count: int | None = None, cycle: bool | None = None) -> int:
+        rel = len(self.domains)
+        self.sources.append(voter)
+        self.targets.append(target)
+        self.domains.append(domain)
+        self.vote_ids.append(vote_id)
+        self.created_at.append(created_at)
+        self.processed.append(processed)
+        self.valid.append(valid)
+        self.current.append(False)
+        self.counts.append(count)
+        self.cycles.append(cycle)
+        self.deleted.append(False)
+
+        self.by_voter.setdefault((voter, domain), []).append(rel)
+        if not processed:
+            self.pending.setdefault((voter, domain), []).append(rel)
+        if current:
+            self.set_current(rel, True)
+        return rel
+
+    def relation(self, rel_id: str) -> int | None:
+        # Comme MATCH ... WHERE elementId(v) = $id : rien si la relation n'existe plus
+        try:
+            rel = int(rel_id)
+        except (TypeError, ValueError):
+            return None
+        if 0 <= rel < len(self.domains) and not self.deleted[rel]:
+            return rel
+        return None
+
+    def set_current(self, rel: int, current: bool) -> None:
+        if bool(self.current[rel]) == current:
+            return
+        self.current[rel] = current
+        domain = self.domains[rel]
+        target = self.targets[rel]
+        out_edges = self.out_edges.setdefault(domain, {})
+        in_edges = self.in_edges.setdefault(domain, {})
+        incoming = self.incoming.setdefault(domain, {})
+        if current:
+            out_edges.setdefault(self.sources[rel], []).append(rel)
+            in_edges.setdefault(target, {})[rel] = None
+            incoming[target] = incoming.get(target, 0) + self.contribution(rel)
+        else:
+            out_edges[self.sources[rel]].remove(rel)
+            del in_edges[target][rel]
+            incoming[target] -= self.contribution(rel)
+
+    def contribution(self, rel: int) -> int:
+        # Comme en Cypher, seules les relations avec cycle = false comptent dans les sommes entrantes
+        return (self.counts[rel] or 0) if self.cycles[rel] is False else 0
+
+    def set_weight(self, rel: int, count: int | None, cycle: bool | None) -> None:
+        if not self.current[rel]:
+            self.counts[rel], self.cycles[rel] = count, cycle
+            return
+        incoming = self.incoming[self.domains[rel]]
+        target = self.targets[rel]
+        incoming[target] -= self.contribution(rel)
+        self.counts[rel], self.cycles[rel] = count, cycle
+        incoming[target] += self.contribution(rel)
+
+    def rebuild_incoming(self, domain: str) -> None:
+        self.incoming[domain] = {
+            node: sum(self.contribution(rel) for rel in rels)
+            for node, rels in self.in_edges.get(domain, {}).items()
+        }
+
+    def set_processed(self, rel: int, valid: bool) -> None:
+        if not self.processed[rel]:
+            self.processed[rel] = True
+            self.pending[(self.sources[rel], self.domains[rel])].remove(rel)
+        self.valid[rel] = valid
+
+    def delete(self, rel: int) -> None:
+        self.set_current(rel, False)
+        if not self.processed[rel]:
+            self.pending[(self.sources[rel], self.domains[rel])].remove(rel)
+        self.by_voter[(self.sources[rel], self.domains[rel])].remove(rel)
+        self.deleted[rel] = True
+
+    def current_relations(self, domain: str) -> list[int]:
+        return [rel for rels in self.out_edges.get(domain, {}).values() for rel in rels]
+
+    def validator(self, domain: str) -> "_StoreValidator":
+        return _StoreValidator(self, domain)
+
+    # -------------------- STATISTIQUES --------------------
+
+    def last_date(self) -> datetime.date:
+        try:
+            return datetime.date.fromisoformat(self.stats_meta["lastDate"])
+        except (KeyError, TypeError, ValueError):
+            return datetime.date.today()
+
+
+class _StoreValidator(DomainVoteValidator):
+    """
+    Vue de DomainVoteValidator sur les relations courantes d'un domaine du
+    stockage, sans copie. Seule check_vote est utilisée : les écritures
+    passent par le stockage, qui tient à jour les sommes entrantes.
+    """
+
+    def __init__(self, store: _MemoryStore, domain: str):
+        super().__init__(store.thresholds)
+        self.sources, self.targets = store.sources, store.targets
+        self.counts, self.cycles = store.counts, store.cycles
+        self.out_edges = store.out_edges.setdefault(domain, {})
+        self.in_edges = store.in_edges.setdefault(domain, {})
+        self.incoming_sums = store.incoming.setdefault(domain, {})
+
+    def incoming(self, node) -> int:
+        return self.incoming_sums.get(node, 0)
+
+
+_store = _MemoryStore()
+
+
+def _parse_datetime(value) -> datetime.datetime:
+    # datetime() Cypher : une date sans fuseau est en UTC
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value
+
+
+class InMemoryVoteRepository:
+    """
+    Implémentation en mémoire de VoteRepository (mêmes méthodes statiques,
+    mêmes résultats), sans Neo4j : sert de double de test, de référence pour
+    vérifier les résultats de Neo4j et de backend des benchmarks.
+
+    Choisie par VOTE_REPOSITORY_BACKEND=memory (cf. db.repository.backend).
+    Les données vivent dans le processus courant et ne sont pas persistées.
+
+    Les poids sont toujours recalculés sur tout le domaine (DelegationGraph),
+    quel que soit le mode : le résultat est celui des trois modes Neo4j.
+    L'index de chaîne (chainDepth / chainRoot), qui n'accélère que les
+    requêtes Cypher, n'est pas maintenu.
+    """
+
+    # -------------------- GESTION DU STOCKAGE --------------------
+
+    @staticmethod
+    def reset() -> None:
+        """
+        Vide le stockage (entre deux tests).
+        """
+        global _store
+        _store = _MemoryStore()
+
+    @staticmethod
+    def load(users: Iterable[dict], votes: Iterable[dict]) -> None:
+        """
+        Chargement direct, sans les règles de save_vote (benchmarks, tests) :
+          users : {id, threshold, publishVotes}
+          votes : {id, voterId, targetUserId, domain, createdAt,
+                   processed, valid?, current?, count?, cycle?}
+        """
+        store = _store
+        parsed: dict[str, datetime.datetime] = {}
+        with store.lock:
+            for user in users:
+                if user["id"] not in store.user_index:
+                    store.add_user(user["id"], user.get("threshold"), user.get("publishVotes"))
+            for vote in votes:
+                store.add_relation(
+                    store.user(vote["voterId"], create=True),
+                    store.user(vote["targetUserId"], create=True),
+                    vote["domain"],
+                    vote.get("id"),
+                    parsed.get(vote["createdAt"]) or parsed.setdefault(
+                        vote["createdAt"], _parse_datetime(vote["createdAt"])
+                    ),
+                    processed=bool(vote.get("processed")),
+                    valid=vote.get("valid"),
+                    current=vote.get("current") is True,
+                    count=vote.get("count"),
+                    cycle=vote.get("cycle"),
+                )
+
+    @staticmethod
+    def relations() -> list[dict]:
+        """
+        Relations VOTED existantes, pour comparaison avec Neo4j :
+        {relId, id, voterId, targetUserId, domain, processed, valid, current, count, cycle}
+        """
+        store = _store
+        with store.lock:
+            return [
+                {
+                    "relId": str(rel),
+                    "id": store.vote_ids[rel],
+                    "voterId": store.user_ids[store.sources[rel]],
+                    "targetUserId": store.user_ids[store.targets[rel]],
+                    "domain": store.domains[rel],
+                    "processed": bool(store.processed[rel]),
+                    "valid": store.valid[rel],
+                    "current": bool(store.current[rel]),
+                    "count": store.counts[rel],
+                    "cycle": store.cycles[rel],
+                }
+                for rel in range(len(store.domains))
+                if not store.deleted[rel]
+            ]
+
+    # -------------------- ENREGISTREMENT DES VOTES --------------------
+
+    @staticmethod
+    def save_vote(vote: dict) -> None:
+        store = _store
+        with store.lock:
+            voter = store.user(str(vote["voterId"]))
+            target_id = str(vote["targetUserId"])
+
+            # Autres votes non traités du votant dans le domaine
+            if voter is not None:
+                for rel in list(store.pending.get((voter, vote["domain"]), ())):
+                    if store.user_ids[store.targets[rel]] != target_id:
+                        store.delete(rel)
+
+            voter = store.user(str(vote["voterId"]), create=True)
+            target = store.user(target_id, create=True)
+
+            # MERGE sur (votant, cible, domaine, processed = false)
+            for rel in store.pending.get((voter, vote["domain"]), ()):
+                if store.targets[rel] == target:
+                    return
+            store.add_relation(voter, target, vote["domain"], str(vote["id"]), _parse_datetime(vote["createdAt"]))
+
+    @staticmethod
+    def save_votes(votes: list[dict], batch_size: int | None = None) -> None:
+        for vote in votes:
+            InMemoryVoteRepository.save_vote(vote)
+
+    @staticmethod
+    def delete_vote_for_voter_and_domain(voter_id: str, domain: str) -> bool:
+        store = _store
+        with store.lock:
+            voter = store.user(voter_id)
+            if voter is None:
+                return False
+
+            deleted_count = 0
+            for rel in list(store.pending.get((voter, domain), ())):
+                if store.targets[rel] != voter:
+                    store.delete(rel)
+                    deleted_count += 1
+
+            store.mark_dirty(voter, domain)
+
+            # Relations du votant dans le domaine (courantes ou non)
+            rels = store.by_voter.get((voter, domain), [])
+            if not any(store.targets[rel] == voter for rel in rels):
+                rel_count = sum(store.valid[rel] is True for rel in rels)
+                # Self-loop non traitée : le votant n'a plus de délégué
+                store.add_relation(
+                    voter, voter, domain, None, datetime.datetime.now(datetime.timezone.utc)
+                )
+                return not (rel_count == 0 and deleted_count == 0)
+
+            return deleted_count > 0
+
+    @staticmethod
+    def find_votes_by_voter_with_stats(voter_id: str, domain: str | None = None) -> dict:
+        store = _store
+        with store.lock:
+            voter = store.user(str(voter_id))
+            last_date = store.stats_meta.get("lastDate")
+
+            rels = []
+            if voter is not None:
+                for vote_domain, out_edges in store.out_edges.items():
+                    if domain is None or vote_domain == domain:
+                        rels.extend(out_edges.get(voter, ()))
+            rels.sort(key=lambda rel: store.created_at[rel], reverse=True)
+
+            return {
+                "publishVotes": voter is not None and store.publish_votes[voter] is True,
+                "lastCounts": dict(store.daily.get(last_date, {}).get(str(voter_id), {})),
+                "votes": [
+                    {
+                        "id": rel,
+                        "voterId": str(voter_id),
+                        "targetUserId": store.user_ids[store.targets[rel]],
+                        "domain": store.domains[rel],
+                        "createdAt": store.created_at[rel],
+                    }
+                    for rel in rels
+                ],
+            }
+
+    @staticmethod
+    def get_received_votes_with_stats(user_id: str, domain: str | None = None) -> dict:
+        store = _store
+        with store.lock:
+            target = store.user(str(user_id))
+            last_date = store.stats_meta.get("lastDate")
+
+            users_by_domain: dict[str, list[str]] = {}
+            if target is not None:
+                for vote_domain, in_edges in store.in_edges.items():
+                    if domain is not None and vote_domain != domain:
+                        continue
+                    voters = dict.fromkeys(store.user_ids[store.sources[rel]] for rel in in_edges.get(target, ()))
+                    if voters:
+                        users_by_domain[vote_domain] = list(voters)
+
+            return {
+                "userId": str(user_id),
+                "publishVotes": target is not None and store.publish_votes[target] is True,
+                "lastCounts": dict(store.daily.get(last_date, {}).get(str(user_id), {})),
+                "usersByDomain": users_by_domain,
+            }
+
+    # -------------------- VALIDATION DES VOTES --------------------
+
+    @staticmethod
+    def fetch_unprocessed_votes() -> list[str]:
+        store = _store
+        with store.lock:
+            return [str(rel) for rel in sorted(rel for rels in store.pending.values() for rel in rels)]
+
+    @staticmethod
+    def mark_vote_valid(rel_id: str):
+        store = _store
+        with store.lock:
+            rel = store.relation(rel_id)
+            if rel is None:
+                return
+            store.set_processed(rel, True)
+            store.set_current(rel, True)
+            store.mark_dirty(store.sources[rel], store.domains[rel])
+            store.mark_dirty(store.targets[rel], store.domains[rel])
+
+    @staticmethod
+    def mark_votes_invalid(rel_ids: list[str]):
+        store = _store
+        with store.lock:
+            for rel_id in rel_ids:
+                rel = store.relation(rel_id)
+                if rel is not None:
+                    store.set_processed(rel, False)
+
+    @staticmethod
+    def record_validation_draw(run_id: str, rejected: list[str], validated: list[str]):
+        # Votes en mémoire : perdus avec le processus, la reprise n'a pas à
+        # être atomique avec le journal
+        InMemoryVoteRepository.mark_votes_invalid(rejected)
+        RunRepository.finish_step(run_id, "validate_setup", vote_ids=validated)
+
+    @staticmethod
+    def clean_duplicate_domain_votes():
+        store = _store
+        with store.lock:
+            # 1. Seul le vote non traité le plus récent par (votant, domaine) est conservé
+            for rels in list(store.pending.values()):
+                if len(rels) > 1:
+                    keep = max(rels, key=lambda rel: store.created_at[rel])
+                    for rel in list(rels):
+                        if rel != keep:
+                            store.delete(rel)
+
+            # 2. Désactive le vote courant vers la même cible qu'un nouveau vote
+            for (voter, domain), rels in list(store.pending.items()):
+                for rel in rels:
+                    target = store.targets[rel]
+                    for current in list(store.out_edges.get(domain, {}).get(voter, ())):
+                        if store.targets[current] == target:
+                            store.set_current(current, False)
+                            store.mark_dirty(voter, domain)
+                            store.mark_dirty(target, domain)
+
+            # 3. Les self-loops non traitées sont validées
+            for (voter, domain), rels in list(store.pending.items()):
+                for rel in list(rels):
+                    if store.targets[rel] == voter:
+                        store.set_processed(rel, True)
+                        store.set_current(rel, True)
+                        store.mark_dirty(voter, domain)
+
+    @staticmethod
+    def recalculate_counts_by_domain(
+        mode: str | None = None, workers: int | None = None, run_id: str | None = None
+    ) -> list[dict]:
+        """
+        Recalcul complet des poids, domaine par domaine (les plus gros en
+        premier). `workers` et `run_id` sont sans effet en mémoire.
+        """
+        mode = mode or RECALCULATION_MODE
+        if mode not in RECALCULATION_MODES:
+            raise ValueError(f"Mode de recalcul inconnu : {mode}")
+
+        store = _store
+        with store.lock:
+            relations = {domain: store.current_relations(domain) for domain in store.out_edges}
+            for domain, rels in relations.items():
+                for rel in rels:
+                    store.counts[rel] = None
+                    store.cycles[rel] = False
+                store.incoming[domain] = {}
+            store.dirty.clear()
+
+            reports = []
+            for domain, rels in sorted(relations.items(), key=lambda item: len(item[1]), reverse=True):
+                if not rels:
+                    continue
+                started = time.perf_counter()
+                graph = DelegationGraph.from_edges((store.sources[rel], store.targets[rel]) for rel in rels)
+                counts, cycles = graph.compute_weights()
+                for rel, count, cycle in zip(rels, counts, cycles):
+                    store.counts[rel] = count
+                    store.cycles[rel] = cycle
+                store.rebuild_incoming(domain)
+                reports.append({"domain": domain, "seconds": time.perf_counter() - started, "error": None})
+
+            store.last_full_run = datetime.datetime.now(datetime.timezone.utc)
+            return reports
+
+    @staticmethod
+    def check_vote_validity(rel_id: str) -> tuple[int, list[str], bool]:
+        store = _store
+        with store.lock:
+            rel = store.relation(rel_id)
+            validator = store.validator(store.domains[rel])
+            count, rels, cycle = validator.check_vote(store.sources[rel], store.targets[rel])
+            return count, None if rels is None else [str(path_rel) for path_rel in rels], cycle
+
+    @staticmethod
+    def update_counts(rel_id: str, count: int, rel_ids: list[str], cycle: bool):
+        store = _store
+        with store.lock:
+            rel = store.relation(rel_id)
+            if rel is not None:
+                store.set_weight(rel, count, cycle)
+
+            for path_id in rel_ids:
+                path_rel = store.relation(path_id)
+                if path_rel is None:
+                    continue
+                if cycle:
+                    store.set_weight(path_rel, count, True)
+                elif store.counts[path_rel] is not None:
+                    # En Cypher, null + count reste null
+                    store.set_weight(path_rel, store.counts[path_rel] + count, store.cycles[path_rel])
+
+    @staticmethod
+    def validate_votes_batch(rel_ids: list[str]) -> list[str]:
+        """
+        Même enchaînement que check_vote_validity -> mark_vote_valid ->
+        update_counts pour chaque vote, dans l'ordre donné ; les votes
+        invalides ne sont pas marqués, leurs identifiants sont retournés.
+        """
+        rejected: list[str] = []
+        with _store.lock:
+            for rel_id in rel_ids:
+                count, rels, cycle = InMemoryVoteRepository.check_vote_validity(rel_id)
+                if count == -1:
+                    rejected.append(rel_id)
+                    continue
+                InMemoryVoteRepository.mark_vote_valid(rel_id)
+                InMemoryVoteRepository.update_counts(rel_id, count, rels, cycle)
+        return rejected
+
+    # -------------------- STATISTIQUES QUOTIDIENNES --------------------
+
+    @staticmethod
+    def append_daily_stats(date: datetime.date | None = None) -> int:
+        if date is None:
+            date = datetime.date.today()
+        date_str = date.isoformat()
+        month = date_str[:7]
+
+        store = _store
+        with store.lock:
+            monthly_ready = store.stats_meta.get("monthlyReady") is True
+
+            # Retire du cumul mensuel l'instantané remplacé (relance pour la même date)
+            replaced = store.daily.pop(date_str, {})
+            if monthly_ready:
+                for user_id, counts in replaced.items():
+                    user_months = store.monthly.get(user_id, {})
+                    for domain, count in counts.items():
+                        if (month, domain) in user_months:
+                            user_months[(month, domain)] -= count or 0
+
+            # Relation cyclique entrante : sa valeur ; sinon somme des entrantes
+            snapshot: dict[str, dict[str, int | None]] = {}
+            for domain, in_edges in store.in_edges.items():
+                for node, rels in in_edges.items():
+                    if not rels:
+                        continue
+                    cyclic = [rel for rel in rels if store.cycles[rel] is True]
+                    snapshot.setdefault(store.user_ids[node], {})[domain] = (
+                        store.counts[cyclic[0]] if cyclic else sum(store.counts[rel] or 0 for rel in rels)
+                    )
+            store.daily[date_str] = snapshot
+            store.stats_meta["lastDate"] = date_str
+            store.stats_meta["domains"] = list(
+                dict.fromkeys(domain for counts in snapshot.values() for domain in counts)
+            )
+
+            if monthly_ready:
+                for user_id, counts in snapshot.items():
+                    user_months = store.monthly.setdefault(user_id, {})
+                    for domain, count in counts.items():
+                        user_months[(month, domain)] = user_months.get((month, domain), 0) + (count or 0)
+
+                # Cumuls vidés par la relance : plus aucun instantané dans le mois
+                for user_id in replaced:
+                    user_months = store.monthly.get(user_id, {})
+                    for key in [key for key, count in user_months.items() if key[0] == month and count == 0]:
+                        if not any(
+                            key[1] in stats.get(user_id, {})
+                            for day, stats in store.daily.items() if day.startswith(month)
+                        ):
+                            del user_months[key]
+
+            updated = len(snapshot)
+
+        if not monthly_ready:
+            InMemoryVoteRepository.rebuild_monthly_stats()
+        return updated
+
+    @staticmethod
+    def rebuild_monthly_stats(batch_size: int = 500) -> int:
+        store = _store
+        with store.lock:
+            monthly: dict[str, dict[tuple[str, str], int]] = {}
+            for day, stats in store.daily.items():
+                for user_id, counts in stats.items():
+                    user_months = monthly.setdefault(user_id, {})
+                    for domain, count in counts.items():
+                        user_months[(day[:7], domain)] = user_months.get((day[:7], domain), 0) + (count or 0)
+            store.monthly = monthly
+            store.stats_meta["monthlyReady"] = True
+            return sum(len(user_months) for user_months in monthly.values())
+
+    @staticmethod
+    def migrate_json_stats(batch_size: int = 500, keep_json: bool = False) -> int:
+        # Pas d'ancien format JSON en mémoire
+        return 0
+
+    @staticmethod
+    def get_daily_votes_to_user(user_id: str, days: int = 30) -> tuple[list[dict], bool]:
+        store = _store
+        with store.lock:
+            last_date = store.last_date()
+            cutoff = (last_date - datetime.timedelta(days=days - 1)).isoformat()
+            node = store.user(user_id)
+            publish_votes = store.publish_votes[node] if node is not None else False
+
+            domain_series: dict[str, list[dict]] = {}
+            for day, stats in store.daily.items():
+                if cutoff <= day <= last_date.isoformat():
+                    for domain, count in stats.get(user_id, {}).items():
+                        domain_series.setdefault(domain, []).append({"date": day, "count": int(count or 0)})
+
+        result = []
+        for domain, series in domain_series.items():
+            series.sort(key=lambda e: e["date"], reverse=True)
+            result.append({"domain": domain, "series": series})
+        result.sort(key=lambda entry: sum(item["count"] for item in entry["series"]), reverse=True)
+        return result, publish_votes
+
+    @staticmethod
+    def get_monthly_votes_to_user(user_id: str, months: int = 12) -> List[dict]:
+        store = _store
+        with store.lock:
+            last_date = store.last_date().isoformat()
+            if store.stats_meta.get("monthlyReady") is True:
+                totals = {
+                    key: count
+                    for key, count in store.monthly.get(user_id, {}).items()
+                    if key[0] <= last_date[:7]
+                }
+            else:
+                # Avant la première reconstruction : agrégation des instantanés
+                totals = {}
+                for day, stats in store.daily.items():
+                    if day <= last_date:
+                        for domain, count in stats.get(user_id, {}).items():
+                            totals[(day[:7], domain)] = totals.get((day[:7], domain), 0) + (count or 0)
+
+        monthly_per_domain: dict[str, list[dict]] = {}
+        for (month, domain), count in totals.items():
+            monthly_per_domain.setdefault(domain, []).append(
+                {"year": int(month[:4]), "month": int(month[5:7]), "count": count}
+            )
+
+        result = []
+        for domain, series in monthly_per_domain.items():
+            series.sort(key=lambda e: (e["year"], e["month"]), reverse=True)
+            result.append({"domain": domain, "series": series[:months]})
+        result.sort(key=lambda entry: sum(item["count"] for item in entry["series"]), reverse=True)
+        return result
+
+    @staticmethod
+    def _chart_entries(domain: str | None, cutoff: str, date: str) -> list[dict]:
+        # Instantanés de la période avec un count positif ({domain, userId, date, count})
+        return [
+            {"domain": stat_domain, "userId": user_id, "date": day, "count": count}
+            for day, stats in _store.daily.items() if cutoff <= day <= date
+            for user_id, counts in stats.items()
+            for stat_domain, count in counts.items()
+            if (domain is None or stat_domain == domain) and count is not None and count > 0
+        ]
+
+    @staticmethod
+    def get_chart_for_domain(domain: str, days: int = 30) -> List[dict]:
+        store = _store
+        with store.lock:
+            last_date = store.last_date()
+            cutoff = last_date - datetime.timedelta(days=days - 1)
+            entries = InMemoryVoteRepository._chart_entries(domain, cutoff.isoformat(), last_date.isoformat())
+        return VoteRepository._rank_chart_entries(entries, LEADERBOARD_SIZE)
+
+    @staticmethod
+    def build_leaderboards(date: datetime.date | None = None) -> int:
+        if date is None:
+            date = datetime.date.today()
+        cutoff = date - datetime.timedelta(days=max(LEADERBOARD_WINDOWS) - 1)
+
+        store = _store
+        with store.lock:
+            entries_by_domain: dict[str, list[dict]] = {}
+            for entry in InMemoryVoteRepository._chart_entries(None, cutoff.isoformat(), date.isoformat()):
+                entries_by_domain.setdefault(entry["domain"], []).append(entry)
+
+            leaderboards = {}
+            for days in LEADERBOARD_WINDOWS:
+                window_start = (date - datetime.timedelta(days=days - 1)).isoformat()
+                for domain, entries in entries_by_domain.items():
+                    top = VoteRepository._rank_chart_entries(
+                        (entry for entry in entries if entry["date"] >= window_start), LEADERBOARD_SIZE
+                    )
+                    leaderboards[(domain, days)] = json.dumps(top)
+
+            # Seul le dernier classement est conservé
+            store.leaderboards = leaderboards
+            store.stats_meta["leaderboardDate"] = date.isoformat()
+            return len(leaderboards)
+
+    @staticmethod
+    def get_leaderboards(days: int) -> dict[str, List[dict]] | None:
+        if days not in LEADERBOARD_WINDOWS:
+            return None
+
+        store = _store
+        with store.lock:
+            meta = store.stats_meta
+            if "lastDate" not in meta or meta.get("leaderboardDate") != meta["lastDate"]:
+                return None
+            return {
+                domain: json.loads(users)
+                for (domain, board_days), users in store.leaderboards.items()
+                if board_days == days
+            }
+
+    @staticmethod
+    def get_all_domains() -> List:
+        store = _store
+        with store.lock:
+            if store.stats_meta.get("domains") is not None:
+                return list(store.stats_meta["domains"])
+            return [domain for domain in store.out_edges if store.current_relations(domain)]
+
+    @staticmethod
+    def get_last_update() -> str:
+        return _store.stats_meta.get("lastDate") or datetime.date.today().isoformat()
+
+    @staticmethod
+    def get_stats_version(user_id: str | None = None) -> tuple[str, bool, List | None]:
+        store = _store
+        with store.lock:
+            node = store.user(user_id) if user_id is not None else None
+            domains = store.stats_meta.get("domains")
+            return (
+                store.stats_meta.get("lastDate") or datetime.date.today().isoformat(),
+                node is not None and store.publish_votes[node] is True,
+                list(domains) if domains is not None else None,
+            )
+
+    # -------------------- LECTURES ASYNC (vues ASGI) --------------------
+    # Pas d'entrée/sortie : les variantes async appellent les lectures sync
+
+    @staticmethod
+    async def afind_votes_by_voter_with_stats(voter_id: str, domain: str | None = None) -> dict:
+        return InMemoryVoteRepository.find_votes_by_voter_with_stats(voter_id, domain)
+
+    @staticmethod
+    async def aget_received_votes_with_stats(user_id: str, domain: str | None = None) -> dict:
+        return InMemoryVoteRepository.get_received_votes_with_stats(user_id, domain)
+
+    @staticmethod
+    async def aget_daily_votes_to_user(user_id: str, days: int = 30) -> tuple[list[dict], bool]:
+        return InMemoryVoteRepository.get_daily_votes_to_user(user_id, days)
+
+    @staticmethod
+    async def aget_monthly_votes_to_user(user_id: str, months: int = 12) -> List[dict]:
+        return InMemoryVoteRepository.get_monthly_votes_to_user(user_id, months)
+
+    @staticmethod
+    async def aget_chart_for_domain(domain: str, days: int = 30) -> List[dict]:
+        return InMemoryVoteRepository.get_chart_for_domain(domain, days)
+
+    @staticmethod
+    async def aget_leaderboards(days: int) -> dict[str, List[dict]] | None:
+        return InMemoryVoteRepository.get_leaderboards(days)
+
+    @staticmethod
+    async def aget_all_domains() -> List:
+        return InMemoryVoteRepository.get_all_domains()
+
+    @staticmethod
+    async def aget_last_update() -> str:
+        return InMemoryVoteRepository.get_last_update()
+
+    @staticmethod
+    async def aget_stats_version(user_id: str | None = None) -> tuple[str, bool, List | None]:
+        return InMemoryVoteRepository.get_stats_version(user_id)
@@ -1,4 +1,4 @@
-from app.neo4j_config import get_driver
+from app.neo4j_config import execute_read, execute_write
 
 
 class PublicationRepository:
@@ -25,13 +25,10 @@ class PublicationRepository:
             dict avec userId et publishVotes
             Si l'utilisateur n'existe pas, retourne publishVotes=True et threshold=-1 par défaut
         """
-        driver = get_driver()
-        with driver.session() as session:
-            result = session.execute_read(
-                PublicationRepository._get_publication_setting_tx,
-                user_id
-            )
-            return result
+        return execute_read(
+            PublicationRepository._get_publication_setting_tx,
+            user_id
+        )
 
     @staticmethod
     def _get_publication_setting_tx(tx, user_id: str) -> dict:
@@ -74,15 +71,12 @@ class PublicationRepository:
         Returns:
             dict avec publishVotes et threshold mis à jour
         """
-        driver = get_driver()
-        with driver.session() as session:
-            result = session.execute_write(
-                PublicationRepository._update_publication_setting_tx,
-                user_id,
-                publish_votes,
-                threshold
-            )
-            return result
+        return execute_write(
+            PublicationRepository._update_publication_setting_tx,
+            user_id,
+            publish_votes,
+            threshold
+        )
 
     @staticmethod
     def _update_publication_setting_tx(tx, user_id: str, publish_votes: bool, threshold: int) -> dict:
@@ -1,7 +1,11 @@
-from app.neo4j_config import get_driver
-from datetime import datetime
+import os
+from app.neo4j_config import aexecute_read, execute_read, execute_write
+from datetime import date, datetime, timedelta
 from typing import Optional, List
 
+# Nombre de jours d'instantanés de résultats conservés (0 = tous)
+RESULTS_RETENTION_DAYS = int(os.getenv("VOTE_RESULTS_RETENTION_DAYS", "365"))
+
 
 class ResultRepository:
     """
@@ -9,6 +13,12 @@ class ResultRepository:
     
     Récupère le classement des utilisateurs par nombre de votes reçus,
     avec filtrage optionnel par domaine et date.
+
+    Les résultats sont matérialisés chaque nuit (les counts ne changent qu'au cron) :
+      (:ResultEntry {date, userId, domain, count, domainTotal, rank, globalRank,
+                     elected, electedAt})
+      (:ResultMeta {id: 'results', date, dates}) : date du dernier instantané et
+      dates (triées) des instantanés conservés, sur RESULTS_RETENTION_DAYS jours
     """
 
     @staticmethod
@@ -27,16 +37,24 @@ class ResultRepository:
             
         Returns:
             Liste de dict contenant userId, domain, count, elected, electedAt
+
+        Sans `since`, les résultats sont lus dans le dernier instantané s'il existe.
         """
-        driver = get_driver()
-        with driver.session() as session:
-            results = session.execute_read(
-                ResultRepository._get_vote_results_tx,
+        if since is None:
+            results = execute_read(
+                ResultRepository._get_materialized_results_tx,
                 domain,
-                top,
-                since
+                top
             )
-            return results
+            if results is not None:
+                return results
+
+        return execute_read(
+            ResultRepository._get_vote_results_tx,
+            domain,
+            top,
+            since
+        )
 
     @staticmethod
     def _get_vote_results_tx(
@@ -53,7 +71,16 @@ class ResultRepository:
         1. Calcul des totaux par domaine (sur TOUS les votes)
         2. Récupération des top N candidats avec leur domainTotal
         """
-        
+        query_totals, query_results, params = ResultRepository._vote_results_queries(domain, top, since)
+        domain_totals = {record["domain"]: record["domainTotal"] for record in tx.run(query_totals, **params)}
+        return ResultRepository._vote_results_from_records(tx.run(query_results, **params), domain_totals)
+
+    @staticmethod
+    def _vote_results_queries(
+        domain: Optional[str],
+        top: int,
+        since: Optional[datetime]
+    ) -> tuple[str, str, dict]:
         # Paramètres communs
         params = {"top": top}
         conditions = []
@@ -77,9 +104,6 @@ class ResultRepository:
             RETURN v.domain AS domain, sum(v.count) AS domainTotal
         """
         
-        result_totals = tx.run(query_totals, **params)
-        domain_totals = {record["domain"]: record["domainTotal"] for record in result_totals}
-        
         # ═══════════════════════════════════════════════════════════════
         # REQUÊTE 2 : Récupérer les top N candidats
         # ═══════════════════════════════════════════════════════════════
@@ -94,9 +118,10 @@ class ResultRepository:
             LIMIT $top
             RETURN userId, domain, userVotes AS count, firstVoteAt AS electedAt
         """
-        
-        result_users = tx.run(query_results, **params)
-        
+        return query_totals, query_results, params
+
+    @staticmethod
+    def _vote_results_from_records(result_users, domain_totals: dict) -> List[dict]:
         # Construire les résultats avec le domainTotal
         results = []
         for record in result_users:
@@ -109,4 +134,395 @@ class ResultRepository:
                 "electedAt": record["electedAt"]
             })
         
-        return results
\ No newline at end of file
+        return results
+
+    @staticmethod
+    def _get_materialized_results_tx(
+        tx,
+        domain: Optional[str],
+        top: int
+    ) -> Optional[List[dict]]:
+        """
+        Lecture du dernier instantané : seules les `top` premières entrées
+        (rang dans le domaine, ou rang global) sont lues.
+        Retourne None s'il n'y a pas encore d'instantané.
+        """
+        snapshot_date = ResultRepository._resolve_snapshot_date_tx(tx)
+        if snapshot_date is None:
+            return None
+
+        return ResultRepository._get_snapshot_entries_tx(tx, snapshot_date, domain, top)
+
+    @staticmethod
+    def get_vote_results_as_of(as_of: date, domain: Optional[str] = None, top: int = 100) -> List[dict]:
+        """
+        Résultats tels qu'ils étaient au `as_of` : lus dans le dernier
+        instantané conservé à cette date (liste vide s'il n'y en a pas).
+        Mêmes champs que get_vote_results.
+        """
+        return execute_read(
+            ResultRepository._get_vote_results_as_of_tx,
+            as_of.isoformat(),
+            domain,
+            top
+        )
+
+    @staticmethod
+    def _get_vote_results_as_of_tx(tx, as_of: str, domain: Optional[str], top: int) -> List[dict]:
+        snapshot_date = ResultRepository._resolve_snapshot_date_tx(tx, as_of)
+        if snapshot_date is None:
+            return []
+
+        return ResultRepository._get_snapshot_entries_tx(tx, snapshot_date, domain, top)
+
+    @staticmethod
+    def get_result_changes(
+        from_date: date,
+        to_date: date,
+        domain: Optional[str] = None,
+        top: int = 100
+    ) -> Optional[dict]:
+        """
+        Compare les `top` premières entrées de deux instantanés (les derniers
+        conservés à `from_date` et à `to_date`) :
+        {
+          "from": str, "to": str,            # dates des instantanés comparés
+          "changes": [ {userId, domain, fromCount, toCount, fromRank, toRank,
+                        fromElected, toElected} ]
+        }
+        Le rang est celui du domaine si `domain` est donné, le rang global sinon.
+        Seules les entrées dont le count, le rang ou l'élection change sont
+        retournées. Retourne None si l'une des dates précède tout instantané.
+        """
+        return execute_read(
+            ResultRepository._get_result_changes_tx,
+            from_date.isoformat(),
+            to_date.isoformat(),
+            domain,
+            top
+        )
+
+    @staticmethod
+    def _get_result_changes_tx(tx, from_str: str, to_str: str, domain: Optional[str], top: int) -> Optional[dict]:
+        from_snapshot = ResultRepository._resolve_snapshot_date_tx(tx, from_str)
+        to_snapshot = ResultRepository._resolve_snapshot_date_tx(tx, to_str)
+        if from_snapshot is None or to_snapshot is None:
+            return None
+
+        snapshots = {
+            snapshot: ResultRepository._entries_by_key(
+                ResultRepository._get_snapshot_entries_tx(tx, snapshot, domain, top)
+            )
+            for snapshot in (from_snapshot, to_snapshot)
+        }
+        before, after = snapshots[from_snapshot], snapshots[to_snapshot]
+
+        # Entrées sorties du top d'un côté : lues une par une dans l'autre instantané
+        keys = list(dict.fromkeys([*before, *after]))
+        for snapshot, entries in ((from_snapshot, before), (to_snapshot, after)):
+            missing = ResultRepository._missing_keys(keys, entries)
+            if missing:
+                entries.update(ResultRepository._entries_by_key(
+                    ResultRepository._get_snapshot_entries_by_key_tx(tx, snapshot, missing)
+                ))
+
+        return ResultRepository._result_changes(from_snapshot, to_snapshot, before, after, keys, domain)
+
+    @staticmethod
+    def _entries_by_key(entries: List[dict]) -> dict:
+        return {(entry["userId"], entry["domain"]): entry for entry in entries}
+
+    @staticmethod
+    def _missing_keys(keys: list, entries: dict) -> List[dict]:
+        return [{"userId": user_id, "domain": dom} for user_id, dom in keys if (user_id, dom) not in entries]
+
+    @staticmethod
+    def _result_changes(from_snapshot: str, to_snapshot: str, before: dict, after: dict,
+                        keys: list, domain: Optional[str]) -> dict:
+        rank_key = "rank" if domain else "globalRank"
+        changes = []
+        for key in keys:
+            old, new = before.get(key), after.get(key)
+            change = {
+                "userId": key[0],
+                "domain": key[1],
+                "fromCount": old["count"] if old else None,
+                "toCount": new["count"] if new else None,
+                "fromRank": old[rank_key] if old else None,
+                "toRank": new[rank_key] if new else None,
+                "fromElected": old["elected"] if old else None,
+                "toElected": new["elected"] if new else None,
+            }
+            if (
+                change["fromCount"] != change["toCount"]
+                or change["fromRank"] != change["toRank"]
+                or change["fromElected"] != change["toElected"]
+            ):
+                changes.append(change)
+
+        # Classement d'arrivée, puis entrées sorties du classement
+        changes.sort(key=lambda c: (c["toRank"] is None, c["toRank"] or 0, c["fromRank"] or 0))
+        return {"from": from_snapshot, "to": to_snapshot, "changes": changes}
+
+    @staticmethod
+    def _resolve_snapshot_date_tx(tx, as_of: Optional[str] = None) -> Optional[str]:
+        """
+        Date du dernier instantané conservé au `as_of` (YYYY-MM-DD),
+        ou du dernier instantané si `as_of` est None.
+        """
+        meta = tx.run(ResultRepository._RESULT_META_QUERY).single()
+        return ResultRepository._snapshot_date(meta, as_of)
+
+    _RESULT_META_QUERY = "MATCH (m:ResultMeta {id: 'results'}) RETURN m.date AS date, m.dates AS dates"
+
+    @staticmethod
+    def _snapshot_date(meta, as_of: Optional[str]) -> Optional[str]:
+        if meta is None or meta["date"] is None:
+            return None
+        if as_of is None:
+            return meta["date"]
+
+        dates = meta["dates"] or [meta["date"]]
+        candidates = [snapshot for snapshot in dates if snapshot <= as_of]
+        return max(candidates) if candidates else None
+
+    @staticmethod
+    def _get_snapshot_entries_tx(tx, snapshot_date: str, domain: Optional[str], top: int) -> List[dict]:
+        result_users = tx.run(
+            ResultRepository._snapshot_entries_query(domain),
+            date=snapshot_date,
+            domain=domain,
+            top=top
+        )
+        return [record.data() for record in result_users]
+
+    @staticmethod
+    def _snapshot_entries_query(domain: Optional[str]) -> str:
+        if domain:
+            condition = "e.domain = $domain AND e.rank <= $top"
+            order = "e.rank"
+        else:
+            condition = "e.globalRank <= $top"
+            order = "e.globalRank"
+
+        return f"""
+            MATCH (e:ResultEntry)
+            WHERE e.date = $date AND {condition}
+            RETURN e.userId AS userId,
+                   e.domain AS domain,
+                   e.count AS count,
+                   e.domainTotal AS domainTotal,
+                   e.rank AS rank,
+                   e.globalRank AS globalRank,
+                   e.elected AS elected,
+                   e.electedAt AS electedAt
+            ORDER BY {order}
+            """
+
+    _SNAPSHOT_ENTRIES_BY_KEY_QUERY = """
+            UNWIND $keys AS key
+            MATCH (e:ResultEntry {date: $date, userId: key.userId, domain: key.domain})
+            RETURN e.userId AS userId,
+                   e.domain AS domain,
+                   e.count AS count,
+                   e.rank AS rank,
+                   e.globalRank AS globalRank,
+                   e.elected AS elected
+            """
+
+    @staticmethod
+    def _get_snapshot_entries_by_key_tx(tx, snapshot_date: str, keys: List[dict]) -> List[dict]:
+        result_users = tx.run(ResultRepository._SNAPSHOT_ENTRIES_BY_KEY_QUERY, date=snapshot_date, keys=keys)
+        return [record.data() for record in result_users]
+
+    @staticmethod
+    def materialize_vote_results(election_threshold: float, snapshot_date: Optional[date] = None) -> int:
+        """
+        Écrit l'instantané des résultats : total par domaine, candidats classés
+        (dans leur domaine et globalement) et drapeau elected au seuil donné.
+        Retourne le nombre d'entrées écrites.
+        """
+        if snapshot_date is None:
+            snapshot_date = date.today()
+
+        return execute_write(
+            ResultRepository._materialize_vote_results_tx,
+            election_threshold,
+            snapshot_date.isoformat()
+        )
+
+    @staticmethod
+    def _materialize_vote_results_tx(tx, election_threshold: float, date_str: str) -> int:
+        # Un seul parcours des relations courantes, groupé par candidat et domaine
+        records = tx.run(
+            """
+            MATCH (voter:User)-[v:VOTED {current: true}]->(target:User)
+            RETURN target.id AS userId,
+                   v.domain AS domain,
+                   sum(v.count) AS count,
+                   min(v.createdAt) AS electedAt
+            """
+        ).data()
+        rows = ResultRepository._rank_results(records, election_threshold)
+
+        # Instantanés conservés : celui du jour remplace une éventuelle relance,
+        # ceux plus anciens que RESULTS_RETENTION_DAYS sont supprimés
+        meta = tx.run(
+            "MATCH (m:ResultMeta {id: 'results'}) RETURN m.date AS date, m.dates AS dates"
+        ).single()
+        dates = set((meta["dates"] or [meta["date"]]) if meta and meta["date"] else [])
+        dates.add(date_str)
+        oldest = ""
+        if RESULTS_RETENTION_DAYS > 0:
+            oldest = (date.fromisoformat(date_str) - timedelta(days=RESULTS_RETENTION_DAYS - 1)).isoformat()
+        dates = sorted(snapshot for snapshot in dates if snapshot >= oldest)
+
+        tx.run(
+            "MATCH (e:ResultEntry) WHERE e.date = $date OR e.date < $oldest DELETE e",
+            date=date_str,
+            oldest=oldest
+        )
+        tx.run(
+            """
+            UNWIND $rows AS row
+            CREATE (e:ResultEntry)
+            SET e = row, e.date = $date
+            """,
+            rows=rows,
+            date=date_str
+        )
+        tx.run(
+            """
+            MERGE (m:ResultMeta {id: 'results'})
+            SET m.date = $latest, m.dates = $dates
+            """,
+            latest=dates[-1],
+            dates=dates
+        )
+        return len(rows)
+
+    @staticmethod
+    def _rank_results(records: List[dict], election_threshold: float) -> List[dict]:
+        """
+        Ajoute domainTotal, rank (dans le domaine), globalRank et elected
+        à des lignes {userId, domain, count, electedAt}.
+        """
+        domain_totals: dict = {}
+        for record in records:
+            domain_totals[record["domain"]] = domain_totals.get(record["domain"], 0) + (record["count"] or 0)
+
+        ordered = sorted(records, key=lambda record: record["count"] or 0, reverse=True)
+        ranks: dict = {}
+        rows = []
+        for global_rank, record in enumerate(ordered, start=1):
+            domain_total = domain_totals[record["domain"]]
+            ranks[record["domain"]] = ranks.get(record["domain"], 0) + 1
+            rows.append({
+                "userId": record["userId"],
+                "domain": record["domain"],
+                "count": record["count"],
+                "domainTotal": domain_total,
+                "rank": ranks[record["domain"]],
+                "globalRank": global_rank,
+                "elected": domain_total > 0 and (record["count"] or 0) >= domain_total * election_threshold,
+                "electedAt": record["electedAt"],
+            })
+        return rows
+
+    # -------------------- LECTURES ASYNC (vues ASGI) --------------------
+    # Mêmes requêtes et mêmes résultats que les lectures sync, sur le driver async
+
+    @staticmethod
+    async def aget_vote_results(
+        domain: Optional[str] = None,
+        top: int = 100,
+        since: Optional[datetime] = None
+    ) -> List[dict]:
+        if since is None:
+            results = await aexecute_read(ResultRepository._aget_materialized_results_tx, domain, top)
+            if results is not None:
+                return results
+
+        return await aexecute_read(ResultRepository._aget_vote_results_tx, domain, top, since)
+
+    @staticmethod
+    async def _aget_vote_results_tx(tx, domain: Optional[str], top: int, since: Optional[datetime]) -> List[dict]:
+        query_totals, query_results, params = ResultRepository._vote_results_queries(domain, top, since)
+        result_totals = await tx.run(query_totals, **params)
+        domain_totals = {record["domain"]: record["domainTotal"] async for record in result_totals}
+        result_users = await tx.run(query_results, **params)
+        return ResultRepository._vote_results_from_records([record async for record in result_users], domain_totals)
+
+    @staticmethod
+    async def _aget_materialized_results_tx(tx, domain: Optional[str], top: int) -> Optional[List[dict]]:
+        snapshot_date = await ResultRepository._aresolve_snapshot_date_tx(tx)
+        if snapshot_date is None:
+            return None
+        return await ResultRepository._aget_snapshot_entries_tx(tx, snapshot_date, domain, top)
+
+    @staticmethod
+    async def aget_vote_results_as_of(as_of: date, domain: Optional[str] = None, top: int = 100) -> List[dict]:
+        return await aexecute_read(ResultRepository._aget_vote_results_as_of_tx, as_of.isoformat(), domain, top)
+
+    @staticmethod
+    async def _aget_vote_results_as_of_tx(tx, as_of: str, domain: Optional[str], top: int) -> List[dict]:
+        snapshot_date = await ResultRepository._aresolve_snapshot_date_tx(tx, as_of)
+        if snapshot_date is None:
+            return []
+        return await ResultRepository._aget_snapshot_entries_tx(tx, snapshot_date, domain, top)
+
+    @staticmethod
+    async def aget_result_changes(
+        from_date: date,
+        to_date: date,
+        domain: Optional[str] = None,
+        top: int = 100
+    ) -> Optional[dict]:
+        return await aexecute_read(
+            ResultRepository._aget_result_changes_tx,
+            from_date.isoformat(),
+            to_date.isoformat(),
+            domain,
+            top
+        )
+
+    @staticmethod
+    async def _aget_result_changes_tx(tx, from_str: str, to_str: str, domain: Optional[str], top: int) -> Optional[dict]:
+        from_snapshot = await ResultRepository._aresolve_snapshot_date_tx(tx, from_str)
+        to_snapshot = await ResultRepository._aresolve_snapshot_date_tx(tx, to_str)
+        if from_snapshot is None or to_snapshot is None:
+            return None
+
+        snapshots = {
+            snapshot: ResultRepository._entries_by_key(
+                await ResultRepository._aget_snapshot_entries_tx(tx, snapshot, domain, top)
+            )
+            for snapshot in (from_snapshot, to_snapshot)
+        }
+        before, after = snapshots[from_snapshot], snapshots[to_snapshot]
+
+        keys = list(dict.fromkeys([*before, *after]))
+        for snapshot, entries in ((from_snapshot, before), (to_snapshot, after)):
+            missing = ResultRepository._missing_keys(keys, entries)
+            if missing:
+                result_users = await tx.run(
+                    ResultRepository._SNAPSHOT_ENTRIES_BY_KEY_QUERY, date=snapshot, keys=missing
+                )
+                entries.update(ResultRepository._entries_by_key(await result_users.data()))
+
+        return ResultRepository._result_changes(from_snapshot, to_snapshot, before, after, keys, domain)
+
+    @staticmethod
+    async def _aresolve_snapshot_date_tx(tx, as_of: Optional[str] = None) -> Optional[str]:
+        meta = await (await tx.run(ResultRepository._RESULT_META_QUERY)).single()
+        return ResultRepository._snapshot_date(meta, as_of)
+
+    @staticmethod
+    async def _aget_snapshot_entries_tx(tx, snapshot_date: str, domain: Optional[str], top: int) -> List[dict]:
+        result_users = await tx.run(
+            ResultRepository._snapshot_entries_query(domain),
+            date=snapshot_date,
+            domain=domain,
+            top=top
+        )
+        return await result_users.data()
@@ -0,0 +1,446 @@
+import datetime
+import uuid
+from typing import Optional
+
+from app.neo4j_config import execute_read, execute_write
+
+# Verrou unique : une seule exécution du traitement quotidien à la fois
+DAILY_VOTES_LOCK = "daily_votes"
+
+# Exécutions de ce processus dont le verrou a été perdu (cf. mark_lock_lost)
+_lost_locks: set[str] = set()
+
+
+class RunCancelled(Exception):
+    """
+    Levée quand l'annulation d'une exécution est constatée (entre deux
+    phases ou deux domaines).
+    """
+
+    def __init__(self, run_id: str):
+        super().__init__(f"Exécution {run_id} annulée")
+        self.run_id = run_id
+
+
+class RunLockLost(Exception):
+    """
+    Levée quand une exécution constate la perte de son verrou (bail expiré
+    ou repris par un autre processus). Elle s'arrête sans écrire dans le
+    journal : une autre exécution a pu la reprendre.
+    """
+
+    def __init__(self, run_id: str):
+        super().__init__(f"Verrou de l'exécution {run_id} perdu")
+        self.run_id = run_id
+
+
+class RunRepository:
+    """
+    Journal des exécutions du traitement quotidien des votes.
+
+    Modèle :
+      (:VoteRun {id, date, status, queuedAt, startedAt, finishedAt, error,
+                 cancelRequested, lockLost})
+      (:VoteRunStep {runId, phase, domain, status, startedAt, finishedAt,
+                     seconds, queries, error, domains, voteIds})
+      (:VoteRunLock {name, owner, runId, expiresAt})
+
+    status : "queued", "running", "completed", "failed" ou "cancelled".
+    Une étape globale d'une phase a domain = '' ; les étapes par domaine
+    portent le nom du domaine. `domains` conserve la liste des domaines
+    à traiter calculée par une étape de préparation, `voteIds` les votes
+    tirés pour être validés (cf. VoteValidationService.validate_unprocessed_votes).
+    """
+
+    @staticmethod
+    def start_run(run_date: datetime.date, resume: bool = False) -> dict:
+        """
+        Démarre une exécution pour `run_date`. Avec `resume`, reprend la
+        dernière exécution non terminée de la même date s'il y en a une.
+        Retourne {"id": str, "resumed": bool}.
+        """
+        return execute_write(
+            RunRepository._start_run_tx, run_date.isoformat(), resume, str(uuid.uuid4())
+        )
+
+    @staticmethod
+    def _start_run_tx(tx, date_str: str, resume: bool, new_id: str) -> dict:
+        if resume:
+            record = tx.run(
+                """
+                MATCH (r:VoteRun {date: $date})
+                WHERE r.status <> 'completed'
+                WITH r ORDER BY r.startedAt DESC LIMIT 1
+                SET r.status = 'running', r.error = null, r.finishedAt = null
+                RETURN r.id AS id
+                """,
+                date=date_str
+            ).single()
+            if record is not None:
+                return {"id": record["id"], "resumed": True}
+
+        tx.run(
+            """
+            CREATE (:VoteRun {id: $id, date: $date, status: 'running', startedAt: datetime()})
+            """,
+            id=new_id,
+            date=date_str
+        )
+        return {"id": new_id, "resumed": False}
+
+    @staticmethod
+    def queue_run(run_date: datetime.date, resume: bool = False) -> dict:
+        """
+        Met en file une exécution pour `run_date` (cf. VoteJobService). Avec
+        `resume`, remet en file la dernière exécution non terminée de la même
+        date, sauf si elle tient le verrou.
+        Retourne {"id": str, "resumed": bool}.
+        """
+        return execute_write(
+            RunRepository._queue_run_tx, run_date.isoformat(), resume, str(uuid.uuid4())
+        )
+
+    @staticmethod
+    def _queue_run_tx(tx, date_str: str, resume: bool, new_id: str) -> dict:
+        if resume:
+            record = tx.run(
+                """
+                MATCH (r:VoteRun {date: $date})
+                WHERE NOT r.status IN ['completed', 'cancelled']
+                  AND NOT EXISTS {
+                      MATCH (l:VoteRunLock {name: $lock})
+                      WHERE l.runId = r.id AND l.expiresAt > datetime()
+                  }
+                WITH r ORDER BY r.startedAt DESC LIMIT 1
+                SET r.status = 'queued', r.queuedAt = datetime(), r.error = null,
+                    r.finishedAt = null, r.cancelRequested = null, r.lockLost = null
+                RETURN r.id AS id
+                """,
+                date=date_str,
+                lock=DAILY_VOTES_LOCK
+            ).single()
+            if record is not None:
+                return {"id": record["id"], "resumed": True}
+
+        tx.run(
+            """
+            CREATE (:VoteRun {id: $id, date: $date, status: 'queued',
+                              queuedAt: datetime(), startedAt: datetime()})
+            """,
+            id=new_id,
+            date=date_str
+        )
+        return {"id": new_id, "resumed": False}
+
+    @staticmethod
+    def claim_run(run_id: str) -> bool:
+        """
+        Passe une exécution en file à "running". False si elle n'est plus en
+        file (annulée, ou déjà prise par un autre processus).
+        """
+        return execute_write(RunRepository._claim_run_tx, run_id)
+
+    @staticmethod
+    def _claim_run_tx(tx, run_id: str) -> bool:
+        record = tx.run(
+            """
+            MATCH (r:VoteRun {id: $id, status: 'queued'})
+            SET r.status = 'running', r.startedAt = datetime(), r.lockLost = null
+            RETURN r.id AS id
+            """,
+            id=run_id
+        ).single()
+        return record is not None
+
+    @staticmethod
+    def request_cancel(run_id: str) -> Optional[str]:
+        """
+        Demande l'annulation d'une exécution : immédiate si elle est en file,
+        constatée par le worker (RunCancelled) si elle est en cours.
+        Retourne le statut de l'exécution ensuite, None si elle n'existe pas.
+        """
+        return execute_write(RunRepository._request_cancel_tx, run_id)
+
+    @staticmethod
+    def _request_cancel_tx(tx, run_id: str) -> Optional[str]:
+        record = tx.run(
+            """
+            MATCH (r:VoteRun {id: $id})
+            FOREACH (_ IN CASE WHEN r.status = 'queued' THEN [1] ELSE [] END |
+                SET r.status = 'cancelled', r.finishedAt = datetime())
+            FOREACH (_ IN CASE WHEN r.status = 'running' THEN [1] ELSE [] END |
+                SET r.cancelRequested = true)
+            RETURN r.status AS status
+            """,
+            id=run_id
+        ).single()
+        return record["status"] if record is not None else None
+
+    @staticmethod
+    def stop_reason(run_id: str) -> Optional[str]:
+        """
+        Raison d'arrêter une exécution en cours, vérifiée entre deux phases ou
+        deux domaines : "lock_lost" (verrou perdu, cf. mark_lock_lost),
+        "cancelled" (annulation demandée) ou None.
+        """
+        if run_id in _lost_locks:
+            return "lock_lost"
+        return execute_read(RunRepository._stop_reason_tx, run_id)
+
+    @staticmethod
+    def _stop_reason_tx(tx, run_id: str) -> Optional[str]:
+        record = tx.run(
+            """
+            MATCH (r:VoteRun {id: $id})
+            RETURN CASE
+                WHEN r.lockLost = true THEN 'lock_lost'
+                WHEN r.cancelRequested = true OR r.status = 'cancelled' THEN 'cancelled'
+            END AS reason
+            """,
+            id=run_id
+        ).single()
+        return record["reason"] if record is not None else None
+
+    @staticmethod
+    def mark_lock_lost(run_id: str) -> None:
+        """
+        Signale la perte du verrou de `run_id` : aussitôt dans ce processus,
+        puis dans le journal pour les workers du pool de recalcul (l'écriture
+        peut échouer si Neo4j est injoignable).
+        """
+        _lost_locks.add(run_id)
+        execute_write(RunRepository._mark_lock_lost_tx, run_id)
+
+    @staticmethod
+    def _mark_lock_lost_tx(tx, run_id: str):
+        tx.run("MATCH (r:VoteRun {id: $id, status: 'running'}) SET r.lockLost = true", id=run_id)
+
+    @staticmethod
+    def forget_lock_lost(run_id: str) -> None:
+        _lost_locks.discard(run_id)
+
+    @staticmethod
+    def get_status(run_id: str) -> Optional[str]:
+        return execute_read(RunRepository._get_status_tx, run_id)
+
+    @staticmethod
+    def _get_status_tx(tx, run_id: str) -> Optional[str]:
+        record = tx.run("MATCH (r:VoteRun {id: $id}) RETURN r.status AS status", id=run_id).single()
+        return record["status"] if record is not None else None
+
+    @staticmethod
+    def finish_run(run_id: str, error: Optional[str] = None, cancelled: bool = False) -> None:
+        execute_write(RunRepository._finish_run_tx, run_id, error, cancelled)
+
+    @staticmethod
+    def _finish_run_tx(tx, run_id: str, error: Optional[str], cancelled: bool = False):
+        tx.run(
+            """
+            MATCH (r:VoteRun {id: $id})
+            SET r.status = CASE
+                    WHEN $cancelled THEN 'cancelled'
+                    WHEN $error IS NULL THEN 'completed'
+                    ELSE 'failed'
+                END,
+                r.error = $error,
+                r.finishedAt = datetime()
+            """,
+            id=run_id,
+            error=error,
+            cancelled=cancelled
+        )
+
+    # -------------------- VERROU --------------------
+
+    @staticmethod
+    def acquire_lock(owner: str, run_id: str, ttl_seconds: int, name: str = DAILY_VOTES_LOCK) -> bool:
+        """
+        Prend (ou prolonge, pour le même `owner`) le verrou `name` pour
+        `ttl_seconds`. Un verrou expiré est repris : un processus arrêté
+        brutalement ne bloque pas les exécutions suivantes.
+        """
+        return execute_write(RunRepository._acquire_lock_tx, name, owner, run_id, ttl_seconds)
+
+    @staticmethod
+    def _acquire_lock_tx(tx, name: str, owner: str, run_id: str, ttl_seconds: int) -> bool:
+        # Le SET prend le verrou d'écriture du nœud : la lecture suivante
+        # voit la dernière valeur validée, deux candidats ne passent pas ensemble
+        tx.run(
+            "MERGE (l:VoteRunLock {name: $name}) SET l.checkedAt = datetime()",
+            name=name
+        ).consume()
+        record = tx.run(
+            """
+            MATCH (l:VoteRunLock {name: $name})
+            WITH l, l.owner IS NULL OR l.owner = $owner OR l.expiresAt < datetime() AS free
+            FOREACH (_ IN CASE WHEN free THEN [1] ELSE [] END |
+                SET l.owner = $owner, l.runId = $runId,
+                    l.expiresAt = datetime() + duration({seconds: $ttl}))
+            RETURN free
+            """,
+            name=name,
+            owner=owner,
+            runId=run_id,
+            ttl=ttl_seconds
+        ).single()
+        return bool(record["free"])
+
+    @staticmethod
+    def release_lock(owner: str, name: str = DAILY_VOTES_LOCK) -> None:
+        execute_write(RunRepository._release_lock_tx, name, owner)
+
+    @staticmethod
+    def _release_lock_tx(tx, name: str, owner: str):
+        tx.run(
+            """
+            MATCH (l:VoteRunLock {name: $name, owner: $owner})
+            SET l.owner = null, l.runId = null, l.expiresAt = null
+            """,
+            name=name,
+            owner=owner
+        )
+
+    @staticmethod
+    def start_step(run_id: str, phase: str, domain: str = "") -> None:
+        execute_write(RunRepository._start_step_tx, run_id, phase, domain)
+
+    @staticmethod
+    def _start_step_tx(tx, run_id: str, phase: str, domain: str):
+        tx.run(
+            """
+            MERGE (s:VoteRunStep {runId: $runId, phase: $phase, domain: $domain})
+            SET s.status = 'running', s.startedAt = datetime(),
+                s.finishedAt = null, s.seconds = null, s.error = null
+            """,
+            runId=run_id,
+            phase=phase,
+            domain=domain
+        )
+
+    @staticmethod
+    def finish_step(
+        run_id: str,
+        phase: str,
+        domain: str = "",
+        seconds: Optional[float] = None,
+        error: Optional[str] = None,
+        domains: Optional[list[str]] = None,
+        queries: Optional[int] = None,
+        vote_ids: Optional[list[str]] = None,
+    ) -> None:
+        """
+        Enregistre la fin d'une étape (créée si start_step n'a pas été appelé,
+        par exemple depuis un processus du pool de recalcul). `queries` est le
+        nombre de requêtes Cypher de l'étape (cf. get_last_phases).
+        """
+        execute_write(
+            RunRepository._finish_step_tx, run_id, phase, domain, seconds, error, domains, queries, vote_ids
+        )
+
+    @staticmethod
+    def _finish_step_tx(tx, run_id: str, phase: str, domain: str, seconds, error, domains, queries=None, vote_ids=None):
+        tx.run(
+            """
+            MERGE (s:VoteRunStep {runId: $runId, phase: $phase, domain: $domain})
+            SET s.status = CASE WHEN $error IS NULL THEN 'completed' ELSE 'failed' END,
+                s.startedAt = coalesce(s.startedAt, datetime()),
+                s.finishedAt = datetime(),
+                s.seconds = $seconds,
+                s.queries = $queries,
+                s.error = $error,
+                s.domains = coalesce($domains, s.domains),
+                s.voteIds = coalesce($voteIds, s.voteIds)
+            """,
+            runId=run_id,
+            phase=phase,
+            domain=domain,
+            seconds=seconds,
+            error=error,
+            domains=domains,
+            queries=queries,
+            voteIds=vote_ids
+        )
+
+    @staticmethod
+    def get_completed_steps(run_id: str) -> dict[tuple[str, str], dict]:
+        """
+        Étapes terminées d'une exécution : (phase, domain) -> {seconds, domains, voteIds}.
+        """
+        return execute_read(RunRepository._get_completed_steps_tx, run_id)
+
+    @staticmethod
+    def _get_completed_steps_tx(tx, run_id: str) -> dict[tuple[str, str], dict]:
+        records = tx.run(
+            """
+            MATCH (s:VoteRunStep {runId: $runId, status: 'completed'})
+            RETURN s.phase AS phase, s.domain AS domain, s.seconds AS seconds, s.domains AS domains,
+                   s.voteIds AS voteIds
+            """,
+            runId=run_id
+        )
+        return {
+            (record["phase"], record["domain"]): {
+                "seconds": record["seconds"], "domains": record["domains"], "voteIds": record["voteIds"],
+            }
+            for record in records
+        }
+
+    @staticmethod
+    def get_last_phases() -> list[dict]:
+        """
+        Dernière étape terminée de chaque phase (étapes globales), toutes
+        exécutions confondues, et nombre d'échecs de la phase dans le journal
+        (annulations exclues) : [{phase, status, seconds, queries, failures}]
+        """
+        return execute_read(RunRepository._get_last_phases_tx)
+
+    @staticmethod
+    def _get_last_phases_tx(tx) -> list[dict]:
+        records = tx.run(
+            """
+            MATCH (s:VoteRunStep {domain: ''})
+            WHERE s.finishedAt IS NOT NULL
+            WITH s ORDER BY s.finishedAt DESC
+            WITH s.phase AS phase, collect(s)[0] AS last,
+                 count(CASE WHEN s.status = 'failed' AND s.error <> 'cancelled' THEN 1 END) AS failures
+            RETURN phase, last.status AS status, last.seconds AS seconds, last.queries AS queries, failures
+            ORDER BY phase
+            """
+        )
+        return [record.data() for record in records]
+
+    @staticmethod
+    def get_run(run_id: Optional[str] = None) -> Optional[dict]:
+        """
+        Exécution `run_id` (la plus récente si None) avec ses étapes :
+        {id, date, status, queuedAt, startedAt, finishedAt, error, cancelRequested,
+         steps: [{phase, domain, status, seconds, error, domainCount}]}
+        """
+        return execute_read(RunRepository._get_run_tx, run_id)
+
+    @staticmethod
+    def _get_run_tx(tx, run_id: Optional[str]) -> Optional[dict]:
+        record = tx.run(
+            """
+            MATCH (r:VoteRun)
+            WHERE $id IS NULL OR r.id = $id
+            WITH r ORDER BY r.startedAt DESC LIMIT 1
+            RETURN r {.id, .date, .status, .queuedAt, .startedAt, .finishedAt, .error,
+                      cancelRequested: coalesce(r.cancelRequested, false)} AS run,
+                   COLLECT {
+                       MATCH (s:VoteRunStep {runId: r.id})
+                       WITH s ORDER BY s.startedAt
+                       RETURN s {.phase, .domain, .status, .seconds, .error, domainCount: size(s.domains)}
+                   } AS steps
+            """,
+            id=run_id
+        ).single()
+        if record is None:
+            return None
+
+        run = dict(record["run"])
+        for key in ("queuedAt", "startedAt", "finishedAt"):
+            if hasattr(run.get(key), "to_native"):
+                run[key] = run[key].to_native()
+        run["steps"] = [dict(step) for step in record["steps"]]
+        return run
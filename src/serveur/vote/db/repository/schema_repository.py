@@ -0,0 +1,105 @@
+from app.neo4j_config import get_driver
+
+
+class SchemaRepository:
+    """
+    Contraintes et index Neo4j utilisés par les requêtes du modèle de vote.
+
+    Chaque entrée est nommée : la création est idempotente (IF NOT EXISTS)
+    et la vérification compare ces noms à SHOW CONSTRAINTS / SHOW INDEXES.
+    """
+
+    CONSTRAINTS = {
+        # MATCH / MERGE (u:User {id: ...}) : seek unique + pas de doublon
+        "user_id_unique":
+            "CREATE CONSTRAINT user_id_unique IF NOT EXISTS "
+            "FOR (u:User) REQUIRE u.id IS UNIQUE",
+        # Journal du traitement quotidien
+        "vote_run_id_unique":
+            "CREATE CONSTRAINT vote_run_id_unique IF NOT EXISTS "
+            "FOR (r:VoteRun) REQUIRE r.id IS UNIQUE",
+        "vote_run_lock_name_unique":
+            "CREATE CONSTRAINT vote_run_lock_name_unique IF NOT EXISTS "
+            "FOR (l:VoteRunLock) REQUIRE l.name IS UNIQUE",
+    }
+
+    INDEXES = {
+        # Relations courantes d'un domaine (recalcul, validation, chaînes)
+        "voted_domain_current":
+            "CREATE INDEX voted_domain_current IF NOT EXISTS "
+            "FOR ()-[r:VOTED]-() ON (r.domain, r.current)",
+        # Votes non traités (fetch_unprocessed_votes, nettoyage des doublons)
+        "voted_processed":
+            "CREATE INDEX voted_processed IF NOT EXISTS "
+            "FOR ()-[r:VOTED]-() ON (r.processed)",
+        # Identifiant métier du vote
+        "voted_id":
+            "CREATE INDEX voted_id IF NOT EXISTS "
+            "FOR ()-[r:VOTED]-() ON (r.id)",
+        # Instantanés quotidiens : par date, par utilisateur et par domaine sur une période
+        "daily_stat_date":
+            "CREATE INDEX daily_stat_date IF NOT EXISTS "
+            "FOR (s:DailyStat) ON (s.date)",
+        "daily_stat_user_date":
+            "CREATE INDEX daily_stat_user_date IF NOT EXISTS "
+            "FOR (s:DailyStat) ON (s.userId, s.date)",
+        "daily_stat_domain_date":
+            "CREATE INDEX daily_stat_domain_date IF NOT EXISTS "
+            "FOR (s:DailyStat) ON (s.domain, s.date)",
+        # Journal : exécutions d'une date, étapes d'une exécution
+        "vote_run_date":
+            "CREATE INDEX vote_run_date IF NOT EXISTS "
+            "FOR (r:VoteRun) ON (r.date)",
+        "vote_run_step_run":
+            "CREATE INDEX vote_run_step_run IF NOT EXISTS "
+            "FOR (s:VoteRunStep) ON (s.runId, s.phase, s.domain)",
+        # Cumuls mensuels par utilisateur
+        "monthly_stat_user_month":
+            "CREATE INDEX monthly_stat_user_month IF NOT EXISTS "
+            "FOR (m:MonthlyStat) ON (m.userId, m.month)",
+        # Classements pré-calculés
+        "leaderboard_days_date":
+            "CREATE INDEX leaderboard_days_date IF NOT EXISTS "
+            "FOR (b:Leaderboard) ON (b.days, b.date)",
+        # Résultats matérialisés : top global et top par domaine
+        "result_entry_date_global_rank":
+            "CREATE INDEX result_entry_date_global_rank IF NOT EXISTS "
+            "FOR (e:ResultEntry) ON (e.date, e.globalRank)",
+        "result_entry_date_domain_rank":
+            "CREATE INDEX result_entry_date_domain_rank IF NOT EXISTS "
+            "FOR (e:ResultEntry) ON (e.date, e.domain, e.rank)",
+        # Comparaison d'instantanés : entrée d'un candidat à une date
+        "result_entry_date_user_domain":
+            "CREATE INDEX result_entry_date_user_domain IF NOT EXISTS "
+            "FOR (e:ResultEntry) ON (e.date, e.userId, e.domain)",
+    }
+
+    @staticmethod
+    def ensure_schema() -> list[str]:
+        """
+        Crée les contraintes et index manquants.
+        Retourne les noms des éléments qui n'existaient pas encore.
+        """
+        missing = SchemaRepository.missing_schema()
+        statements = {**SchemaRepository.CONSTRAINTS, **SchemaRepository.INDEXES}
+
+        driver = get_driver()
+        with driver.session() as session:
+            for name in missing:
+                session.run(statements[name]).consume()
+        return missing
+
+    @staticmethod
+    def missing_schema() -> list[str]:
+        """
+        Retourne les noms des contraintes et index attendus absents de la base.
+        """
+        # Requêtes en auto-commit : pas de nouvelles tentatives si Neo4j est indisponible
+        driver = get_driver()
+        with driver.session() as session:
+            constraints = set(session.run("SHOW CONSTRAINTS YIELD name RETURN name").value())
+            indexes = set(session.run("SHOW INDEXES YIELD name RETURN name").value())
+
+        missing = [name for name in SchemaRepository.CONSTRAINTS if name not in constraints]
+        missing += [name for name in SchemaRepository.INDEXES if name not in indexes]
+        return missing
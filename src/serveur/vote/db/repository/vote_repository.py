@@ -1,17 +1,77 @@
 import datetime
+import heapq
 import json
-from app.neo4j_config import get_driver
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from app.neo4j_config import aexecute_read, execute_read, execute_write, get_driver, reset_driver
+from core.rules.delegation_chain import chain_index
+from core.rules.delegation_graph import DelegationGraph, incremental_weights
+from core.rules.vote_validation import DomainVoteValidator
+from db.repository.run_repository import RunCancelled, RunLockLost, RunRepository
 from uuid import *
 from typing import List
 
+# Mode de recalcul des poids : "gds" (projections GDS, une requête par nœud),
+# "memory" (calcul en mémoire côté Python, une écriture groupée par domaine)
+# ou "incremental" (seules les chaînes en aval des votes modifiés sont recalculées)
+RECALCULATION_MODE = os.getenv("VOTE_RECALCULATION_MODE", "gds")
+RECALCULATION_MODES = ("gds", "memory", "incremental")
+
+# Nombre de processus recalculant des domaines en parallèle (1 = séquentiel)
+RECALCULATION_WORKERS = int(os.getenv("VOTE_RECALCULATION_WORKERS", "1"))
+
+# Nombre maximum de votes écrits par transaction dans save_votes
+BULK_BATCH_SIZE = int(os.getenv("VOTE_BULK_BATCH_SIZE", "500"))
+
+# Préfixe des projections GDS du recalcul des poids (noms déterministes :
+# une projection restée après un arrêt brutal est supprimée au recalcul suivant)
+GDS_GRAPH_PREFIX = "myGraph"
+
+# Mémoire (en Mo) que les projections GDS simultanées d'un recalcul ne doivent
+# pas dépasser, d'après gds.graph.project.estimate (0 = pas de limite)
+GDS_MEMORY_BUDGET_MB = int(os.getenv("VOTE_GDS_MEMORY_BUDGET_MB", "0"))
+
+# Fenêtres (en jours) et taille des classements pré-calculés chaque nuit
+LEADERBOARD_WINDOWS = (7, 30, 90)
+LEADERBOARD_SIZE = 10
+
+logger = logging.getLogger(__name__)
+
 class VoteRepository:
     """
     Persistance des votes dans Neo4j.
 
     Modèle :
-      (voter:User {id, threshold, publishVotes})
-          -[:VOTED {id, createdAt, domain, count, processed, valid, cycle, current}]->
-      (target:User {id, threshold, publishVotes})
+      (voter:User {id, threshold, publishVotes, dirtyDomains})
+          -[:VOTED {id, createdAt, domain, count, processed, valid, cycle, current,
+                    chainDepth, chainRoot}]->
+      (target:User {id, threshold, publishVotes, dirtyDomains})
+
+    `dirtyDomains` liste les domaines où une relation courante touchant
+    l'utilisateur a changé depuis le dernier recalcul des poids.
+
+    (:DailyStat {userId, date, domain, count}) : instantané quotidien des voix
+    reçues par un utilisateur dans un domaine (date au format YYYY-MM-DD).
+
+    (:MonthlyStat {userId, month, domain, count}) : somme des DailyStat du mois
+    (month au format YYYY-MM), tenue à jour par append_daily_stats une fois
+    StatsMeta.monthlyReady posé par rebuild_monthly_stats.
+
+    (:Leaderboard {domain, days, date, users}) : top LEADERBOARD_SIZE du domaine
+    sur les `days` derniers jours au `date` donné (users : JSON du graphique).
+
+    (:StatsMeta {id: 'daily_stats', lastDate, domains}) : `domains` est le
+    catalogue des domaines ayant des relations courantes, écrit avec
+    l'instantané quotidien (les relations courantes ne changent qu'au cron).
+
+    `chainDepth` / `chainRoot` indexent la chaîne de délégation : sur une
+    relation courante, longueur et fin du plus long chemin partant de son
+    votant (cf. core.rules.delegation_chain). Ils sont maintenus à chaque
+    changement de relation courante ; une valeur nulle renvoie au parcours
+    exhaustif.
     """
 
     @staticmethod
@@ -25,9 +85,7 @@ class VoteRepository:
           "createdAt": datetime
         }
         """
-        driver = get_driver()
-        with driver.session() as session:
-            session.execute_write(VoteRepository._save_vote_tx, vote)
+        execute_write(VoteRepository._save_vote_tx, vote)
 
     @staticmethod
     def _save_vote_tx(tx, vote: dict):
@@ -68,19 +126,77 @@ class VoteRepository:
             createdAt=vote["createdAt"].isoformat(),
         )
 
+    @staticmethod
+    def save_votes(votes: list[dict], batch_size: int | None = None) -> None:
+        """
+        Enregistre plusieurs votes (même format que save_vote), par lots de
+        `batch_size` votes par transaction (par défaut VOTE_BULK_BATCH_SIZE).
+
+        Même sémantique que des appels successifs à save_vote, à condition
+        qu'un même lot ne contienne qu'un vote par (voterId, domain).
+        """
+        batch_size = batch_size or BULK_BATCH_SIZE
+        rows = [
+            {
+                "id": str(vote["id"]),
+                "voterId": str(vote["voterId"]),
+                "targetUserId": str(vote["targetUserId"]),
+                "domain": vote["domain"],
+                "createdAt": vote["createdAt"].isoformat(),
+            }
+            for vote in votes
+        ]
+
+        for start in range(0, len(rows), batch_size):
+            execute_write(VoteRepository._save_votes_tx, rows[start:start + batch_size])
+
+    @staticmethod
+    def _save_votes_tx(tx, rows: list[dict]):
+        # Supprime les autres votes non traités du votant dans chaque domaine
+        tx.run(
+            """
+            UNWIND $rows AS vote
+            MATCH (v:User {id: vote.voterId})-[rel:VOTED {domain: vote.domain, processed: false}]->(t:User)
+            WHERE t.id <> vote.targetUserId
+            DELETE rel
+            """,
+            rows=rows,
+        )
+
+        tx.run(
+            """
+            UNWIND $rows AS vote
+            MERGE (voter:User {id: vote.voterId})
+            ON CREATE SET
+                voter.threshold    = 100,
+                voter.publishVotes = false
+            MERGE (target:User {id: vote.targetUserId})
+            ON CREATE SET
+                target.threshold    = 100,
+                target.publishVotes = false
+
+            WITH voter, target, vote
+
+            MERGE (voter)-[rel:VOTED {domain: vote.domain, processed: false}]->(target)
+            ON CREATE SET
+                rel.id        = vote.id,
+                rel.createdAt = datetime(vote.createdAt),
+                rel.processed = false
+            """,
+            rows=rows,
+        )
+
     @staticmethod
     def delete_vote_for_voter_and_domain(voter_id: str, domain: str) -> bool:
         """
         Supprime la relation VOTED pour un voter + domain.
         Retourne True si une relation a été supprimée, False sinon.
         """
-        driver = get_driver()
-        with driver.session() as session:
-            return session.execute_write(
-                VoteRepository._delete_vote_for_voter_and_domain_tx,
-                voter_id,
-                domain,
-            )
+        return execute_write(
+            VoteRepository._delete_vote_for_voter_and_domain_tx,
+            voter_id,
+            domain,
+        )
 
     @staticmethod
     def _delete_vote_for_voter_and_domain_tx(tx, voter_id: str, domain: str) -> bool:
@@ -97,6 +213,17 @@ class VoteRepository:
         ).single()
         deleted_count = result["nbDeleted"] if result is not None else 0
 
+        # Marque le votant pour le recalcul incrémental du domaine
+        tx.run(
+            """
+            MATCH (v:User {id: $voterId})
+            SET v.dirtyDomains = coalesce(v.dirtyDomains, [])
+                + [d IN [$domain] WHERE NOT d IN coalesce(v.dirtyDomains, [])]
+            """,
+            voterId=voter_id,
+            domain=domain,
+        )
+
         # Compte les votes self-loop et les votes self-loop non processed
         self_record = tx.run(
             """
@@ -144,116 +271,143 @@ class VoteRepository:
         
 
     @staticmethod
-    def find_votes_by_voter(voter_id: str, domain: str | None = None) -> list[dict]:
-        driver = get_driver()
-        with driver.session() as session:
-            return session.execute_read(
-                VoteRepository._find_votes_by_voter_tx,
-                voter_id,
-                domain,
-            )
+    def find_votes_by_voter_with_stats(voter_id: str, domain: str | None = None) -> dict:
+        """
+        Lit en une requête tout ce qu'affiche la liste des votes émis :
+        {
+          "publishVotes": bool,
+          "lastCounts": { str: int },   # voix reçues au dernier instantané
+          "votes": [ {id, voterId, targetUserId, domain, createdAt} ]
+        }
+        """
+        return execute_read(
+            VoteRepository._find_votes_by_voter_with_stats_tx,
+            voter_id,
+            domain,
+        )
 
-    @staticmethod
-    def _find_votes_by_voter_tx(tx, voter_id: str, domain: str | None) -> list[dict]:
-        query = """
-            MATCH (voter:User {id: $voterId})-[rel:VOTED {current: true}]->(target:User)
-            WHERE $domain IS NULL OR rel.domain = $domain
-            RETURN id(rel)       AS id,
-                   voter.id      AS voterId,
-                   target.id     AS targetUserId,
-                   rel.domain    AS domain,
-                   rel.createdAt AS createdAt,
-                   voter.publishVotes AS publishVotes
-            ORDER BY rel.createdAt DESC
+    # Requêtes partagées par les lectures sync et async (cf. LECTURES ASYNC)
+    _VOTES_BY_VOTER_QUERY = """
+            OPTIONAL MATCH (m:StatsMeta {id: 'daily_stats'})
+            OPTIONAL MATCH (voter:User {id: $voterId})
+            RETURN voter.publishVotes AS publishVotes,
+                   COLLECT {
+                       MATCH (s:DailyStat)
+                       WHERE s.userId = $voterId
+                       AND s.date = m.lastDate
+                       RETURN [s.domain, s.count]
+                   } AS entries,
+                   COLLECT {
+                       MATCH (voter)-[rel:VOTED {current: true}]->(target:User)
+                       WHERE $domain IS NULL OR rel.domain = $domain
+                       WITH rel, target
+                       ORDER BY rel.createdAt DESC
+                       RETURN {
+                           id: id(rel),
+                           targetUserId: target.id,
+                           domain: rel.domain,
+                           createdAt: rel.createdAt
+                       }
+                   } AS votes
             """
 
-        records = tx.run(
-            query,
+    @staticmethod
+    def _find_votes_by_voter_with_stats_tx(tx, voter_id: str, domain: str | None) -> dict:
+        record = tx.run(
+            VoteRepository._VOTES_BY_VOTER_QUERY,
             voterId=str(voter_id),
             domain=domain,
-        )
+        ).single()
+        return VoteRepository._votes_by_voter_from_record(record, voter_id)
 
+    @staticmethod
+    def _votes_by_voter_from_record(record, voter_id: str) -> dict:
         votes: list[dict] = []
-        for record in records:
-            created_at = record["createdAt"]
+        for vote in record["votes"]:
+            created_at = vote["createdAt"]
             if hasattr(created_at, "to_native"):
                 created_at = created_at.to_native()
 
             votes.append(
                 {
-                    "id": record["id"],
-                    "voterId": record["voterId"],
-                    "targetUserId": record["targetUserId"],
-                    "domain": record["domain"],
+                    "id": vote["id"],
+                    "voterId": str(voter_id),
+                    "targetUserId": vote["targetUserId"],
+                    "domain": vote["domain"],
                     "createdAt": created_at,
                 }
             )
 
-        return votes
+        return {
+            "publishVotes": record["publishVotes"] is True,
+            "lastCounts": {stat_domain: count for stat_domain, count in record["entries"]},
+            "votes": votes,
+        }
 
     @staticmethod
-    def get_received_votes_summary(user_id: str, domain: str | None = None) -> dict:
+    def get_received_votes_with_stats(user_id: str, domain: str | None = None) -> dict:
         """
-        Retourne un dict:
+        Lit en une requête tout ce qu'affiche le résumé des votes reçus :
         {
           "userId": str,
+          "publishVotes": bool,
+          "lastCounts": { str: int },   # voix reçues au dernier instantané
           "usersByDomain": { str: [str] }
         }
         """
-        driver = get_driver()
-        with driver.session() as session:
-            return session.execute_read(
-                VoteRepository._get_received_votes_summary_tx,
-                user_id,
-                domain,
-            )
+        return execute_read(
+            VoteRepository._get_received_votes_with_stats_tx,
+            user_id,
+            domain,
+        )
 
-    @staticmethod
-    def _get_received_votes_summary_tx(tx, user_id: str, domain: str | None) -> dict:
-        query = """
-                MATCH (voter:User)-[rel:VOTED {current: true}]->(target:User {id: $userId})
-                WHERE $domain IS NULL OR rel.domain = $domain
-                RETURN rel.domain                 AS domain,
-                       collect(DISTINCT voter.id) AS voters
+    _RECEIVED_VOTES_QUERY = """
+                OPTIONAL MATCH (m:StatsMeta {id: 'daily_stats'})
+                OPTIONAL MATCH (target:User {id: $userId})
+                RETURN target.publishVotes AS publishVotes,
+                       COLLECT {
+                           MATCH (s:DailyStat)
+                           WHERE s.userId = $userId
+                           AND s.date = m.lastDate
+                           RETURN [s.domain, s.count]
+                       } AS entries,
+                       COLLECT {
+                           MATCH (voter:User)-[rel:VOTED {current: true}]->(target)
+                           WHERE rel.domain IS NOT NULL
+                           AND ($domain IS NULL OR rel.domain = $domain)
+                           WITH rel.domain AS domain, collect(DISTINCT voter.id) AS voters
+                           RETURN [domain, voters]
+                       } AS voters
             """
 
-        records = tx.run(
-            query,
+    @staticmethod
+    def _get_received_votes_with_stats_tx(tx, user_id: str, domain: str | None) -> dict:
+        record = tx.run(
+            VoteRepository._RECEIVED_VOTES_QUERY,
             userId=str(user_id),
             domain=domain,
-        )
-
-        users_by_domain: dict[str, list[str]] = {}
-
-        for record in records:
-            domain_key = record["domain"]
-            if domain_key is None:
-                continue
-
-            voters = record["voters"] or []
-
-            users_by_domain[domain_key] = [str(v) for v in voters]
+        ).single()
+        return VoteRepository._received_votes_from_record(record, user_id)
 
+    @staticmethod
+    def _received_votes_from_record(record, user_id: str) -> dict:
         return {
             "userId": str(user_id),
-            "usersByDomain": users_by_domain,
+            "publishVotes": record["publishVotes"] is True,
+            "lastCounts": {stat_domain: count for stat_domain, count in record["entries"]},
+            "usersByDomain": {
+                domain_key: [str(v) for v in voters]
+                for domain_key, voters in record["voters"]
+            },
         }
 
-
-    # -------------------- RECUPERATION DES VOTES NON TRAITES --------------------
-    
     @staticmethod
     def fetch_unprocessed_votes() -> list[str]:
         """
         Récupère les relations VOTED dont processed = false (votes non traités).
         Retourne une liste d'elementId() des relations.
         """
-        driver = get_driver()
-        with driver.session() as session:
-            results = session.execute_read(
-                VoteRepository._fetch_unprocessed_votes_tx
-            )
-            return results
+        return execute_read(VoteRepository._fetch_unprocessed_votes_tx)
 
     @staticmethod
     def _fetch_unprocessed_votes_tx(tx) -> list[str]:
@@ -278,25 +432,34 @@ class VoteRepository:
         Marque une relation VOTED comme validée :
         processed = true et valid = true.
         """
-        driver = get_driver()
-        with driver.session() as session:
-            session.execute_write(
-                VoteRepository._mark_vote_valid_tx, rel_id
-            )
+        execute_write(
+            VoteRepository._mark_vote_valid_tx, rel_id
+        )
 
     @staticmethod
     def _mark_vote_valid_tx(tx, rel_id: str):
-        # Met à jour les propriétés processed et valid sur les relations
-        tx.run(
+        # Met à jour les propriétés processed et valid sur la relation
+        # (accès direct par elementId) et marque les deux extrémités pour
+        # le recalcul incrémental
+        rec = tx.run(
             """
-            MATCH (:User)-[v:VOTED]->(:User)
+            MATCH (u)-[v:VOTED]->(t)
             WHERE elementId(v) = $id
             SET v.processed = true,
                 v.valid = true,
                 v.current = true
+            WITH u, v.domain AS domain, [u, t] AS ends
+            UNWIND ends AS n
+            SET n.dirtyDomains = coalesce(n.dirtyDomains, [])
+                + [d IN [domain] WHERE NOT d IN coalesce(n.dirtyDomains, [])]
+            RETURN DISTINCT elementId(u) AS voterId, domain
             """,
             id=rel_id,
-        )
+        ).single()
+
+        # Le votant a une nouvelle relation courante : son amont change de chaîne
+        if rec is not None:
+            VoteRepository._refresh_chain_index_tx(tx, rec["domain"], [rec["voterId"]])
 
 
     # -------------------- MARQUAGE DES VOTES INVALIDES --------------------
@@ -307,19 +470,19 @@ class VoteRepository:
         Marque une liste de relations VOTED comme invalidées :
         processed = true et valid = false.
         """
-        driver = get_driver()
-        with driver.session() as session:
-            session.execute_write(
-                VoteRepository._mark_votes_invalid_tx, rel_ids
-            )
+        execute_write(
+            VoteRepository._mark_votes_invalid_tx, rel_ids
+        )
 
     @staticmethod
     def _mark_votes_invalid_tx(tx, rel_ids: list[str]):
         # Même logique que mark_votes_valid, mais valid = false
+        # Une recherche directe par elementId pour chaque id : coût O(len(ids))
         tx.run(
             """
-            MATCH (:User)-[v:VOTED]->(:User)
-            WHERE elementId(v) IN $ids
+            UNWIND $ids AS relId
+            MATCH ()-[v:VOTED]->()
+            WHERE elementId(v) = relId
             SET v.processed = true,
                 v.valid = false
             """,
@@ -327,6 +490,23 @@ class VoteRepository:
         )
     
 
+    @staticmethod
+    def record_validation_draw(run_id: str, rejected: list[str], validated: list[str]):
+        """
+        Marque les votes écartés par le tirage de la validation comme invalidés
+        et journalise le tirage (étape "validate_setup" de `run_id`, avec les
+        votes tirés pour être validés) dans une seule transaction : une reprise
+        voit soit les deux, soit aucun.
+        """
+        execute_write(VoteRepository._record_validation_draw_tx, run_id, rejected, validated)
+
+    @staticmethod
+    def _record_validation_draw_tx(tx, run_id: str, rejected: list[str], validated: list[str]):
+        if rejected:
+            VoteRepository._mark_votes_invalid_tx(tx, rejected)
+        RunRepository._finish_step_tx(tx, run_id, "validate_setup", "", None, None, None, vote_ids=validated)
+
+
     # -------------------- SUPRESSION DES VOTES DUPLIQUES --------------------
 
     @staticmethod
@@ -336,9 +516,7 @@ class VoteRepository:
         Seul le plus récent est conservé.
         A utiliser pour supprimer les votes qui ont une copie non traitée.
         """
-        driver = get_driver()
-        with driver.session() as session:
-            session.execute_write(VoteRepository._clean_duplicate_domain_votes_tx)
+        execute_write(VoteRepository._clean_duplicate_domain_votes_tx)
 
     @staticmethod
     def _clean_duplicate_domain_votes_tx(tx):
@@ -360,53 +538,283 @@ class VoteRepository:
         )
 
         # Désactive le dernier vote actif si un nouveau arrive
-        tx.run(
+        deactivated = tx.run(
             """
             MATCH (voter:User)-[v:VOTED {processed: false}]->(target:User)
             WITH voter, v.domain AS vDomain, target
             MATCH (voter)-[v2:VOTED {current: true, domain: vDomain}]->(target)
             SET v2.current = false
+            REMOVE v2.chainDepth, v2.chainRoot
+            WITH voter, vDomain, [voter, target] AS ends
+            UNWIND ends AS n
+            SET n.dirtyDomains = coalesce(n.dirtyDomains, [])
+                + [d IN [vDomain] WHERE NOT d IN coalesce(n.dirtyDomains, [])]
+            RETURN DISTINCT vDomain AS domain, elementId(voter) AS voterId
             """
-        )
+        ).data()
         
 
         # Valide toutes les self-loop non traitées (processed=false)
         # Celles-ci sont marquées processed=true et valid=true
-        tx.run(
+        self_loops = tx.run(
             """
             MATCH (u:User)-[v:VOTED {processed: false}]->(u)
-            SET v.processed = true, v.valid = true, v.current = true
+            SET v.processed = true, v.valid = true, v.current = true,
+                u.dirtyDomains = coalesce(u.dirtyDomains, [])
+                + [d IN [v.domain] WHERE NOT d IN coalesce(u.dirtyDomains, [])]
+            RETURN DISTINCT v.domain AS domain, elementId(u) AS voterId
             """
-        )
+        ).data()
+
+        # Mise à jour de l'index de chaîne en amont des votants concernés
+        seeds_by_domain: dict[str, list[str]] = {}
+        for record in deactivated + self_loops:
+            seeds_by_domain.setdefault(record["domain"], []).append(record["voterId"])
+        for domain, seeds in seeds_by_domain.items():
+            VoteRepository._refresh_chain_index_tx(tx, domain, seeds)
 
 
     # -------------------- RECALCUL GLOBAL DES COUNTS DES VOTES --------------------
 
     @staticmethod  
-    def recalculate_counts_by_domain():  
+    def recalculate_counts_by_domain(
+        mode: str | None = None, workers: int | None = None, run_id: str | None = None
+    ) -> list[dict]:
         """
         Recalcule tous les poids des relations VOTED :
+        - Estimation de la mémoire des projections GDS (mode "gds")
         - Réinitialisation globale
-        - Recalcul domaine par domaine
-        - Nettoyage final des graphes GDS
+        - Recalcul domaine par domaine, chacun sur sa propre projection
+
+        En mode "incremental", seules les zones en aval des utilisateurs marqués
+        (dirtyDomains) sont recalculées ; sans recalcul complet préalable, on
+        se rabat sur le mode "memory".
+
+        Les domaines sont indépendants (toutes les requêtes filtrent sur r.domain) :
+        avec plusieurs workers, ils sont répartis sur un pool de processus,
+        les plus gros en premier.
+
+        En mode "gds", le recalcul est refusé (RuntimeError, avant toute
+        modification) si les projections simultanées dépassent
+        VOTE_GDS_MEMORY_BUDGET_MB.
+
+        Avec `run_id`, l'avancement est journalisé (cf. RunRepository) : une
+        exécution reprise ne refait ni l'initialisation (qui remet les poids à
+        zéro) ni les domaines déjà recalculés.
+
+        :param mode: "gds", "memory" ou "incremental" (par défaut VOTE_RECALCULATION_MODE)
+        :param workers: nombre de processus (par défaut VOTE_RECALCULATION_WORKERS)
+        :param run_id: exécution du traitement quotidien à journaliser
+        :return: rapport par domaine {domain, seconds, error}
         """
-        driver = get_driver()
-        
-        # 1. Phase d'initialisation + récupération des domaines existants
-        with driver.session() as session:
-            domains = session.execute_write(VoteRepository._setup_recalculation_by_domain_tx)
+        mode = mode or RECALCULATION_MODE
+        if mode not in RECALCULATION_MODES:
+            raise ValueError(f"Mode de recalcul inconnu : {mode}")
+        workers = workers or RECALCULATION_WORKERS
+
+        if mode == "incremental":
+            has_full_run = execute_read(VoteRepository._has_full_recalculation_tx)
+            if has_full_run:
+                return VoteRepository._recalculate_counts_incrementally(workers, run_id)
+            mode = "memory"
+
+        use_gds = mode == "gds"
+        completed = RunRepository.get_completed_steps(run_id) if run_id else {}
+
+        # 1. Estimation des projections restantes, puis initialisation +
+        #    récupération des domaines existants
+        setup = completed.get(("recalculate_setup", ""))
+        if use_gds:
+            pending = None
+            if setup is not None:
+                pending = [
+                    domain for domain in setup["domains"] or []
+                    if ("recalculate", domain) not in completed
+                ]
+            VoteRepository._estimate_projections(pending, workers)
+
+        if setup is not None:
+            domains = setup["domains"] or []
+        else:
+            domains = execute_write(VoteRepository._setup_recalculation_by_domain_tx, use_gds)
+            if run_id:
+                RunRepository.finish_step(run_id, "recalculate_setup", domains=domains)
+
+        # 2. Recalcul pour chaque domaine, suivi de la reconstruction complète
+        #    de son index de chaîne
+        recalculate_tx = (
+            VoteRepository._recalculate_counts_by_domain_tx
+            if use_gds
+            else VoteRepository._recalculate_counts_by_domain_in_memory_tx
+        )
+        reports = VoteRepository._process_domains(
+            (recalculate_tx, VoteRepository._refresh_chain_index_tx),
+            {domain: () for domain in domains if ("recalculate", domain) not in completed},
+            workers,
+            run_id,
+            "recalculate",
+        )
+
+        # 3. Marquage du recalcul complet
+        execute_write(VoteRepository._cleanup_recalculation_by_domain_tx)
+
+        return reports
+
+    @staticmethod
+    def _process_domains(
+        steps: tuple,
+        domain_args: dict[str, tuple],
+        workers: int,
+        run_id: str | None = None,
+        phase: str | None = None,
+    ) -> list[dict]:
+        """
+        Exécute les transactions `steps` pour chaque domaine, dans l'ordre de
+        `domain_args` (domaine -> arguments supplémentaires des transactions).
+
+        Avec plus d'un worker, chaque domaine est traité dans un processus du
+        pool, qui a son propre driver. Tous les domaines sont traités même si
+        l'un échoue ; les échecs sont levés ensemble à la fin.
+
+        Avec `run_id`, chaque domaine est journalisé comme étape `phase` dès
+        qu'il est terminé ; si l'exécution est annulée ou a perdu son verrou,
+        les domaines restants ne sont pas traités (RunCancelled / RunLockLost).
+        """
+        if workers <= 1 or len(domain_args) <= 1:
+            reports = [
+                VoteRepository._process_domain(domain, steps, *args, run_id=run_id, phase=phase)
+                for domain, args in domain_args.items()
+            ]
+        else:
+            # "spawn" et non "fork" : le processus serveur a d'autres threads
+            # (driver Neo4j, prolongation du verrou, requêtes) et un fork peut
+            # hériter d'un verrou tenu par l'un d'eux. Le driver est recréé
+            # dans chaque worker par reset_driver.
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(domain_args)),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=reset_driver,
+            ) as pool:
+                futures = [
+                    pool.submit(
+                        VoteRepository._process_domain, domain, steps, *args, run_id=run_id, phase=phase
+                    )
+                    for domain, args in domain_args.items()
+                ]
+                reports = [future.result() for future in futures]
+
+        stopped = {report["stopped"] for report in reports if report.get("stopped")}
+        if "lock_lost" in stopped:
+            raise RunLockLost(run_id)
+        if stopped:
+            raise RunCancelled(run_id)
+
+        for report in reports:
+            if report["error"] is None:
+                logger.info("Recalcul du domaine %s : %.2f s", report["domain"], report["seconds"])
+            else:
+                logger.error(
+                    "Échec du recalcul du domaine %s après %.2f s : %s",
+                    report["domain"], report["seconds"], report["error"],
+                )
 
-        # 2. Recalcul pour chaque domaine
-        for domain in domains:
-            with driver.session() as session:
-                session.execute_write(VoteRepository._recalculate_counts_by_domain_tx, domain)
+        failed = [report["domain"] for report in reports if report["error"] is not None]
+        if failed:
+            raise RuntimeError(f"Échec du recalcul des domaines : {', '.join(failed)}")
+        return reports
 
-        # 3. Suppression du graphe global utilisé dans GDS
-        with driver.session() as session:
-            session.execute_write(VoteRepository._cleanup_recalculation_by_domain_tx)
+    @staticmethod
+    def _process_domain(domain: str, steps: tuple, *args, run_id: str | None = None, phase: str | None = None) -> dict:
+        # Exécuté dans le processus courant ou dans un worker du pool
+        stopped = RunRepository.stop_reason(run_id) if run_id else None
+        if stopped is not None:
+            return {"domain": domain, "seconds": 0.0, "error": None, "stopped": stopped}
+
+        started = time.perf_counter()
+        error = None
+        try:
+            driver = get_driver()
+            for step in steps:
+                with driver.session() as session:
+                    session.execute_write(step, domain, *args)
+        except Exception as exc:
+            error = repr(exc)
+        seconds = time.perf_counter() - started
+
+        if run_id:
+            try:
+                RunRepository.finish_step(run_id, phase, domain, seconds, error)
+            except Exception as exc:
+                # Le domaine sera refait à la reprise : le journal n'est qu'une optimisation
+                logger.warning("Journalisation du domaine %s impossible : %r", domain, exc)
+        return {"domain": domain, "seconds": seconds, "error": error}
+
+    @staticmethod
+    def _estimate_projections(domains: list[str] | None, workers: int) -> dict[str, int]:
+        """
+        Estime (gds.graph.project.estimate) la mémoire de la projection de
+        chaque domaine à recalculer (tous si `domains` est None) et la journalise.
+
+        Avec plusieurs workers, les plus grosses projections coexistent : leur
+        somme est comparée à VOTE_GDS_MEMORY_BUDGET_MB.
+
+        :return: domaine -> estimation haute en octets
+        """
+        sizes = execute_read(VoteRepository._get_domain_sizes_tx)
+        if domains is not None:
+            sizes = [size for size in sizes if size["domain"] in set(domains)]
+        estimates = execute_read(VoteRepository._estimate_projections_tx, sizes)
+
+        for estimate in estimates:
+            logger.info(
+                "Projection GDS du domaine %s : %s nœuds, %s relations, mémoire estimée %s",
+                estimate["domain"], estimate["nodeCount"], estimate["relationshipCount"],
+                estimate["requiredMemory"],
+            )
+
+        peak = sum(sorted((estimate["bytesMax"] for estimate in estimates), reverse=True)[:max(workers, 1)])
+        budget = GDS_MEMORY_BUDGET_MB * 1024 * 1024
+        if budget and peak > budget:
+            raise RuntimeError(
+                f"Projections GDS estimées à {peak / 1024 / 1024:.0f} Mo "
+                f"(budget VOTE_GDS_MEMORY_BUDGET_MB={GDS_MEMORY_BUDGET_MB})"
+            )
+        return {estimate["domain"]: estimate["bytesMax"] for estimate in estimates}
+
+    @staticmethod
+    def _get_domain_sizes_tx(tx) -> list[dict]:
+        # Un utilisateur à la fois votant et élu est compté deux fois :
+        # l'estimation reste une borne haute
+        return tx.run("""
+            MATCH ()-[r:VOTED]->()
+            WHERE r.current = true
+            WITH r.domain AS domain,
+                 count(r) AS relationshipCount,
+                 count(DISTINCT startNode(r)) + count(DISTINCT endNode(r)) AS nodeCount
+            RETURN domain, nodeCount, relationshipCount
+            ORDER BY relationshipCount DESC
+        """).data()
+
+    @staticmethod
+    def _estimate_projections_tx(tx, sizes: list[dict]) -> list[dict]:
+        # Estimation sur un graphe fictif de la taille du sous-graphe du domaine
+        return tx.run(
+            """
+            UNWIND $sizes AS size
+            CALL gds.graph.project.estimate('User', 'VOTED', {
+                nodeCount: size.nodeCount,
+                relationshipCount: size.relationshipCount
+            })
+            YIELD requiredMemory, bytesMax
+            RETURN size.domain AS domain, size.nodeCount AS nodeCount,
+                   size.relationshipCount AS relationshipCount,
+                   requiredMemory, bytesMax
+            """,
+            sizes=sizes
+        ).data()
 
     @staticmethod
-    def _setup_recalculation_by_domain_tx(tx) -> list[str]:
+    def _setup_recalculation_by_domain_tx(tx, drop_stale_projections: bool = True) -> list[str]:
         # 1. Remise à zéro des propriétés `count` et `cycle` de toutes les relations VOTED
         tx.run("""
             MATCH (:User)-[r:VOTED]->(:User)
@@ -414,28 +822,57 @@ class VoteRepository:
             SET r.count = null, r.cycle = false
         """)
 
-        # 2. Collecte de tous les domaines présents dans les relations VOTED
-        result = tx.run("MATCH ()-[r:VOTED]->() WHERE r.current = true RETURN DISTINCT r.domain AS domain")
-        domains = [record["domain"] for record in result]
-
-        # 3. Projection du graphe global dans GDS avec toutes les relations VOTED
+        # Le recalcul complet remplace toutes les marques du recalcul incrémental ;
+        # le marqueur n'est reposé qu'en fin de recalcul (cf. cleanup)
         tx.run("""
-            CALL gds.graph.project(
-                'myGraph',
-                'User',
-                { VOTED: { type: 'VOTED', orientation: 'NATURAL' } }
-            )
+            MATCH (u:User)
+            WHERE u.dirtyDomains IS NOT NULL
+            REMOVE u.dirtyDomains
         """)
+        tx.run("MATCH (m:RecalculationMeta {id: 'weights'}) DELETE m")
+
+        # 2. Collecte de tous les domaines présents dans les relations VOTED,
+        #    les plus gros en premier (ils bornent la durée d'un recalcul parallèle)
+        result = tx.run("""
+            MATCH ()-[r:VOTED]->()
+            WHERE r.current = true
+            RETURN r.domain AS domain, count(r) AS relCount
+            ORDER BY relCount DESC
+        """)
+        domains = [record["domain"] for record in result]
+
+        # 3. Suppression des projections laissées par un recalcul interrompu
+        #    (chaque domaine projette ensuite son propre sous-graphe)
+        if drop_stale_projections:
+            VoteRepository._drop_stale_projections_tx(tx)
 
         # Retourner la liste des domaines pour itération
         return domains
 
+    @staticmethod
+    def _drop_stale_projections_tx(tx):
+        # Le catalogue GDS n'est pas transactionnel : une projection survit à
+        # l'échec de la transaction qui l'a créée
+        tx.run(
+            """
+            CALL gds.graph.list()
+            YIELD graphName
+            WHERE graphName = $prefix OR graphName STARTS WITH $prefix + '_'
+            CALL gds.graph.drop(graphName, false)
+            YIELD graphName AS dropped
+            RETURN count(dropped) AS dropped
+            """,
+            prefix=GDS_GRAPH_PREFIX
+        ).consume()
+
     @staticmethod
     def _recalculate_counts_by_domain_tx(tx, domain: str):
-        graph_name = f"myGraph_{domain}"
+        graph_name = f"{GDS_GRAPH_PREFIX}_{domain}"
 
         # 4. Projection d'un sous-graphe GDS filtré par domaine
-        #    On ne projette que les relations VOTED de ce domaine
+        #    On ne projette que les relations VOTED de ce domaine,
+        #    en remplaçant celle d'une tentative précédente interrompue
+        tx.run("CALL gds.graph.drop($graphName, false) YIELD graphName", graphName=graph_name).consume()
         tx.run(
             """
             MATCH (u1:User)-[r:VOTED]->(u2:User)
@@ -453,22 +890,32 @@ class VoteRepository:
         )
 
         # 5. Calcul des composantes fortement connexes (SCC) dans ce sous-graphe
-        tx.run(
-            "CALL gds.scc.write($graphName, { writeProperty: 'component' })",
-            graphName=graph_name
-        )
+        #    Résultat streamé et gardé en mémoire (elementId -> composante) :
+        #    aucune propriété partagée n'est écrite sur les nœuds User
+        components = {
+            record["nodeId"]: record["componentId"]
+            for record in tx.run(
+                """
+                CALL gds.scc.stream($graphName)
+                YIELD nodeId, componentId
+                RETURN elementId(gds.util.asNode(nodeId)) AS nodeId, componentId
+                """,
+                graphName=graph_name
+            )
+        }
 
         # 6. Marquage des relations cycliques (dans ce domaine) :
         #    celles dont les deux extrémités sont dans la même composante
         tx.run(
             """
             MATCH (u1:User)-[r:VOTED]->(u2:User)
-            WHERE u1.component = u2.component
-            AND r.domain = $domain
+            WHERE r.domain = $domain
             AND r.current = true
+            AND $components[elementId(u1)] = $components[elementId(u2)]
             SET r.cycle = true
             """,
-            domain=domain
+            domain=domain,
+            components=components
         )
 
         # 7. Tri topologique des nœuds dans ce sous-graphe (DAG)
@@ -519,35 +966,26 @@ class VoteRepository:
 
         # 9. Calcul des poids des cycles :
         #    On trouve les composantes cycliques (taille > 1) et on calcule le “cycle value”
-        comps = tx.run(
-            """
-            MATCH (u:User)
-            WHERE EXISTS {
-                MATCH (u)-[r:VOTED]->()
-                WHERE r.domain = $domain
-                AND r.current = true
-            }
-            WITH u.component AS comp, count(*) AS compSize
-            WHERE compSize > 1
-            RETURN comp, compSize
-            """,
-            domain=domain
-        ).data()
+        members_by_comp: dict[int, list[str]] = {}
+        for node_id, comp in components.items():
+            members_by_comp.setdefault(comp, []).append(node_id)
 
-        for rec in comps:
-            comp = rec["comp"]
-            comp_size = rec["compSize"]
+        for comp, members in members_by_comp.items():
+            comp_size = len(members)
+            if comp_size <= 1:
+                continue
 
             ext_sum_rec = tx.run(
                 """
-                MATCH (src:User)-[r:VOTED]->(dst:User)
-                WHERE dst.component = $comp
-                AND src.component <> $comp
+                MATCH (dst:User)
+                WHERE elementId(dst) IN $members
+                MATCH (src:User)-[r:VOTED]->(dst)
+                WHERE NOT elementId(src) IN $members
                 AND r.domain = $domain
                 AND r.current = true
                 RETURN sum(coalesce(r.count, 0)) AS extSum
                 """,
-                comp=comp,
+                members=members,
                 domain=domain
             ).single()
             ext_sum = ext_sum_rec["extSum"] or 0
@@ -556,28 +994,186 @@ class VoteRepository:
 
             tx.run(
                 """
-                MATCH (a:User)-[rel:VOTED]->(b:User)
-                WHERE a.component = $comp
-                AND b.component = $comp
+                MATCH (a:User)
+                WHERE elementId(a) IN $members
+                MATCH (a)-[rel:VOTED]->(b:User)
+                WHERE elementId(b) IN $members
                 AND rel.domain = $domain
                 AND rel.current = true
                 SET rel.count = $cycleValue
                 """,
-                comp=comp,
+                members=members,
                 domain=domain,
                 cycleValue=cycle_value
             )
 
-        # 10. Nettoyage : suppression de la propriété component sur les nœuds User
-        tx.run("MATCH (u:User) REMOVE u.component")
-
-        # 11. Suppression du graphe GDS projeté pour ce domaine
+        # 10. Suppression du graphe GDS projeté pour ce domaine
         tx.run("CALL gds.graph.drop($graphName) YIELD graphName", graphName=graph_name)
 
+    @staticmethod
+    def _recalculate_counts_by_domain_in_memory_tx(tx, domain: str):
+        # 4. Chargement en une requête de toutes les relations courantes du domaine
+        records = tx.run(
+            """
+            MATCH (u1:User)-[r:VOTED]->(u2:User)
+            WHERE r.domain = $domain
+            AND r.current = true
+            RETURN elementId(r) AS relId, elementId(u1) AS sourceId, elementId(u2) AS targetId
+            """,
+            domain=domain
+        ).data()
+
+        # 5. SCC, tri topologique, propagation et valeur des cycles en mémoire
+        graph = DelegationGraph.from_edges(
+            (record["sourceId"], record["targetId"]) for record in records
+        )
+        counts, cycles = graph.compute_weights()
+
+        # 6. Écriture groupée : seules les relations différentes de l'état
+        #    réinitialisé (count = null, cycle = false) sont mises à jour
+        rows = [
+            {"relId": record["relId"], "count": count, "cycle": cycle}
+            for record, count, cycle in zip(records, counts, cycles)
+            if count is not None or cycle
+        ]
+        if rows:
+            tx.run(
+                """
+                UNWIND $rows AS row
+                MATCH ()-[r:VOTED]->()
+                WHERE elementId(r) = row.relId
+                SET r.count = row.count, r.cycle = row.cycle
+                """,
+                rows=rows
+            )
+
     @staticmethod
     def _cleanup_recalculation_by_domain_tx(tx):
-        # Supprime le graphe global projeté dans GDS
-        tx.run("CALL gds.graph.drop('myGraph') YIELD graphName")
+        # Les poids sont cohérents : le recalcul incrémental peut partir de cet état
+        tx.run(
+            """
+            MERGE (m:RecalculationMeta {id: 'weights'})
+            SET m.lastFullRun = datetime()
+            """
+        )
+
+    # -------------------- RECALCUL INCREMENTAL DES COUNTS --------------------
+
+    @staticmethod
+    def _has_full_recalculation_tx(tx) -> bool:
+        record = tx.run(
+            "MATCH (m:RecalculationMeta {id: 'weights'}) RETURN m.lastFullRun AS lastFullRun"
+        ).single()
+        return record is not None and record["lastFullRun"] is not None
+
+    @staticmethod
+    def _recalculate_counts_incrementally(workers: int = 1, run_id: str | None = None) -> list[dict]:
+        """
+        Recalcule uniquement les zones affectées depuis le dernier recalcul :
+        pour chaque domaine, tout ce qui est en aval d'un utilisateur marqué.
+        Le résultat est identique à un recalcul complet.
+        Reprise naturelle : les marques d'un domaine recalculé sont effacées.
+        """
+        seeds_by_domain = execute_read(VoteRepository._fetch_dirty_seeds_tx)
+
+        ordered = sorted(seeds_by_domain.items(), key=lambda item: len(item[1]), reverse=True)
+        return VoteRepository._process_domains(
+            (VoteRepository._recalculate_counts_incrementally_tx,),
+            {domain: (seeds,) for domain, seeds in ordered},
+            workers,
+            run_id,
+            "recalculate",
+        )
+
+    @staticmethod
+    def _fetch_dirty_seeds_tx(tx) -> dict[str, list[str]]:
+        records = tx.run(
+            """
+            MATCH (u:User)
+            WHERE u.dirtyDomains IS NOT NULL
+            UNWIND u.dirtyDomains AS domain
+            RETURN domain, collect(DISTINCT elementId(u)) AS seeds
+            """
+        )
+        return {record["domain"]: record["seeds"] for record in records}
+
+    @staticmethod
+    def _recalculate_counts_incrementally_tx(tx, domain: str, seeds: list[str]):
+        # 1. Zone affectée : tous les nœuds atteignables depuis les nœuds marqués
+        #    (RETURN DISTINCT permet au planner d'élaguer l'expansion)
+        affected = tx.run(
+            """
+            MATCH (s:User)
+            WHERE elementId(s) IN $seeds
+            MATCH (s)-[:VOTED*0.. {domain: $domain, current: true}]->(n:User)
+            RETURN DISTINCT elementId(n) AS nodeId
+            """,
+            seeds=seeds,
+            domain=domain
+        ).value()
+        affected_set = set(affected)
+
+        # 2. Relations courantes entrant dans la zone : internes (source dans la zone)
+        #    ou frontières (source hors zone, count stocké inchangé)
+        records = tx.run(
+            """
+            UNWIND $nodes AS nodeId
+            MATCH (u1:User)-[r:VOTED]->(u2:User)
+            WHERE elementId(u2) = nodeId
+            AND r.domain = $domain
+            AND r.current = true
+            RETURN elementId(r)  AS relId,
+                   elementId(u1) AS sourceId,
+                   elementId(u2) AS targetId,
+                   r.count       AS count,
+                   r.cycle       AS cycle
+            """,
+            nodes=affected,
+            domain=domain
+        ).data()
+
+        internal = [record for record in records if record["sourceId"] in affected_set]
+        boundary = (
+            (record["targetId"], record["count"], record["cycle"])
+            for record in records
+            if record["sourceId"] not in affected_set
+        )
+
+        # 3. Recalcul en mémoire de la zone
+        counts, cycles = incremental_weights(
+            [(record["sourceId"], record["targetId"]) for record in internal],
+            boundary,
+        )
+
+        # 4. Écriture groupée de toutes les relations internes
+        rows = [
+            {"relId": record["relId"], "count": count, "cycle": cycle}
+            for record, count, cycle in zip(internal, counts, cycles)
+        ]
+        if rows:
+            tx.run(
+                """
+                UNWIND $rows AS row
+                MATCH ()-[r:VOTED]->()
+                WHERE elementId(r) = row.relId
+                SET r.count = row.count, r.cycle = row.cycle
+                """,
+                rows=rows
+            )
+
+        # 5. Le domaine est à jour pour ces utilisateurs
+        tx.run(
+            """
+            MATCH (u:User)
+            WHERE elementId(u) IN $seeds
+            SET u.dirtyDomains = [d IN u.dirtyDomains WHERE d <> $domain]
+            WITH u
+            WHERE size(u.dirtyDomains) = 0
+            REMOVE u.dirtyDomains
+            """,
+            seeds=seeds,
+            domain=domain
+        )
     
 
     # -------------------- VERIFICATION DE LA VALIDITE D'UN VOTE --------------------
@@ -593,9 +1189,7 @@ class VoteRepository:
                 - relIds : la liste des elementId() des relations sur le chemin concerné  
                 - cycle : booléen indiquant si le vote forme un cycle
         """
-        driver = get_driver()
-        with driver.session() as session:
-            return session.execute_write(VoteRepository._check_vote_validity, rel_id)
+        return execute_write(VoteRepository._check_vote_validity, rel_id)
         
 
     @staticmethod
@@ -603,7 +1197,7 @@ class VoteRepository:
         # Récupère le votant, la cible, et le domaine de la relation à valider
         rec = tx.run(
             """
-            MATCH (u:User)-[v:VOTED]->(t:User)
+            MATCH (u)-[v:VOTED]->(t)
             WHERE elementId(v) = $relId
             RETURN elementId(u) AS voterId, v.domain AS domain, t as target
             """,
@@ -618,18 +1212,7 @@ class VoteRepository:
             return 0, [], True
 
         # Recherche du chemin des votes valides à partir de la cible
-        path = tx.run(
-            """
-            MATCH p = ((start:User)-[:VOTED* {domain: $domain, current: true}]->(n:User)
-            WHERE elementId(start) = $startId)
-            WITH nodes(p) AS allNodes, relationships(p) AS allRels
-            ORDER BY length(p) DESC
-            LIMIT 1
-            RETURN allNodes, allRels
-            """,
-            startId=target.element_id,
-            domain=domain
-        ).single()
+        path = VoteRepository._find_delegation_path_tx(tx, target.element_id, domain)
         nodes = path["allNodes"] or [] if path else []
         rels = path["allRels"] or [] if path else []
 
@@ -705,6 +1288,275 @@ class VoteRepository:
         return incoming + 1, [rel.element_id for rel in rels], cycle
     
 
+    @staticmethod
+    def _find_delegation_path_tx(tx, start_id: str, domain: str):
+        """
+        Plus long chemin de relations courantes partant de `start_id`
+        (record {allNodes, allRels}, ou None s'il n'y en a pas).
+
+        Si la relation courante du départ est indexée (chainDepth), le chemin
+        est la chaîne de successeurs de longueur connue : une seule expansion
+        de longueur fixe. Sinon (index absent, nœud avec plusieurs relations
+        courantes), on énumère tous les chemins.
+        """
+        head = tx.run(
+            """
+            MATCH (start:User)-[r:VOTED {domain: $domain, current: true}]->(:User)
+            WHERE elementId(start) = $startId
+            RETURN count(r) AS outCount, collect(r.chainDepth)[0] AS depth
+            """,
+            startId=start_id,
+            domain=domain
+        ).single()
+
+        if head["outCount"] == 0:
+            return None
+
+        if head["outCount"] == 1 and head["depth"] is not None:
+            depth = int(head["depth"])
+            path = tx.run(
+                f"""
+                MATCH p = ((start:User)-[:VOTED*{depth}..{depth} {{domain: $domain, current: true}}]->(n:User)
+                WHERE elementId(start) = $startId)
+                RETURN nodes(p) AS allNodes, relationships(p) AS allRels
+                LIMIT 1
+                """,
+                startId=start_id,
+                domain=domain
+            ).single()
+            if path is not None:
+                return path
+
+        return tx.run(
+            """
+            MATCH p = ((start:User)-[:VOTED* {domain: $domain, current: true}]->(n:User)
+            WHERE elementId(start) = $startId)
+            WITH nodes(p) AS allNodes, relationships(p) AS allRels
+            ORDER BY length(p) DESC
+            LIMIT 1
+            RETURN allNodes, allRels
+            """,
+            startId=start_id,
+            domain=domain
+        ).single()
+
+
+    # -------------------- INDEX DES CHAINES DE DELEGATION --------------------
+
+    @staticmethod
+    def _refresh_chain_index_tx(tx, domain: str, seed_ids: list[str] | None = None):
+        """
+        Recalcule chainDepth / chainRoot des relations courantes du domaine.
+
+        :param seed_ids: elementId() des votants dont la relation courante a
+            changé ; seul leur amont est recalculé. None : tout le domaine.
+        """
+        if seed_ids is None:
+            records = tx.run(
+                """
+                MATCH (a:User)-[r:VOTED]->(b:User)
+                WHERE r.domain = $domain
+                AND r.current = true
+                RETURN elementId(r) AS relId, a.id AS sourceId, b.id AS targetId
+                """,
+                domain=domain
+            ).data()
+            exits = {}
+        else:
+            # Zone : les votants modifiés et tous ceux qui leur délèguent
+            zone = tx.run(
+                """
+                MATCH (s:User)
+                WHERE elementId(s) IN $seeds
+                MATCH (a:User)-[:VOTED*0.. {domain: $domain, current: true}]->(s)
+                RETURN DISTINCT elementId(a) AS nodeId
+                """,
+                seeds=seed_ids,
+                domain=domain
+            ).value()
+            zone_ids = set(zone)
+
+            # Relations courantes de la zone, avec l'index déjà stocké de leur cible
+            records = tx.run(
+                """
+                UNWIND $nodes AS nodeId
+                MATCH (a:User)-[r:VOTED]->(b:User)
+                WHERE elementId(a) = nodeId
+                AND r.domain = $domain
+                AND r.current = true
+                OPTIONAL MATCH (b)-[next:VOTED {domain: $domain, current: true}]->(:User)
+                WITH r, a, b, collect(next) AS nexts
+                RETURN elementId(r) AS relId,
+                       a.id         AS sourceId,
+                       b.id         AS targetId,
+                       elementId(b) AS targetNodeId,
+                       size(nexts)  AS nextCount,
+                       CASE WHEN size(nexts) = 1 THEN nexts[0].chainDepth END AS nextDepth,
+                       CASE WHEN size(nexts) = 1 THEN nexts[0].chainRoot END  AS nextRoot
+                """,
+                nodes=zone,
+                domain=domain
+            ).data()
+
+            exits = {}
+            for record in records:
+                if record["targetNodeId"] in zone_ids or record["nextCount"] == 0:
+                    continue
+                if record["nextDepth"] is None:
+                    exits[record["targetId"]] = (None, None)
+                else:
+                    exits[record["targetId"]] = (record["nextDepth"], record["nextRoot"])
+
+        index = chain_index(
+            ((record["sourceId"], record["targetId"]) for record in records), exits
+        )
+        rows = [
+            {"relId": record["relId"], "depth": depth, "root": root}
+            for record, (depth, root) in zip(records, index)
+        ]
+        if rows:
+            tx.run(
+                """
+                UNWIND $rows AS row
+                MATCH ()-[r:VOTED]->()
+                WHERE elementId(r) = row.relId
+                SET r.chainDepth = row.depth, r.chainRoot = row.root
+                """,
+                rows=rows
+            )
+
+
+    # -------------------- VALIDATION GROUPEE DES VOTES --------------------
+
+    @staticmethod
+    def validate_votes_batch(rel_ids: list[str]) -> list[str]:
+        """
+        Valide une liste de votes (elementId() des relations VOTED) dans l'ordre donné,
+        avec la même logique que check_vote_validity + mark_vote_valid + update_counts,
+        mais en chargeant une seule fois le graphe de chaque domaine.
+
+        Les votes validés et les counts modifiés sont écrits en quelques UNWIND.
+        Les votes invalides ne sont pas marqués : leurs identifiants sont retournés.
+        """
+        votes = execute_read(VoteRepository._fetch_votes_details_tx, rel_ids)
+
+        # Regroupement par domaine en conservant l'ordre (mélangé) des votes
+        votes_by_domain: dict[str, list[dict]] = {}
+        for vote in votes:
+            votes_by_domain.setdefault(vote["domain"], []).append(vote)
+
+        rejected: list[str] = []
+        for domain, domain_votes in votes_by_domain.items():
+            rejected.extend(execute_write(
+                VoteRepository._validate_votes_batch_tx, domain, domain_votes
+            ))
+        return rejected
+
+    @staticmethod
+    def _fetch_votes_details_tx(tx, rel_ids: list[str]) -> list[dict]:
+        # Détails des votes à valider, dans l'ordre de la liste fournie
+        records = tx.run(
+            """
+            UNWIND range(0, size($ids) - 1) AS position
+            MATCH (u:User)-[v:VOTED]->(t:User)
+            WHERE elementId(v) = $ids[position]
+            RETURN position,
+                   elementId(v) AS relId,
+                   elementId(u) AS voterId,
+                   elementId(t) AS targetId,
+                   v.domain     AS domain,
+                   u.threshold  AS voterThreshold,
+                   t.threshold  AS targetThreshold
+            ORDER BY position
+            """,
+            ids=rel_ids
+        ).data()
+        return records
+
+    @staticmethod
+    def _validate_votes_batch_tx(tx, domain: str, votes: list[dict]) -> list[str]:
+        # 1. Chargement du sous-graphe courant du domaine
+        records = tx.run(
+            """
+            MATCH (u1:User)-[r:VOTED]->(u2:User)
+            WHERE r.domain = $domain
+            AND r.current = true
+            RETURN elementId(r)  AS relId,
+                   elementId(u1) AS sourceId,
+                   elementId(u2) AS targetId,
+                   r.count       AS count,
+                   r.cycle       AS cycle,
+                   u1.threshold  AS sourceThreshold,
+                   u2.threshold  AS targetThreshold
+            """,
+            domain=domain
+        )
+
+        thresholds: dict[str, int | None] = {}
+        edges = []
+        for record in records:
+            thresholds[record["sourceId"]] = record["sourceThreshold"]
+            thresholds[record["targetId"]] = record["targetThreshold"]
+            edges.append(record)
+        for vote in votes:
+            thresholds[vote["voterId"]] = vote["voterThreshold"]
+            thresholds[vote["targetId"]] = vote["targetThreshold"]
+
+        validator = DomainVoteValidator(thresholds)
+        for record in edges:
+            validator.add_edge(
+                record["relId"], record["sourceId"], record["targetId"],
+                record["count"], record["cycle"],
+            )
+
+        # 2. Vérification + application des votes un par un, en mémoire
+        rejected = validator.validate(
+            (vote["relId"], vote["voterId"], vote["targetId"]) for vote in votes
+        )
+
+        # 3. Écritures groupées : votes validés, puis counts du chemin modifiés
+        created = validator.created_rows()
+        if created:
+            tx.run(
+                """
+                UNWIND $rows AS row
+                MATCH ()-[v:VOTED]->()
+                WHERE elementId(v) = row.relId
+                SET v.processed = true,
+                    v.valid = true,
+                    v.current = true,
+                    v.count = row.count,
+                    v.cycle = row.cycle
+                WITH [startNode(v), endNode(v)] AS ends
+                UNWIND ends AS n
+                SET n.dirtyDomains = coalesce(n.dirtyDomains, [])
+                    + [d IN [$domain] WHERE NOT d IN coalesce(n.dirtyDomains, [])]
+                """,
+                rows=created,
+                domain=domain
+            )
+
+        updated = validator.updated_rows()
+        if updated:
+            tx.run(
+                """
+                UNWIND $rows AS row
+                MATCH ()-[v:VOTED]->()
+                WHERE elementId(v) = row.relId
+                SET v.count = row.count, v.cycle = row.cycle
+                """,
+                rows=updated
+            )
+
+        # 4. Index de chaîne en amont des nouveaux votants
+        if created:
+            rejected_ids = set(rejected)
+            voters = {vote["voterId"] for vote in votes if vote["relId"] not in rejected_ids}
+            VoteRepository._refresh_chain_index_tx(tx, domain, list(voters))
+
+        return rejected
+
+
     # -------------------- MISE A JOUR DES COUNTS D'UN NOUVEAU VOTE VALIDE --------------------
 
     @staticmethod
@@ -718,15 +1570,13 @@ class VoteRepository:
         :param relIds: liste d’elementId() des relations sur le chemin  
         :param cycle: booléen indiquant si c’est un cycle
         """
-        driver = get_driver()
-        with driver.session() as session:
-            session.execute_write(VoteRepository._update_counts, rel_id, count, rel_ids, cycle)
+        execute_write(VoteRepository._update_counts, rel_id, count, rel_ids, cycle)
 
     @staticmethod
     def _update_counts(tx, rel_id: str, count: int, rel_ids: list[str], cycle: bool):
         tx.run(
             """
-            MATCH (:User)-[v:VOTED]->(:User)
+            MATCH ()-[v:VOTED]->()
             WHERE elementId(v) = $relId
             SET v.count = $count, v.cycle = $cycle
             """,
@@ -739,8 +1589,9 @@ class VoteRepository:
             # Si c’est un cycle, on met le même count a toutes les relations du chemin
             tx.run(
                 """
-                MATCH (:User)-[v:VOTED]->(:User)
-                WHERE elementId(v) IN $relIds
+                UNWIND $relIds AS relId
+                MATCH ()-[v:VOTED]->()
+                WHERE elementId(v) = relId
                 SET v.count = $count, v.cycle = true
                 """,
                 relIds=rel_ids,
@@ -751,8 +1602,9 @@ class VoteRepository:
             # Sinon, on incrémente le count des relations du chemin
             tx.run(
                 """
-                MATCH (:User)-[v:VOTED]->(:User)
-                WHERE elementId(v) IN $relIds
+                UNWIND $relIds AS relId
+                MATCH ()-[v:VOTED]->()
+                WHERE elementId(v) = relId
                 SET v.count = v.count + $count
                 """,
                 relIds=rel_ids,
@@ -765,113 +1617,306 @@ class VoteRepository:
     @staticmethod
     def append_daily_stats(date: datetime.date | None = None) -> int:
         """
-        Pour chaque User, ajoute dans la map `stats` une entrée dont la clé est la date (YYYY-MM-DD)
-        et la valeur est le nombre de voix reçues ce jour :
+        Écrit l'instantané du jour : pour chaque User ayant reçu des votes, un nœud
+        (:DailyStat {userId, date, domain, count}) par domaine, avec comme count :
           - si l'utilisateur a au moins une relation entrante VOTED current=true avec cycle=true,
-            on prend la valeur `count` de l'une de ces relations (elles ont la même valeur pour un cycle),
-          - sinon on prend la somme des `count` de toutes les relations entrantes current=true.
+            la valeur `count` de l'une de ces relations (elles ont la même valeur pour un cycle),
+          - sinon la somme des `count` de toutes les relations entrantes current=true.
+        Les nœuds déjà écrits pour cette date sont remplacés (relance possible).
+        Les cumuls MonthlyStat du mois sont mis à jour dans la même transaction ;
+        ils sont reconstruits entièrement s'ils n'existent pas encore.
         Retourne le nombre d'utilisateurs mis à jour.
         """
         if date is None:
             date = datetime.date.today()
         date_str = date.isoformat()
 
-        driver = get_driver()
-        with driver.session() as session:
-            return session.execute_write(VoteRepository._append_daily_stats_tx, date_str)
+        updated, monthly_ready = execute_write(VoteRepository._append_daily_stats_tx, date_str)
+        if not monthly_ready:
+            VoteRepository.rebuild_monthly_stats()
+        return updated
 
     @staticmethod
-    def _append_daily_stats_tx(tx, date_str: str) -> int:
+    def _append_daily_stats_tx(tx, date_str: str) -> tuple[int, bool]:
+        meta = tx.run(
+            "MATCH (m:StatsMeta {id: 'daily_stats'}) RETURN m.monthlyReady AS monthlyReady"
+        ).single()
+        monthly_ready = meta is not None and meta["monthlyReady"] is True
+
+        if monthly_ready:
+            # Retire du cumul mensuel l'instantané remplacé (relance pour la même date)
+            tx.run(
+                """
+                MATCH (s:DailyStat {date: $dateStr})
+                MATCH (m:MonthlyStat {userId: s.userId, month: substring($dateStr, 0, 7), domain: s.domain})
+                SET m.count = m.count - coalesce(s.count, 0)
+                """,
+                dateStr=date_str,
+            )
+
+        tx.run(
+            "MATCH (s:DailyStat {date: $dateStr}) DELETE s",
+            dateStr=date_str,
+        )
+
         res = tx.run(
             """
-            MATCH (u:User)
-            OPTIONAL MATCH (u)<-[r:VOTED {current: true}]-(:User)
-            WITH u, collect(r) AS rels
-            UNWIND [d IN [x IN rels | x.domain] WHERE d IS NOT NULL] AS domain
-            WITH u, domain, [x IN rels WHERE x.domain = domain] AS relsByDomain
+            MATCH (:User)-[r:VOTED {current: true}]->(u:User)
+            WHERE r.domain IS NOT NULL
+            WITH u, r.domain AS domain, collect(r) AS relsByDomain
             WITH u, domain,
                  [x IN relsByDomain WHERE coalesce(x.cycle, false) = true] AS cycles,
                  reduce(total = 0, y IN relsByDomain | total + coalesce(y.count, 0)) AS totalSum
-            WITH u, domain,
-                 CASE WHEN size(cycles) > 0 THEN cycles[0].count ELSE totalSum END AS votes
-            WITH u, collect([domain, votes]) AS entries
-            WITH u, apoc.map.fromPairs(entries) AS domainMap
-            SET u.stats = apoc.convert.toJson(
-                apoc.map.setKey(
-                    apoc.convert.fromJsonMap(coalesce(u.stats, '{}')),
-                    $dateStr,
-                    domainMap
-                )
-            )
-            WITH count(u) AS updated
+            CREATE (:DailyStat {
+                userId: u.id,
+                date:   $dateStr,
+                domain: domain,
+                count:  CASE WHEN size(cycles) > 0 THEN cycles[0].count ELSE totalSum END
+            })
+            WITH count(DISTINCT u) AS updated, collect(DISTINCT domain) AS domains
             MERGE (m:StatsMeta {id: 'daily_stats'})
-            SET m.lastDate = $dateStr
+            SET m.lastDate = $dateStr,
+                m.domains  = domains
             RETURN updated
             """,
             dateStr=date_str,
         ).single()
 
-        return int(res["updated"]) if res is not None else 0
-    
+        if monthly_ready:
+            tx.run(
+                """
+                MATCH (s:DailyStat {date: $dateStr})
+                MERGE (m:MonthlyStat {userId: s.userId, month: substring($dateStr, 0, 7), domain: s.domain})
+                ON CREATE SET m.count = 0
+                SET m.count = m.count + s.count
+                """,
+                dateStr=date_str,
+            )
+            # Cumuls vidés par la relance : plus aucun DailyStat dans le mois
+            tx.run(
+                """
+                MATCH (m:MonthlyStat)
+                WHERE m.month = substring($dateStr, 0, 7)
+                AND m.count = 0
+                AND NOT EXISTS {
+                    MATCH (s:DailyStat)
+                    WHERE s.userId = m.userId
+                    AND s.domain = m.domain
+                    AND s.date STARTS WITH m.month
+                }
+                DELETE m
+                """,
+                dateStr=date_str,
+            )
 
-    # -------------------- RECUPERATION DES STATS DE VOTES --------------------
+        return (int(res["updated"]) if res is not None else 0), monthly_ready
 
-    def get_daily_votes_to_user(user_id: uuid4, days: int = 30) -> tuple[list[dict], bool]:
+    @staticmethod
+    def rebuild_monthly_stats(batch_size: int = 500) -> int:
         """
-        Retourne une liste d'objets { date: 'YYYY-MM-DD', count: int, byDomain: {domain:count} }
-        triée par date décroissante, limitée à `days`.
-        Lit la propriété u.stats (JSON string) et la parse côté application.
+        Recalcule tous les nœuds MonthlyStat à partir des DailyStat, par lots
+        de `batch_size` utilisateurs, puis pose StatsMeta.monthlyReady.
+        Retourne le nombre de nœuds MonthlyStat écrits.
         """
-        drv = get_driver()
-        with drv.session() as session:
-            return session.execute_read(VoteRepository._get_daily_votes_to_user_tx, user_id, days)
+        written = 0
+        after = ""
+        while True:
+            rebuilt, after = execute_write(
+                VoteRepository._rebuild_monthly_stats_tx, after, batch_size
+            )
+            if after is None:
+                break
+            written += rebuilt
+
+        execute_write(VoteRepository._set_monthly_ready_tx)
+        return written
 
     @staticmethod
-    def _get_daily_votes_to_user_tx(tx, user_id: str, days: int) -> tuple[list[dict], bool]:
-        meta = tx.run("MATCH (m:StatsMeta {id: 'daily_stats'}) RETURN m.lastDate AS lastDate").single()
-        last_date_str = meta["lastDate"] if meta and meta["lastDate"] is not None else None
-        try:
-            last_date = datetime.date.fromisoformat(last_date_str) if last_date_str else datetime.date.today()
-        except Exception:
-            last_date = datetime.date.today()
-        
-        rec = tx.run(
+    def _rebuild_monthly_stats_tx(tx, after: str, batch_size: int) -> tuple[int, str | None]:
+        user_ids = tx.run(
             """
-            MATCH (u:User {id: $userId})
-            RETURN u.stats AS stats, u.publishVotes AS publishVotes
+            MATCH (s:DailyStat)
+            WHERE s.userId > $after
+            WITH DISTINCT s.userId AS userId
+            ORDER BY userId
+            LIMIT $batchSize
+            RETURN userId
+            """,
+            after=after,
+            batchSize=batch_size
+        ).value()
+        if not user_ids:
+            return 0, None
+
+        tx.run(
+            "MATCH (m:MonthlyStat) WHERE m.userId IN $userIds DELETE m",
+            userIds=user_ids
+        )
+        res = tx.run(
+            """
+            MATCH (s:DailyStat)
+            WHERE s.userId IN $userIds
+            WITH s.userId AS userId, substring(s.date, 0, 7) AS month, s.domain AS domain,
+                 sum(coalesce(s.count, 0)) AS count
+            CREATE (:MonthlyStat {userId: userId, month: month, domain: domain, count: count})
+            RETURN count(*) AS written
             """,
-            userId=user_id
+            userIds=user_ids
         ).single()
-        stats_json = rec["stats"] if rec is not None else None
-        if not stats_json:
-            return []
 
-        try:
-            stats_map = json.loads(stats_json)
-        except Exception:
-            return []
+        return int(res["written"]), user_ids[-1]
 
-        cutoff = last_date - datetime.timedelta(days=days-1)
-        # domain -> list of {date, count}
-        domain_series: dict[str, list[dict]] = {}
+    @staticmethod
+    def _set_monthly_ready_tx(tx):
+        tx.run(
+            """
+            MERGE (m:StatsMeta {id: 'daily_stats'})
+            SET m.monthlyReady = true
+            """
+        )
 
-        for date_str, domain_map in stats_map.items():
+    @staticmethod
+    def migrate_json_stats(batch_size: int = 500, keep_json: bool = False) -> int:
+        """
+        Migration unique : convertit l'ancienne propriété JSON `u.stats`
+        ({date: {domain: count}}) en nœuds DailyStat.
+        Retourne le nombre de nœuds DailyStat écrits.
+        """
+        written = 0
+        after = ""
+        while True:
+            migrated, after = execute_write(
+                VoteRepository._migrate_json_stats_tx, after, batch_size, keep_json
+            )
+            if after is None:
+                return written
+            written += migrated
+
+    @staticmethod
+    def _migrate_json_stats_tx(tx, after: str, batch_size: int, keep_json: bool) -> tuple[int, str | None]:
+        # Lot suivant d'utilisateurs ayant encore des stats JSON, dans l'ordre des ids
+        users = tx.run(
+            """
+            MATCH (u:User)
+            WHERE u.stats IS NOT NULL
+            AND u.id > $after
+            RETURN u.id AS userId, u.stats AS stats
+            ORDER BY u.id
+            LIMIT $batchSize
+            """,
+            after=after,
+            batchSize=batch_size
+        ).data()
+        if not users:
+            return 0, None
+
+        rows = []
+        for user in users:
             try:
-                d = datetime.date.fromisoformat(date_str)
+                stats_map = json.loads(user["stats"])
             except Exception:
                 continue
-            if d < cutoff or d > last_date:
-                continue
-            if not isinstance(domain_map, dict):
+            if not isinstance(stats_map, dict):
                 continue
-            for dom, v in domain_map.items():
-                try:
-                    val = int(v)
-                except Exception:
-                    val = 0
-                if dom not in domain_series:
-                    domain_series[dom] = []
-                domain_series[dom].append({"date": date_str, "count": val})
+            for date_str, domain_map in stats_map.items():
+                if not isinstance(domain_map, dict):
+                    continue
+                for dom, v in domain_map.items():
+                    try:
+                        val = int(v)
+                    except Exception:
+                        val = 0
+                    rows.append({"userId": user["userId"], "date": date_str, "domain": dom, "count": val})
+
+        tx.run(
+            """
+            UNWIND $rows AS row
+            MERGE (s:DailyStat {userId: row.userId, date: row.date, domain: row.domain})
+            SET s.count = row.count
+            """,
+            rows=rows
+        )
+
+        if not keep_json:
+            tx.run(
+                """
+                MATCH (u:User)
+                WHERE u.id IN $userIds
+                REMOVE u.stats
+                """,
+                userIds=[user["userId"] for user in users]
+            )
+
+        return len(rows), users[-1]["userId"]
+    
+
+    # -------------------- RECUPERATION DES STATS DE VOTES --------------------
+
+    _STATS_META_QUERY = """
+            MATCH (m:StatsMeta {id: 'daily_stats'})
+            RETURN m.lastDate AS lastDate, m.monthlyReady AS monthlyReady
+            """
+
+    @staticmethod
+    def _get_stats_last_date_tx(tx) -> datetime.date:
+        meta = tx.run(VoteRepository._STATS_META_QUERY).single()
+        return VoteRepository._stats_last_date(meta)
+
+    @staticmethod
+    def _stats_last_date(meta) -> datetime.date:
+        # Date du dernier instantané (aujourd'hui si absente ou illisible)
+        last_date_str = meta["lastDate"] if meta and meta["lastDate"] is not None else None
+        try:
+            return datetime.date.fromisoformat(last_date_str) if last_date_str else datetime.date.today()
+        except Exception:
+            return datetime.date.today()
+
+    @staticmethod
+    def get_daily_votes_to_user(user_id: uuid4, days: int = 30) -> tuple[list[dict], bool]:
+        """
+        Retourne une liste d'objets { domain, series: [{date: 'YYYY-MM-DD', count: int}] },
+        séries triées par date décroissante, limitées aux `days` derniers jours.
+        Ne lit que les nœuds DailyStat de la période.
+        """
+        return execute_read(VoteRepository._get_daily_votes_to_user_tx, user_id, days)
+
+    _PUBLISH_VOTES_QUERY = """
+            MATCH (u:User {id: $userId})
+            RETURN u.publishVotes AS publishVotes
+            """
+
+    _DAILY_STATS_QUERY = """
+            MATCH (s:DailyStat)
+            WHERE s.userId = $userId
+            AND s.date >= $cutoff
+            AND s.date <= $lastDate
+            RETURN s.date AS date, s.domain AS domain, s.count AS count
+            """
+
+    @staticmethod
+    def _get_daily_votes_to_user_tx(tx, user_id: str, days: int) -> tuple[list[dict], bool]:
+        last_date = VoteRepository._get_stats_last_date_tx(tx)
+        cutoff = last_date - datetime.timedelta(days=days-1)
+
+        rec = tx.run(VoteRepository._PUBLISH_VOTES_QUERY, userId=user_id).single()
+        publish_votes = rec["publishVotes"] if rec is not None else False
+
+        res = tx.run(
+            VoteRepository._DAILY_STATS_QUERY,
+            userId=user_id,
+            cutoff=cutoff.isoformat(),
+            lastDate=last_date.isoformat()
+        )
+        return (VoteRepository._daily_series(res), publish_votes)
+
+    @staticmethod
+    def _daily_series(records) -> list[dict]:
+        # domain -> list of {date, count}
+        domain_series: dict[str, list[dict]] = {}
+        for rec in records:
+            domain_series.setdefault(rec["domain"], []).append(
+                {"date": rec["date"], "count": int(rec["count"] or 0)}
+            )
 
         # trier chaque série par date décroissante
         result: list[dict] = []
@@ -881,7 +1926,7 @@ class VoteRepository:
 
         # trier domaines par somme décroissante (utile pour présentation)
         result.sort(key=lambda entry: sum(item["count"] for item in entry["series"]), reverse=True)
-        return (result, rec["publishVotes"] if rec is not None else False)
+        return result
 
     @staticmethod
     def get_monthly_votes_to_user(user_id: str, months: int = 12) -> List[dict]:
@@ -889,62 +1934,60 @@ class VoteRepository:
         Agrège les valeurs journalières en mois (année, mois, count) et retourne
         une liste triée par (year, month) décroissant limitée à `months`.
         """
-        drv = get_driver()
-        with drv.session() as session:
-            return session.execute_read(VoteRepository._get_monthly_votes_to_user_tx, user_id, months)
-
-    @staticmethod
-    def _get_monthly_votes_to_user_tx(tx, user_id: str, months: int) -> List[dict]:
-        meta = tx.run("MATCH (m:StatsMeta {id: 'daily_stats'}) RETURN m.lastDate AS lastDate").single()
-        last_date_str = meta["lastDate"] if meta and meta["lastDate"] is not None else None
-        try:
-            last_date = datetime.date.fromisoformat(last_date_str) if last_date_str else datetime.date.today()
-        except Exception:
-            last_date = datetime.date.today()
+        return execute_read(VoteRepository._get_monthly_votes_to_user_tx, user_id, months)
+
+    _MONTHLY_STATS_QUERY = """
+                MATCH (m:MonthlyStat)
+                WHERE m.userId = $userId
+                AND m.month <= $lastMonth
+                WITH m
+                ORDER BY m.month DESC
+                WITH m.domain AS domain, collect(m)[..$months] AS stats
+                UNWIND stats AS m
+                RETURN domain,
+                       toInteger(substring(m.month, 0, 4)) AS year,
+                       toInteger(substring(m.month, 5, 2)) AS month,
+                       m.count AS count
+                """
 
-        rec = tx.run(
-            """
-            MATCH (u:User {id: $userId})
-            RETURN u.stats AS stats
-            """,
-            userId=user_id
-        ).single()
-        stats_json = rec["stats"] if rec is not None else None
-        if not stats_json:
-            return []
+    _MONTHLY_FROM_DAILY_QUERY = """
+                MATCH (s:DailyStat)
+                WHERE s.userId = $userId
+                AND s.date <= $lastDate
+                RETURN s.domain AS domain,
+                       toInteger(substring(s.date, 0, 4)) AS year,
+                       toInteger(substring(s.date, 5, 2)) AS month,
+                       sum(coalesce(s.count, 0)) AS count
+                """
 
-        try:
-            stats_map = json.loads(stats_json)
-        except Exception:
-            return []
+    @staticmethod
+    def _monthly_query(meta, user_id: str, months: int) -> tuple[str, dict]:
+        last_date = VoteRepository._stats_last_date(meta)
+        if meta is not None and meta["monthlyReady"] is True:
+            # Cumuls mensuels : au plus `months` valeurs par domaine
+            return VoteRepository._MONTHLY_STATS_QUERY, {
+                "userId": user_id, "lastMonth": last_date.isoformat()[:7], "months": months,
+            }
+        # Avant la première reconstruction : agrégation des DailyStat (date au format YYYY-MM-DD)
+        return VoteRepository._MONTHLY_FROM_DAILY_QUERY, {"userId": user_id, "lastDate": last_date.isoformat()}
 
-        monthly_per_domain: dict[str, dict[tuple[int,int], int]] = {}
+    @staticmethod
+    def _get_monthly_votes_to_user_tx(tx, user_id: str, months: int) -> List[dict]:
+        meta = tx.run(VoteRepository._STATS_META_QUERY).single()
+        query, params = VoteRepository._monthly_query(meta, user_id, months)
+        return VoteRepository._monthly_series(tx.run(query, **params), months)
 
-        for date_str, domain_map in stats_map.items():
-            try:
-                d = datetime.date.fromisoformat(date_str)
-            except Exception:
-                continue
-            if d > last_date:
-                continue
-            if not isinstance(domain_map, dict):
-                continue
-            year_month = (d.year, d.month)
-            for dom, v in domain_map.items():
-                try:
-                    val = int(v)
-                except Exception:
-                    val = 0
-                monthly_per_domain.setdefault(dom, {})
-                monthly_per_domain[dom][year_month] = monthly_per_domain[dom].get(year_month, 0) + val
+    @staticmethod
+    def _monthly_series(records, months: int) -> List[dict]:
+        monthly_per_domain: dict[str, list[dict]] = {}
+        for rec in records:
+            monthly_per_domain.setdefault(rec["domain"], []).append(
+                {"year": rec["year"], "month": rec["month"], "count": rec["count"]}
+            )
 
         # construire le résultat : pour chaque domaine une série triée (year,month) desc
         result: list[dict] = []
-        for dom, map_ym in monthly_per_domain.items():
-            series = [
-                {"year": ym[0], "month": ym[1], "count": cnt}
-                for ym, cnt in map_ym.items()
-            ]
+        for dom, series in monthly_per_domain.items():
             series.sort(key=lambda e: (e["year"], e["month"]), reverse=True)
             result.append({"domain": dom, "series": series[:months]})
 
@@ -958,109 +2001,307 @@ class VoteRepository:
         Pour un domaine donné, retourne les top 10 users (sur la période `days`)
         avec pour chacun la série journalière [{date, count}] (triée décroissante).
         """
-        drv = get_driver()
-        with drv.session() as session:
-            return session.execute_read(VoteRepository._get_chart_for_domain_tx, domain, days)
+        return execute_read(VoteRepository._get_chart_for_domain_tx, domain, days)
+
+    _CHART_QUERY = """
+            MATCH (s:DailyStat)
+            WHERE s.domain = $domain
+            AND s.date >= $cutoff
+            AND s.date <= $lastDate
+            AND s.count > 0
+            RETURN s.userId AS userId, s.date AS date, s.count AS count
+            """
 
     @staticmethod
     def _get_chart_for_domain_tx(tx, domain: str, days: int) -> List[dict]:
-        meta = tx.run("MATCH (m:StatsMeta {id: 'daily_stats'}) RETURN m.lastDate AS lastDate").single()
-        last_date_str = meta["lastDate"] if meta and meta["lastDate"] is not None else None
-        try:
-            last_date = datetime.date.fromisoformat(last_date_str) if last_date_str else datetime.date.today()
-        except Exception:
-            last_date = datetime.date.today()
+        last_date = VoteRepository._get_stats_last_date_tx(tx)
+        cutoff = last_date - datetime.timedelta(days=days-1)
 
-        # Récupère tous les users qui ont une propriété stats
+        # Récupère les instantanés du domaine sur la période
         res = tx.run(
+            VoteRepository._CHART_QUERY,
+            domain=domain,
+            cutoff=cutoff.isoformat(),
+            lastDate=last_date.isoformat()
+        )
+
+        return VoteRepository._rank_chart_entries(res, LEADERBOARD_SIZE)
+
+    @staticmethod
+    def _rank_chart_entries(entries, limit: int) -> List[dict]:
+        # entries : {userId, date, count} ; retourne le top `limit` par total,
+        # chaque série triée par date décroissante
+        entries = list(entries)
+        totals: dict[str, int] = {}
+        for rec in entries:
+            totals[rec["userId"]] = totals.get(rec["userId"], 0) + rec["count"]
+
+        # top par total desc (à égalité, ordre d'apparition) ; séries construites pour le top seulement
+        top = {
+            user_id: {"userId": user_id, "total": totals[user_id], "votes": []}
+            for user_id in heapq.nlargest(limit, totals, key=totals.get)
+        }
+        for rec in entries:
+            entry = top.get(rec["userId"])
+            if entry is not None:
+                entry["votes"].append({"date": rec["date"], "count": rec["count"]})
+        for entry in top.values():
+            entry["votes"].sort(key=lambda e: e["date"], reverse=True)
+        return list(top.values())
+
+    # -------------------- CLASSEMENTS PRE-CALCULES --------------------
+
+    @staticmethod
+    def build_leaderboards(date: datetime.date | None = None) -> int:
+        """
+        Matérialise, pour chaque domaine et chaque fenêtre de LEADERBOARD_WINDOWS,
+        le graphique des LEADERBOARD_SIZE utilisateurs les plus votés.
+        À appeler après append_daily_stats. Retourne le nombre de classements écrits.
+        """
+        if date is None:
+            date = datetime.date.today()
+
+        return execute_write(VoteRepository._build_leaderboards_tx, date)
+
+    @staticmethod
+    def _build_leaderboards_tx(tx, date: datetime.date) -> int:
+        # Une seule lecture couvrant la plus grande fenêtre, tous domaines confondus
+        cutoff = date - datetime.timedelta(days=max(LEADERBOARD_WINDOWS) - 1)
+        entries_by_domain: dict[str, list[dict]] = {}
+        for rec in tx.run(
             """
-            MATCH (u:User)
-            WHERE u.stats IS NOT NULL
-            RETURN u.id AS userId, u.stats AS stats
+            MATCH (s:DailyStat)
+            WHERE s.date >= $cutoff
+            AND s.date <= $date
+            AND s.count > 0
+            RETURN s.domain AS domain, s.userId AS userId, s.date AS date, s.count AS count
+            """,
+            cutoff=cutoff.isoformat(),
+            date=date.isoformat()
+        ):
+            entries_by_domain.setdefault(rec["domain"], []).append(
+                {"userId": rec["userId"], "date": rec["date"], "count": rec["count"]}
+            )
+
+        rows = []
+        for days in LEADERBOARD_WINDOWS:
+            window_start = (date - datetime.timedelta(days=days - 1)).isoformat()
+            for domain, entries in entries_by_domain.items():
+                top = VoteRepository._rank_chart_entries(
+                    (entry for entry in entries if entry["date"] >= window_start), LEADERBOARD_SIZE
+                )
+                rows.append({"domain": domain, "days": days, "users": json.dumps(top)})
+
+        # Seul le dernier classement est conservé
+        tx.run("MATCH (b:Leaderboard) DELETE b")
+        tx.run(
             """
+            UNWIND $rows AS row
+            CREATE (:Leaderboard {domain: row.domain, days: row.days, date: $date, users: row.users})
+            WITH count(*) AS written
+            MERGE (m:StatsMeta {id: 'daily_stats'})
+            SET m.leaderboardDate = $date
+            """,
+            rows=rows,
+            date=date.isoformat()
         )
+        return len(rows)
 
-        cutoff = last_date - datetime.timedelta(days=days-1)
-        per_user = []
-        for rec in res:
-            user_id = rec["userId"]
-            stats_json = rec["stats"]
-            try:
-                stats_map = json.loads(stats_json)
-            except Exception:
-                continue
+    @staticmethod
+    def get_leaderboards(days: int) -> dict[str, List[dict]] | None:
+        """
+        Classements pré-calculés de tous les domaines pour la fenêtre `days`
+        ({domain: users}), ou None si cette fenêtre n'est pas matérialisée
+        pour la dernière date de stats (l'appelant calcule alors en direct).
+        """
+        if days not in LEADERBOARD_WINDOWS:
+            return None
 
-            day_entries = []
-            total = 0
-            for date_str, domain_map in stats_map.items():
-                try:
-                    d = datetime.date.fromisoformat(date_str)
-                except Exception:
-                    continue
-                # n'utiliser que les dates entre cutoff et last_date
-                if d < cutoff or d > last_date:
-                    continue
-                count_for_domain = 0
-                if isinstance(domain_map, dict):
-                    val = domain_map.get(domain)
-                    try:
-                        count_for_domain = int(val) if val is not None else 0
-                    except Exception:
-                        count_for_domain = 0
-                if count_for_domain > 0:
-                    day_entries.append({"date": date_str, "count": count_for_domain})
-                    total += count_for_domain
+        return execute_read(VoteRepository._get_leaderboards_tx, days)
 
-            if total > 0:
-                # trier day_entries par date desc
-                day_entries.sort(key=lambda e: e["date"], reverse=True)
-                per_user.append({"userId": user_id, "total": total, "votes": day_entries})
+    _LEADERBOARDS_QUERY = """
+            MATCH (m:StatsMeta {id: 'daily_stats'})
+            WHERE m.leaderboardDate = m.lastDate
+            OPTIONAL MATCH (b:Leaderboard {days: $days, date: m.lastDate})
+            RETURN count(m) AS ready, collect([b.domain, b.users]) AS boards
+            """
+
+    @staticmethod
+    def _get_leaderboards_tx(tx, days: int) -> dict[str, List[dict]] | None:
+        rec = tx.run(VoteRepository._LEADERBOARDS_QUERY, days=days).single()
+        return VoteRepository._leaderboards_from_record(rec)
 
-        # trier par total desc et garder top 10
-        per_user.sort(key=lambda u: u["total"], reverse=True)
-        return per_user[:10]
+    @staticmethod
+    def _leaderboards_from_record(rec) -> dict[str, List[dict]] | None:
+        if rec is None or not rec["ready"]:
+            return None
+        return {domain: json.loads(users) for domain, users in rec["boards"] if domain is not None}
 
     @staticmethod
     def get_all_domains() -> List:
-        drv = get_driver()
-        with drv.session() as session:
-            return session.execute_read(VoteRepository._get_all_domains_tx)
+        """
+        Domaines ayant des relations courantes. Lus à chaque appel (un seul
+        nœud StatsMeta) : pas de cache par processus, qu'un cron exécuté
+        dans un autre processus ne pourrait pas invalider.
+        """
+        return execute_read(VoteRepository._get_all_domains_tx)
+
+    _DOMAINS_CATALOGUE_QUERY = "MATCH (m:StatsMeta {id: 'daily_stats'}) RETURN m.domains AS domains"
+    _CURRENT_DOMAINS_QUERY = "MATCH ()-[r:VOTED]->() WHERE r.current = true RETURN DISTINCT r.domain AS domain"
 
     @staticmethod
     def _get_all_domains_tx(tx) -> List:
-        res = tx.run(
-            "MATCH ()-[r:VOTED]->() WHERE r.current = true RETURN DISTINCT r.domain AS domain"
-        )
+        # Catalogue écrit par append_daily_stats ; parcours des relations avant le premier cron
+        rec = tx.run(VoteRepository._DOMAINS_CATALOGUE_QUERY).single()
+        if rec is not None and rec['domains'] is not None:
+            return list(rec['domains'])
+
+        res = tx.run(VoteRepository._CURRENT_DOMAINS_QUERY)
         return [rec['domain'] for rec in res]
     
     @staticmethod
     def get_last_update() -> str:
-        drv = get_driver()
-        with drv.session() as session:
-            return session.execute_read(VoteRepository._get_last_update_tx)
+        return execute_read(VoteRepository._get_last_update_tx)
 
     @staticmethod
     def _get_last_update_tx(tx) -> str:
-        res = tx.run(
-            "MATCH (m:StatsMeta {id: 'daily_stats'}) RETURN m.lastDate AS lastDate"
-        ).single()
+        return VoteRepository._last_update(tx.run(VoteRepository._STATS_META_QUERY).single())
+
+    @staticmethod
+    def _last_update(res) -> str:
         return res['lastDate'] if res and res['lastDate'] is not None else datetime.date.today().isoformat()
 
     @staticmethod
-    def get_publish_votes_setting(user_id: str) -> tuple[bool, dict]:
-        drv = get_driver()
-        with drv.session() as session:
-            return session.execute_read(VoteRepository._get_publish_votes_setting_tx, user_id)
-    
+    def get_stats_version(user_id: str | None = None) -> tuple[str, bool, List | None]:
+        """
+        Retourne (date du dernier instantané, publishVotes de `user_id`,
+        catalogue StatsMeta.domains ou None avant le premier instantané) :
+        les réponses de statistiques ne changent qu'avec ces valeurs.
+        """
+        return execute_read(VoteRepository._get_stats_version_tx, user_id)
+
+    _STATS_VERSION_QUERY = """
+            OPTIONAL MATCH (m:StatsMeta {id: 'daily_stats'})
+            OPTIONAL MATCH (u:User {id: $userId})
+            RETURN m.lastDate AS lastDate, u.publishVotes AS publishVotes, m.domains AS domains
+            """
+
     @staticmethod
-    def _get_publish_votes_setting_tx(tx, user_id: str) -> tuple[bool, dict]:
-        res = tx.run(
-            "MATCH (u:User {id: $userId}) RETURN u.publishVotes AS publishVotes, u.stats AS stats",
-            userId=user_id
-        ).single()
-        stats_json = res['stats'] if res and res['stats'] is not None else None
-        try:
-            stats = json.loads(stats_json)
-        except Exception:
-            return res['publishVotes'] if res and res['publishVotes'] is not False else False, {}
-        return res['publishVotes'] if res and res['publishVotes'] is not False else False, stats
+    def _get_stats_version_tx(tx, user_id: str | None) -> tuple[str, bool, List | None]:
+        res = tx.run(VoteRepository._STATS_VERSION_QUERY, userId=user_id).single()
+        return VoteRepository._stats_version_from_record(res)
+
+    @staticmethod
+    def _stats_version_from_record(res) -> tuple[str, bool, List | None]:
+        last_date = str(res['lastDate']) if res['lastDate'] is not None else datetime.date.today().isoformat()
+        domains = list(res['domains']) if res['domains'] is not None else None
+        return last_date, res['publishVotes'] is True, domains
+
+    # -------------------- LECTURES ASYNC (vues ASGI) --------------------
+    # Mêmes requêtes et mêmes résultats que les lectures sync, sur le driver async
+
+    @staticmethod
+    async def afind_votes_by_voter_with_stats(voter_id: str, domain: str | None = None) -> dict:
+        return await aexecute_read(VoteRepository._afind_votes_by_voter_with_stats_tx, voter_id, domain)
+
+    @staticmethod
+    async def _afind_votes_by_voter_with_stats_tx(tx, voter_id: str, domain: str | None) -> dict:
+        result = await tx.run(VoteRepository._VOTES_BY_VOTER_QUERY, voterId=str(voter_id), domain=domain)
+        return VoteRepository._votes_by_voter_from_record(await result.single(), voter_id)
+
+    @staticmethod
+    async def aget_received_votes_with_stats(user_id: str, domain: str | None = None) -> dict:
+        return await aexecute_read(VoteRepository._aget_received_votes_with_stats_tx, user_id, domain)
+
+    @staticmethod
+    async def _aget_received_votes_with_stats_tx(tx, user_id: str, domain: str | None) -> dict:
+        result = await tx.run(VoteRepository._RECEIVED_VOTES_QUERY, userId=str(user_id), domain=domain)
+        return VoteRepository._received_votes_from_record(await result.single(), user_id)
+
+    @staticmethod
+    async def _astats_meta_tx(tx):
+        return await (await tx.run(VoteRepository._STATS_META_QUERY)).single()
+
+    @staticmethod
+    async def aget_daily_votes_to_user(user_id: str, days: int = 30) -> tuple[list[dict], bool]:
+        return await aexecute_read(VoteRepository._aget_daily_votes_to_user_tx, user_id, days)
+
+    @staticmethod
+    async def _aget_daily_votes_to_user_tx(tx, user_id: str, days: int) -> tuple[list[dict], bool]:
+        last_date = VoteRepository._stats_last_date(await VoteRepository._astats_meta_tx(tx))
+        cutoff = last_date - datetime.timedelta(days=days-1)
+
+        rec = await (await tx.run(VoteRepository._PUBLISH_VOTES_QUERY, userId=user_id)).single()
+        publish_votes = rec["publishVotes"] if rec is not None else False
+
+        res = await tx.run(
+            VoteRepository._DAILY_STATS_QUERY,
+            userId=user_id,
+            cutoff=cutoff.isoformat(),
+            lastDate=last_date.isoformat()
+        )
+        return (VoteRepository._daily_series([rec async for rec in res]), publish_votes)
+
+    @staticmethod
+    async def aget_monthly_votes_to_user(user_id: str, months: int = 12) -> List[dict]:
+        return await aexecute_read(VoteRepository._aget_monthly_votes_to_user_tx, user_id, months)
+
+    @staticmethod
+    async def _aget_monthly_votes_to_user_tx(tx, user_id: str, months: int) -> List[dict]:
+        meta = await VoteRepository._astats_meta_tx(tx)
+        query, params = VoteRepository._monthly_query(meta, user_id, months)
+        res = await tx.run(query, **params)
+        return VoteRepository._monthly_series([rec async for rec in res], months)
+
+    @staticmethod
+    async def aget_chart_for_domain(domain: str, days: int = 30) -> List[dict]:
+        return await aexecute_read(VoteRepository._aget_chart_for_domain_tx, domain, days)
+
+    @staticmethod
+    async def _aget_chart_for_domain_tx(tx, domain: str, days: int) -> List[dict]:
+        last_date = VoteRepository._stats_last_date(await VoteRepository._astats_meta_tx(tx))
+        cutoff = last_date - datetime.timedelta(days=days-1)
+        res = await tx.run(
+            VoteRepository._CHART_QUERY,
+            domain=domain,
+            cutoff=cutoff.isoformat(),
+            lastDate=last_date.isoformat()
+        )
+        return VoteRepository._rank_chart_entries([rec async for rec in res], LEADERBOARD_SIZE)
+
+    @staticmethod
+    async def aget_leaderboards(days: int) -> dict[str, List[dict]] | None:
+        if days not in LEADERBOARD_WINDOWS:
+            return None
+        return await aexecute_read(VoteRepository._aget_leaderboards_tx, days)
+
+    @staticmethod
+    async def _aget_leaderboards_tx(tx, days: int) -> dict[str, List[dict]] | None:
+        rec = await (await tx.run(VoteRepository._LEADERBOARDS_QUERY, days=days)).single()
+        return VoteRepository._leaderboards_from_record(rec)
+
+    @staticmethod
+    async def aget_all_domains() -> List:
+        return await aexecute_read(VoteRepository._aget_all_domains_tx)
+
+    @staticmethod
+    async def _aget_all_domains_tx(tx) -> List:
+        rec = await (await tx.run(VoteRepository._DOMAINS_CATALOGUE_QUERY)).single()
+        if rec is not None and rec['domains'] is not None:
+            return list(rec['domains'])
+
+        res = await tx.run(VoteRepository._CURRENT_DOMAINS_QUERY)
+        return [rec['domain'] async for rec in res]
+
+    @staticmethod
+    async def aget_last_update() -> str:
+        return VoteRepository._last_update(await aexecute_read(VoteRepository._astats_meta_tx))
+
+    @staticmethod
+    async def aget_stats_version(user_id: str | None = None) -> tuple[str, bool, List | None]:
+        return await aexecute_read(VoteRepository._aget_stats_version_tx, user_id)
+
+    @staticmethod
+    async def _aget_stats_version_tx(tx, user_id: str | None) -> tuple[str, bool, List | None]:
+        res = await (await tx.run(VoteRepository._STATS_VERSION_QUERY, userId=user_id)).single()
+        return VoteRepository._stats_version_from_record(res)
@@ -12,6 +12,14 @@ if str(BASE_DIR) not in sys.path:
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
 django.setup()
 
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # Chaque test prépare ses propres données
+    cache.clear()
+
 @pytest.fixture(autouse=True)
 def override_authentication(settings):
     settings.REST_FRAMEWORK["DEFAULT_AUTHENTICATION_CLASSES"] = [
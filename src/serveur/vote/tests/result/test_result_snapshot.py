@@ -0,0 +1,107 @@
+from core.services.result_service import ResultService
+from db.repository.result_repository import ResultRepository
+
+
+def test_rank_results_sets_totals_ranks_and_elected():
+    records = [
+        {"userId": "a", "domain": "tech", "count": 10, "electedAt": None},
+        {"userId": "b", "domain": "tech", "count": 30, "electedAt": None},
+        {"userId": "c", "domain": "design", "count": 5, "electedAt": None},
+        {"userId": "d", "domain": "tech", "count": None, "electedAt": None},
+    ]
+
+    rows = {row["userId"]: row for row in ResultRepository._rank_results(records, 0.20)}
+
+    assert rows["b"]["rank"] == 1 and rows["b"]["globalRank"] == 1
+    assert rows["a"]["rank"] == 2 and rows["a"]["globalRank"] == 2
+    assert rows["c"]["rank"] == 1 and rows["c"]["globalRank"] == 3
+    assert rows["a"]["domainTotal"] == 40
+    assert rows["a"]["elected"] is True
+    assert rows["d"]["elected"] is False
+
+
+class DummyResultRepository:
+    @staticmethod
+    def get_vote_results(domain, top, since):
+        return [
+            {"userId": "a", "domain": "tech", "count": 1, "domainTotal": 100, "elected": True, "electedAt": None},
+            {"userId": "b", "domain": "tech", "count": 30, "domainTotal": 100, "electedAt": None},
+        ]
+
+
+def test_service_keeps_materialized_elected_flag(monkeypatch):
+    monkeypatch.setattr(
+        "core.services.result_service.ResultRepository", DummyResultRepository, raising=True
+    )
+
+    results = ResultService.get_vote_results()
+
+    assert [result["elected"] for result in results] == [True, True]
+    assert all("domainTotal" not in result for result in results)
+
+
+def test_result_changes_compares_top_entries(monkeypatch):
+    snapshots = {
+        "2025-12-01": [
+            {"userId": "a", "domain": "tech", "count": 10, "globalRank": 1, "elected": True},
+            {"userId": "b", "domain": "tech", "count": 5, "globalRank": 2, "elected": False},
+            {"userId": "c", "domain": "art", "count": 3, "globalRank": 3, "elected": True},
+        ],
+        "2025-12-08": [
+            {"userId": "b", "domain": "tech", "count": 12, "globalRank": 1, "elected": True},
+            {"userId": "a", "domain": "tech", "count": 10, "globalRank": 2, "elected": True},
+            {"userId": "d", "domain": "art", "count": 4, "globalRank": 3, "elected": True},
+        ],
+    }
+    outside_top = {("2025-12-08", "c"): {"userId": "c", "domain": "art", "count": 1, "globalRank": 5, "elected": False}}
+
+    monkeypatch.setattr(
+        ResultRepository, "_resolve_snapshot_date_tx",
+        staticmethod(lambda tx, as_of=None: "2025-12-08" if as_of >= "2025-12-08" else "2025-12-01"),
+    )
+    monkeypatch.setattr(
+        ResultRepository, "_get_snapshot_entries_tx",
+        staticmethod(lambda tx, date, domain, top: [dict(entry) for entry in snapshots[date][:top]]),
+    )
+    monkeypatch.setattr(
+        ResultRepository, "_get_snapshot_entries_by_key_tx",
+        staticmethod(lambda tx, date, keys: [
+            outside_top[(date, key["userId"])] for key in keys if (date, key["userId"]) in outside_top
+        ]),
+    )
+
+    changes = ResultRepository._get_result_changes_tx(None, "2025-12-03", "2025-12-10", None, 3)
+
+    assert changes["from"] == "2025-12-01" and changes["to"] == "2025-12-08"
+    by_user = {change["userId"]: change for change in changes["changes"]}
+    assert [change["userId"] for change in changes["changes"]] == ["b", "a", "d", "c"]
+    assert by_user["b"]["fromCount"] == 5 and by_user["b"]["toElected"] is True
+    assert by_user["d"]["fromRank"] is None and by_user["d"]["toRank"] == 3
+    assert by_user["c"]["toRank"] == 5 and by_user["c"]["toElected"] is False
+
+
+class DummyChangesService:
+    changes = None
+
+    @staticmethod
+    def get_result_changes(from_date, to_date, domain, top):
+        return DummyChangesService.changes
+
+
+def test_result_changes_endpoint(monkeypatch):
+    from rest_framework.test import APIClient
+
+    monkeypatch.setattr("api.result_controller.ResultService", DummyChangesService, raising=True)
+    client = APIClient()
+
+    response = client.get("/api/results/changes?from=2025-12-01", HTTP_AUTHORIZATION="Bearer 1")
+    assert response.status_code == 400
+
+    DummyChangesService.changes = None
+    response = client.get("/api/results/changes?from=2025-12-01&to=2025-12-08", HTTP_AUTHORIZATION="Bearer 1")
+    assert response.status_code == 404
+
+    DummyChangesService.changes = {"from": "2025-12-01", "to": "2025-12-08", "changes": []}
+    response = client.get("/api/results/changes?from=2025-12-01&to=2025-12-08", HTTP_AUTHORIZATION="Bearer 1")
+    assert response.status_code == 200
+    assert response.json() == {"from": "2025-12-01", "to": "2025-12-08", "changes": []}
@@ -0,0 +1,45 @@
+from db.repository import vote_repository
+from db.repository.vote_repository import VoteRepository
+
+
+class DummyTx:
+    def __init__(self, catalogue, current):
+        self.catalogue = catalogue
+        self.current = current
+        self.queries = []
+
+    def run(self, query, **params):
+        self.queries.append(query)
+        if query == VoteRepository._DOMAINS_CATALOGUE_QUERY:
+            return DummyResult([{"domains": self.catalogue}] if self.catalogue is not None else [])
+        return DummyResult([{"domain": domain} for domain in self.current])
+
+
+class DummyResult:
+    def __init__(self, records):
+        self.records = records
+
+    def single(self):
+        return self.records[0] if self.records else None
+
+    def __iter__(self):
+        return iter(self.records)
+
+
+def test_get_all_domains_reads_the_catalogue_on_every_call(monkeypatch):
+    # Pas de cache par processus : le catalogue écrit par un cron d'un autre processus est vu aussitôt
+    tx = DummyTx(["france", "tech"], [])
+    monkeypatch.setattr(vote_repository, "execute_read", lambda work: work(tx), raising=True)
+
+    assert VoteRepository.get_all_domains() == ["france", "tech"]
+    tx.catalogue = ["france", "tech", "sport"]
+    assert VoteRepository.get_all_domains() == ["france", "tech", "sport"]
+    assert tx.queries == [VoteRepository._DOMAINS_CATALOGUE_QUERY] * 2
+
+
+def test_get_all_domains_scans_relations_before_the_first_snapshot(monkeypatch):
+    tx = DummyTx(None, ["tech"])
+    monkeypatch.setattr(vote_repository, "execute_read", lambda work: work(tx), raising=True)
+
+    assert VoteRepository.get_all_domains() == ["tech"]
+    assert tx.queries[-1] == VoteRepository._CURRENT_DOMAINS_QUERY
@@ -0,0 +1,56 @@
+from core.services.stats_service import StatsService
+from db.repository.vote_repository import VoteRepository
+
+
+def test_rank_chart_entries_keeps_top_users_with_sorted_series():
+    entries = [
+        {"userId": "a", "date": "2025-12-14", "count": 2},
+        {"userId": "b", "date": "2025-12-15", "count": 5},
+        {"userId": "a", "date": "2025-12-15", "count": 4},
+        {"userId": "c", "date": "2025-12-15", "count": 1},
+    ]
+
+    top = VoteRepository._rank_chart_entries(entries, 2)
+
+    assert [user["userId"] for user in top] == ["a", "b"]
+    assert top[0]["total"] == 6
+    assert [vote["date"] for vote in top[0]["votes"]] == ["2025-12-15", "2025-12-14"]
+
+
+class DummyRepo:
+    live_calls = []
+
+    @staticmethod
+    def get_all_domains():
+        return ["france", "tech"]
+
+    @staticmethod
+    def get_leaderboards(days):
+        if days != 30:
+            return None
+        return {"france": [{"userId": "4", "total": 3, "votes": [{"date": "2025-12-15", "count": 3}]}]}
+
+    @staticmethod
+    def get_chart_for_domain(domain, days):
+        DummyRepo.live_calls.append((domain, days))
+        return []
+
+
+def test_get_chart_reads_precomputed_leaderboards(monkeypatch):
+    monkeypatch.setattr("core.services.stats_service.VoteRepository", DummyRepo, raising=True)
+    DummyRepo.live_calls = []
+
+    chart = StatsService.get_chart(days=30)
+
+    assert chart[0]["users"][0]["userId"] == "4"
+    assert chart[1] == {"domain": "tech", "users": []}
+    assert DummyRepo.live_calls == []
+
+
+def test_get_chart_falls_back_to_live_query(monkeypatch):
+    monkeypatch.setattr("core.services.stats_service.VoteRepository", DummyRepo, raising=True)
+    DummyRepo.live_calls = []
+
+    StatsService.get_chart(domain="tech", days=12)
+
+    assert DummyRepo.live_calls == [("tech", 12)]
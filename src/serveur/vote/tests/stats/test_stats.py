@@ -24,10 +24,12 @@ def sample_data(driver):
 
         session.run("""
             CREATE (u:User {id: '1', publishVotes: true})
-            CREATE (u2:User {id: '2', stats: '{"2025-12-15": {"france": 1}}', publishVotes: true})
+            CREATE (u2:User {id: '2', publishVotes: true})
             CREATE (u3:User {id: '3', publishVotes: true})
-            CREATE (u4:User {id: '4', stats: '{"2025-12-15": {"france": 3}}', publishVotes: true})
+            CREATE (u4:User {id: '4', publishVotes: true})
             CREATE (u5:User {id: '5', publishVotes: true})
+            CREATE (:DailyStat {userId: '2', date: '2025-12-15', domain: 'france', count: 1})
+            CREATE (:DailyStat {userId: '4', date: '2025-12-15', domain: 'france', count: 3})
 
             CREATE (u)-[:VOTED {current: true, created_at: datetime(), count: 1, domain: "france"}]->(u2)
             CREATE (u2)-[:VOTED {created_at: datetime("2025-02-14T15:30:00Z"), count: 2, domain: "france"}]->(u4)
@@ -128,3 +130,25 @@ def test_chart(sample_data, driver):
     assert len(first_user['votes']) == 1
     first_vote = first_user['votes'][0]
     assert first_vote['count'] == 3
+
+
+def test_monthly_rollups_match_daily_aggregation(sample_data, driver):
+    from db.repository.vote_repository import VoteRepository
+
+    before = VoteRepository.get_monthly_votes_to_user("4")
+    VoteRepository.rebuild_monthly_stats()
+
+    assert VoteRepository.get_monthly_votes_to_user("4") == before
+
+
+def test_append_daily_stats_updates_monthly_rollups(sample_data, driver):
+    import datetime
+    from db.repository.vote_repository import VoteRepository
+
+    VoteRepository.rebuild_monthly_stats()
+    # Relancé pour la même date : l'instantané remplacé n'est compté qu'une fois
+    VoteRepository.append_daily_stats(datetime.date(2025, 12, 16))
+    VoteRepository.append_daily_stats(datetime.date(2025, 12, 16))
+
+    monthly = VoteRepository.get_monthly_votes_to_user("2")
+    assert monthly == [{"domain": "france", "series": [{"year": 2025, "month": 12, "count": 2}]}]
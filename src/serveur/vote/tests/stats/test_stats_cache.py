@@ -0,0 +1,112 @@
+from rest_framework.test import APIClient
+
+
+class DummyStatsService:
+    last_date = "2025-12-15"
+    publish_votes = True
+    domains = ["france"]
+    chart_calls = 0
+    daily_calls = 0
+
+    @staticmethod
+    def get_stats_version(user_id=None):
+        return DummyStatsService.last_date, DummyStatsService.publish_votes, DummyStatsService.domains
+
+    @staticmethod
+    def get_chart(domain=None, days=30, domains=None):
+        DummyStatsService.chart_calls += 1
+        return [{"domain": d, "users": []} for d in domains]
+
+    @staticmethod
+    def get_daily_stats(user_id, days=30, include_monthly=False):
+        DummyStatsService.daily_calls += 1
+        return {"userId": user_id, "byDomain": []}
+
+
+def _client(monkeypatch):
+    monkeypatch.setattr("api.stats_controller.StatsService", DummyStatsService, raising=True)
+    DummyStatsService.last_date = "2025-12-15"
+    DummyStatsService.publish_votes = True
+    DummyStatsService.domains = ["france"]
+    DummyStatsService.chart_calls = 0
+    DummyStatsService.daily_calls = 0
+    return APIClient()
+
+
+def test_chart_is_cached_until_a_new_snapshot(monkeypatch):
+    client = _client(monkeypatch)
+
+    first = client.get("/api/stats/chart", HTTP_AUTHORIZATION="Bearer 1")
+    second = client.get("/api/stats/chart", HTTP_AUTHORIZATION="Bearer 1")
+
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    assert DummyStatsService.chart_calls == 1
+    assert first["ETag"].startswith('"2025-12-15-')
+    assert first["Last-Modified"] == "Mon, 15 Dec 2025 00:00:00 GMT"
+
+    client.get("/api/stats/chart?days=7", HTTP_AUTHORIZATION="Bearer 1")
+    assert DummyStatsService.chart_calls == 2
+
+    DummyStatsService.last_date = "2025-12-16"
+    third = client.get("/api/stats/chart", HTTP_AUTHORIZATION="Bearer 1")
+    assert DummyStatsService.chart_calls == 3
+    assert third["ETag"] != first["ETag"]
+
+
+def test_conditional_get_returns_not_modified(monkeypatch):
+    client = _client(monkeypatch)
+    etag = client.get("/api/stats/chart", HTTP_AUTHORIZATION="Bearer 1")["ETag"]
+
+    response = client.get("/api/stats/chart", HTTP_AUTHORIZATION="Bearer 1", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+
+    response = client.get(
+        "/api/stats/chart",
+        HTTP_AUTHORIZATION="Bearer 1",
+        HTTP_IF_MODIFIED_SINCE="Mon, 15 Dec 2025 00:00:00 GMT",
+    )
+    assert response.status_code == 304
+
+    DummyStatsService.last_date = "2025-12-16"
+    response = client.get("/api/stats/chart", HTTP_AUTHORIZATION="Bearer 1", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+
+
+def test_daily_cache_follows_publish_votes(monkeypatch):
+    client = _client(monkeypatch)
+
+    public = client.get("/api/stats/votes/daily/4", HTTP_AUTHORIZATION="Bearer 1")
+    client.get("/api/stats/votes/daily/4", HTTP_AUTHORIZATION="Bearer 1")
+    assert DummyStatsService.daily_calls == 1
+
+    DummyStatsService.publish_votes = False
+    private = client.get("/api/stats/votes/daily/4", HTTP_AUTHORIZATION="Bearer 1")
+    assert DummyStatsService.daily_calls == 2
+    assert private["ETag"] != public["ETag"]
+
+
+def test_daily_ignores_if_modified_since(monkeypatch):
+    # publishVotes peut changer dans la journée : pas de Last-Modified, donc pas de 304 sur la date
+    client = _client(monkeypatch)
+
+    response = client.get(
+        "/api/stats/votes/daily/4",
+        HTTP_AUTHORIZATION="Bearer 1",
+        HTTP_IF_MODIFIED_SINCE="Mon, 15 Dec 2025 00:00:00 GMT",
+    )
+    assert response.status_code == 200
+    assert not response.has_header("Last-Modified")
+
+
+def test_chart_cache_follows_the_domain_catalogue(monkeypatch):
+    client = _client(monkeypatch)
+
+    first = client.get("/api/stats/chart", HTTP_AUTHORIZATION="Bearer 1")
+    DummyStatsService.domains = ["france", "tech"]
+    second = client.get("/api/stats/chart", HTTP_AUTHORIZATION="Bearer 1")
+
+    assert DummyStatsService.chart_calls == 2
+    assert [entry["domain"] for entry in second.json()] == ["france", "tech"]
+    assert second["ETag"] != first["ETag"]
@@ -0,0 +1,135 @@
+from asgiref.sync import async_to_sync
+from rest_framework.test import APIRequestFactory
+
+# Les vues sont importées dans les tests : authentication_classes est lu à
+# la définition de la classe, après l'override de conftest
+
+
+class DummyVoteService:
+    calls = []
+
+    @staticmethod
+    async def aget_votes_by_voter(voter_id, domain=None, is_me=False):
+        DummyVoteService.calls.append((voter_id, domain, is_me))
+        return [{"id": "v1", "voterId": voter_id, "targetUserId": "u2", "domain": "tech", "createdAt": None}]
+
+
+class DummyStatsService:
+    chart_calls = 0
+
+    @staticmethod
+    async def aget_stats_version(user_id=None):
+        return "2025-12-15", True, ["france"]
+
+    @staticmethod
+    async def aget_chart(domain=None, days=30, domains=None):
+        DummyStatsService.chart_calls += 1
+        return [{"domain": "france", "users": []}]
+
+
+class DummyResultService:
+    calls = []
+
+    @staticmethod
+    async def aget_vote_results(domain=None, top=100, since=None, as_of=None):
+        DummyResultService.calls.append((domain, top))
+        return []
+
+
+def _get(view_class, path, auth=True, **kwargs):
+    headers = {"HTTP_AUTHORIZATION": "Bearer u1"} if auth else {}
+    request = APIRequestFactory().get(path, **headers)
+    response = async_to_sync(view_class.as_view())(request, **kwargs)
+    response.render()
+    return response
+
+
+def test_votes_by_voter_async_view(monkeypatch):
+    from api.vote_controller import VotesByVoterAsyncView, VotesByVoterMeAsyncView
+
+    monkeypatch.setattr("api.vote_controller.VoteService", DummyVoteService, raising=True)
+    DummyVoteService.calls = []
+
+    response = _get(VotesByVoterAsyncView, "/api/votes/by-voter/u9?domain=tech", voterId="u9")
+    me = _get(VotesByVoterMeAsyncView, "/api/votes/by-voter/me")
+
+    assert response.status_code == me.status_code == 200
+    assert response.data[0]["voterId"] == "u9"
+    assert DummyVoteService.calls == [("u9", "tech", False), ("u1", None, True)]
+
+
+def test_async_view_keeps_authentication():
+    from api.vote_controller import VotesByVoterAsyncView
+
+    response = _get(VotesByVoterAsyncView, "/api/votes/by-voter/u9", auth=False, voterId="u9")
+
+    assert response.status_code == 403
+
+
+def test_async_stats_view_shares_the_response_cache(monkeypatch):
+    from api.stats_controller import StatsChartAsyncView
+
+    monkeypatch.setattr("api.stats_controller.StatsService", DummyStatsService, raising=True)
+    DummyStatsService.chart_calls = 0
+
+    first = _get(StatsChartAsyncView, "/api/stats/chart")
+    second = _get(StatsChartAsyncView, "/api/stats/chart")
+
+    assert first.status_code == second.status_code == 200
+    assert first["ETag"] == second["ETag"]
+    assert DummyStatsService.chart_calls == 1
+
+
+def test_async_result_view_validates_like_the_sync_view(monkeypatch):
+    from api.result_controller import ResultAsyncView
+
+    monkeypatch.setattr("api.result_controller.ResultService", DummyResultService, raising=True)
+    DummyResultService.calls = []
+
+    bad = _get(ResultAsyncView, "/api/results?top=0")
+    ok = _get(ResultAsyncView, "/api/results?domain=tech&top=5")
+
+    assert bad.status_code == 400
+    assert ok.status_code == 200
+    assert DummyResultService.calls == [("tech", 5)]
+
+
+def test_async_views_reuse_the_openapi_schema():
+    from api.result_controller import ResultAsyncView, ResultView
+    from api.vote_controller import VotesByVoterAsyncView, VotesByVoterView
+
+    assert VotesByVoterAsyncView.get.kwargs["schema"] is VotesByVoterView.get.kwargs["schema"]
+    assert ResultAsyncView.get.kwargs["schema"] is ResultView.get.kwargs["schema"]
+
+
+def test_async_driver_is_closed_after_a_wsgi_request(monkeypatch):
+    from app import neo4j_config
+    from api.vote_controller import VotesByVoterAsyncView
+
+    drivers = []
+
+    class DummyAsyncDriver:
+        closed = False
+
+        async def close(self):
+            self.closed = True
+
+    def driver(uri, **options):
+        drivers.append(DummyAsyncDriver())
+        return drivers[-1]
+
+    class DriverVoteService:
+        @staticmethod
+        async def aget_votes_by_voter(voter_id, domain=None, is_me=False):
+            assert neo4j_config.get_async_driver() is neo4j_config.get_async_driver()
+            return []
+
+    monkeypatch.setattr(neo4j_config.AsyncGraphDatabase, "driver", driver, raising=True)
+    monkeypatch.setattr("api.vote_controller.VoteService", DriverVoteService, raising=True)
+
+    _get(VotesByVoterAsyncView, "/api/votes/by-voter/u9", voterId="u9")
+    _get(VotesByVoterAsyncView, "/api/votes/by-voter/u9", voterId="u9")
+
+    # Une boucle par requête hors ASGI : un driver par requête, fermé avec elle
+    assert len(drivers) == 2 and all(driver.closed for driver in drivers)
+    assert len(neo4j_config._async_drivers) == 0
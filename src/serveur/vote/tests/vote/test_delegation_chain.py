@@ -0,0 +1,51 @@
+import random
+
+from core.rules.delegation_chain import chain_index
+from core.rules.vote_validation import DomainVoteValidator
+
+
+def _legacy_trail(edges: list[tuple[int, int]], start: int) -> tuple[int, int]:
+    # Plus long chemin tel que le calcule _check_vote_validity
+    validator = DomainVoteValidator({})
+    for position, (source, target) in enumerate(edges):
+        validator.add_edge(str(position), source, target, 1, False)
+    trail = validator.longest_trail(start)
+    return len(trail), validator.targets[trail[-1]] if trail else start
+
+
+def test_chain_depth_and_root():
+    index = chain_index([("A", "B"), ("B", "C"), ("D", "B")])
+
+    assert index == [(2, "C"), (1, "C"), (2, "C")]
+
+
+def test_cycle_members_and_upstream_nodes():
+    # A -> B -> C -> A, D -> A, E -> E
+    index = chain_index([("A", "B"), ("B", "C"), ("C", "A"), ("D", "A"), ("E", "E")])
+
+    assert index == [(3, "A"), (3, "B"), (3, "C"), (4, "A"), (1, "E")]
+
+
+def test_branching_node_is_not_indexed_upstream():
+    index = chain_index([("A", "B"), ("B", "C"), ("B", "D"), ("D", "E")])
+
+    assert index == [(None, None), (None, None), (None, None), (1, "E")]
+
+
+def test_exits_extend_chains_outside_the_zone():
+    index = chain_index([("A", "B"), ("C", "D")], exits={"B": (3, "Z"), "D": (None, None)})
+
+    assert index == [(4, "Z"), (None, None)]
+
+
+def test_matches_legacy_longest_trail_on_random_functional_graphs():
+    rng = random.Random(3)
+    for _ in range(300):
+        node_count = rng.randint(1, 15)
+        edges = [
+            (node, rng.randrange(node_count))
+            for node in range(node_count)
+            if rng.random() < 0.8
+        ]
+        for (source, _), indexed in zip(edges, chain_index(edges)):
+            assert indexed == _legacy_trail(edges, source)
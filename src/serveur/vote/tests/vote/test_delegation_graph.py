@@ -0,0 +1,168 @@
+import random
+from collections import deque
+
+from core.rules.delegation_graph import DelegationGraph, incremental_weights
+
+
+def _gds_reference(node_count: int, edges: list[tuple[int, int]]):
+    """
+    Ré-exécute naïvement les étapes du recalcul GDS
+    (SCC, tri topologique de Kahn, propagation, valeur des cycles).
+    """
+    successors = [[] for _ in range(node_count)]
+    for source, target in edges:
+        successors[source].append(target)
+
+    reach = []
+    for start in range(node_count):
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for nxt in successors[node]:
+                if nxt not in seen:
+                    seen.add(nxt)
+                    queue.append(nxt)
+        reach.append(seen)
+
+    component = [
+        min(other for other in range(node_count) if other in reach[node] and node in reach[other])
+        for node in range(node_count)
+    ]
+    cycles = [component[s] == component[t] for s, t in edges]
+
+    in_degree = [0] * node_count
+    for _, target in edges:
+        in_degree[target] += 1
+    queue = deque(node for node in range(node_count) if in_degree[node] == 0)
+    order = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for _, target in [e for e in edges if e[0] == node]:
+            in_degree[target] -= 1
+            if in_degree[target] == 0:
+                queue.append(target)
+
+    counts = [None] * len(edges)
+    for node in order:
+        incoming = sum(
+            counts[i] or 0 for i, (s, t) in enumerate(edges) if t == node and not cycles[i]
+        )
+        for i, (s, t) in enumerate(edges):
+            if s == node and not cycles[i]:
+                counts[i] = 1 + incoming
+
+    for comp in set(component):
+        members = {n for n in range(node_count) if component[n] == comp}
+        comp_size = sum(1 for n in members if successors[n])
+        if comp_size <= 1:
+            continue
+        external = sum(
+            counts[i] or 0 for i, (s, t) in enumerate(edges) if t in members and s not in members
+        )
+        for i, (s, t) in enumerate(edges):
+            if s in members and t in members:
+                counts[i] = comp_size + external
+
+    return counts, cycles
+
+
+def test_chain_counts_propagate():
+    # A -> C, B -> C, C -> D
+    graph = DelegationGraph.from_edges([("A", "C"), ("B", "C"), ("C", "D")])
+    counts, cycles = graph.compute_weights()
+
+    assert counts == [1, 1, 3]
+    assert cycles == [False, False, False]
+
+
+def test_cycle_value_includes_external_votes():
+    # A <-> B, C -> A, B -> D (en aval du cycle)
+    graph = DelegationGraph.from_edges([("A", "B"), ("B", "A"), ("C", "A"), ("B", "D")])
+    counts, cycles = graph.compute_weights()
+
+    assert counts == [3, 3, 1, None]
+    assert cycles == [True, True, False, False]
+
+
+def test_self_loop_is_cycle_without_count():
+    graph = DelegationGraph.from_edges([("A", "A"), ("B", "A"), ("A", "C")])
+    counts, cycles = graph.compute_weights()
+
+    assert counts == [None, 1, None]
+    assert cycles == [True, False, False]
+
+
+def test_matches_gds_reference_on_random_graphs():
+    rng = random.Random(42)
+    for _ in range(300):
+        node_count = rng.randint(1, 12)
+        edges = [
+            (rng.randrange(node_count), rng.randrange(node_count))
+            for _ in range(rng.randint(1, 18))
+        ]
+        graph = DelegationGraph.from_edges(edges)
+        index = {key: position for position, key in enumerate(graph.keys)}
+        remapped = [(index[s], index[t]) for s, t in edges]
+
+        assert graph.compute_weights() == _gds_reference(graph.node_count, remapped)
+
+
+def test_tarjan_handles_long_chains_without_recursion():
+    size = 50_000
+    edges = [(i, i + 1) for i in range(size)] + [(size, 0)]
+    graph = DelegationGraph.from_edges(edges)
+    component, component_count = graph.strongly_connected_components()
+
+    assert component_count == 1
+    counts, cycles = graph.compute_weights()
+    assert all(cycles)
+    assert set(counts) == {size + 1}
+
+
+def test_incremental_weights_match_full_recalculation():
+    rng = random.Random(7)
+    for _ in range(300):
+        node_count = rng.randint(2, 12)
+        edges = [
+            (rng.randrange(node_count), rng.randrange(node_count))
+            for _ in range(rng.randint(1, 16))
+        ]
+        counts, cycles = DelegationGraph(node_count, *zip(*edges)).compute_weights()
+        stored = dict(zip(edges, zip(counts, cycles)))
+
+        # Quelques votes retirés ou ajoutés : leurs deux extrémités sont marquées
+        seeds = set()
+        for _ in range(rng.randint(1, 3)):
+            if edges and rng.random() < 0.5:
+                seeds.update(edges.pop(rng.randrange(len(edges))))
+            else:
+                edge = (rng.randrange(node_count), rng.randrange(node_count))
+                if edge not in edges:
+                    edges.append(edge)
+                    seeds.update(edge)
+        if not edges:
+            continue
+
+        # Zone affectée : tout ce qui est en aval des nœuds marqués
+        affected = set(seeds)
+        queue = deque(seeds)
+        while queue:
+            node = queue.popleft()
+            for source, target in edges:
+                if source == node and target not in affected:
+                    affected.add(target)
+                    queue.append(target)
+
+        internal = [edge for edge in edges if edge[0] in affected]
+        boundary = [
+            (target, *stored[(source, target)])
+            for source, target in edges
+            if source not in affected and target in affected
+        ]
+        partial = dict(zip(internal, zip(*incremental_weights(internal, boundary))))
+        merged = [partial.get(edge, stored.get(edge)) for edge in edges]
+
+        full_counts, full_cycles = DelegationGraph(node_count, *zip(*edges)).compute_weights()
+        assert merged == list(zip(full_counts, full_cycles))
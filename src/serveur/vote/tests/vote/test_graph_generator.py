@@ -0,0 +1,45 @@
+import datetime
+from collections import Counter
+
+from benchmarks.bench_daily_pipeline import compare
+from benchmarks.graph_generator import GraphSpec, generate_votes, participation
+
+TODAY = datetime.date(2025, 12, 1)
+
+
+def test_generated_graph_shapes():
+    spec = GraphSpec(users=2_000, domains=4)
+    votes = list(generate_votes(spec, TODAY))
+    assert votes == list(generate_votes(spec, TODAY))
+
+    history = [vote for vote in votes if vote["processed"]]
+    today = [vote for vote in votes if not vote["processed"]]
+
+    # Un vote historique courant par votant et par domaine
+    history_keys = Counter((vote["voterId"], vote["domain"]) for vote in history)
+    assert max(history_keys.values()) == 1
+    assert Counter(vote["domain"] for vote in history) == participation(spec)
+
+    # Domaines déséquilibrés, self-loops, votes du jour en double
+    sizes = sorted(participation(spec).values(), reverse=True)
+    assert sizes[0] > 4 * sizes[-1]
+    assert any(vote["voterId"] == vote["targetUserId"] for vote in history)
+    today_keys = Counter((vote["voterId"], vote["domain"]) for vote in today)
+    assert max(today_keys.values()) == 2
+
+    # Degré entrant en loi de puissance : quelques utilisateurs très populaires
+    in_degree = Counter(vote["targetUserId"] for vote in history)
+    top = sum(count for _, count in in_degree.most_common(len(in_degree) // 100))
+    assert top > 0.1 * len(history)
+
+
+def test_compare_reports_every_phase():
+    previous = {"pipeline": {"seconds": 10.0, "phases": {"validate": 4.0, "results": 1.0}}}
+    current = {"pipeline": {"seconds": 8.0, "phases": {"validate": 2.0, "daily_stats": 1.0}}}
+
+    assert compare(previous, current) == [
+        ("total", 10.0, 8.0),
+        ("validate", 4.0, 2.0),
+        ("daily_stats", None, 1.0),
+        ("results", 1.0, None),
+    ]
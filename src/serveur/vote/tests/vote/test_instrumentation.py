@@ -0,0 +1,215 @@
+import pytest
+from django.test import Client
+
+from api import metrics_controller
+from app.instrumentation import METRICS, InstrumentedDriver, collect
+
+
+class DummyCounters:
+    nodes_created = 0
+    nodes_deleted = 0
+    relationships_created = 0
+    relationships_deleted = 0
+    properties_set = 2
+    labels_added = 0
+    labels_removed = 0
+
+
+class DummySummary:
+    counters = DummyCounters()
+    profile = {"dbHits": 3, "children": [{"dbHits": 4, "children": []}]}
+
+
+class DummyResult:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.consumed = 0
+
+    def __iter__(self):
+        while self.rows:
+            yield self.rows.pop(0)
+
+    def single(self, strict=False):
+        record = self.rows[0] if self.rows else None
+        self.rows = []
+        return record
+
+    def consume(self):
+        self.consumed += 1
+        self.rows = []
+        return DummySummary()
+
+
+class DummyTransaction:
+    def __init__(self):
+        self.queries = []
+
+    def run(self, query, parameters=None, **kwargs):
+        self.queries.append(query)
+        return DummyResult([{"n": 1}, {"n": 2}, {"n": 3}])
+
+    def close(self):
+        pass
+
+
+class DummySession:
+    def __init__(self):
+        self.tx = DummyTransaction()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_read(self, work, *args):
+        return work(self.tx, *args)
+
+    def execute_write(self, work, *args):
+        return work(self.tx, *args)
+
+    def begin_transaction(self):
+        return self.tx
+
+
+class DummyDriver:
+    def session(self):
+        return DummySession()
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    monkeypatch.setattr(metrics_controller.RunRepository, "get_last_phases", staticmethod(lambda: []), raising=True)
+    METRICS.reset()
+    yield METRICS
+    METRICS.reset()
+
+
+def _value(name, **labels):
+    return METRICS.values.get(name, {}).get(tuple(sorted(labels.items())))
+
+
+def _count_rows_tx(tx):
+    return [record["n"] for record in tx.run("MATCH (n) RETURN n")]
+
+
+def _single_tx(tx):
+    return tx.run("MATCH (n) RETURN n").single()
+
+
+def test_queries_are_attributed_to_the_work_function(metrics):
+    driver = InstrumentedDriver(DummyDriver())
+
+    with collect() as totals:
+        with driver.session() as session:
+            assert session.execute_read(_count_rows_tx) == [1, 2, 3]
+            session.execute_write(_single_tx)
+
+    assert _value("vote_neo4j_queries_total", method="_count_rows_tx") == 1
+    assert _value("vote_neo4j_query_rows_total", method="_count_rows_tx") == 3
+    assert _value("vote_neo4j_query_rows_total", method="_single_tx") == 1
+    assert _value("vote_neo4j_query_updates_total", method="_single_tx") == 2
+    assert (totals.queries, totals.rows, totals.updates, totals.db_hits) == (2, 4, 4, 0)
+
+
+def test_unread_results_are_recorded_at_the_end_of_the_work(metrics):
+    driver = InstrumentedDriver(DummyDriver())
+
+    def _unread_tx(tx):
+        tx.run("MATCH (n) SET n.seen = true")
+
+    with driver.session() as session:
+        session.execute_write(_unread_tx)
+
+    name = _unread_tx.__qualname__
+    assert _value("vote_neo4j_queries_total", method=name) == 1
+    assert _value("vote_neo4j_query_rows_total", method=name) == 0
+
+
+def test_explicit_transaction_attributes_queries_to_the_caller(metrics):
+    driver = InstrumentedDriver(DummyDriver())
+
+    with driver.session() as session:
+        tx = session.begin_transaction()
+        _single_tx(tx)
+        tx.close()
+
+    assert _value("vote_neo4j_queries_total", method="_single_tx") == 1
+
+
+def test_profiled_queries_count_db_hits(metrics, monkeypatch):
+    monkeypatch.setattr("app.instrumentation.NEO4J_PROFILE_QUERIES", True, raising=True)
+    session = InstrumentedDriver(DummyDriver()).session()
+
+    session.execute_read(_single_tx)
+    session.execute_read(lambda tx: tx.run("SHOW INDEXES").single())
+
+    assert session.tx.queries == ["PROFILE MATCH (n) RETURN n", "SHOW INDEXES"]
+    assert _value("vote_neo4j_query_db_hits_total", method="_single_tx") == 7
+
+
+def test_render_prometheus_text_format(metrics):
+    METRICS.inc("vote_neo4j_queries_total", {"method": 'Repo."quoted"'})
+    METRICS.observe("vote_http_request_seconds", {"route": "api/results"}, 0.02)
+
+    text = METRICS.render()
+
+    assert "# TYPE vote_neo4j_queries_total counter" in text
+    assert 'vote_neo4j_queries_total{method="Repo.\\"quoted\\""} 1' in text
+    assert 'vote_http_request_seconds_bucket{route="api/results",le="0.01"} 0' in text
+    assert 'vote_http_request_seconds_bucket{route="api/results",le="0.025"} 1' in text
+    assert 'vote_http_request_seconds_bucket{route="api/results",le="+Inf"} 1' in text
+    assert 'vote_http_request_seconds_count{route="api/results"} 1' in text
+
+
+def test_metrics_endpoint_records_requests(metrics, monkeypatch):
+    monkeypatch.setattr(metrics_controller, "VOTE_METRICS_TOKEN", "secret", raising=True)
+    client = Client()
+
+    first = client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+    second = client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+
+    assert first.status_code == 200
+    assert first["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert "Server-Timing" not in first
+    assert 'vote_http_requests_total{method="GET",route="metrics",status="200"} 1' in second.content.decode()
+
+
+def test_metrics_endpoint_requires_token(metrics, monkeypatch):
+    monkeypatch.setattr(metrics_controller, "VOTE_METRICS_TOKEN", "", raising=True)
+    client = Client()
+
+    assert client.get("/metrics").status_code == 404
+
+    monkeypatch.setattr(metrics_controller, "VOTE_METRICS_TOKEN", "secret", raising=True)
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", HTTP_AUTHORIZATION="Bearer other").status_code == 401
+    assert client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret").status_code == 200
+
+
+def test_server_timing_is_opt_in(metrics, monkeypatch):
+    monkeypatch.setattr(metrics_controller, "VOTE_METRICS_TOKEN", "secret", raising=True)
+    monkeypatch.setattr("app.metrics_middleware.VOTE_SERVER_TIMING", True, raising=True)
+
+    response = Client().get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+
+    assert response["Server-Timing"].startswith("app;dur=")
+
+
+def test_metrics_endpoint_renders_phases_from_the_run_journal(metrics, monkeypatch):
+    monkeypatch.setattr(metrics_controller, "VOTE_METRICS_TOKEN", "secret", raising=True)
+    monkeypatch.setattr(
+        metrics_controller.RunRepository, "get_last_phases",
+        staticmethod(lambda: [
+            {"phase": "recalculate", "status": "completed", "seconds": 12.5, "queries": 40, "failures": 1},
+            {"phase": "validate", "status": "failed", "seconds": None, "queries": None, "failures": 2},
+        ]),
+        raising=True,
+    )
+
+    text = Client().get("/metrics", HTTP_AUTHORIZATION="Bearer secret").content.decode()
+
+    assert 'vote_daily_phase_seconds{phase="recalculate"} 12.5' in text
+    assert 'vote_daily_phase_neo4j_queries{phase="recalculate"} 40' in text
+    assert 'vote_daily_phase_errors_total{phase="validate"} 2' in text
+    assert 'vote_daily_phase_seconds{phase="validate"}' not in text
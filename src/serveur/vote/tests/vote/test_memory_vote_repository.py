@@ -0,0 +1,167 @@
+import datetime
+
+import pytest
+
+from benchmarks.graph_generator import GraphSpec, generate_users, generate_votes
+from core.services.vote_service import VoteService
+from db.repository.memory_vote_repository import InMemoryVoteRepository
+
+DAY = datetime.date(2025, 12, 1)
+AT = datetime.datetime(2025, 12, 1, 8, tzinfo=datetime.timezone.utc)
+
+
+@pytest.fixture
+def memory_repository(monkeypatch):
+    InMemoryVoteRepository.reset()
+    monkeypatch.setattr("core.services.vote_service.VoteRepository", InMemoryVoteRepository, raising=True)
+    yield InMemoryVoteRepository
+    InMemoryVoteRepository.reset()
+
+
+def _save(voter, target, domain="tech", minutes=0):
+    InMemoryVoteRepository.save_vote({
+        "id": f"{voter}-{target}-{minutes}",
+        "voterId": voter,
+        "targetUserId": target,
+        "domain": domain,
+        "createdAt": AT + datetime.timedelta(minutes=minutes),
+    })
+
+
+def _weights(domain="tech"):
+    return {
+        (rel["voterId"], rel["targetUserId"]): (rel["count"], rel["cycle"])
+        for rel in InMemoryVoteRepository.relations()
+        if rel["current"] and rel["domain"] == domain
+    }
+
+
+def test_validation_recalculation_and_stats(memory_repository):
+    for voter, target in (("A", "C"), ("B", "C"), ("C", "D"), ("D", "A")):
+        _save(voter, target)
+
+    assert memory_repository.validate_votes_batch(memory_repository.fetch_unprocessed_votes()) == []
+    validated = _weights()
+    assert validated == {
+        ("A", "C"): (4, True),
+        ("B", "C"): (1, False),
+        ("C", "D"): (4, True),
+        ("D", "A"): (4, True),
+    }
+
+    # Le recalcul complet retrouve les poids de la validation incrémentale
+    reports = memory_repository.recalculate_counts_by_domain(mode="gds")
+    assert [report["domain"] for report in reports] == ["tech"]
+    assert _weights() == validated
+
+    assert memory_repository.append_daily_stats(DAY) == 3
+    by_domain, publish_votes = memory_repository.get_daily_votes_to_user("C")
+    assert by_domain == [{"domain": "tech", "series": [{"date": "2025-12-01", "count": 4}]}]
+    assert publish_votes is False
+    assert memory_repository.get_monthly_votes_to_user("C") == [
+        {"domain": "tech", "series": [{"year": 2025, "month": 12, "count": 4}]}
+    ]
+    assert memory_repository.get_all_domains() == ["tech"]
+
+    assert memory_repository.build_leaderboards(DAY) == 3
+    assert memory_repository.get_leaderboards(7)["tech"][0]["total"] == 4
+
+
+def test_threshold_rejects_vote(memory_repository):
+    memory_repository.load(
+        [{"id": "C", "threshold": 1, "publishVotes": True}],
+        [],
+    )
+    for voter in "ABE":
+        _save(voter, "C")
+
+    first, second, third = memory_repository.fetch_unprocessed_votes()
+    assert memory_repository.validate_votes_batch([first, second, third]) == [third]
+    assert memory_repository.fetch_unprocessed_votes() == [third]
+
+
+def test_clean_duplicates_and_revote(memory_repository):
+    memory_repository.load([], [
+        {"id": "old", "voterId": "E", "targetUserId": "F", "domain": "tech",
+         "createdAt": "2025-11-30T08:00:00", "processed": True, "valid": True, "current": True},
+        {"id": "early", "voterId": "E", "targetUserId": "G", "domain": "tech",
+         "createdAt": "2025-12-01T07:00:00", "processed": False},
+        {"id": "late", "voterId": "E", "targetUserId": "F", "domain": "tech",
+         "createdAt": "2025-12-01T08:00:00", "processed": False},
+        {"id": "self", "voterId": "H", "targetUserId": "H", "domain": "tech",
+         "createdAt": "2025-12-01T08:00:00", "processed": False},
+    ])
+
+    memory_repository.clean_duplicate_domain_votes()
+
+    relations = {rel["id"]: rel for rel in memory_repository.relations()}
+    assert "early" not in relations
+    assert relations["old"]["current"] is False
+    assert relations["self"]["processed"] and relations["self"]["current"]
+    assert memory_repository.fetch_unprocessed_votes() == [relations["late"]["relId"]]
+
+
+def test_memory_repository_as_service_double(memory_repository):
+    VoteService.create_vote("A", "C", "tech")
+    VoteService.create_vote("B", "C", "tech")
+    memory_repository.validate_votes_batch(memory_repository.fetch_unprocessed_votes())
+    memory_repository.append_daily_stats(DAY)
+
+    received = VoteService.get_received_votes("C", is_me=True)
+    assert received["byDomain"] == {"tech": 2}
+    assert sorted(received["usersByDomain"]["tech"]) == ["A", "B"]
+    assert [vote["targetUserId"] for vote in VoteService.get_votes_by_voter("A", is_me=True)] == ["C"]
+
+    # Sans vote courant, le retrait crée une self-loop non traitée
+    assert VoteService.delete_vote("Z", "tech") is False
+    assert VoteService.delete_vote("A", "tech") is True
+
+
+def test_memory_repository_matches_neo4j():
+    # Oracle : mêmes opérations sur Neo4j et en mémoire, mêmes poids
+    from app.neo4j_config import get_driver
+    from benchmarks.bench_daily_pipeline import drop_graph, load_graph
+    from db.repository.vote_repository import VoteRepository
+
+    spec = GraphSpec(users=300, domains=3)
+    InMemoryVoteRepository.reset()
+    InMemoryVoteRepository.load(generate_users(spec), generate_votes(spec, DAY))
+
+    driver = get_driver()
+    with driver.session() as session:
+        drop_graph(session)
+        load_graph(session, spec)
+    try:
+        for repository in (VoteRepository, InMemoryVoteRepository):
+            repository.clean_duplicate_domain_votes()
+            repository.recalculate_counts_by_domain(mode="memory")
+
+        with driver.session() as session:
+            neo4j_ids = dict(session.run(
+                "MATCH ()-[r:VOTED {processed: false}]->() RETURN r.id AS id, elementId(r) AS relId"
+            ).values())
+        memory_ids = {
+            rel["id"]: rel["relId"] for rel in InMemoryVoteRepository.relations() if not rel["processed"]
+        }
+        order = sorted(neo4j_ids)
+        assert order == sorted(memory_ids)
+        VoteRepository.validate_votes_batch([neo4j_ids[vote_id] for vote_id in order])
+        InMemoryVoteRepository.validate_votes_batch([memory_ids[vote_id] for vote_id in order])
+
+        with driver.session() as session:
+            neo4j_weights = {
+                record["id"]: (record["count"], record["cycle"], record["current"])
+                for record in session.run(
+                    "MATCH ()-[r:VOTED]->() RETURN r.id AS id, r.count AS count, "
+                    "r.cycle AS cycle, coalesce(r.current, false) AS current"
+                )
+            }
+        memory_weights = {
+            rel["id"]: (rel["count"], rel["cycle"], rel["current"])
+            for rel in InMemoryVoteRepository.relations()
+        }
+        assert memory_weights == neo4j_weights
+    finally:
+        InMemoryVoteRepository.reset()
+        with driver.session() as session:
+            drop_graph(session)
@@ -0,0 +1,135 @@
+import pytest
+from neo4j import READ_ACCESS
+from neo4j.exceptions import ServiceUnavailable
+
+from app import neo4j_config
+from app.neo4j_config import execute_read, execute_write, request_scope
+
+
+class DummyTransaction:
+    def __init__(self, log):
+        self.log = log
+
+    def close(self):
+        self.log.append("tx.close")
+
+
+class DummySession:
+    def __init__(self, log):
+        self.log = log
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def begin_transaction(self):
+        self.log.append("tx.begin")
+        return DummyTransaction(self.log)
+
+    def execute_read(self, work, *args):
+        self.log.append("execute_read")
+        return work("tx", *args)
+
+    def execute_write(self, work, *args):
+        self.log.append("execute_write")
+        return work("tx", *args)
+
+    def close(self):
+        self.log.append("session.close")
+
+
+class DummyDriver:
+    def __init__(self):
+        self.log = []
+        self.access_modes = []
+
+    def session(self, default_access_mode=None):
+        self.log.append("session")
+        self.access_modes.append(default_access_mode)
+        return DummySession(self.log)
+
+
+@pytest.fixture
+def driver(monkeypatch):
+    dummy = DummyDriver()
+    monkeypatch.setattr(neo4j_config, "get_driver", lambda: dummy, raising=True)
+    return dummy
+
+
+def test_calls_outside_a_request_open_their_own_session(driver):
+    execute_read(lambda tx: None)
+    execute_read(lambda tx: None)
+
+    assert driver.log.count("session") == 2
+
+
+def test_request_reads_share_one_session_and_transaction(driver):
+    with request_scope():
+        assert execute_read(lambda tx, value: value, 1) == 1
+        execute_read(lambda tx: None)
+        execute_read(lambda tx: None)
+
+    assert driver.log == ["session", "tx.begin", "tx.close", "session.close"]
+
+
+def test_write_ends_the_shared_read_transaction(driver):
+    with request_scope():
+        execute_read(lambda tx: None)
+        execute_write(lambda tx: None)
+        execute_read(lambda tx: None)
+
+    assert driver.log == [
+        "session", "tx.begin", "tx.close", "execute_write",
+        "tx.begin", "tx.close", "session.close",
+    ]
+
+
+def test_failed_read_discards_the_transaction(driver):
+    def failing(tx):
+        raise ValueError("boom")
+
+    with request_scope():
+        with pytest.raises(ValueError):
+            execute_read(failing)
+        execute_read(lambda tx: None)
+
+    assert driver.log.count("tx.begin") == 2
+
+
+def test_request_without_neo4j_calls_opens_no_session(driver):
+    with request_scope():
+        pass
+
+    assert driver.log == []
+
+
+def test_request_reads_use_a_read_session(driver):
+    with request_scope():
+        execute_read(lambda tx: None)
+
+    assert driver.access_modes == [READ_ACCESS]
+
+
+def test_transient_read_error_is_retried_in_a_new_session(driver, monkeypatch):
+    monkeypatch.setattr(neo4j_config.time, "sleep", lambda seconds: None, raising=True)
+    attempts = []
+
+    def flaky(tx):
+        attempts.append(tx)
+        if len(attempts) == 1:
+            raise ServiceUnavailable("leader switch")
+        return "ok"
+
+    def failing(tx):
+        raise ValueError("boom")
+
+    with request_scope():
+        assert execute_read(flaky) == "ok"
+        with pytest.raises(ValueError):
+            execute_read(failing)
+
+    assert len(attempts) == 2 and attempts[0] is not attempts[1]
+    assert driver.log.count("session") == 2
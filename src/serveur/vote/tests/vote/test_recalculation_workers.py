@@ -0,0 +1,101 @@
+import pytest
+
+from db.repository.vote_repository import VoteRepository
+
+
+class DummySession:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_write(self, step, *args):
+        return step(None, *args)
+
+
+class DummyDriver:
+    def session(self):
+        return DummySession()
+
+
+@pytest.fixture
+def dummy_driver(monkeypatch):
+    monkeypatch.setattr(
+        "db.repository.vote_repository.get_driver", lambda: DummyDriver(), raising=True
+    )
+
+
+def test_process_domains_reports_each_domain(dummy_driver):
+    calls = []
+
+    def step(tx, domain, extra):
+        calls.append((domain, extra))
+
+    reports = VoteRepository._process_domains((step,), {"tech": (1,), "art": (2,)}, 1)
+
+    assert calls == [("tech", 1), ("art", 2)]
+    assert [report["domain"] for report in reports] == ["tech", "art"]
+    assert all(report["error"] is None and report["seconds"] >= 0 for report in reports)
+
+
+def test_process_domains_runs_all_domains_before_raising(dummy_driver):
+    calls = []
+
+    def step(tx, domain):
+        calls.append(domain)
+        if domain == "tech":
+            raise ValueError("boom")
+
+    with pytest.raises(RuntimeError, match="tech"):
+        VoteRepository._process_domains((step,), {"tech": (), "art": ()}, 1)
+
+    assert calls == ["tech", "art"]
+
+
+@pytest.fixture
+def gds_estimates(monkeypatch):
+    writes = []
+    monkeypatch.setattr(
+        "db.repository.vote_repository.execute_read", lambda work, *args: work(None, *args), raising=True
+    )
+    monkeypatch.setattr(
+        "db.repository.vote_repository.execute_write",
+        lambda work, *args: writes.append(work.__name__) or ["tech", "art"],
+        raising=True,
+    )
+    monkeypatch.setattr(
+        VoteRepository, "_get_domain_sizes_tx",
+        staticmethod(lambda tx: [
+            {"domain": "tech", "nodeCount": 200, "relationshipCount": 100},
+            {"domain": "art", "nodeCount": 20, "relationshipCount": 10},
+        ]),
+    )
+    monkeypatch.setattr(
+        VoteRepository, "_estimate_projections_tx",
+        staticmethod(lambda tx, sizes: [
+            {**size, "requiredMemory": "", "bytesMax": size["relationshipCount"] * 1024 * 1024}
+            for size in sizes
+        ]),
+    )
+    monkeypatch.setattr(VoteRepository, "_process_domains", staticmethod(lambda *args, **kwargs: []))
+    return writes
+
+
+def test_gds_recalculation_refuses_to_start_over_memory_budget(gds_estimates, monkeypatch):
+    monkeypatch.setattr("db.repository.vote_repository.GDS_MEMORY_BUDGET_MB", 105, raising=True)
+
+    # Deux workers : les deux projections coexistent (110 Mo)
+    with pytest.raises(RuntimeError, match="VOTE_GDS_MEMORY_BUDGET_MB"):
+        VoteRepository.recalculate_counts_by_domain(mode="gds", workers=2)
+
+    assert gds_estimates == []
+
+
+def test_gds_recalculation_within_memory_budget(gds_estimates, monkeypatch):
+    monkeypatch.setattr("db.repository.vote_repository.GDS_MEMORY_BUDGET_MB", 105, raising=True)
+
+    VoteRepository.recalculate_counts_by_domain(mode="gds", workers=1)
+
+    assert gds_estimates == ["_setup_recalculation_by_domain_tx", "_cleanup_recalculation_by_domain_tx"]
+    assert VoteRepository._estimate_projections(["art"], 1) == {"art": 10 * 1024 * 1024}
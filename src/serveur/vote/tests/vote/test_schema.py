@@ -0,0 +1,80 @@
+from db.repository.schema_repository import SchemaRepository
+
+
+class DummyResult:
+    def __init__(self, names):
+        self.names = names
+
+    def value(self):
+        return self.names
+
+    def consume(self):
+        return None
+
+
+class DummySession:
+    executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query):
+        if query.startswith("SHOW CONSTRAINTS"):
+            return DummyResult(["user_id_unique"])
+        if query.startswith("SHOW INDEXES"):
+            return DummyResult(["voted_processed"])
+        DummySession.executed.append(query)
+        return DummyResult([])
+
+
+class DummyDriver:
+    def session(self):
+        return DummySession()
+
+
+def test_missing_schema_and_ensure_only_creates_missing(monkeypatch):
+    monkeypatch.setattr(
+        "db.repository.schema_repository.get_driver", lambda: DummyDriver(), raising=True
+    )
+    DummySession.executed = []
+
+    missing = SchemaRepository.missing_schema()
+
+    assert "user_id_unique" not in missing
+    assert "voted_processed" not in missing
+    assert "voted_domain_current" in missing
+
+    created = SchemaRepository.ensure_schema()
+
+    assert created == missing
+    assert all("IF NOT EXISTS" in query for query in DummySession.executed)
+    assert len(DummySession.executed) == len(missing)
+
+
+def test_schema_check_starts_once_and_can_be_disabled(monkeypatch):
+    from api import apps
+
+    started = []
+
+    class DummyThread:
+        def __init__(self, target, daemon):
+            self.target = target
+
+        def start(self):
+            started.append(self.target)
+
+    monkeypatch.setattr(apps.threading, "Thread", DummyThread, raising=True)
+    monkeypatch.setattr(apps, "_schema_check_started", False, raising=True)
+
+    monkeypatch.setenv("VOTE_SCHEMA_CHECK", "false")
+    apps.start_schema_check()
+    assert started == []
+
+    # Actif par défaut, une seule fois par processus
+    monkeypatch.delenv("VOTE_SCHEMA_CHECK")
+    apps.start_schema_check()
+    apps.start_schema_check()
+    assert started == [apps.check_vote_schema]
@@ -591,3 +591,38 @@ def test_received_votes_chain_cross_domain():
 
     assert "finance" not in data["byDomain"]
 
+
+
+def test_create_votes_bulk_reports_each_item(monkeypatch):
+    class DummyRepo:
+        saved = None
+
+        @staticmethod
+        def save_votes(votes: list[dict]) -> None:
+            DummyRepo.saved = votes
+
+    monkeypatch.setattr(
+        "core.services.vote_service.VoteRepository",
+        DummyRepo,
+        raising=True,
+    )
+
+    client = APIClient()
+    payload = {
+        "votes": [
+            {"targetUserId": "t1", "domain": "tech"},
+            {"domain": "design"},
+            {"targetUserId": "t2", "domain": "tech"},
+        ]
+    }
+
+    response = client.post(
+        "/api/votes/bulk", payload, format="json", HTTP_AUTHORIZATION="Bearer bulk-voter"
+    )
+
+    assert response.status_code == 207
+    data = response.json()
+    assert data["created"] == 1
+    assert [item["status"] for item in data["results"]] == ["replaced", "invalid", "created"]
+    assert data["results"][2]["vote"]["voterId"] == "bulk-voter"
+    assert [vote["targetUserId"] for vote in DummyRepo.saved] == ["t2"]
@@ -0,0 +1,235 @@
+import pytest
+from rest_framework.test import APIClient
+
+from core.services import vote_job_service
+from core.services.vote_job_service import VoteJobService, _LockHeartbeat
+from db.repository.run_repository import RunCancelled, RunLockLost
+
+
+class DummyRunRepository:
+    lock_attempts = []
+    status = "queued"
+    claimable = True
+    events = []
+
+    @staticmethod
+    def acquire_lock(owner, run_id, ttl_seconds):
+        DummyRunRepository.events.append("acquire_lock")
+        return DummyRunRepository.lock_attempts.pop(0) if DummyRunRepository.lock_attempts else True
+
+    @staticmethod
+    def release_lock(owner):
+        DummyRunRepository.events.append("release_lock")
+
+    @staticmethod
+    def get_status(run_id):
+        return DummyRunRepository.status
+
+    @staticmethod
+    def claim_run(run_id):
+        DummyRunRepository.events.append("claim_run")
+        return DummyRunRepository.claimable
+
+    @staticmethod
+    def mark_lock_lost(run_id):
+        DummyRunRepository.events.append(("mark_lock_lost", run_id))
+
+    @staticmethod
+    def forget_lock_lost(run_id):
+        pass
+
+
+class DummyValidationService:
+    PHASES = ("clean_duplicates", "recalculate", "validate", "daily_stats", "results")
+    error = None
+
+    @staticmethod
+    def process_daily_votes(resume=False, run_id=None):
+        DummyRunRepository.events.append(("process", run_id))
+        if DummyValidationService.error is not None:
+            raise DummyValidationService.error
+        return run_id
+
+
+@pytest.fixture
+def dummy_jobs(monkeypatch):
+    DummyRunRepository.lock_attempts = []
+    DummyRunRepository.status = "queued"
+    DummyRunRepository.claimable = True
+    DummyRunRepository.events = []
+    DummyValidationService.error = None
+    monkeypatch.setattr("core.services.vote_job_service.RunRepository", DummyRunRepository, raising=True)
+    monkeypatch.setattr("core.services.vote_job_service.VoteValidationService", DummyValidationService, raising=True)
+    monkeypatch.setattr("core.services.vote_job_service.JOB_LOCK_POLL_INTERVAL", 0, raising=True)
+
+
+def test_job_waits_for_the_lock_then_runs(dummy_jobs):
+    DummyRunRepository.lock_attempts = [False, False, True]
+
+    VoteJobService._execute("run-1")
+
+    assert DummyRunRepository.events == [
+        "acquire_lock", "acquire_lock", "acquire_lock", "claim_run", ("process", "run-1"), "release_lock",
+    ]
+
+
+def test_job_cancelled_while_waiting_is_not_run(dummy_jobs):
+    DummyRunRepository.lock_attempts = [False]
+    DummyRunRepository.status = "cancelled"
+
+    VoteJobService._execute("run-1")
+
+    assert DummyRunRepository.events == ["acquire_lock"]
+
+
+def test_job_releases_the_lock_when_unclaimable_or_cancelled(dummy_jobs):
+    DummyRunRepository.claimable = False
+    VoteJobService._execute("run-1")
+
+    assert DummyRunRepository.events == ["acquire_lock", "claim_run", "release_lock"]
+
+    DummyRunRepository.claimable = True
+    DummyRunRepository.events = []
+    DummyValidationService.error = RunCancelled("run-1")
+    VoteJobService._execute("run-1")
+
+    assert DummyRunRepository.events[-1] == "release_lock"
+
+
+def test_failed_job_releases_the_lock_and_raises(dummy_jobs):
+    DummyValidationService.error = ValueError("boom")
+
+    with pytest.raises(ValueError):
+        VoteJobService._execute("run-1")
+    assert DummyRunRepository.events[-1] == "release_lock"
+
+
+def test_progress_counts_phases_and_domains():
+    steps = [
+        {"phase": "clean_duplicates", "domain": "", "status": "completed", "domainCount": None},
+        {"phase": "recalculate_setup", "domain": "", "status": "completed", "domainCount": 3},
+        {"phase": "recalculate", "domain": "", "status": "running", "domainCount": None},
+        {"phase": "recalculate", "domain": "tech", "status": "completed", "domainCount": None},
+        {"phase": "recalculate", "domain": "art", "status": "failed", "domainCount": None},
+    ]
+
+    assert VoteJobService._progress(steps) == {
+        "phasesDone": 1,
+        "phasesTotal": 5,
+        "currentPhase": "recalculate",
+        "domainsDone": 1,
+        "domainsTotal": 3,
+    }
+
+
+class DummyJobService:
+    jobs = {}
+
+    @staticmethod
+    def enqueue(resume=False):
+        return {"id": "run-7", "resumed": resume, "status": "queued"}
+
+    @staticmethod
+    def get_job(run_id):
+        return DummyJobService.jobs.get(run_id)
+
+    @staticmethod
+    def cancel(run_id):
+        job = DummyJobService.jobs.get(run_id)
+        return job["status"] if job else None
+
+
+def test_force_validation_returns_a_job(monkeypatch):
+    monkeypatch.setattr("api.vote_controller.VoteJobService", DummyJobService, raising=True)
+    monkeypatch.setattr("app.security_config.VOTE_OPERATOR_UIDS", {"1"}, raising=True)
+
+    response = APIClient().get("/api/votes/validate/force?resume=true", HTTP_AUTHORIZATION="Bearer 1")
+
+    assert response.status_code == 202
+    assert response.data == {"jobId": "run-7", "status": "queued", "resumed": True}
+    assert response["Location"] == "/api/votes/validate/jobs/run-7"
+
+
+def test_job_status_and_cancel(monkeypatch):
+    monkeypatch.setattr("api.vote_controller.VoteJobService", DummyJobService, raising=True)
+    monkeypatch.setattr("app.security_config.VOTE_OPERATOR_UIDS", {"1"}, raising=True)
+    DummyJobService.jobs = {
+        "run-7": {
+            "id": "run-7", "date": "2025-12-15", "status": "completed", "cancelRequested": False,
+            "error": None, "steps": [],
+            "progress": {"phasesDone": 5, "phasesTotal": 5, "currentPhase": None, "domainsDone": 0, "domainsTotal": 0},
+        },
+    }
+    client = APIClient()
+
+    status = client.get("/api/votes/validate/jobs/run-7", HTTP_AUTHORIZATION="Bearer 1")
+    missing = client.get("/api/votes/validate/jobs/run-8", HTTP_AUTHORIZATION="Bearer 1")
+    cancel = client.delete("/api/votes/validate/jobs/run-7", HTTP_AUTHORIZATION="Bearer 1")
+
+    assert status.status_code == 200
+    assert status.data["jobId"] == "run-7" and status.data["progress"]["phasesDone"] == 5
+    assert missing.status_code == 404
+    assert cancel.status_code == 409
+
+
+def test_jobs_are_reserved_to_operators(monkeypatch):
+    monkeypatch.setattr("api.vote_controller.VoteJobService", DummyJobService, raising=True)
+    monkeypatch.setattr("app.security_config.VOTE_OPERATOR_UIDS", {"ops"}, raising=True)
+    DummyJobService.jobs = {"run-7": {"status": "running"}}
+    client = APIClient()
+
+    assert client.delete("/api/votes/validate/jobs/run-7", HTTP_AUTHORIZATION="Bearer 1").status_code == 403
+    assert client.get("/api/votes/validate/jobs/run-7", HTTP_AUTHORIZATION="Bearer 1").status_code == 403
+    assert client.get("/api/votes/validate/force?resume=true", HTTP_AUTHORIZATION="Bearer 1").status_code == 403
+    assert client.get("/api/votes/validate/force", HTTP_AUTHORIZATION="Bearer 1").status_code == 202
+    assert client.delete("/api/votes/validate/jobs/run-7", HTTP_AUTHORIZATION="Bearer ops").status_code == 202
+
+
+def test_job_stopped_by_a_lost_lock_releases_it(dummy_jobs):
+    DummyValidationService.error = RunLockLost("run-1")
+
+    VoteJobService._execute("run-1")
+
+    assert DummyRunRepository.events[-1] == "release_lock"
+
+
+def test_heartbeat_flags_a_lock_taken_over(dummy_jobs, monkeypatch):
+    monkeypatch.setattr(vote_job_service, "JOB_LOCK_TTL", 0, raising=True)
+    DummyRunRepository.lock_attempts = [True, False]
+
+    heartbeat = _LockHeartbeat("owner-1", "run-1")
+    heartbeat.run()
+
+    assert DummyRunRepository.events == ["acquire_lock", "acquire_lock", ("mark_lock_lost", "run-1")]
+
+
+def test_heartbeat_flags_a_lease_that_could_not_be_renewed(dummy_jobs, monkeypatch):
+    monkeypatch.setattr(vote_job_service, "JOB_LOCK_TTL", 0, raising=True)
+
+    def unreachable(owner, run_id, ttl_seconds):
+        raise ConnectionError("neo4j")
+
+    monkeypatch.setattr(DummyRunRepository, "acquire_lock", staticmethod(unreachable), raising=True)
+
+    _LockHeartbeat("owner-1", "run-1").run()
+
+    assert DummyRunRepository.events == [("mark_lock_lost", "run-1")]
+
+
+def test_lost_lock_is_seen_locally_even_if_neo4j_is_unreachable(monkeypatch):
+    from db.repository import run_repository
+    from db.repository.run_repository import RunRepository
+
+    def unreachable(*args):
+        raise ConnectionError("neo4j")
+
+    monkeypatch.setattr(run_repository, "execute_write", unreachable, raising=True)
+    monkeypatch.setattr(run_repository, "execute_read", unreachable, raising=True)
+
+    with pytest.raises(ConnectionError):
+        RunRepository.mark_lock_lost("run-1")
+    assert RunRepository.stop_reason("run-1") == "lock_lost"
+
+    RunRepository.forget_lock_lost("run-1")
+    with pytest.raises(ConnectionError):
+        RunRepository.stop_reason("run-1")
@@ -0,0 +1,309 @@
+import pytest
+
+from core.services.vote_validation_service import VoteValidationService
+from db.repository.run_repository import RunCancelled, RunLockLost
+from db.repository.vote_repository import VoteRepository
+
+
+class DummyRunRepository:
+    resumed = False
+    completed = {}
+    events = []
+    cancel_after = None
+    stop_reason_after = "cancelled"
+
+    @staticmethod
+    def start_run(run_date, resume=False):
+        DummyRunRepository.events.append(("start_run", resume))
+        return {"id": "run-1", "resumed": DummyRunRepository.resumed}
+
+    @staticmethod
+    def get_completed_steps(run_id):
+        return DummyRunRepository.completed
+
+    @staticmethod
+    def start_step(run_id, phase, domain=""):
+        DummyRunRepository.events.append(("start_step", phase))
+
+    @staticmethod
+    def finish_step(run_id, phase, domain="", seconds=None, error=None, domains=None, queries=None):
+        DummyRunRepository.events.append(("finish_step", phase, error))
+
+    @staticmethod
+    def finish_run(run_id, error=None, cancelled=False):
+        DummyRunRepository.events.append(("finish_run", "cancelled" if cancelled else error))
+
+    @staticmethod
+    def stop_reason(run_id):
+        # Arrêt (stop_reason_after) demandé une fois la phase `cancel_after` terminée
+        if ("finish_step", DummyRunRepository.cancel_after, None) in DummyRunRepository.events:
+            return DummyRunRepository.stop_reason_after
+        return None
+
+
+class DummyVoteRepository:
+    calls = []
+    fail_on = None
+
+    @staticmethod
+    def _call(name):
+        DummyVoteRepository.calls.append(name)
+        if DummyVoteRepository.fail_on == name:
+            raise ValueError("boom")
+
+    @staticmethod
+    def clean_duplicate_domain_votes():
+        DummyVoteRepository._call("clean_duplicates")
+
+    @staticmethod
+    def recalculate_counts_by_domain(run_id=None):
+        DummyVoteRepository._call("recalculate")
+
+    @staticmethod
+    def fetch_unprocessed_votes():
+        DummyVoteRepository._call("validate")
+        return []
+
+    @staticmethod
+    def append_daily_stats(date):
+        DummyVoteRepository._call("daily_stats")
+
+    @staticmethod
+    def build_leaderboards(date):
+        pass
+
+
+class DummyResultService:
+    @staticmethod
+    def materialize_results():
+        DummyVoteRepository._call("results")
+
+
+@pytest.fixture
+def dummy_run(monkeypatch):
+    DummyRunRepository.resumed = False
+    DummyRunRepository.completed = {}
+    DummyRunRepository.events = []
+    DummyRunRepository.cancel_after = None
+    DummyRunRepository.stop_reason_after = "cancelled"
+    DummyVoteRepository.calls = []
+    DummyVoteRepository.fail_on = None
+    monkeypatch.setattr("core.services.vote_validation_service.RunRepository", DummyRunRepository, raising=True)
+    monkeypatch.setattr("core.services.vote_validation_service.VoteRepository", DummyVoteRepository, raising=True)
+    monkeypatch.setattr("core.services.vote_validation_service.ResultService", DummyResultService, raising=True)
+
+
+def test_process_daily_votes_runs_every_phase(dummy_run):
+    run_id = VoteValidationService.process_daily_votes()
+
+    assert run_id == "run-1"
+    assert DummyVoteRepository.calls == ["clean_duplicates", "recalculate", "validate", "daily_stats", "results"]
+    assert DummyRunRepository.events[-1] == ("finish_run", None)
+
+
+def test_resumed_run_skips_completed_phases(dummy_run):
+    DummyRunRepository.resumed = True
+    DummyRunRepository.completed = {
+        ("clean_duplicates", ""): {"seconds": 1.0, "domains": None},
+        ("recalculate", ""): {"seconds": 2.0, "domains": None},
+        # Une étape par domaine ne marque pas la phase comme terminée
+        ("validate", "tech"): {"seconds": 1.0, "domains": None},
+    }
+
+    VoteValidationService.process_daily_votes(resume=True)
+
+    assert DummyRunRepository.events[0] == ("start_run", True)
+    assert DummyVoteRepository.calls == ["validate", "daily_stats", "results"]
+
+
+def test_failed_phase_marks_step_and_run_failed(dummy_run):
+    DummyVoteRepository.fail_on = "validate"
+
+    with pytest.raises(ValueError, match="boom"):
+        VoteValidationService.process_daily_votes()
+
+    assert DummyVoteRepository.calls == ["clean_duplicates", "recalculate", "validate"]
+    assert DummyRunRepository.events[-2][:2] == ("finish_step", "validate")
+    assert "boom" in DummyRunRepository.events[-2][2]
+    assert DummyRunRepository.events[-1][0] == "finish_run"
+    assert DummyRunRepository.events[-1][1].startswith("validate:")
+
+
+class DummySession:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_write(self, step, *args):
+        return step(None, *args)
+
+
+def test_process_domains_journals_each_domain(monkeypatch):
+    journal = []
+    monkeypatch.setattr(
+        "db.repository.vote_repository.get_driver",
+        lambda: type("Driver", (), {"session": lambda self: DummySession()})(),
+        raising=True,
+    )
+    monkeypatch.setattr(
+        "db.repository.vote_repository.RunRepository.finish_step",
+        staticmethod(lambda run_id, phase, domain="", seconds=None, error=None, domains=None:
+                     journal.append((run_id, phase, domain, error))),
+        raising=True,
+    )
+    monkeypatch.setattr(
+        "db.repository.vote_repository.RunRepository.stop_reason",
+        staticmethod(lambda run_id: None),
+        raising=True,
+    )
+
+    def step(tx, domain):
+        if domain == "art":
+            raise ValueError("boom")
+
+    with pytest.raises(RuntimeError):
+        VoteRepository._process_domains((step,), {"tech": (), "art": ()}, 1, run_id="run-1", phase="recalculate")
+
+    assert journal[0] == ("run-1", "recalculate", "tech", None)
+    assert journal[1][:3] == ("run-1", "recalculate", "art") and "boom" in journal[1][3]
+
+
+def test_each_phase_logs_a_structured_line(dummy_run, caplog):
+    DummyVoteRepository.fail_on = "daily_stats"
+
+    with caplog.at_level("INFO", logger="core.services.vote_validation_service"):
+        with pytest.raises(ValueError):
+            VoteValidationService.process_daily_votes()
+
+    phases = [record.vote_run_phase for record in caplog.records if hasattr(record, "vote_run_phase")]
+    assert [(fields["phase"], fields["status"]) for fields in phases] == [
+        ("clean_duplicates", "ok"), ("recalculate", "ok"), ("validate", "ok"), ("daily_stats", "error"),
+    ]
+    assert "run=run-1 phase=clean_duplicates status=ok" in caplog.records[0].getMessage()
+
+
+def test_cancel_is_honoured_between_phases(dummy_run):
+    DummyRunRepository.cancel_after = "recalculate"
+
+    with pytest.raises(RunCancelled):
+        VoteValidationService.process_daily_votes(run_id="run-9")
+
+    assert DummyVoteRepository.calls == ["clean_duplicates", "recalculate"]
+    assert DummyRunRepository.events[0] == ("start_step", "clean_duplicates")
+    assert DummyRunRepository.events[-1] == ("finish_run", "cancelled")
+
+
+def test_process_domains_stops_remaining_domains_on_cancel(monkeypatch):
+    processed = []
+    monkeypatch.setattr(
+        "db.repository.vote_repository.get_driver",
+        lambda: type("Driver", (), {"session": lambda self: DummySession()})(),
+        raising=True,
+    )
+    monkeypatch.setattr(
+        "db.repository.vote_repository.RunRepository.finish_step",
+        staticmethod(lambda *args, **kwargs: None),
+        raising=True,
+    )
+    monkeypatch.setattr(
+        "db.repository.vote_repository.RunRepository.stop_reason",
+        staticmethod(lambda run_id: "cancelled" if len(processed) >= 1 else None),
+        raising=True,
+    )
+
+    def step(tx, domain):
+        processed.append(domain)
+
+    with pytest.raises(RunCancelled):
+        VoteRepository._process_domains((step,), {"tech": (), "art": (), "sport": ()}, 1, run_id="run-1", phase="recalculate")
+
+    assert processed == ["tech"]
+
+
+def test_lost_lock_stops_the_run_without_touching_the_journal(dummy_run):
+    DummyRunRepository.cancel_after = "clean_duplicates"
+    DummyRunRepository.stop_reason_after = "lock_lost"
+
+    with pytest.raises(RunLockLost):
+        VoteValidationService.process_daily_votes(run_id="run-9")
+
+    assert DummyVoteRepository.calls == ["clean_duplicates"]
+    assert DummyRunRepository.events == [("start_step", "clean_duplicates"), ("finish_step", "clean_duplicates", None)]
+
+
+def test_validation_draw_is_marked_first_and_kept_on_resume(dummy_run, monkeypatch):
+    unprocessed = [str(i) for i in range(10)]
+    invalid = []
+    draws = []
+    validated = []
+
+    def mark_votes_invalid(rel_ids):
+        invalid.extend(rel_ids)
+        for rel_id in rel_ids:
+            unprocessed.remove(rel_id)
+
+    def record_validation_draw(run_id, rejected, kept):
+        # Marquage et journal dans la même transaction côté repository
+        mark_votes_invalid(rejected)
+        draws.append(list(kept))
+
+    def validate_vote(vote_id):
+        if len(validated) == 4:
+            raise ValueError("boom")
+        unprocessed.remove(vote_id)
+        validated.append(vote_id)
+        return True
+
+    monkeypatch.setattr(DummyVoteRepository, "fetch_unprocessed_votes", staticmethod(lambda: list(unprocessed)))
+    monkeypatch.setattr(DummyVoteRepository, "mark_votes_invalid", staticmethod(mark_votes_invalid), raising=False)
+    monkeypatch.setattr(
+        DummyVoteRepository, "record_validation_draw", staticmethod(record_validation_draw), raising=False
+    )
+    monkeypatch.setattr(VoteValidationService, "validate_vote", staticmethod(validate_vote))
+
+    with pytest.raises(ValueError):
+        VoteValidationService.validate_unprocessed_votes(run_id="run-1")
+
+    # Les votes écartés par le tirage sont marqués avec le journal, avant la validation
+    assert len(invalid) == 1 and len(draws) == 1 and len(draws[0]) == 9
+    assert validated == draws[0][:4]
+
+    # Vote enregistré entre l'arrêt et la reprise
+    unprocessed.append("new")
+    DummyRunRepository.completed = {
+        ("validate_setup", ""): {"seconds": None, "domains": None, "voteIds": draws[0]},
+    }
+    monkeypatch.setattr(
+        VoteValidationService, "validate_vote",
+        staticmethod(lambda vote_id: validated.append(vote_id) or unprocessed.remove(vote_id) or True),
+    )
+    VoteValidationService.validate_unprocessed_votes(run_id="run-1")
+
+    # Reprise : pas de nouveau tirage, seuls les votes tirés sont validés, dans l'ordre du tirage
+    assert len(invalid) == 1 and len(draws) == 1
+    assert validated == draws[0]
+    assert unprocessed == ["new"]
+
+
+def test_validation_draw_is_written_in_one_transaction(monkeypatch):
+    class RecordingTx:
+        queries = []
+
+        def run(self, query, *args, **params):
+            RecordingTx.queries.append((query, params))
+
+    writes = []
+    monkeypatch.setattr(
+        "db.repository.vote_repository.execute_write",
+        lambda work, *args: writes.append(work) or work(RecordingTx(), *args),
+        raising=True,
+    )
+
+    VoteRepository.record_validation_draw("run-1", ["r1"], ["v1", "v2"])
+
+    assert len(writes) == 1 and len(RecordingTx.queries) == 2
+    assert RecordingTx.queries[0][1]["ids"] == ["r1"]
+    assert RecordingTx.queries[1][1]["voteIds"] == ["v1", "v2"]
+    assert RecordingTx.queries[1][1]["phase"] == "validate_setup"
@@ -85,21 +85,13 @@ def test_get_votes_by_voter_delegates_to_repository(monkeypatch):
         ]
 
         @staticmethod
-        def find_votes_by_voter(voter_id: str, domain: str | None = None):
+        def find_votes_by_voter_with_stats(voter_id: str, domain: str | None = None):
             DummyRepo.called_with = (voter_id, domain)
-            return DummyRepo.return_value
-        
-        @staticmethod
-        def get_publish_votes_setting(user_id: str):
-            return True, {"2025-12-15": { "tech": 2, "design": 1 }}
-        
-        @staticmethod
-        def get_last_update():
-            return "2025-12-15"
-        
-        @staticmethod
-        def get_all_domains():
-            return ["tech", "design"]
+            return {
+                "publishVotes": True,
+                "lastCounts": {"tech": 2, "design": 1},
+                "votes": DummyRepo.return_value,
+            }
 
     monkeypatch.setattr(
         "core.services.vote_service.VoteRepository",
@@ -123,34 +115,27 @@ def test_get_votes_by_voter_delegates_to_repository(monkeypatch):
 def test_get_received_votes_delegates_to_repository(monkeypatch):
     class DummyRepo:
         called_with = None
-        return_value = {
-            "userId": "22222222-2222-2222-2222-222222222222",
-            "total": 3,
-            "byDomain": {"tech": 2, "design": 1},
-            "usersByDomain": {
-                "tech": [
-                    "11111111-1111-1111-1111-111111111111",
-                    "33333333-3333-3333-3333-333333333333",
-                ],
-                "design": [
-                    "44444444-4444-4444-4444-444444444444",
-                ],
-            },
-        }
+        return_value = None
 
         @staticmethod
-        def get_received_votes_summary(user_id: str, domain: str | None = None) -> dict:
+        def get_received_votes_with_stats(user_id: str, domain: str | None = None) -> dict:
             DummyRepo.called_with = (user_id, domain)
+            DummyRepo.return_value = {
+                "userId": "22222222-2222-2222-2222-222222222222",
+                "publishVotes": True,
+                "lastCounts": {"tech": 2, "design": 1},
+                "usersByDomain": {
+                    "tech": [
+                        "11111111-1111-1111-1111-111111111111",
+                        "33333333-3333-3333-3333-333333333333",
+                    ],
+                    "design": [
+                        "44444444-4444-4444-4444-444444444444",
+                    ],
+                },
+            }
             return DummyRepo.return_value
 
-        @staticmethod
-        def get_publish_votes_setting(user_id: str):
-            return True, {"2025-12-15": { "tech": 2, "design": 1 }}
-        
-        @staticmethod
-        def get_last_update():
-            return "2025-12-15"
-
     monkeypatch.setattr(
         "core.services.vote_service.VoteRepository",
         DummyRepo,
@@ -162,6 +147,9 @@ def test_get_received_votes_delegates_to_repository(monkeypatch):
     summary = VoteService.get_received_votes(user_id=user_id, domain=None)
 
     assert summary is DummyRepo.return_value
+    assert summary["total"] == 3
+    assert summary["byDomain"] == {"tech": 2, "design": 1}
+    assert "publishVotes" not in summary and "lastCounts" not in summary
     assert DummyRepo.called_with == (user_id, None)
 
     summary = VoteService.get_received_votes(user_id=user_id, domain="tech")
@@ -169,3 +157,124 @@ def test_get_received_votes_delegates_to_repository(monkeypatch):
     assert summary is DummyRepo.return_value
     assert DummyRepo.called_with == (user_id, "tech")
 
+
+
+def test_private_voter_only_exposes_domains_above_min_public_votes(monkeypatch):
+    class DummyRepo:
+        @staticmethod
+        def find_votes_by_voter_with_stats(voter_id: str, domain: str | None = None):
+            return {
+                "publishVotes": False,
+                "lastCounts": {"tech": 5, "design": 1},
+                "votes": [
+                    {"id": "vote-1", "domain": "tech"},
+                    {"id": "vote-2", "domain": "design"},
+                ],
+            }
+
+        @staticmethod
+        def get_received_votes_with_stats(user_id: str, domain: str | None = None) -> dict:
+            return {
+                "userId": user_id,
+                "publishVotes": False,
+                "lastCounts": {"tech": 5, "design": 1},
+                "usersByDomain": {"tech": ["a"], "design": ["b"]},
+            }
+
+    monkeypatch.setattr("core.services.vote_service.MIN_PUBLIC_VOTES", 5, raising=True)
+    monkeypatch.setattr(
+        "core.services.vote_service.VoteRepository",
+        DummyRepo,
+        raising=True,
+    )
+
+    votes = VoteService.get_votes_by_voter(voter_id="v1")
+    assert [vote["id"] for vote in votes] == ["vote-1"]
+    assert len(VoteService.get_votes_by_voter(voter_id="v1", is_me=True)) == 2
+
+    summary = VoteService.get_received_votes(user_id="u1")
+    assert summary["byDomain"] == {"tech": 5}
+    assert summary["usersByDomain"] == {"tech": ["a"]}
+    assert summary["total"] == 5
+
+
+def test_create_votes_keeps_last_vote_per_domain(monkeypatch):
+    class DummyRepo:
+        saved = None
+
+        @staticmethod
+        def save_votes(votes: list[dict]) -> None:
+            DummyRepo.saved = votes
+
+    monkeypatch.setattr(
+        "core.services.vote_service.VoteRepository",
+        DummyRepo,
+        raising=True,
+    )
+
+    voter_id = "11111111-1111-1111-1111-111111111111"
+    results = VoteService.create_votes(
+        voter_id=voter_id,
+        items=[
+            {"targetUserId": "t1", "domain": "tech"},
+            {"targetUserId": "t2", "domain": "design"},
+            {"targetUserId": "t3", "domain": "tech"},
+        ],
+    )
+
+    assert [result["status"] for result in results] == ["replaced", "created", "created"]
+    assert [vote["targetUserId"] for vote in DummyRepo.saved] == ["t2", "t3"]
+    assert all(vote["voterId"] == voter_id for vote in DummyRepo.saved)
+    assert results[2]["vote"] is DummyRepo.saved[1]
+
+
+def test_import_votes_keeps_last_vote_per_voter_and_domain(monkeypatch):
+    class DummyRepo:
+        saved = None
+
+        @staticmethod
+        def save_votes(votes: list[dict]) -> None:
+            DummyRepo.saved = votes
+
+    monkeypatch.setattr("core.services.vote_service.VoteRepository", DummyRepo, raising=True)
+
+    results = VoteService.import_votes(
+        items=[
+            {"voterId": "v1", "targetUserId": "t1", "domain": "tech"},
+            {"voterId": "v2", "targetUserId": "t2", "domain": "tech"},
+            {"voterId": "v1", "targetUserId": "t3", "domain": "tech"},
+        ],
+    )
+
+    assert [result["status"] for result in results] == ["replaced", "created", "created"]
+    assert [(vote["voterId"], vote["targetUserId"]) for vote in DummyRepo.saved] == [("v2", "t2"), ("v1", "t3")]
+
+
+def test_import_votes_command_reads_csv_in_chunks(monkeypatch, tmp_path):
+    from io import StringIO
+
+    from django.core.management import call_command
+
+    chunks = []
+
+    def import_votes(items):
+        chunks.append(items)
+        return [{"status": "created"} for _ in items]
+
+    monkeypatch.setattr(VoteService, "import_votes", staticmethod(import_votes), raising=True)
+    path = tmp_path / "votes.csv"
+    path.write_text(
+        "voterId,targetUserId,domain\n"
+        "v1,t1,tech\n"
+        ",t2,tech\n"
+        "v3,t3,art\n"
+        "v4,t4,art\n",
+        encoding="utf-8",
+    )
+    out, err = StringIO(), StringIO()
+
+    call_command("import_votes", str(path), "--chunk-size", "2", stdout=out, stderr=err)
+
+    assert [[item["voterId"] for item in chunk] for chunk in chunks] == [["v1"], ["v3", "v4"]]
+    assert "Ligne 3 ignorée" in err.getvalue()
+    assert "3 votes importés, 0 remplacés, 1 lignes invalides" in out.getvalue()
@@ -0,0 +1,83 @@
+from core.rules.vote_validation import DomainVoteValidator
+
+
+def _edges(validator: DomainVoteValidator) -> dict[tuple[str, str], tuple]:
+    return {
+        (validator.sources[e], validator.targets[e]): (validator.counts[e], validator.cycles[e])
+        for e in range(len(validator.rel_ids))
+    }
+
+
+def test_sequential_chain_then_cycle():
+    validator = DomainVoteValidator({node: 100 for node in "ABCD"})
+
+    rejected = validator.validate([
+        ("r1", "A", "C"),
+        ("r2", "B", "C"),
+        ("r3", "C", "D"),
+    ])
+
+    assert rejected == []
+    assert _edges(validator) == {
+        ("A", "C"): (1, False),
+        ("B", "C"): (1, False),
+        ("C", "D"): (3, False),
+    }
+
+    # D -> A ferme le cycle A -> C -> D -> A
+    assert validator.validate([("r4", "D", "A")]) == []
+    edges = _edges(validator)
+    assert edges[("A", "C")] == (4, True)
+    assert edges[("C", "D")] == (4, True)
+    assert edges[("D", "A")] == (4, True)
+    assert edges[("B", "C")] == (1, False)
+
+
+def test_threshold_rejects_vote_and_leaves_graph_untouched():
+    validator = DomainVoteValidator({"A": 100, "B": 100, "C": 1, "E": 100})
+    validator.add_edge("r1", "A", "C", 1, False)
+    validator.add_edge("r2", "B", "C", 1, False)
+
+    assert validator.validate([("r3", "E", "C")]) == ["r3"]
+    assert validator.created_rows() == []
+    assert validator.updated_rows() == []
+
+
+def test_path_counts_are_incremented():
+    validator = DomainVoteValidator({node: -1 for node in "ABCD"})
+    validator.add_edge("r1", "B", "C", 1, False)
+    validator.add_edge("r2", "C", "D", 2, False)
+
+    assert validator.validate([("r3", "A", "B")]) == []
+    assert validator.created_rows() == [{"relId": "r3", "count": 1, "cycle": False}]
+    assert validator.updated_rows() == [
+        {"relId": "r1", "count": 2, "cycle": False},
+        {"relId": "r2", "count": 3, "cycle": False},
+    ]
+
+
+def test_trailing_self_loop_is_ignored():
+    validator = DomainVoteValidator({"C": 100, "D": 100})
+    validator.add_edge("self", "D", "D", None, True)
+
+    assert validator.check_vote("C", "D") == (1, [], False)
+
+
+def test_null_count_stays_null_like_cypher():
+    validator = DomainVoteValidator({})
+    validator.add_edge("r1", "B", "C", None, False)
+
+    validator.validate([("r2", "A", "B")])
+
+    assert validator.counts[0] is None
+
+
+def test_longest_trail_explores_branches():
+    validator = DomainVoteValidator({})
+    validator.add_edge("r1", "A", "B", 1, False)
+    validator.add_edge("r2", "A", "C", 1, False)
+    validator.add_edge("r3", "C", "D", 2, False)
+
+    trail = validator.longest_trail("A")
+
+    assert [validator.rel_ids[e] for e in trail] == ["r2", "r3"]